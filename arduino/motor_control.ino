@@ -37,6 +37,45 @@ const int lazerPin = 6;
 #define STEPPER_CMD 0x02
 #define LASER_CMD 0x03
 
+// === Çok Eksenli Çerçeve Protokolü (src/serial_protocol.py ile aynı) ===
+// A5 | seq | flags | servo u16 LE | stepper u16 LE | CRC-8 (seq..stepper)
+// Açılar 1/100 derece; yalnızca flags ile geçerli işaretlenen alanlar uygulanır
+#define FRAME_START 0xA5
+#define FRAME_SIZE 8
+#define FLAG_LASER_ON 0x01
+#define FLAG_SERVO 0x02
+#define FLAG_STEPPER 0x04
+#define FLAG_LASER 0x08
+int lastFrameSequence = -1;
+unsigned long framesLost = 0;
+unsigned long frameCrcErrors = 0;
+
+// === Baud Müzakeresi (src/serial_protocol.py ile aynı) ===
+// "?" -> yetenekler, "B<baud>" -> OK + hız değişimi, "E<token>" -> echo (yeni hızı onaylar)
+const long defaultBaud = 9600;
+const long supportedBauds[] = {9600, 19200, 57600, 115200, 230400};
+const int supportedBaudCount = sizeof(supportedBauds) / sizeof(supportedBauds[0]);
+const unsigned long baudCommitTimeout = 1000;  // Onaylanmayan hız bu sürede 9600'e döner
+const unsigned long linkTimeout = 3000;        // Geçerli komut gelmezse 9600'e dön
+long linkBaud = defaultBaud;
+bool baudCommitted = true;
+unsigned long baudSwitchTime = 0;
+unsigned long lastValidCommand = 0;
+
+// === Metin Satırları ===
+// Yalnızca '\n' ile biten tam satırlar işlenir; yazdırılamayan bir bayt satırı iptal eder
+// (yarım kalmış bir çerçevenin 'S'/'M'/'B'/'E' değerli baytı metin komutu sayılmaz)
+const int textLineMax = 24;
+const unsigned long textLineTimeout = 50;  // ms, tamamlanmayan satır atılır
+char textLine[textLineMax + 1];
+int textLength = -1;  // -1: satır içinde değil
+unsigned long textLineStart = 0;
+
+// === Telemetri (src/telemetry.py ayrıştırır) ===
+// T <millis> <servo> <stepper> <hedef servo> <hedef stepper> <lazer 0/1>
+const unsigned long telemetryInterval = 100;  // ms, 9600'ün üstünde yarısı
+unsigned long lastTelemetry = 0;
+
 void setup() {
   servo.attach(servoPin);
   servo.write(currentServoAngle);
@@ -49,19 +88,36 @@ void setup() {
   pinMode(lazerPin, OUTPUT);
   digitalWrite(lazerPin, LOW);
 
-  Serial.begin(9600);
+  Serial.begin(defaultBaud);
+  Serial.setTimeout(textLineTimeout);
   Serial.println("Integrated Servo + Step + Lazer kontrol sistemi hazır.");
 }
 
 void loop() {
-  if (Serial.available() > 0) {
-    if (Serial.peek() == 'S' || Serial.peek() == 'M' || Serial.peek() == 'a' || Serial.peek() == 'p') {
-      processTextCommand();
+  // Gelen her şeyi işle - yüksek hızda bir döngüde birden çok komut gelir
+  int commandBudget = 16;
+  while (Serial.available() > 0 && commandBudget-- > 0) {
+    int availableBefore = Serial.available();
+    char next = Serial.peek();
+    if (textLength >= 0 || next == 'S' || next == 'M' || next == 'a' || next == 'p' || next == '?' || next == 'B' || next == 'E') {
+      readTextLine();
     }
     else if (Serial.peek() == START_BYTE) {
       processBinaryCommand();
     }
+    else if (Serial.peek() == FRAME_START) {
+      processFrame();
+    }
+    else {
+      Serial.read();  // Bilinmeyen bayt - ayrıştırıcının takılmaması için at
+    }
+    if (Serial.available() == availableBefore) break;  // Eksik paket - kalanını bekle
   }
+  if (textLength >= 0 && millis() - textLineStart > textLineTimeout) {
+    textLength = -1;  // Satır sonu hiç gelmedi
+  }
+  checkLinkWatchdog();
+  sendTelemetry();
 
   moveStepperToAngle(targetStepperAngle);
   moveServoToAngle(targetServoAngle);
@@ -69,15 +125,86 @@ void loop() {
   delay(10);  // Faster loop for better responsiveness
 }
 
-void processTextCommand() {
-  String input = Serial.readStringUntil('\n');
+void readTextLine() {
+  if (textLength < 0) {
+    textLength = 0;
+    textLineStart = millis();
+  }
+  while (Serial.available() > 0) {
+    int c = Serial.peek();
+    if (c == '\n') {
+      Serial.read();
+      textLine[textLength] = '\0';
+      textLength = -1;
+      processTextCommand(String(textLine));
+      return;
+    }
+    if (c == '\r') {
+      Serial.read();
+      continue;
+    }
+    if (c < 0x20 || c > 0x7E || textLength >= textLineMax) {
+      textLength = -1;  // İkili veri - bayt çerçeve ayrıştırıcısına kalır
+      return;
+    }
+    textLine[textLength++] = Serial.read();
+  }
+}
+
+// "30", "-5", "30.0" gibi sayılar; başka her şey (ikili çöp dahil) reddedilir
+bool parseNumber(const String &text, long &value) {
+  int i = (text.length() > 0 && text[0] == '-') ? 1 : 0;
+  int digits = 0;
+  while (i < (int)text.length() && isDigit(text[i])) { i++; digits++; }
+  if (digits == 0 || digits > 6) return false;
+  if (i < (int)text.length() && text[i] == '.') {
+    i++;
+    while (i < (int)text.length() && isDigit(text[i])) i++;
+  }
+  if (i != (int)text.length()) return false;
+  value = text.toInt();
+  return true;
+}
+
+void resetLinkState() {
+  lastFrameSequence = -1;  // Yeni oturumun ilk çerçevesi tekrar sayılmasın
+}
+
+void processTextCommand(String input) {
   input.trim();
+  long value;
+  bool isCommand = input == "?" || input == "a" || input == "p" ||
+                   ((input.startsWith("B") || input.startsWith("E") || input.startsWith("S") || input.startsWith("M")) &&
+                    parseNumber(input.substring(1), value));
+  if (!isCommand) return;
+  lastValidCommand = millis();
 
-  if (input.startsWith("S")) {
-    int angle = input.substring(1).toInt();
+  if (input == "?") {
+    resetLinkState();  // Host bağlanırken yetenekleri sorar
+    Serial.print("CAP proto=text,binary,frame baud=");
+    for (int i = 0; i < supportedBaudCount; i++) {
+      Serial.print(supportedBauds[i]);
+      if (i < supportedBaudCount - 1) Serial.print(',');
+    }
+    Serial.println();
+  } else if (input.startsWith("B")) {
+    long baud = value;
+    if (isSupportedBaud(baud)) {
+      Serial.print("OK B");
+      Serial.println(baud);
+      Serial.flush();  // Cevap eski hızda gitsin
+      switchBaud(baud, baud == defaultBaud);
+    } else {
+      Serial.println("ERR B");
+    }
+  } else if (input.startsWith("E")) {
+    Serial.println(input);  // Echo - yeni hızı da onaylar
+    baudCommitted = true;
+  } else if (input.startsWith("S")) {
+    int angle = value;
     targetServoAngle = constrain(angle, servoMinAngle, servoMaxAngle);
   } else if (input.startsWith("M")) {
-    int angle = input.substring(1).toInt();
+    int angle = value;
     // Improved anti-jitter filtering for stepper
     if (abs(angle - lastTargetStepperAngle) > angleTolerance || 
         (millis() - lastStepperCommand) > minCommandInterval) {
@@ -98,6 +225,7 @@ void processBinaryCommand() {
       byte cmd = Serial.read();
       byte data = Serial.read();
       if (Serial.read() == END_BYTE) {
+        lastValidCommand = millis();
         switch (cmd) {
           case SERVO_CMD:
             targetServoAngle = constrain(data, servoMinAngle, servoMaxAngle);
@@ -120,6 +248,99 @@ void processBinaryCommand() {
   }
 }
 
+bool isSupportedBaud(long baud) {
+  for (int i = 0; i < supportedBaudCount; i++) {
+    if (supportedBauds[i] == baud) return true;
+  }
+  return false;
+}
+
+void switchBaud(long baud, bool committed) {
+  Serial.end();
+  Serial.begin(baud);
+  linkBaud = baud;
+  baudCommitted = committed;
+  baudSwitchTime = millis();
+}
+
+void checkLinkWatchdog() {
+  unsigned long now = millis();
+  bool linkLost = now - lastValidCommand > linkTimeout;
+  if (linkLost) resetLinkState();
+  if (linkBaud == defaultBaud) return;
+  if ((!baudCommitted && now - baudSwitchTime > baudCommitTimeout) || linkLost) {
+    switchBaud(defaultBaud, true);
+  }
+}
+
+void sendTelemetry() {
+  unsigned long interval = (linkBaud > defaultBaud) ? telemetryInterval / 2 : telemetryInterval;
+  unsigned long now = millis();
+  if (now - lastTelemetry < interval) return;
+  lastTelemetry = now;
+  Serial.print("T ");
+  Serial.print(now);
+  Serial.print(' ');
+  Serial.print(currentServoAngle);
+  Serial.print(' ');
+  Serial.print(currentStepperAngle, 2);
+  Serial.print(' ');
+  Serial.print(targetServoAngle);
+  Serial.print(' ');
+  Serial.print(targetStepperAngle, 2);
+  Serial.print(' ');
+  Serial.println(digitalRead(lazerPin) == HIGH ? 1 : 0);
+}
+
+byte crc8(const byte *data, int length) {
+  byte crc = 0x00;
+  for (int i = 0; i < length; i++) {
+    crc ^= data[i];
+    for (int bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x80) ? (byte)((crc << 1) ^ 0x07) : (byte)(crc << 1);
+    }
+  }
+  return crc;
+}
+
+void processFrame() {
+  if (Serial.available() < FRAME_SIZE) return;
+  byte frame[FRAME_SIZE];
+  Serial.readBytes(frame, FRAME_SIZE);
+  if (crc8(frame + 1, FRAME_SIZE - 2) != frame[FRAME_SIZE - 1]) {
+    frameCrcErrors++;
+    return;
+  }
+
+  lastValidCommand = millis();
+  int sequence = frame[1];
+  if (sequence == lastFrameSequence) return;  // Tekrarlanan çerçeve
+  if (lastFrameSequence >= 0) {
+    framesLost += (byte)(sequence - lastFrameSequence - 1);
+  }
+  lastFrameSequence = sequence;
+
+  byte flags = frame[2];
+  float servoAngle = ((unsigned int)frame[3] | ((unsigned int)frame[4] << 8)) / 100.0;
+  float stepperAngle = ((unsigned int)frame[5] | ((unsigned int)frame[6] << 8)) / 100.0;
+
+  if (flags & FLAG_SERVO) {
+    targetServoAngle = constrain((int)(servoAngle + 0.5), servoMinAngle, servoMaxAngle);
+  }
+  if (flags & FLAG_STEPPER) {
+    // Same anti-jitter filtering as the text/binary commands
+    if (abs(stepperAngle - lastTargetStepperAngle) > angleTolerance ||
+        (millis() - lastStepperCommand) > minCommandInterval) {
+      targetStepperAngle = constrain(stepperAngle, (float)stepperMinAngle, (float)stepperMaxAngle);
+      lastTargetStepperAngle = (int)(stepperAngle + 0.5);
+      lastStepperCommand = millis();
+    }
+  }
+  if (flags & FLAG_LASER) {
+    digitalWrite(lazerPin, (flags & FLAG_LASER_ON) ? HIGH : LOW);
+  }
+}
+
 void moveServoToAngle(int targetAngle) {
   targetAngle = constrain(targetAngle, servoMinAngle, servoMaxAngle);
   if (currentServoAngle != targetAngle) {
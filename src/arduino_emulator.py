@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Pure-Python stand-in for the turret's Arduino (arduino/motor_control.ino) on a
+Linux pseudo-terminal, so SerialComm and everything above it run end to end
+without the board: SerialComm(port=emulator.port) opens it like a real port.
+
+The device speaks the firmware's text, binary and frame protocols, link
+negotiation and telemetry (see serial_protocol.py), and moves the motors with
+the firmware's timing: one loop pass is the stepper burst (up to
+maxStepIncrement degrees at stepDelay per half step, skipped within
+angleTolerance), one servo degree with its 20 ms delay, and the 10 ms loop
+delay. Bytes take their wire time at the current baud rate, and the link can
+add latency/jitter, drop bytes and flip bits. A host baud rate that doesn't
+match the device's turns the bytes into garbage.
+
+Usage: python arduino_emulator.py [--latency 5] [--jitter 2] [--loss 0.001] [--corrupt 0.001] [--benchmark]
+"""
+
+import argparse
+import os
+import pty
+import random
+import select
+import termios
+import threading
+import time
+import tty
+from collections import deque
+
+from serial_protocol import DEFAULT_BAUD, SUPPORTED_BAUDS, TELEMETRY_INTERVAL, ProtocolEmulator
+
+# termios speed constant -> baud rate
+TERMIOS_BAUDS = {getattr(termios, f"B{baud}"): baud for baud in SUPPORTED_BAUDS if hasattr(termios, f"B{baud}")}
+
+
+class FirmwareModel(ProtocolEmulator):
+    """ProtocolEmulator with the firmware's motor timing and stepper anti-jitter filter."""
+
+    # Constants of motor_control.ino
+    STEPS_PER_REVOLUTION = 200
+    STEP_DELAY = 0.001  # stepDelay, per half step
+    MAX_STEP_INCREMENT = 12  # degrees per loop pass
+    ANGLE_TOLERANCE = 3.0  # stepper deadband, also the anti-jitter threshold
+    MIN_COMMAND_INTERVAL = 0.1  # a stepper target within ANGLE_TOLERANCE is only taken after this long
+    SERVO_STEP_DELAY = 0.02  # one degree per loop pass
+    LOOP_DELAY = 0.01
+
+    def __init__(self, clock=time.monotonic, **kwargs):
+        super().__init__(clock=clock, **kwargs)
+        self.last_target_stepper = -1
+        self.last_stepper_command = -1e9
+        self.loop_passes = 0
+
+    def _set_servo_target(self, angle):
+        super()._set_servo_target(int(angle + 0.5))
+
+    def _set_stepper_target(self, angle):
+        now = self.clock()
+        if abs(angle - self.last_target_stepper) > self.ANGLE_TOLERANCE or \
+                now - self.last_stepper_command > self.MIN_COMMAND_INTERVAL:
+            super()._set_stepper_target(angle)
+            self.last_target_stepper = int(angle + 0.5)
+            self.last_stepper_command = now
+
+    def _update_motion(self, now):
+        # Run the firmware's loop passes that fit into the elapsed time
+        while self.last_motion_update < now:
+            self.last_motion_update += self._loop_pass()
+
+    def _loop_pass(self):
+        """One pass of the firmware's loop(); returns its duration in seconds."""
+        self.loop_passes += 1
+        duration = self.LOOP_DELAY
+        diff = self.stepper - self.stepper_position
+        if abs(diff) >= self.ANGLE_TOLERANCE:
+            steps = max(1, int(min(abs(diff), self.MAX_STEP_INCREMENT) * self.STEPS_PER_REVOLUTION / 360.0))
+            moved = steps * 360.0 / self.STEPS_PER_REVOLUTION
+            self.stepper_position = self._clamp(self.stepper_position + (moved if diff > 0 else -moved),
+                                                self.STEPPER_LIMITS)
+            duration += steps * 2 * self.STEP_DELAY
+        if self.servo_position != self.servo:
+            self.servo_position += 1 if self.servo_position < self.servo else -1
+            duration += self.SERVO_STEP_DELAY
+        return duration
+
+
+class ArduinoEmulator:
+    """
+    FirmwareModel served on a pseudo-terminal from a background thread.
+    - port: device path to give SerialComm / pyserial (after start())
+    - latency / jitter: seconds added to every chunk in each direction (order is kept)
+    - loss_rate / corruption_rate: per byte, in both directions
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, loss_rate=0.0, corruption_rate=0.0, seed=None,
+                 telemetry_interval=TELEMETRY_INTERVAL):
+        self.model = FirmwareModel(telemetry_interval=telemetry_interval)
+        self.latency = latency
+        self.jitter = jitter
+        self.loss_rate = loss_rate
+        self.corruption_rate = corruption_rate
+        self.tick = 0.002  # seconds between device polls
+        self.port = None
+        self._rng = random.Random(seed)
+        self._master = None
+        self._slave = None
+        self._to_device = deque()  # (due, bytes, host baud when sent)
+        self._to_host = deque()  # (due, bytes, device baud when sent)
+        self._last_due = {'device': 0.0, 'host': 0.0}
+        self._wire_free = {'device': 0.0, 'host': 0.0}  # when each direction's line is idle again
+        self.running = False
+        self.thread = None
+
+        self.bytes_from_host = 0
+        self.bytes_to_host = 0
+        self.bytes_dropped = 0
+        self.bytes_corrupted = 0
+        self.host_overruns = 0  # bytes lost because the host didn't read its input
+
+    def start(self):
+        if self.running:
+            return self.port
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)  # no echo or line editing before the host configures the port
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"[ArduinoEmulator] 🔌 Emülatör hazır: {self.port}")
+        return self.port
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def host_baud(self):
+        """Baud rate the host configured on its end of the pty."""
+        return TERMIOS_BAUDS.get(termios.tcgetattr(self._slave)[5])
+
+    def _run(self):
+        while self.running:
+            readable, _, _ = select.select([self._master], [], [], self.tick)
+            now = time.monotonic()
+            if readable:
+                try:
+                    data = os.read(self._master, 4096)
+                except (BlockingIOError, OSError):
+                    data = b""
+                if data:
+                    self.bytes_from_host += len(data)
+                    self._schedule(self._to_device, 'device', now, data, self.host_baud())
+
+            while self._to_device and self._to_device[0][0] <= now:
+                _, data, baud = self._to_device.popleft()
+                self.model.feed(data if baud == self.model.baud else bytes(len(data)))
+            self.model.poll()
+            while self.model.output:
+                data, baud = self.model.output.popleft()
+                self._schedule(self._to_host, 'host', now, data, baud)
+            while self._to_host and self._to_host[0][0] <= now:
+                _, data, baud = self._to_host.popleft()
+                self._write_to_host(data if baud == self.host_baud() else bytes(len(data)))
+
+    def _schedule(self, queue, direction, now, data, baud):
+        data = self._impair(data)
+        if not data:
+            return
+        # Bytes take 10 bit times each on the wire (8N1), then the link latency
+        finish = max(now, self._wire_free[direction]) + len(data) * 10.0 / (baud or DEFAULT_BAUD)
+        self._wire_free[direction] = finish
+        due = finish + self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        due = max(due, self._last_due[direction])  # a serial line doesn't reorder bytes
+        self._last_due[direction] = due
+        queue.append((due, data, baud))
+
+    def _impair(self, data):
+        if not self.loss_rate and not self.corruption_rate:
+            return data
+        out = bytearray()
+        for byte in data:
+            if self._rng.random() < self.loss_rate:
+                self.bytes_dropped += 1
+                continue
+            if self._rng.random() < self.corruption_rate:
+                byte ^= 1 << self._rng.randrange(8)
+                self.bytes_corrupted += 1
+            out.append(byte)
+        return bytes(out)
+
+    def _write_to_host(self, data):
+        try:
+            written = os.write(self._master, data)
+        except BlockingIOError:
+            written = 0
+        self.bytes_to_host += written
+        self.host_overruns += len(data) - written
+
+    def get_stats(self):
+        return {
+            'port': self.port,
+            'baud': self.model.baud,
+            'servo': self.model.servo_position,
+            'stepper': self.model.stepper_position,
+            'laser': self.model.laser,
+            'bytes_from_host': self.bytes_from_host,
+            'bytes_to_host': self.bytes_to_host,
+            'bytes_dropped': self.bytes_dropped,
+            'bytes_corrupted': self.bytes_corrupted,
+            'host_overruns': self.host_overruns,
+            'frames': self.model.frames,
+            'frames_lost': self.model.frames_lost,
+            'crc_errors': self.model.crc_errors,
+        }
+
+
+def benchmark_protocol(emulator, protocol, moves=10, baud=None, tolerance=3.0, timeout=5.0):
+    """
+    Drive the emulated turret through `moves` setpoints with SerialComm and
+    measure how long the measured pose (telemetry) takes to arrive.
+    """
+    from serial_comm import SerialComm
+
+    serial = SerialComm(port=emulator.port, protocol=protocol)
+    rng = random.Random(1)
+    arrivals, missed = [], 0
+    try:
+        if baud is not None:
+            serial.negotiate_baud(baud)
+        bytes_before = serial.bytes_sent
+        for _ in range(moves):
+            servo, stepper = rng.randint(5, 55), rng.randint(20, 250)  # binary protocol bytes stop at 255
+            start = time.time()
+            serial.send_command(0x01, servo)
+            serial.send_command(0x02, stepper)
+            while time.time() - start < timeout:
+                pose = serial.latest_pose()
+                if pose is not None and abs(pose.servo - servo) <= 0.5 and abs(pose.stepper - stepper) <= tolerance:
+                    arrivals.append(time.time() - start)
+                    break
+                time.sleep(0.01)
+            else:
+                missed += 1
+        return {
+            'protocol': protocol,
+            'baud': serial.baudrate,
+            'moves': moves,
+            'missed': missed,
+            'mean_arrival_s': sum(arrivals) / len(arrivals) if arrivals else None,
+            'max_arrival_s': max(arrivals) if arrivals else None,
+            'bytes_sent': serial.bytes_sent - bytes_before,
+            'link_errors': serial.link_errors,
+        }
+    finally:
+        serial.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulate the turret's Arduino on a pseudo-terminal")
+    parser.add_argument("--latency", type=float, default=0.0, help="Link latency in ms (each direction)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in ms")
+    parser.add_argument("--loss", type=float, default=0.0, help="Byte loss probability")
+    parser.add_argument("--corrupt", type=float, default=0.0, help="Bit-flip probability per byte")
+    parser.add_argument("--seed", type=int, help="Random seed for the impairments")
+    parser.add_argument("--benchmark", action="store_true", help="Run SerialComm against it with each protocol")
+    parser.add_argument("--moves", type=int, default=10, help="Setpoints per protocol in --benchmark")
+    args = parser.parse_args()
+
+    emulator = ArduinoEmulator(latency=args.latency / 1000, jitter=args.jitter / 1000, loss_rate=args.loss,
+                               corruption_rate=args.corrupt, seed=args.seed)
+    with emulator:
+        if not args.benchmark:
+            print(f"[ArduinoEmulator] SerialComm(port=\"{emulator.port}\") ile bağlanın - çıkış için Ctrl+C")
+            try:
+                while True:
+                    time.sleep(1.0)
+            except KeyboardInterrupt:
+                return
+
+        print(f"{'protocol':<8} {'baud':>7} {'mean arrival':>13} {'max arrival':>12} {'missed':>7} {'bytes':>6}")
+        for protocol, baud in (("text", None), ("binary", None), ("frame", None), ("frame", 115200)):
+            report = benchmark_protocol(emulator, protocol, moves=args.moves, baud=baud)
+            mean = f"{report['mean_arrival_s'] * 1000:.0f} ms" if report['mean_arrival_s'] is not None else "-"
+            worst = f"{report['max_arrival_s'] * 1000:.0f} ms" if report['max_arrival_s'] is not None else "-"
+            print(f"{protocol:<8} {report['baud']:>7} {mean:>13} {worst:>12} {report['missed']:>7} "
+                  f"{report['bytes_sent']:>6}")
+        print(emulator.get_stats())
+
+
+if __name__ == "__main__":
+    main()
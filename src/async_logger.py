@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Asynchronous, per-component logging for the control loops.
+
+Logging a message costs a level check and a deque append: formatting and all
+console/file I/O happen on a background sink thread, so a slow terminal can't
+stall a 100 Hz loop. The ring buffer keeps the newest `capacity` records; when
+the sink falls behind the oldest are dropped (and counted). Identical messages
+from a component are written once per `repeat_window` seconds, followed by a
+"repeated N times" line.
+
+    log = get_logger("SerialComm")
+    log.debug("Servo -> %.1f", angle)   # formatted only if written
+    set_level("SerialComm", DEBUG)
+
+Sinks: the console (default) and a compact binary log (BinaryLogSink,
+read back with read_binary_log() or `python async_logger.py <file>`).
+Environment: TURRET_LOG_LEVEL=INFO, TURRET_LOG_LEVELS=SerialComm=DEBUG,RadarTracking=WARNING,
+TURRET_LOG_FILE=turret.tlog
+"""
+
+import atexit
+import itertools
+import os
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+# Binary log layout (little-endian)
+BINARY_MAGIC = b"TLOG1\n"
+RECORD_COMPONENT = 0  # <BHH + name: type, component id, name length
+RECORD_MESSAGE = 1  # <BdBHIH + text: type, time, level, component id, repeat count, text length
+COMPONENT_HEADER = struct.Struct("<BHH")
+MESSAGE_HEADER = struct.Struct("<BdBHIH")
+
+
+def parse_level(level):
+    """Level number from a number or a name ("debug", "WARNING", ...)."""
+    if isinstance(level, int):
+        return level
+    for number, name in LEVEL_NAMES.items():
+        if name == str(level).upper():
+            return number
+    raise ValueError(f"Unknown log level '{level}' (expected one of {list(LEVEL_NAMES.values())})")
+
+
+@dataclass
+class LogRecord:
+    timestamp: float
+    level: int
+    component: str
+    message: str
+    repeated: int = 0  # > 0: "the previous message was repeated this many more times"
+
+
+class ConsoleSink:
+    """Writes "[Component] message" lines, like the print() calls it replaces."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, record):
+        if record.repeated:
+            line = f"[{record.component}] ↻ ({record.repeated}x tekrarlandı) {record.message}\n"
+        else:
+            line = f"[{record.component}] {record.message}\n"
+        (self.stream or sys.stdout).write(line)
+
+    def flush(self):
+        (self.stream or sys.stdout).flush()
+
+    def close(self):
+        self.flush()
+
+
+class BinaryLogSink:
+    """
+    Compact binary log: each component name is written once, then records
+    carry a 2-byte component id, an 8-byte timestamp and the UTF-8 text.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "ab")
+        # Every session starts with the magic and its own component table, so a file can be appended to
+        self.file.write(BINARY_MAGIC)
+        self.components = {}
+
+    def write(self, record):
+        component_id = self.components.get(record.component)
+        if component_id is None:
+            component_id = self.components[record.component] = len(self.components)
+            name = record.component.encode()
+            self.file.write(COMPONENT_HEADER.pack(RECORD_COMPONENT, component_id, len(name)) + name)
+        text = record.message.encode()[:0xFFFF]
+        self.file.write(MESSAGE_HEADER.pack(RECORD_MESSAGE, record.timestamp, record.level, component_id,
+                                            record.repeated, len(text)) + text)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_binary_log(path):
+    """LogRecords of a binary log file, in order."""
+    with open(path, "rb") as f:
+        data = f.read()
+    records, components, offset = [], {}, 0
+    while offset < len(data):
+        if data.startswith(BINARY_MAGIC, offset):
+            components, offset = {}, offset + len(BINARY_MAGIC)
+            continue
+        if data[offset] == RECORD_COMPONENT:
+            _, component_id, length = COMPONENT_HEADER.unpack_from(data, offset)
+            offset += COMPONENT_HEADER.size
+            components[component_id] = data[offset:offset + length].decode()
+        elif data[offset] == RECORD_MESSAGE:
+            _, timestamp, level, component_id, repeated, length = MESSAGE_HEADER.unpack_from(data, offset)
+            offset += MESSAGE_HEADER.size
+            records.append(LogRecord(timestamp, level, components.get(component_id, f"#{component_id}"),
+                                     data[offset:offset + length].decode(errors="replace"), repeated))
+        else:
+            raise ValueError(f"Corrupt log record at byte {offset}")
+        offset += length
+    return records
+
+
+class Logger:
+    """Per-component front end of a LogService."""
+
+    __slots__ = ("component", "service")
+
+    def __init__(self, component, service):
+        self.component = component
+        self.service = service
+
+    def is_enabled_for(self, level):
+        return level >= self.service.levels.get(self.component, self.service.default_level)
+
+    def debug(self, msg, *args):
+        self.service.log(self.component, DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        self.service.log(self.component, INFO, msg, args)
+
+    def warning(self, msg, *args):
+        self.service.log(self.component, WARNING, msg, args)
+
+    def error(self, msg, *args):
+        self.service.log(self.component, ERROR, msg, args)
+
+
+class LogService:
+    """
+    Ring buffer plus sink thread. log() may be called from any thread without
+    taking a lock (deque.append and the sequence counter are atomic); the sink
+    thread drains the ring every flush_interval seconds, or right away for
+    warnings and errors.
+    """
+
+    def __init__(self, capacity=4096, flush_interval=0.05, repeat_window=1.0, default_level=INFO, sinks=None):
+        self.capacity = capacity
+        self.flush_interval = flush_interval  # seconds between sink passes
+        self.repeat_window = repeat_window  # seconds an identical message stays suppressed
+        self.default_level = default_level
+        self.levels = {}  # component -> level
+        self.sinks = [ConsoleSink()] if sinks is None else list(sinks)
+        self._ring = deque(maxlen=capacity)
+        self._sequence = itertools.count()
+        self._last_sequence = -1
+        self._recent = {}  # (component, level, text) -> [window start, suppressed count, last record]
+        self._wake = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+        self.written = 0
+        self.dropped = 0
+        self.suppressed = 0
+
+    def get_logger(self, component):
+        return Logger(component, self)
+
+    def set_level(self, component, level):
+        """Level of one component, or of every component without its own level when `component` is None."""
+        if component is None:
+            self.default_level = parse_level(level)
+        else:
+            self.levels[component] = parse_level(level)
+
+    def add_sink(self, sink):
+        with self._drain_lock:
+            self.sinks.append(sink)
+
+    def log(self, component, level, msg, args=()):
+        if level < self.levels.get(component, self.default_level):
+            return
+        self._ring.append((next(self._sequence), time.time(), level, component, msg, args))
+        if not self._running:
+            self.start()
+        if level >= WARNING:
+            self._wake.set()
+
+    def start(self):
+        with self._start_lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._sink_loop, daemon=True)
+            self._thread.start()
+
+    def _sink_loop(self):
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.drain()
+
+    def drain(self):
+        """Write out everything queued so far (the sink thread calls this)."""
+        with self._drain_lock:
+            while True:
+                try:
+                    sequence, timestamp, level, component, msg, args = self._ring.popleft()
+                except IndexError:
+                    break
+                if sequence > self._last_sequence:
+                    self.dropped += sequence - self._last_sequence - 1
+                    self._last_sequence = sequence
+                else:
+                    self.dropped -= 1  # arrived after a later record, counted as a gap before
+                try:
+                    text = msg % args if args else str(msg)
+                except (TypeError, ValueError):
+                    text = f"{msg} {args}"
+                self._emit(LogRecord(timestamp, level, component, text))
+            self._expire_repeats(time.time())
+            for sink in self.sinks:
+                sink.flush()
+
+    def _emit(self, record):
+        key = (record.component, record.level, record.message)
+        entry = self._recent.get(key)
+        if entry is not None and record.timestamp - entry[0] < self.repeat_window:
+            entry[1] += 1
+            entry[2] = record
+            self.suppressed += 1
+            return
+        if entry is not None and entry[1]:
+            self._write(LogRecord(entry[2].timestamp, entry[2].level, entry[2].component, entry[2].message,
+                                  entry[1]))
+        self._recent[key] = [record.timestamp, 0, record]
+        self._write(record)
+
+    def _expire_repeats(self, now):
+        for key, (start, count, last) in list(self._recent.items()):
+            if now - start >= self.repeat_window:
+                del self._recent[key]
+                if count:
+                    self._write(LogRecord(last.timestamp, last.level, last.component, last.message, count))
+
+    def _write(self, record):
+        self.written += 1
+        for sink in self.sinks:
+            try:
+                sink.write(record)
+            except Exception as e:
+                sys.stderr.write(f"[AsyncLogger] ❌ Sink hatası: {e}\n")
+
+    def flush(self):
+        self.drain()
+
+    def shutdown(self):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.drain()
+        # Pending repeat counts are written too
+        self._expire_repeats(float("inf"))
+        for sink in self.sinks:
+            sink.close()
+
+    def get_stats(self):
+        return {
+            'queued': len(self._ring),
+            'capacity': self.capacity,
+            'written': self.written,
+            'dropped': self.dropped,
+            'suppressed': self.suppressed,
+            'levels': {component: LEVEL_NAMES.get(level, level) for component, level in self.levels.items()},
+        }
+
+
+def _service_from_environment():
+    service = LogService(default_level=parse_level(os.environ.get("TURRET_LOG_LEVEL", "INFO")))
+    for item in filter(None, os.environ.get("TURRET_LOG_LEVELS", "").split(",")):
+        component, _, level = item.partition("=")
+        service.set_level(component.strip(), level.strip())
+    if os.environ.get("TURRET_LOG_FILE"):
+        service.add_sink(BinaryLogSink(os.environ["TURRET_LOG_FILE"]))
+    return service
+
+
+service = _service_from_environment()
+atexit.register(service.shutdown)
+
+
+def get_logger(component):
+    return service.get_logger(component)
+
+
+def set_level(component, level):
+    service.set_level(component, level)
+
+
+def log_to_file(path):
+    """Also write every record to a binary log at `path`."""
+    service.add_sink(BinaryLogSink(path))
+
+
+def flush():
+    service.flush()
+
+
+def get_stats():
+    return service.get_stats()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python async_logger.py <binary log file>")
+        sys.exit(1)
+    for entry in read_binary_log(sys.argv[1]):
+        stamp = time.strftime("%H:%M:%S", time.localtime(entry.timestamp)) + f".{int(entry.timestamp * 1000) % 1000:03d}"
+        repeat = f" (+{entry.repeated}x)" if entry.repeated else ""
+        print(f"{stamp} {LEVEL_NAMES.get(entry.level, entry.level):<7} [{entry.component}] {entry.message}{repeat}")
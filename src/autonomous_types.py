@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional, Tuple
+
+
+# Shared by the autonomous systems (SimpleAutonomousMode, RadarTrackingSystem) and the GUI
+
+class AutonomousState(Enum):
+    IDLE = "idle"
+    SCAN = "scan"  # No enemy - run the coverage scan
+    LOCK = "lock"  # Enemy selected - servo it onto the crosshair
+    FIRE = "fire"  # Shot released this tick
+    ASSESS = "assess"  # Judge the shot (killed / missed) before moving on
+    REACQUIRE = "reacquire"  # Target lost - search around its predicted position
+    REVISIT = "revisit"  # Look at a known track's predicted position between scan tiles
+    GLANCE = "glance"  # Short coverage glance taken during an engagement
+
+
+@dataclass(frozen=True)
+class AutonomousSnapshot:
+    """Immutable view of the autonomous state, published by the control thread."""
+    state: AutonomousState = AutonomousState.IDLE
+    is_active: bool = False
+    target_id: Optional[int] = None
+    target_bbox: Optional[Tuple[int, int, int, int]] = None
+    target_type: Optional[str] = None
+    target_confidence: float = 0.0
+    target_distance: Optional[float] = None
+    target_count: int = 0
+    kills: int = 0
+    misses: int = 0
+    tws_metrics: Tuple[Tuple[str, float], ...] = ()
+    servo_angle: float = 30
+    stepper_angle: float = 150
+    scan_progress: float = 0.0
+    frame_dimensions: str = "640x480"
+    status_message: str = "Autonomous mode not active"
+    timestamp: float = 0.0
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark the detector's inference profiles on recorded data.
+
+Recorded data is a YOLO-style folder: images (.jpg/.png) with a label file of
+the same name (class cx cy w h, normalized) either next to each image or in a
+sibling "labels" folder. For each profile the script reports FPS and recall
+(fraction of labelled objects matched by a detection at IoU >= 0.5).
+With --cascade it also compares the color/shape pre-detector alone, YOLO
+alone and the cascade (YOLO only on the pre-detector's proposals).
+
+Usage: python benchmark_inference.py <data_dir> [--profiles search track] [--limit 200] [--cascade]
+"""
+
+import argparse
+import os
+import time
+from dataclasses import replace
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_recording(data_dir):
+    """List of (image_path, (N, 5) array of [class, x1, y1, x2, y2] in pixels)."""
+    samples = []
+    for root, _, files in os.walk(data_dir):
+        for name in sorted(files):
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            image_path = os.path.join(root, name)
+            samples.append((image_path, _label_path(image_path)))
+    return [(path, labels) for path, labels in samples if labels is not None]
+
+
+def _label_path(image_path):
+    stem = os.path.splitext(image_path)[0]
+    candidates = [stem + ".txt"]
+    folder, name = os.path.split(stem)
+    if os.path.basename(folder) == "images":
+        candidates.append(os.path.join(os.path.dirname(folder), "labels", name + ".txt"))
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def read_labels(label_path, width, height):
+    """YOLO label file -> (N, 5) array of [class, x1, y1, x2, y2] in pixels."""
+    rows = np.loadtxt(label_path, ndmin=2) if os.path.getsize(label_path) else np.empty((0, 5))
+    if not len(rows):
+        return np.empty((0, 5))
+    cls, cx, cy, w, h = rows[:, 0], rows[:, 1] * width, rows[:, 2] * height, rows[:, 3] * width, rows[:, 4] * height
+    return np.column_stack((cls, cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2))
+
+
+def box_iou(a, b):
+    """(N, 4) x (M, 4) -> (N, M) IoU matrix of x1y1x2y2 boxes."""
+    a = np.asarray(a, dtype=float).reshape(-1, 4)
+    b = np.asarray(b, dtype=float).reshape(-1, 4)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def count_matches(ground_truth, detections, iou_threshold=0.5):
+    """Greedy one-to-one matching; returns how many ground-truth boxes were found."""
+    if not len(ground_truth) or not len(detections):
+        return 0
+    iou = box_iou(ground_truth, detections)
+    matched = 0
+    while iou.size and iou.max() >= iou_threshold:
+        gt, det = np.unravel_index(np.argmax(iou), iou.shape)
+        matched += 1
+        iou[gt, :] = 0
+        iou[:, det] = 0
+    return matched
+
+
+def benchmark_profile(profile, samples, predict, warmup=3, iou_threshold=0.5):
+    """FPS and recall of one profile. predict(frame, profile) -> ultralytics results."""
+    frames = [cv2.imread(path) for path, _ in samples]
+    for frame in frames[:warmup]:
+        predict(frame, profile)
+
+    total_objects = found = detections = 0
+    elapsed = 0.0
+    for frame, (_, label_path) in zip(frames, samples):
+        height, width = frame.shape[:2]
+        labels = read_labels(label_path, width, height)
+        if profile.classes:
+            labels = labels[np.isin(labels[:, 0], profile.classes)]
+
+        start = time.perf_counter()
+        results = predict(frame, profile)
+        elapsed += time.perf_counter() - start
+
+        boxes = _result_boxes(results)
+        total_objects += len(labels)
+        detections += len(boxes)
+        found += count_matches(labels[:, 1:], boxes, iou_threshold)
+
+    return {
+        'profile': profile.name,
+        'imgsz': profile.imgsz,
+        'conf': profile.conf,
+        'frames': len(frames),
+        'fps': len(frames) / elapsed if elapsed > 0 else 0.0,
+        'recall': found / total_objects if total_objects else 0.0,
+        'detections_per_frame': detections / len(frames) if frames else 0.0,
+    }
+
+
+def _result_boxes(results):
+    return np.concatenate([r.boxes.xyxy.cpu().numpy() for r in results]) if results else np.empty((0, 4))
+
+
+def benchmark_cascade(profile, samples, predict, shape_detector, warmup=3, iou_threshold=0.5, max_crop_share=0.5):
+    """
+    Recall and per-frame latency of the pre-detector alone, YOLO alone and the
+    cascade. The cascade skips YOLO on frames without candidates and runs it
+    at native resolution on the proposal crop otherwise (full frame when the
+    crop would cover more than max_crop_share of it).
+    """
+    frames = [cv2.imread(path) for path, _ in samples]
+    for frame in frames[:warmup]:
+        predict(frame, profile)
+        shape_detector.detect(frame)
+
+    pipelines = ("pre-detector", "yolo", "cascade")
+    found = dict.fromkeys(pipelines, 0)
+    elapsed = dict.fromkeys(pipelines, 0.0)
+    total_objects = yolo_runs = 0
+    for frame, (_, label_path) in zip(frames, samples):
+        height, width = frame.shape[:2]
+        labels = read_labels(label_path, width, height)
+        if profile.classes:
+            labels = labels[np.isin(labels[:, 0], profile.classes)]
+        total_objects += len(labels)
+
+        start = time.perf_counter()
+        candidates = shape_detector.detect(frame)
+        pre_time = time.perf_counter() - start
+        elapsed["pre-detector"] += pre_time
+        found["pre-detector"] += count_matches(labels[:, 1:], [c.bbox for c in candidates], iou_threshold)
+
+        start = time.perf_counter()
+        yolo_boxes = _result_boxes(predict(frame, profile))
+        elapsed["yolo"] += time.perf_counter() - start
+        found["yolo"] += count_matches(labels[:, 1:], yolo_boxes, iou_threshold)
+
+        start = time.perf_counter()
+        boxes = np.empty((0, 4))
+        region = shape_detector.proposal_region(candidates, frame.shape)
+        if region is not None:
+            x1, y1, x2, y2 = region
+            yolo_runs += 1
+            if (x2 - x1) * (y2 - y1) > max_crop_share * width * height:
+                boxes = _result_boxes(predict(frame, profile))
+            else:
+                boxes = _result_boxes(predict(frame[y1:y2, x1:x2], replace(profile, imgsz=max(x2 - x1, y2 - y1))))
+                boxes = boxes + [x1, y1, x1, y1]
+        elapsed["cascade"] += pre_time + time.perf_counter() - start
+        found["cascade"] += count_matches(labels[:, 1:], boxes, iou_threshold)
+
+    return [{
+        'pipeline': name,
+        'frames': len(frames),
+        'latency_ms': elapsed[name] / len(frames) * 1000 if frames else 0.0,
+        'recall': found[name] / total_objects if total_objects else 0.0,
+        'yolo_share': {"pre-detector": 0.0, "yolo": 1.0}.get(name, yolo_runs / len(frames) if frames else 0.0),
+    } for name in pipelines]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference profiles on recorded data")
+    parser.add_argument("data_dir", help="Folder of recorded frames with YOLO labels")
+    parser.add_argument("--profiles", nargs="+", help="Profiles to run (default: all)")
+    parser.add_argument("--limit", type=int, default=0, help="Use at most this many frames")
+    parser.add_argument("--iou", type=float, default=0.5, help="IoU needed to count a labelled object as found")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Also compare the color/shape pre-detector, YOLO and the cascade")
+    args = parser.parse_args()
+
+    # Loads the model - only needed when actually benchmarking
+    from object_detection import INFERENCE_PROFILES, predict
+
+    samples = load_recording(args.data_dir)
+    if args.limit:
+        samples = samples[:args.limit]
+    if not samples:
+        print(f"[Benchmark] ❌ No labelled frames found in {args.data_dir}")
+        return
+
+    print(f"[Benchmark] 📂 {len(samples)} labelled frames from {args.data_dir}")
+    for name in args.profiles or INFERENCE_PROFILES:
+        report = benchmark_profile(INFERENCE_PROFILES[name], samples, predict, iou_threshold=args.iou)
+        print(f"[Benchmark] {report['profile']:8s} imgsz={report['imgsz']:4d} conf={report['conf']:.2f} "
+              f"fps={report['fps']:6.1f} recall={report['recall'] * 100:5.1f}% "
+              f"det/frame={report['detections_per_frame']:.2f}")
+
+    if args.cascade:
+        from shape_detector import ShapeDetector
+        profile = INFERENCE_PROFILES[(args.profiles or ["search"])[0]]
+        print(f"[Benchmark] 🔗 Cascade comparison on the '{profile.name}' profile")
+        for report in benchmark_cascade(profile, samples, predict, ShapeDetector(), iou_threshold=args.iou):
+            print(f"[Benchmark] {report['pipeline']:12s} latency={report['latency_ms']:6.1f} ms "
+                  f"recall={report['recall'] * 100:5.1f}% yolo on {report['yolo_share'] * 100:5.1f}% of frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,25 @@
 # camera_manager.py
 import cv2
 import threading
+import object_detection
 from object_detection import detect_objects
+from inference_gate import InferenceGate
+from qrcode_reader import QRCodeReader
+from frame_cache import FrameCache
+import frame_cache
+from collections import deque
 import time
 import math
+from async_logger import get_logger
+
+log = get_logger("CameraManager")
 
 class CameraManager:
     def __init__(self, serial_comm=None):
         self.cap = cv2.VideoCapture(0)
         self.running = False
         self.frame = None
+        self.frames = None  # FrameCache of self.frame - derived images shared by all consumers
         self.tracks = []
         self.lock = threading.Lock()
         self.serial = serial_comm
@@ -20,8 +30,10 @@ class CameraManager:
         self.target_servo_angle = 30
         self.target_stepper_angle = 150
         
-        # Position verification
+        # Position verification (against measured positions from device telemetry)
         self.position_tolerance = 2.0  # Degrees tolerance for position verification
+        self.stepper_tolerance = 3.0  # Degrees; the firmware's stepper deadband (angleTolerance)
+        self.position_timeout = 3.0  # Seconds to wait for the motors to arrive
         self.last_position_check = 0
         self.position_check_interval = 0.5  # Check position every 0.5 seconds
         
@@ -39,38 +51,64 @@ class CameraManager:
         # Movement history for debugging
         self.movement_history = []
         self.max_history_size = 50
+        
+        # Run the detector only on settled, sharp frames
+        self.inference_gate = InferenceGate()  # main.py connects it to the motor control's motion streamer
+        self.motion = None  # MotorControl's MotionStreamer, kept in sync with camera moves (set by main.py)
+        self.processed_capture_times = deque(maxlen=32)  # Capture times of frames that went through detection
+        self.tracking_frame_interval = 0.02  # Pause after a (cheap) tracking-window inference
+        
+        # Target/station QR markers, decoded on the reader's own worker at a lower rate
+        self.qr_reader = QRCodeReader()
 
     def start(self):
         if not self.cap.isOpened():
-            print("Kamera açılamadı.")
+            log.error("Kamera açılamadı.")
             return
         self.running = True
         self.thread = threading.Thread(target=self.capture_loop, daemon=True)
         self.thread.start()
-        print("Kamera başlatıldı.")
+        self.qr_reader.start()
+        log.info("Kamera başlatıldı.")
         
         # Set initial position for autonomous mode with verification
         self.set_autonomous_start_position()
 
     def stop(self):
         self.running = False
+        self.qr_reader.stop()
         self.cap.release()
-        print("Kamera kapatıldı.")
+        log.info("Kamera kapatıldı.")
 
     def capture_loop(self):
         while self.running:
             ret, frame = self.cap.read()
             if not ret:
                 continue
+            capture_time = time.time()
+            frames = FrameCache(frame, capture_time)
 
-            processed_frame, tracks = detect_objects(frame)
+            decision = self.inference_gate.evaluate(frames, capture_time)
+            if not decision.run:
+                # Keep the video live; the unchanged track list means "no new detections"
+                with self.lock:
+                    self._set_current_frame(frames)
+                continue
+
+            processed_frame, tracks = detect_objects(frames)
 
             with self.lock:
-                self.frame = processed_frame
+                self._set_current_frame(frames)
                 self.tracks = tracks
+                self.processed_capture_times.append(capture_time)
+            self.qr_reader.submit(frames, [(t['track_id'], t['bbox']) for t in tracks], capture_time)
 
             # MUCH SLOWER for YOLO detection - 10 FPS instead of 30 FPS
-            time.sleep(0.1)  # 10 FPS for better YOLO detection
+            # (crops around the engaged target are cheap enough to run near camera rate)
+            if object_detection.tracking_window.is_active:
+                time.sleep(self.tracking_frame_interval)
+            else:
+                time.sleep(0.1)  # 10 FPS for better YOLO detection
             
     def set_autonomous_start_position(self):
         """Set camera to optimal starting position for autonomous mode with verification."""
@@ -79,44 +117,67 @@ class CameraManager:
             self.target_servo_angle = 30  # Center servo
             self.target_stepper_angle = 150  # Center stepper
             
-            # Send commands and verify position
+            # Send commands and verify position (in the background: start() runs on the GUI thread)
             self._send_motor_commands()
-            self._verify_position()
+            self._verify_position_in_background()
             
-            print("[CameraManager] 🎯 Set to autonomous start position: Servo=30°, Stepper=150°")
+            log.info("🎯 Set to autonomous start position: Servo=30°, Stepper=150°")
         else:
-            print("[CameraManager] ⚠️ SerialComm not connected, cannot set start position")
+            log.warning("⚠️ SerialComm not connected, cannot set start position")
 
     def reset_position(self):
         """Reset to safe starting position with verification."""
-        print("Kamera başlangıç konumuna getiriliyor...")
+        log.info("Kamera başlangıç konumuna getiriliyor...")
         if self.serial:
             self.target_servo_angle = 30
             self.target_stepper_angle = 150
             self._send_motor_commands()
-            self._verify_position()
-            print("Servo 30°, Stepper 150° - Safe position set and verified.")
+            self._verify_position_in_background()
+            log.info("Servo 30°, Stepper 150° - Safe position set.")
         else:
-            print("SerialComm bağlı değil, sıfırlama yapılamadı.")
+            log.warning("SerialComm bağlı değil, sıfırlama yapılamadı.")
+
+    def _verify_position_in_background(self):
+        """Run _verify_position on its own thread so the caller (the GUI) never waits for the motors."""
+        threading.Thread(target=self._verify_position, daemon=True).start()
 
     def _verify_position(self):
-        """Verify that motors have reached their target positions."""
+        """Wait until the measured position (device telemetry) reaches the target, up to position_timeout."""
         if not self.serial:
             return False
+        if not hasattr(self.serial, 'latest_pose'):
+            log.warning("⚠️ Position feedback not available, cannot verify")
+            return False
+        if self.serial.latest_pose() is None:
+            # No telemetry (older firmware, simulation): there is nothing to wait for
+            log.warning("⚠️ Position verification skipped: no telemetry from the device")
+            return False
             
-        # Wait a bit for motors to move
-        time.sleep(0.2)
-        
-        # Check if current position is close to target
-        servo_error = abs(self.current_servo_angle - self.target_servo_angle)
-        stepper_error = abs(self.current_stepper_angle - self.target_stepper_angle)
-        
-        if servo_error <= self.position_tolerance and stepper_error <= self.position_tolerance:
-            print(f"[CameraManager] ✅ Position verified: Servo={self.current_servo_angle:.1f}°, Stepper={self.current_stepper_angle:.1f}°")
-            return True
+        deadline = time.time() + self.position_timeout
+        servo_error = stepper_error = None
+        while time.time() < deadline:
+            if self._update_measured_position():
+                servo_error = abs(self.current_servo_angle - self.target_servo_angle)
+                stepper_error = abs(self.current_stepper_angle - self.target_stepper_angle)
+                if servo_error <= self.position_tolerance and stepper_error <= self.stepper_tolerance:
+                    log.info(f"✅ Position verified: Servo={self.current_servo_angle:.1f}°, Stepper={self.current_stepper_angle:.1f}°")
+                    return True
+            time.sleep(0.05)
+            
+        if servo_error is None:
+            log.warning("⚠️ Position verification failed: no telemetry from the device")
         else:
-            print(f"[CameraManager] ⚠️ Position verification failed: Servo error={servo_error:.1f}°, Stepper error={stepper_error:.1f}°")
+            log.warning(f"⚠️ Position verification failed: Servo error={servo_error:.1f}°, Stepper error={stepper_error:.1f}°")
+        return False
+        
+    def _update_measured_position(self):
+        """Set current_* from the latest device telemetry; False when there is no fresh telemetry."""
+        pose = self.serial.latest_pose() if hasattr(self.serial, 'latest_pose') else None
+        if pose is None:
             return False
+        self.current_servo_angle = pose.servo
+        self.current_stepper_angle = pose.stepper
+        return True
 
     def move_camera_smooth(self, dx, dy):
         """
@@ -158,7 +219,7 @@ class CameraManager:
         stepper_movement = abs(self.target_stepper_angle - self.current_stepper_angle)
         
         if servo_movement > 10 or stepper_movement > 20:  # Safety limits
-            print(f"[CameraManager] ⚠️ Excessive movement detected: Servo={servo_movement:.1f}°, Stepper={stepper_movement:.1f}°")
+            log.warning("⚠️ Excessive movement detected: Servo=%.1f°, Stepper=%.1f°", servo_movement, stepper_movement)
             # Limit movement to safe values
             if servo_movement > 10:
                 if self.target_servo_angle > self.current_servo_angle:
@@ -179,7 +240,8 @@ class CameraManager:
         # Record movement for debugging
         self._record_movement(dx, dy, servo_change, stepper_change)
         
-        print(f"[CameraManager] 📡 Enhanced movement: dx={dx:.2f}, dy={dy:.2f} -> Servo={self.target_servo_angle:.1f}°, Stepper={self.target_stepper_angle:.1f}°")
+        log.debug("📡 Enhanced movement: dx=%.2f, dy=%.2f -> Servo=%.1f°, Stepper=%.1f°",
+                  dx, dy, self.target_servo_angle, self.target_stepper_angle)
 
     def _record_movement(self, dx, dy, servo_change, stepper_change):
         """Record movement for debugging and analysis."""
@@ -215,9 +277,9 @@ class CameraManager:
             # Send commands
             self._send_motor_commands()
 
-            print(f"[CameraManager] 📡 Legacy movement: Servo={servo_angle}°, Stepper={stepper_angle}°")
+            log.debug("📡 Legacy movement: Servo=%s°, Stepper=%s°", servo_angle, stepper_angle)
         else:
-            print("[CameraManager] SerialComm bağlı değil, hareket gönderilemedi.")
+            log.warning("SerialComm bağlı değil, hareket gönderilemedi.")
 
     def _send_motor_commands(self):
         """Send motor commands to Arduino with enhanced error handling."""
@@ -225,36 +287,85 @@ class CameraManager:
             return
             
         try:
-            # Send servo command
-            self.serial.send_command(0x01, int(self.target_servo_angle))
+            # Send through the motion streamer when connected, so planned slews start from this pose
+            if self.motion is not None:
+                self.motion.command(0, int(self.target_servo_angle))
+                self.motion.command(1, int(self.target_stepper_angle))
+            else:
+                self.serial.send_command(0x01, int(self.target_servo_angle))
+                self.serial.send_command(0x02, int(self.target_stepper_angle))
             
-            # Send stepper command  
-            self.serial.send_command(0x02, int(self.target_stepper_angle))
+            self.inference_gate.note_motion()
             
-            # Update current positions
-            self.current_servo_angle = self.target_servo_angle
-            self.current_stepper_angle = self.target_stepper_angle
+            # Current positions come from telemetry; without it, assume the target is reached
+            if not self._update_measured_position():
+                self.current_servo_angle = self.target_servo_angle
+                self.current_stepper_angle = self.target_stepper_angle
             
         except Exception as e:
-            print(f"[CameraManager] ❌ Error sending motor commands: {e}")
+            log.error(f"❌ Error sending motor commands: {e}")
             # Try to recover by resetting to safe position
             self._emergency_reset_position()
 
     def _emergency_reset_position(self):
         """Emergency reset to safe position if communication fails."""
-        print("[CameraManager] 🚨 Emergency position reset")
+        log.warning("🚨 Emergency position reset")
         self.target_servo_angle = 30
         self.target_stepper_angle = 150
         self.current_servo_angle = 30
         self.current_stepper_angle = 150
 
+    def _set_current_frame(self, frames):
+        """Make `frames` the current frame and free the previous frame's derived images."""
+        if self.frames is not None:
+            self.frames.release()
+        self.frames = frames
+        self.frame = frames.bgr
+
     def get_frame(self):
+        """Current frame, tracks and the capture time of the frame the tracks were detected on (or None)."""
+        with self.lock:
+            capture_time = self.processed_capture_times[-1] if self.processed_capture_times else None
+            return self.frame, self.tracks, capture_time
+            
+    def get_frame_cache(self):
+        """Current frame as a FrameCache (reuse its RGB/HSV/gray instead of converting again) and tracks."""
+        with self.lock:
+            return self.frames, self.tracks
+            
+    def set_inference_profile(self, name):
+        """Select the detector's inference profile ("manual", "search" or "track")."""
+        object_detection.set_inference_profile(name)
+        
+    def set_tracking_target(self, bbox, velocity=(0.0, 0.0), observed_at=None):
+        """Run the detector on a window around this target (None returns to full frames)."""
+        if bbox is None:
+            object_detection.tracking_window.clear()
+        else:
+            object_detection.tracking_window.set_target(bbox, velocity, observed_at)
+        
+    def get_inference_status(self):
+        """Inference profile, governor tier/latency, tracking window, gate, QR reader and frame cache statistics."""
+        status = object_detection.get_inference_status()
+        status['gate'] = self.inference_gate.get_stats()
+        status['qr'] = self.qr_reader.get_stats()
+        status['frame_cache'] = frame_cache.get_stats()
+        return status
+        
+    def get_qr_codes(self):
+        """QR markers currently in view with a decoded payload (see QRCodeReader)."""
+        return self.qr_reader.get_codes()
+        
+    def processed_frames_since(self, timestamp):
+        """Number of frames captured at or after `timestamp` that went through detection."""
         with self.lock:
-            return self.frame, self.tracks
+            return sum(1 for t in self.processed_capture_times if t >= timestamp)
             
     def get_camera_position(self):
         """Get current camera position with enhanced information."""
+        measured = self.serial is not None and self._update_measured_position()
         return {
+            'measured': measured,
             'servo_angle': self.current_servo_angle,
             'stepper_angle': self.current_stepper_angle,
             'target_servo': self.target_servo_angle,
@@ -0,0 +1,681 @@
+import time
+import math
+import random
+import threading
+import itertools
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from scan_planner import ScanPlanner, SERVO_SLEW_RATE, STEPPER_SLEW_RATE
+from pid_controller import VisualServoController, pixel_error_to_angles
+from kill_assessment import red_fraction
+
+
+class BalloonColor(Enum):
+    RED = "red"  # Enemy - must be eliminated
+    BLUE = "blue"  # Friendly - never engaged
+    UNKNOWN = "unknown"
+
+
+@dataclass
+class BalloonTarget:
+    track_id: int
+    bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
+    center: Tuple[int, int]  # x, y center
+    color: BalloonColor
+    confidence: float
+    last_seen: float
+    distance_to_center: float = 0.0  # pixels from the crosshair
+    eliminated: bool = False
+    elimination_time: Optional[float] = None
+    shots_fired: int = 0
+    last_fire_time: float = 0.0
+    fire_area: float = 0.0  # bbox area at the last shot
+    fire_red: float = 0.0  # red pixel fraction of the bbox at the last shot
+    kill_evidence: int = 0  # consecutive frames since the shot showing a shrink or color change
+
+
+class EngagementScheduler:
+    """
+    Orders enemy targets by slew + dwell time.
+    Both axes move at the same time, so a leg costs the slower axis' time.
+    The default "kill_latency" objective minimises the sum of the times at
+    which each target is killed, so quick kills are not postponed to save a
+    fraction of a second at the end of the mission; "makespan" minimises the
+    total mission time only. Small target sets are solved exactly; larger
+    ones use nearest neighbour improved with 2-opt.
+    """
+
+    OBJECTIVES = ("kill_latency", "makespan")
+
+    def __init__(self, servo_rate=SERVO_SLEW_RATE, stepper_rate=STEPPER_SLEW_RATE, dwell_time=1.2,
+                 settle_time=0.15, exhaustive_limit=7, objective="kill_latency"):
+        if objective not in self.OBJECTIVES:
+            raise ValueError(f"Unknown scheduling objective: {objective}")
+        self.servo_rate = servo_rate
+        self.stepper_rate = stepper_rate
+        self.dwell_time = dwell_time  # Fire + kill confirmation time per target
+        self.settle_time = settle_time
+        self.exhaustive_limit = exhaustive_limit  # Max targets for brute-force ordering
+        self.objective = objective
+
+    def leg_time(self, a, b):
+        """Slew time between two (servo, stepper) poses."""
+        move_time = max(abs(b[0] - a[0]) / self.servo_rate, abs(b[1] - a[1]) / self.stepper_rate)
+        return move_time + self.settle_time if move_time > 0 else 0.0
+
+    def sequence_time(self, start, order, positions):
+        """Total slew + dwell time to engage targets in `order` starting from `start`."""
+        total = 0.0
+        previous = start
+        for track_id in order:
+            total += self.leg_time(previous, positions[track_id]) + self.dwell_time
+            previous = positions[track_id]
+        return total
+
+    def cost(self, start, order, positions):
+        """Objective value of an engagement order."""
+        if self.objective == "makespan":
+            return self.sequence_time(start, order, positions)
+        elapsed, total = 0.0, 0.0
+        previous = start
+        for track_id in order:
+            elapsed += self.leg_time(previous, positions[track_id]) + self.dwell_time
+            total += elapsed
+            previous = positions[track_id]
+        return total
+
+    def plan(self, start, positions: Dict[int, Tuple[float, float]]) -> List[int]:
+        """Return track ids in engagement order. Ties keep ascending track id order."""
+        ids = sorted(positions)
+        if len(ids) <= 1:
+            return ids
+        if len(ids) <= self.exhaustive_limit:
+            best, best_time = None, math.inf
+            for order in itertools.permutations(ids):
+                total = self.cost(start, order, positions)
+                if total < best_time - 1e-9:
+                    best, best_time = list(order), total
+            return best
+        return self._two_opt(start, self._nearest_neighbour(start, ids, positions), positions)
+
+    def _nearest_neighbour(self, start, ids, positions):
+        remaining = list(ids)
+        order = []
+        previous = start
+        while remaining:
+            nearest = min(remaining, key=lambda i: (self.leg_time(previous, positions[i]), i))
+            order.append(nearest)
+            remaining.remove(nearest)
+            previous = positions[nearest]
+        return order
+
+    def _two_opt(self, start, order, positions):
+        best_time = self.cost(start, order, positions)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(order) - 1):
+                for j in range(i + 2, len(order) + 1):
+                    candidate = order[:i] + order[i:j][::-1] + order[j:]
+                    total = self.cost(start, candidate, positions)
+                    if total < best_time - 1e-9:
+                        order, best_time = candidate, total
+                        improved = True
+        return order
+
+
+class Capability11Tracker:
+    """
+    Capability 11 autonomous mission: eliminate the red balloons, never engage blue ones.
+    Enemy targets are engaged in the order chosen by EngagementScheduler from
+    slew plus dwell time; the order is re-planned when targets appear,
+    disappear or move relative to each other. A kill needs positive evidence
+    after a shot: the bbox shrinks or the balloon stops looking red for
+    `kill_confirm_frames` frames, or the track disappears right after such a
+    frame or with the red gone from where it was. A target that merely
+    drops out of the detections is not counted.
+    """
+
+    def __init__(self, serial_comm, laser_control, camera_manager, motor_control):
+        self.serial_comm = serial_comm
+        self.laser_control = laser_control
+        self.camera_manager = camera_manager
+        self.motor_control = motor_control
+
+        # Motor limits
+        self.servo_min = 5
+        self.servo_max = 55
+        self.stepper_min = 10
+        self.stepper_max = 290
+
+        # Current motor positions
+        self.current_servo_angle = 30
+        self.current_stepper_angle = 150
+
+        # Camera frame dimensions (updated from camera)
+        self.frame_width = 640
+        self.frame_height = 480
+        self.crosshair_x = 320
+        self.crosshair_y = 240
+
+        # Mission parameters
+        self.required_eliminations = 3  # Red balloons to eliminate
+        self.fire_range = 50  # pixels from crosshair
+        self.fire_duration = 0.3  # seconds
+        self.refire_interval = 1.2  # LaserControl blocks for 1 s per shot
+        self.kill_confirm_time = 0.5  # Track must be gone this long after a shot
+        self.kill_shrink_ratio = 0.5  # bbox area (relative to the shot) at or below which the balloon popped
+        self.kill_color_drop = 0.5  # relative drop of the red pixel fraction that counts as popped
+        self.kill_confirm_frames = 2  # consecutive frames of shrink/color evidence
+        self.target_lost_timeout = 2.0  # seconds before an unseen target is dropped
+        self.replan_threshold = 40  # pixels of relative target motion that trigger a re-plan
+
+        # Target state (records persist across frames, keyed by track_id)
+        self.targets_by_id: Dict[int, BalloonTarget] = {}
+        self.red_targets: List[BalloonTarget] = []
+        self.blue_targets: List[BalloonTarget] = []
+        self.current_target: Optional[BalloonTarget] = None
+
+        # Engagement schedule
+        self.scheduler = EngagementScheduler()
+        self.engagement_plan: List[int] = []
+        self.plan_offsets: Dict[int, Tuple[float, float]] = {}  # Centroid-relative centers at plan time
+        self.planned_mission_time = 0.0
+        self.replan_count = 0
+
+        # Tracking and scanning
+        self.visual_servo = VisualServoController()
+        self.visual_servo_target_id = None
+        self.scan_planner = ScanPlanner(servo_limits=(self.servo_min, self.servo_max),
+                                        stepper_limits=(self.stepper_min, self.stepper_max))
+        self.scan_waypoints = self.scan_planner.plan(start=(self.current_servo_angle, self.current_stepper_angle))
+        self.scan_index = 0
+        self.scan_next_move_time = 0
+        self.movement_interval = 0.1
+        self.movement_tolerance = 0.3
+        self.last_movement_time = time.time()
+
+        # Mission state
+        self.red_balloons_eliminated = 0
+        self.mission_complete = False
+        self.mission_start_time = 0.0
+        self.mission_end_time = 0.0
+        self.shots_fired = 0
+
+        # Thread state
+        self.is_active = False
+        self.running = False
+        self.tracker_thread = None
+        self.loop_interval = 0.05
+
+        # Latest camera read (the camera publishes a new track list per processed frame)
+        self._frame = None
+        self._last_tracks = None
+        self._visible_ids = set()  # balloon track ids in the latest track list
+
+    def start_capability11_mode(self):
+        """Start a new Capability 11 mission."""
+        if self.is_active:
+            print("[Capability11] ⚠️ Capability 11 mode already active")
+            return
+
+        self._reset_mission()
+        self.is_active = True
+        self.running = True
+        self.mission_start_time = time.time()
+
+        self.tracker_thread = threading.Thread(target=self._tracker_loop, daemon=True)
+        self.tracker_thread.start()
+        print("[Capability11] 🚀 Capability 11 mode started - eliminate red balloons, protect blue")
+
+    def stop_capability11_mode(self):
+        """Stop the mission loop."""
+        self.is_active = False
+        self.running = False
+        if self.tracker_thread and self.tracker_thread is not threading.current_thread():
+            self.tracker_thread.join(timeout=1.0)
+        print("[Capability11] 🛑 Capability 11 mode stopped")
+
+    def _reset_mission(self):
+        self.targets_by_id.clear()
+        self._last_tracks = None
+        self._visible_ids = set()
+        self.red_targets = []
+        self.blue_targets = []
+        self.current_target = None
+        self.engagement_plan = []
+        self.plan_offsets = {}
+        self.planned_mission_time = 0.0
+        self.replan_count = 0
+        self.red_balloons_eliminated = 0
+        self.mission_complete = False
+        self.mission_end_time = 0.0
+        self.shots_fired = 0
+        self.visual_servo.reset()
+        self.visual_servo_target_id = None
+
+    def _tracker_loop(self):
+        """Main mission loop - owns target state, scheduling and engagement."""
+        while self.running and self.is_active:
+            try:
+                self._update_targets()
+                self._update_plan()
+                self._check_mission_complete()
+
+                if not self.mission_complete:
+                    if self.current_target:
+                        self._track_current_target()
+                        self._engage_current_target()
+                    else:
+                        self._execute_scanning()
+
+                time.sleep(self.loop_interval)
+            except Exception as e:
+                print(f"[Capability11] ❌ Error in tracker loop: {e}")
+                time.sleep(0.2)
+
+    def _update_frame_dimensions(self, frame):
+        """Update frame dimensions from camera."""
+        if frame is not None:
+            height, width = frame.shape[:2]
+            if width != self.frame_width or height != self.frame_height:
+                self.frame_width = width
+                self.frame_height = height
+                self.crosshair_x = width // 2
+                self.crosshair_y = height // 2
+
+    @staticmethod
+    def _classify_color(label):
+        label = label.lower()
+        if 'red' in label or 'kirmizi' in label:
+            return BalloonColor.RED
+        if 'blue' in label or 'mavi' in label:
+            return BalloonColor.BLUE
+        return BalloonColor.UNKNOWN
+
+    def _distance_to_crosshair(self, center):
+        return math.hypot(center[0] - self.crosshair_x, center[1] - self.crosshair_y)
+
+    def _update_targets(self):
+        """
+        Update persistent target records from the camera's current tracks.
+        Re-reading the same track list is not a new sighting: last_seen (the
+        frame's capture time) and kill evidence only advance on a new list.
+        """
+        current_time = time.time()
+        frame, tracks, capture_time = self.camera_manager.get_frame()
+        self._frame = frame
+        self._update_frame_dimensions(frame)
+        new_frame = tracks is not self._last_tracks
+        self._last_tracks = tracks
+        seen_at = capture_time if capture_time is not None else current_time
+        seen_ids = set()
+
+        for track in tracks or []:
+            label = track.get('label', '')
+            if 'balloon' not in label.lower():
+                continue
+            track_id = track['track_id']
+            seen_ids.add(track_id)
+            if not new_frame:
+                continue
+            bbox = tuple(track['bbox'])
+            center = ((bbox[0] + bbox[2]) // 2, (bbox[1] + bbox[3]) // 2)
+
+            target = self.targets_by_id.get(track_id)
+            if target is None:
+                target = BalloonTarget(track_id=track_id, bbox=bbox, center=center,
+                                       color=self._classify_color(label),
+                                       confidence=track.get('confidence') or 0.0,
+                                       last_seen=seen_at)
+                self.targets_by_id[track_id] = target
+            target.bbox = bbox
+            target.center = center
+            target.confidence = track.get('confidence') or 0.0
+            target.last_seen = seen_at
+            target.distance_to_center = self._distance_to_crosshair(center)
+            if self._awaiting_kill(target) and seen_at > target.last_fire_time:
+                if self._kill_evidence(target, self._classify_color(label), frame):
+                    target.kill_evidence += 1
+                    if target.kill_evidence >= self.kill_confirm_frames:
+                        self._confirm_elimination(target)
+                else:
+                    target.kill_evidence = 0
+
+        self._visible_ids = seen_ids
+
+        # Confirm kills of targets missing from the latest detections and drop stale records (eliminated ones included)
+        # (a list the camera keeps re-publishing does not keep its tracks alive past target_lost_timeout)
+        for track_id, target in list(self.targets_by_id.items()):
+            missing_for = current_time - target.last_seen
+            if (track_id not in seen_ids and self._awaiting_kill(target) and missing_for >= self.kill_confirm_time
+                    and self._vanished_with_evidence(target, frame)):
+                self._confirm_elimination(target)
+            elif missing_for > self.target_lost_timeout:
+                del self.targets_by_id[track_id]
+
+        self.red_targets = sorted((t for t in self.targets_by_id.values() if t.color == BalloonColor.RED),
+                                  key=lambda t: (t.distance_to_center, t.track_id))
+        self.blue_targets = [t for t in self.targets_by_id.values() if t.color == BalloonColor.BLUE]
+
+    @staticmethod
+    def _awaiting_kill(target):
+        return target.color == BalloonColor.RED and not target.eliminated and target.shots_fired > 0
+
+    def _kill_evidence(self, target, color, frame):
+        """Whether the target, seen in this frame, looks popped compared to the moment of the shot."""
+        if color != BalloonColor.RED:
+            return True
+        if target.fire_area and self._area(target.bbox) <= target.fire_area * self.kill_shrink_ratio:
+            return True
+        return self._red_gone(target, frame)
+
+    def _vanished_with_evidence(self, target, frame):
+        """A vanished target counts as killed if it looked popped when last seen, or its red is gone."""
+        return target.kill_evidence > 0 or self._red_gone(target, frame)
+
+    def _red_gone(self, target, frame):
+        if frame is None or target.fire_red <= 0:
+            return False
+        return red_fraction(frame, target.bbox) <= target.fire_red * (1.0 - self.kill_color_drop)
+
+    @staticmethod
+    def _area(bbox):
+        return max(0, bbox[2] - bbox[0]) * max(0, bbox[3] - bbox[1])
+
+    def _confirm_elimination(self, target):
+        target.eliminated = True
+        target.elimination_time = time.time()
+        self.red_balloons_eliminated += 1
+        print(f"[Capability11] 💥 Red balloon {target.track_id} eliminated "
+              f"({self.red_balloons_eliminated}/{self.required_eliminations})")
+
+    def _visible_enemies(self):
+        """Red targets in the latest detections, eliminated or not."""
+        return {t.track_id: t for t in self.red_targets if t.track_id in self._visible_ids}
+
+    def _relative_offsets(self, targets):
+        """Target centers relative to their centroid - unaffected by turret pan/tilt."""
+        if not targets:
+            return {}
+        cx = sum(t.center[0] for t in targets.values()) / len(targets)
+        cy = sum(t.center[1] for t in targets.values()) / len(targets)
+        return {i: (t.center[0] - cx, t.center[1] - cy) for i, t in targets.items()}
+
+    def _update_plan(self):
+        """Keep the engagement order current; re-plan on appear/disappear/relative motion."""
+        visible = self._visible_enemies()
+        live = {i: t for i, t in visible.items() if not t.eliminated}
+
+        # Eliminated targets simply drop off the plan
+        self.engagement_plan = [i for i in self.engagement_plan
+                                if i in self.targets_by_id and not self.targets_by_id[i].eliminated]
+
+        offsets = self._relative_offsets(visible)
+        needs_replan = set(live) != set(self.engagement_plan)
+        if not needs_replan:
+            for track_id in live:
+                offset, previous = offsets[track_id], self.plan_offsets.get(track_id)
+                if previous is None or math.hypot(offset[0] - previous[0],
+                                                  offset[1] - previous[1]) > self.replan_threshold:
+                    needs_replan = True
+                    break
+
+        if needs_replan:
+            self._replan(live)
+            self.plan_offsets = offsets
+
+        self.current_target = self.targets_by_id[self.engagement_plan[0]] if self.engagement_plan else None
+
+    def _replan(self, live):
+        """Compute the slew-optimal engagement order from the current aim point."""
+        positions = {}
+        for track_id, target in live.items():
+            servo_error, stepper_error = pixel_error_to_angles(
+                target.center[0] - self.crosshair_x, target.center[1] - self.crosshair_y,
+                self.frame_width, self.frame_height)
+            positions[track_id] = (servo_error, stepper_error)
+
+        self.engagement_plan = self.scheduler.plan((0.0, 0.0), positions)
+        self.planned_mission_time = self.scheduler.sequence_time((0.0, 0.0), self.engagement_plan, positions)
+        if self.engagement_plan:
+            self.replan_count += 1
+            print(f"[Capability11] 🗺️ Engagement order: {self.engagement_plan} "
+                  f"(~{self.planned_mission_time:.1f}s)")
+
+    def _check_mission_complete(self):
+        if not self.mission_complete and self.red_balloons_eliminated >= self.required_eliminations:
+            self.mission_complete = True
+            self.mission_end_time = time.time()
+            self.current_target = None
+            print(f"[Capability11] 🏁 Mission complete in {self.mission_end_time - self.mission_start_time:.1f}s")
+
+    def _command_turret(self, servo, stepper):
+        """Send a pose to the motors."""
+        servo = max(self.servo_min, min(self.servo_max, servo))
+        stepper = max(self.stepper_min, min(self.stepper_max, stepper))
+        # Older motor interfaces expose move_servo/move_stepper instead of set_*_angle
+        if hasattr(self.motor_control, 'set_servo_angle'):
+            self.motor_control.set_servo_angle(int(round(servo)))
+            self.motor_control.set_stepper_angle(int(round(stepper)))
+        else:
+            self.motor_control.move_servo(int(round(servo)))
+            self.motor_control.move_stepper(int(round(stepper)))
+        self.current_servo_angle = servo
+        self.current_stepper_angle = stepper
+
+    def _track_current_target(self):
+        """Keep the crosshair on the current target with the visual-servo controller."""
+        current_time = time.time()
+        dt = current_time - self.last_movement_time
+        if dt < self.movement_interval:
+            return
+
+        if self.current_target.track_id != self.visual_servo_target_id:
+            self.visual_servo.reset()
+            self.visual_servo_target_id = self.current_target.track_id
+
+        servo_error, stepper_error = pixel_error_to_angles(
+            self.current_target.center[0] - self.crosshair_x, self.current_target.center[1] - self.crosshair_y,
+            self.frame_width, self.frame_height)
+        servo_delta, stepper_delta = self.visual_servo.update(
+            servo_error, stepper_error, self.current_servo_angle, self.current_stepper_angle, min(dt, 0.5))
+
+        if abs(servo_delta) > self.movement_tolerance or abs(stepper_delta) > self.movement_tolerance:
+            self._command_turret(self.current_servo_angle + servo_delta, self.current_stepper_angle + stepper_delta)
+        self.last_movement_time = current_time
+
+    def _engage_current_target(self):
+        """Fire at the current target once it is inside the fire range."""
+        target = self.current_target
+        if target is None or target.color != BalloonColor.RED or target.eliminated:
+            return
+
+        current_time = time.time()
+        if current_time - target.last_fire_time < self.refire_interval:
+            return
+        if target.distance_to_center > self.fire_range:
+            return
+
+        try:
+            self.laser_control.fire_laser(self.fire_duration)
+        except Exception as e:
+            print(f"[Capability11] ❌ Error firing laser: {e}")
+            return
+        target.shots_fired += 1
+        target.last_fire_time = current_time
+        target.fire_area = self._area(target.bbox)
+        target.fire_red = red_fraction(self._frame, target.bbox)
+        target.kill_evidence = 0
+        self.shots_fired += 1
+        print(f"[Capability11] 🔫 Fired at red balloon {target.track_id} (shot {target.shots_fired})")
+
+    def _execute_scanning(self):
+        """Coverage scan while no enemy target is visible."""
+        current_time = time.time()
+        if current_time < self.scan_next_move_time:
+            return
+        if self.scan_index >= len(self.scan_waypoints):
+            self.scan_waypoints = self.scan_planner.plan(
+                start=(self.current_servo_angle, self.current_stepper_angle))
+            self.scan_index = 0
+
+        waypoint = self.scan_waypoints[self.scan_index]
+        slew_time = self.scan_planner.slew_time((self.current_servo_angle, self.current_stepper_angle), waypoint)
+        self._command_turret(waypoint[0], waypoint[1])
+        self.scan_index += 1
+        self.scan_next_move_time = current_time + slew_time + self.scan_planner.dwell_time
+
+    def emergency_stop(self):
+        """Emergency stop all systems."""
+        self.stop_capability11_mode()
+        if hasattr(self.laser_control, 'emergency_stop'):
+            self.laser_control.emergency_stop()
+        if hasattr(self.motor_control, 'emergency_stop'):
+            self.motor_control.emergency_stop()
+        print("[Capability11] 🚨 Emergency stop executed")
+
+    def get_status(self):
+        """Get current mission status."""
+        if self.mission_complete:
+            mission_duration = self.mission_end_time - self.mission_start_time
+        elif self.mission_start_time:
+            mission_duration = time.time() - self.mission_start_time
+        else:
+            mission_duration = 0.0
+        return {
+            'is_active': self.is_active,
+            'mission_start_time': self.mission_start_time,
+            'mission_duration': mission_duration,
+            'mission_complete': self.mission_complete,
+            'red_balloons_eliminated': self.red_balloons_eliminated,
+            'required_eliminations': self.required_eliminations,
+            'current_target': self.current_target.track_id if self.current_target else None,
+            'engagement_plan': list(self.engagement_plan),
+            'planned_mission_time': self.planned_mission_time,
+            'replan_count': self.replan_count,
+            'shots_fired': self.shots_fired,
+            'servo_angle': self.current_servo_angle,
+            'stepper_angle': self.current_stepper_angle,
+        }
+
+    @staticmethod
+    def _target_dict(target):
+        return {
+            'track_id': target.track_id,
+            'color': target.color.value,
+            'center': target.center,
+            'bbox': target.bbox,
+            'confidence': target.confidence,
+            'distance_to_center': target.distance_to_center,
+            'eliminated': target.eliminated,
+            'shots_fired': target.shots_fired,
+        }
+
+    def get_target_info(self):
+        """Get target information (red targets sorted by distance to the crosshair)."""
+        return {
+            'current_target': self._target_dict(self.current_target) if self.current_target else None,
+            'red_targets': [self._target_dict(t) for t in self.red_targets],
+            'blue_targets': [self._target_dict(t) for t in self.blue_targets],
+            'engagement_order': list(self.engagement_plan),
+        }
+
+    # GUI Integration Methods
+    def activate(self):
+        """Activate Capability 11 - called by GUI."""
+        self.start_capability11_mode()
+
+    def deactivate(self):
+        """Deactivate Capability 11 - called by GUI."""
+        self.stop_capability11_mode()
+
+    def process_frame(self, frame, tracks):
+        """Return (target_bbox, target_id, status) for the GUI overlay; the mission loop owns processing."""
+        if not self.is_active:
+            return None, None, "Capability 11 not active"
+
+        if self.mission_complete:
+            return None, None, f"MISSION COMPLETE - {self.red_balloons_eliminated} red balloons eliminated"
+
+        target = self.current_target
+        if target is None:
+            return None, None, f"SCANNING - {self.red_balloons_eliminated}/{self.required_eliminations} eliminated"
+
+        if target.distance_to_center <= self.fire_range:
+            status = f"FIRING at enemy {target.track_id}"
+        else:
+            status = f"TRACKING enemy {target.track_id} - distance: {target.distance_to_center:.1f}px"
+        return target.bbox, target.track_id, status
+
+
+# === Mission benchmark ===
+
+def simulate_mission(order_policy, positions, start=(30.0, 150.0), hit_probability=0.7,
+                     scheduler=None, seed=0):
+    """
+    Mission completion time for one scenario.
+    order_policy(start, positions, scheduler) -> list of track ids.
+    Each shot hits with `hit_probability`; a miss costs another dwell.
+    """
+    scheduler = scheduler or EngagementScheduler()
+    rng = random.Random(seed)
+    order = order_policy(start, positions, scheduler)
+    total = 0.0
+    previous = start
+    for track_id in order:
+        total += scheduler.leg_time(previous, positions[track_id])
+        total += scheduler.dwell_time
+        while rng.random() > hit_probability:
+            total += scheduler.dwell_time
+        previous = positions[track_id]
+    return total
+
+
+def closest_first_policy(start, positions, scheduler):
+    """Engage in order of angular distance from the starting aim point."""
+    return sorted(positions, key=lambda i: (math.hypot(positions[i][0] - start[0],
+                                                       positions[i][1] - start[1]), i))
+
+
+def nearest_neighbour_policy(start, positions, scheduler):
+    """Greedy: always slew to the quickest-to-reach remaining target."""
+    return scheduler._nearest_neighbour(start, sorted(positions), positions)
+
+
+def kill_latency_policy(start, positions, scheduler):
+    """EngagementScheduler order minimising the sum of kill times (the tracker default)."""
+    return EngagementScheduler(scheduler.servo_rate, scheduler.stepper_rate, scheduler.dwell_time,
+                               scheduler.settle_time, objective="kill_latency").plan(start, positions)
+
+
+def makespan_policy(start, positions, scheduler):
+    """EngagementScheduler order minimising total mission time."""
+    return EngagementScheduler(scheduler.servo_rate, scheduler.stepper_rate, scheduler.dwell_time,
+                               scheduler.settle_time, objective="makespan").plan(start, positions)
+
+
+def benchmark_missions(scenario_count=200, target_count=3, seed=42):
+    """Average mission completion time per ordering policy over randomized scenarios."""
+    rng = random.Random(seed)
+    policies = {
+        'closest_first': closest_first_policy,
+        'nearest_neighbour': nearest_neighbour_policy,
+        'kill_latency': kill_latency_policy,
+        'makespan': makespan_policy,
+    }
+    totals = {name: 0.0 for name in policies}
+    for scenario in range(scenario_count):
+        positions = {i + 1: (rng.uniform(5, 55), rng.uniform(10, 290)) for i in range(target_count)}
+        for name, policy in policies.items():
+            totals[name] += simulate_mission(policy, positions, seed=scenario)
+    return {name: total / scenario_count for name, total in totals.items()}
+
+
+if __name__ == "__main__":
+    for count in (3, 5, 8):
+        results = benchmark_missions(target_count=count)
+        summary = ", ".join(f"{name}={value:.2f}s" for name, value in results.items())
+        print(f"[Capability11] 📊 {count} targets: {summary}")
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import Counter
+
+import cv2
+
+# Color conversions from the camera's BGR frame
+CONVERSIONS = {
+    "rgb": cv2.COLOR_BGR2RGB,
+    "hsv": cv2.COLOR_BGR2HSV,
+    "lab": cv2.COLOR_BGR2LAB,
+    "gray": cv2.COLOR_BGR2GRAY,
+}
+
+
+class FrameCacheStats:
+    """Process-wide count of derived images computed vs. served from a frame's cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.computed = Counter()
+        self.reused = Counter()
+        self.frames = 0
+
+    def count_frame(self):
+        with self._lock:
+            self.frames += 1
+
+    def record(self, key, reused):
+        with self._lock:
+            (self.reused if reused else self.computed)[key] += 1
+
+    def get_stats(self):
+        with self._lock:
+            computed, reused = sum(self.computed.values()), sum(self.reused.values())
+            return {
+                'frames': self.frames,
+                'computed': computed,
+                'saved': reused,
+                'saved_share': reused / (computed + reused) if computed + reused else 0.0,
+                'by_kind': {kind: {'computed': self.computed[kind], 'saved': self.reused[kind]}
+                            for kind in sorted(set(self.computed) | set(self.reused))},
+            }
+
+
+stats = FrameCacheStats()
+
+
+class FrameCache:
+    """
+    One camera frame plus its derived images (RGB, HSV, LAB, gray and
+    downscaled versions), each computed on first access and shared with every
+    later consumer of the same frame. The BGR frame must not be drawn on -
+    consumers that annotate work on a copy.
+    - get(kind, width): full frame, or downscaled to `width` (INTER_AREA) first
+    - roi(kind, bbox): a slice of the full-frame image when someone already
+      computed it, else only the ROI is converted (and cached per bbox)
+    - release(): drops the derived images when the frame is retired
+    """
+
+    def __init__(self, frame, captured_at=None):
+        self.bgr = frame
+        self.captured_at = time.time() if captured_at is None else captured_at
+        self.shape = frame.shape
+        self._images = {}
+        self._lock = threading.RLock()
+        stats.count_frame()
+
+    @classmethod
+    def of(cls, frame):
+        """The frame's cache - a plain array gets a private cache of its own."""
+        return frame if isinstance(frame, FrameCache) else cls(frame)
+
+    def get(self, kind="bgr", width=None):
+        if kind != "bgr" and kind not in CONVERSIONS:
+            raise ValueError(f"Unknown image kind '{kind}' (expected bgr or one of {sorted(CONVERSIONS)})")
+        height, full_width = self.shape[:2]
+        if width is not None and width >= full_width:
+            width = None
+        if kind == "bgr" and width is None:
+            return self.bgr
+
+        key = (kind, width)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                stats.record(kind, reused=True)
+                return image
+            if kind == "bgr":
+                size = (width, max(1, int(round(height * width / full_width))))
+                image = cv2.resize(self.bgr, size, interpolation=cv2.INTER_AREA)
+            else:
+                source = self.get("bgr", width)
+                image = source if kind == "gray" and source.ndim == 2 else cv2.cvtColor(source, CONVERSIONS[kind])
+            self._images[key] = image
+            stats.record(kind, reused=False)
+            return image
+
+    def roi(self, kind, bbox):
+        """Region (x1, y1, x2, y2) of a derived full-resolution image."""
+        x1, y1, x2, y2 = bbox
+        if kind == "bgr":
+            return self.bgr[y1:y2, x1:x2]
+        with self._lock:
+            full = self._images.get((kind, None))
+            if full is not None:
+                stats.record(kind, reused=True)
+                return full[y1:y2, x1:x2]
+            key = (kind, None, tuple(bbox))
+            image = self._images.get(key)
+            if image is not None:
+                stats.record(kind, reused=True)
+                return image
+            if kind not in CONVERSIONS:
+                raise ValueError(f"Unknown image kind '{kind}'")
+            image = cv2.cvtColor(self.bgr[y1:y2, x1:x2], CONVERSIONS[kind])
+            self._images[key] = image
+            stats.record(kind, reused=False)
+            return image
+
+    def release(self):
+        with self._lock:
+            self._images.clear()
+
+
+def get_stats():
+    return stats.get_stats()
@@ -167,8 +167,11 @@ class SunkarGUI(ctk.CTk):
         self.start_button.configure(text="Başlat", fg_color="#242E3A")
 
     def update_loop(self):
-        frame, tracks = self.camera_manager.get_frame()
-        if frame is not None:
+        frames, tracks = self.camera_manager.get_frame_cache()
+        if frames is not None:
+            # Overlays are drawn on a copy of the frame's shared RGB image (colors below are RGB),
+            # so the camera frame stays clean and is converted once, not on every GUI tick
+            frame = frames.get("rgb").copy()
             auto_mode = self.mode_switch.get() == 1
             selected_bbox = None
             status_message = ""
@@ -180,7 +183,7 @@ class SunkarGUI(ctk.CTk):
                 color = (0, 255, 0)
                 # Highlight the selected target in red
                 if track_id == self.selected_track_id:
-                    color = (0, 0, 255)
+                    color = (255, 0, 0)
                     selected_bbox = (x1, y1, x2, y2)
                 cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
                 cv2.putText(frame, f"ID:{track_id} {det['label']}", (x1, max(0, y1 - 10)),
@@ -191,14 +194,16 @@ class SunkarGUI(ctk.CTk):
                 # Activate autonomous mode if not already active
                 if not self.auto_mode_active:
                     try:
+                        self.camera_manager.set_inference_profile("search")
                         self.autonomous_manager.activate()
                         self.auto_mode_active = True
                     except:
                         pass
                 
-                # Process autonomous mode
+                # Read the state published by the autonomous control thread
                 try:
-                    target_bbox, target_id, status = self.autonomous_manager.process_frame(frame, tracks)
+                    snapshot = self.autonomous_manager.get_snapshot()
+                    target_bbox, target_id, status = snapshot.target_bbox, snapshot.target_id, snapshot.status_message
                     status_message = status
                     
                     if target_bbox and target_id:
@@ -210,22 +215,23 @@ class SunkarGUI(ctk.CTk):
                         
                         if "firing" in status.lower():
                             # Draw red crosshair for firing
-                            self.draw_crosshair(frame, center, color=(0, 0, 255), size=15, thickness=3)
+                            self.draw_crosshair(frame, center, color=(255, 0, 0), size=15, thickness=3)
                             cv2.putText(frame, "FIRING!", (center[0] - 30, center[1] - 20),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 0), 2)
                         elif "locking" in status.lower():
                             # Draw yellow crosshair for locking
-                            self.draw_crosshair(frame, center, color=(0, 255, 255), size=12, thickness=2)
+                            self.draw_crosshair(frame, center, color=(255, 255, 0), size=12, thickness=2)
                             cv2.putText(frame, "LOCKING", (center[0] - 30, center[1] - 20),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
                         else:
                             # Draw blue crosshair for tracking
-                            self.draw_crosshair(frame, center, color=(255, 0, 0), size=10, thickness=2)
+                            self.draw_crosshair(frame, center, color=(0, 0, 255), size=10, thickness=2)
                             cv2.putText(frame, "TRACKING", (center[0] - 30, center[1] - 20),
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
                     
-                    # Update status display
-                    self.status_box.configure(text=f"Otonom: {status_message}")
+                    # Update status display (with the inference governor's current tier)
+                    tier = self.camera_manager.get_inference_status()['governor']['tier']
+                    self.status_box.configure(text=f"Otonom: {status_message} | {tier}")
                 except:
                     self.status_box.configure(text="Otonom mod hatası")
             elif auto_mode:
@@ -255,15 +261,15 @@ class SunkarGUI(ctk.CTk):
                 # Deactivate autonomous mode when switching to manual
                 if self.auto_mode_active:
                     self.autonomous_manager.deactivate()
+                    self.camera_manager.set_inference_profile("manual")
                     self.auto_mode_active = False
             
             # --- Draw crosshair for selected target (manual mode) ---
             if not auto_mode and selected_bbox is not None:
                 self.draw_crosshair(frame, ((selected_bbox[0] + selected_bbox[2]) // 2, (selected_bbox[1] + selected_bbox[3]) // 2))
             
-            # Convert and display frame
-            img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(img)
+            # Display frame (already RGB)
+            pil_image = Image.fromarray(frame)
             imgtk = CTkImage(light_image=pil_image, size=(700, 400))
             self.video_label.configure(image=imgtk)
             self.video_label.imgtk = imgtk
@@ -340,14 +346,14 @@ class SunkarGUI(ctk.CTk):
         self.status_box.configure(text="Başlangıç konumuna getirildi.")
         print("Reset butonu çalıştı.")
 
-    def draw_crosshair(self, frame, center, color=(0,0,255), size=10, thickness=2):
+    def draw_crosshair(self, frame, center, color=(255,0,0), size=10, thickness=2):
         x, y = center
         cv2.line(frame, (x - size, y), (x + size, y), color, thickness)
         cv2.line(frame, (x, y - size), (x, y + size), color, thickness)
         cv2.circle(frame, (x, y), 3, color, -1)
 
     def on_video_click(self, event):
-        frame, tracks = self.camera_manager.get_frame()
+        frame, tracks, _ = self.camera_manager.get_frame()
         if frame is None:
             return
         display_w, display_h = self.video_label.winfo_width(), self.video_label.winfo_height()
@@ -375,7 +381,7 @@ class SunkarGUI(ctk.CTk):
         """Fire the laser - called from GUI Fire button or joystick fire button."""
         if self.mode_switch.get():  # Auto mode
             # In auto mode, fire at the lowest ID balloon
-            frame, tracks = self.camera_manager.get_frame()
+            frame, tracks, _ = self.camera_manager.get_frame()
             if tracks:
                 # Find balloon with lowest ID
                 lowest_id_track = min(tracks, key=lambda x: x['track_id'])
@@ -503,10 +509,9 @@ class SunkarGUI(ctk.CTk):
 
     def update_restricted_video(self):
         if self.restricted_container and self.restricted_container.winfo_ismapped():
-            frame, _ = self.camera_manager.get_frame()
-            if frame is not None:
-                img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(img)
+            frames, _ = self.camera_manager.get_frame_cache()
+            if frames is not None:
+                pil_image = Image.fromarray(frames.get("rgb"))
                 imgtk = CTkImage(light_image=pil_image, size=(700, 400))
                 self.restricted_video_label.configure(image=imgtk)
                 self.restricted_video_label.imgtk = imgtk
@@ -0,0 +1,123 @@
+import time
+import cv2
+from dataclasses import dataclass
+from frame_cache import FrameCache
+
+
+def frame_sharpness(frame, size=320):
+    """Variance of the Laplacian of a downscaled gray frame (higher = sharper)."""
+    frames = FrameCache.of(frame)
+    height, width = frames.shape[:2]
+    scale = size / max(height, width)
+    gray = frames.get("gray", max(1, int(width * scale)) if scale < 1.0 else None)
+    return float(cv2.Laplacian(gray, cv2.CV_32F).var())
+
+
+@dataclass
+class GateDecision:
+    run: bool  # run inference on this frame
+    reason: str  # "settled", "tracking", "forced", "moving" or "blurry"
+    settled: bool
+    sharpness: float = 0.0  # 0 when the frame was rejected before scoring
+
+
+class InferenceGate:
+    """
+    Decides which camera frames are worth running the detector on.
+    A frame passes when the turret has settled (no commanded motion for
+    `settle_time`) and it is sharp: its Laplacian variance reaches
+    `sharpness_ratio` of a reference that follows the sharpest recent settled
+    frames. While tracking, `tracking_policy` relaxes the rule:
+    - "always": every frame is processed (the turret servos continuously)
+    - "sharp": frames only need to be sharp, not settled
+    - "settled": same rule as scanning
+    If nothing has passed for `max_skip_time`, the next frame is processed
+    anyway so a dark or featureless scene can't blind the system.
+    """
+
+    TRACKING_POLICIES = ("always", "sharp", "settled")
+
+    def __init__(self, settle_time=0.15, sharpness_ratio=0.5, min_sharpness=15.0, max_skip_time=1.0,
+                 tracking_policy="sharp", motion=None):
+        if tracking_policy not in self.TRACKING_POLICIES:
+            raise ValueError(f"Unknown tracking policy: {tracking_policy}")
+        self.settle_time = settle_time  # seconds after the last motion command before frames count as settled
+        self.sharpness_ratio = sharpness_ratio  # fraction of the reference sharpness a frame must reach
+        self.min_sharpness = min_sharpness  # absolute floor (Laplacian variance)
+        self.max_skip_time = max_skip_time  # never go longer than this without inference
+        self.tracking_policy = tracking_policy
+        self.motion = motion  # MotionStreamer (is_moving, last_command_time) or None
+        self.tracking = False  # Set by the autonomous mode while it servos on a target
+
+        self.reference_sharpness = None
+        self.reference_rise = 0.5  # EMA weight when a settled frame is sharper than the reference
+        self.reference_decay = 0.05  # EMA weight when it is blurrier (scene lost texture)
+        self.last_motion_time = 0.0
+        self.last_run_time = 0.0
+        self.counts = {reason: 0 for reason in ("settled", "tracking", "forced", "moving", "blurry")}
+
+    def note_motion(self, now=None):
+        """A motion command was sent outside the motion streamer."""
+        self.last_motion_time = time.time() if now is None else now
+
+    def is_settled(self, now=None):
+        now = time.time() if now is None else now
+        last_motion = self.last_motion_time
+        if self.motion is not None:
+            if self.motion.is_moving:
+                return False
+            last_motion = max(last_motion, self.motion.last_command_time)
+        return now - last_motion >= self.settle_time
+
+    def is_sharp(self, sharpness):
+        threshold = self.min_sharpness
+        if self.reference_sharpness is not None:
+            threshold = max(threshold, self.sharpness_ratio * self.reference_sharpness)
+        return sharpness >= threshold
+
+    def _update_reference(self, sharpness):
+        if self.reference_sharpness is None:
+            self.reference_sharpness = sharpness
+            return
+        weight = self.reference_rise if sharpness > self.reference_sharpness else self.reference_decay
+        self.reference_sharpness += weight * (sharpness - self.reference_sharpness)
+
+    def evaluate(self, frame, now=None) -> GateDecision:
+        """Decide whether to run inference on `frame` (captured at `now`)."""
+        now = time.time() if now is None else now
+        settled = self.is_settled(now)
+        policy = self.tracking_policy if self.tracking else "settled"
+
+        if policy == "always":
+            decision = GateDecision(True, "tracking", settled)
+        elif not settled and policy == "settled":
+            decision = GateDecision(False, "moving", settled)
+        else:
+            sharpness = frame_sharpness(frame)
+            if settled:
+                # Settled frames can't be motion-blurred, so they define what sharp looks like
+                self._update_reference(sharpness)
+            if self.is_sharp(sharpness):
+                decision = GateDecision(True, "tracking" if self.tracking else "settled", settled, sharpness)
+            else:
+                decision = GateDecision(False, "blurry", settled, sharpness)
+
+        if not decision.run and now - self.last_run_time >= self.max_skip_time:
+            decision.run, decision.reason = True, "forced"
+        if decision.run:
+            self.last_run_time = now
+        self.counts[decision.reason] += 1
+        return decision
+
+    def get_stats(self):
+        total = sum(self.counts.values())
+        processed = self.counts["settled"] + self.counts["tracking"] + self.counts["forced"]
+        return {
+            'frames': total,
+            'processed': processed,
+            'skip_rate': 1.0 - processed / total if total else 0.0,
+            'counts': dict(self.counts),
+            'reference_sharpness': self.reference_sharpness,
+            'tracking': self.tracking,
+            'tracking_policy': self.tracking_policy,
+        }
@@ -0,0 +1,108 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class InferenceTier:
+    name: str
+    weights: str  # model variant key ("nano", "small", ...)
+    imgsz: int  # input size cap (pixels)
+    cost: float  # relative latency, used to predict whether the next tier up fits
+
+
+# Cheapest first; cost ~ model FLOPs ratio x (imgsz / 320)²
+DEFAULT_TIERS = (
+    InferenceTier("nano-320", "nano", 320, 1.0),
+    InferenceTier("nano-480", "nano", 480, 2.25),
+    InferenceTier("nano-640", "nano", 640, 4.0),
+    InferenceTier("small-480", "small", 480, 6.75),
+    InferenceTier("small-640", "small", 640, 12.0),
+)
+
+
+class InferenceGovernor:
+    """
+    Closed-loop governor that keeps per-frame inference latency within a budget
+    by moving along a ladder of model variants and input sizes.
+    - Steps down as soon as the recent `percentile` latency exceeds the budget
+    - Steps up only when the next tier's predicted latency (measured latency
+      scaled by the cost ratio) fits within `upgrade_margin` of the budget
+    - After any switch it holds for `hold_frames` frames; an upgrade that had
+      to be undone doubles that tier's hold (up to `max_hold_frames`) so it
+      doesn't oscillate
+    """
+
+    def __init__(self, tiers: Sequence[InferenceTier] = DEFAULT_TIERS, budget=0.1, window=20, percentile=90,
+                 upgrade_margin=0.75, hold_frames=30, max_hold_frames=600, start_tier=None):
+        if not tiers:
+            raise ValueError("InferenceGovernor needs at least one tier")
+        self.tiers: List[InferenceTier] = list(tiers)
+        self.budget = budget  # seconds per frame
+        self.percentile = percentile
+        self.upgrade_margin = upgrade_margin  # predicted latency must fit within this fraction of the budget
+        self.hold_frames = hold_frames  # frames to stay on a tier after switching
+        self.max_hold_frames = max_hold_frames
+
+        self.index = len(self.tiers) // 2 if start_tier is None else start_tier
+        self.latencies = deque(maxlen=window)
+        self._frames_on_tier = 0
+        self._upgrade_hold = [hold_frames] * len(self.tiers)  # frames before trying tier i from below
+        self._upgraded_from = None  # tier index we came from by an upgrade, if not yet proven
+        self.switches = 0
+        self.last_switch_time = time.time()
+
+    @property
+    def tier(self) -> InferenceTier:
+        return self.tiers[self.index]
+
+    def recent_latency(self):
+        return float(np.percentile(self.latencies, self.percentile)) if self.latencies else 0.0
+
+    def record(self, latency) -> InferenceTier:
+        """Account one frame's inference latency (seconds); returns the tier for the next frame."""
+        self.latencies.append(latency)
+        self._frames_on_tier += 1
+        if len(self.latencies) < self.latencies.maxlen // 2:
+            return self.tier
+
+        recent = self.recent_latency()
+        if recent > self.budget and self.index > 0:
+            if self._upgraded_from is not None:
+                # The last upgrade didn't fit - wait longer before trying this tier again
+                self._upgrade_hold[self.index] = min(2 * self._upgrade_hold[self.index], self.max_hold_frames)
+            self._switch(self.index - 1, recent)
+        elif self.index < len(self.tiers) - 1 and self._frames_on_tier >= self._upgrade_hold[self.index + 1]:
+            predicted = recent * self.tiers[self.index + 1].cost / self.tier.cost
+            if predicted <= self.upgrade_margin * self.budget:
+                self._switch(self.index + 1, recent)
+        if self._upgraded_from is not None and self._frames_on_tier >= self.hold_frames:
+            # Held the upgraded tier within budget - it has proven itself
+            self._upgrade_hold[self.index] = self.hold_frames
+            self._upgraded_from = None
+        return self.tier
+
+    def _switch(self, index, recent):
+        upgrade = index > self.index
+        print(f"[InferenceGovernor] {'⬆️' if upgrade else '⬇️'} {self.tier.name} -> {self.tiers[index].name} "
+              f"(p{self.percentile} {recent * 1000:.0f} ms, budget {self.budget * 1000:.0f} ms)")
+        self._upgraded_from = self.index if upgrade else None
+        self.index = index
+        self.latencies.clear()
+        self._frames_on_tier = 0
+        self.switches += 1
+        self.last_switch_time = time.time()
+
+    def get_stats(self):
+        latencies = list(self.latencies)
+        return {
+            'tier': self.tier.name,
+            'tier_index': self.index,
+            'budget_ms': self.budget * 1000,
+            'latency_p50_ms': float(np.percentile(latencies, 50)) * 1000 if latencies else 0.0,
+            'latency_p90_ms': float(np.percentile(latencies, 90)) * 1000 if latencies else 0.0,
+            'switches': self.switches,
+        }
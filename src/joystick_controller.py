@@ -2,6 +2,9 @@ import pygame
 import time
 import math
 from serial_comm import SerialComm
+from async_logger import get_logger
+
+log = get_logger("JoystickController")
 
 class JoystickController:
     def __init__(self, serial_comm=None, port="COM14", mode="manual", protocol="text"):
@@ -12,6 +15,7 @@ class JoystickController:
             self.serial = SerialComm(port=port, protocol=protocol)
         self.mode = mode
         self.protocol = protocol
+        self.motion = None  # MotorControl's MotionStreamer, kept in sync with joystick commands (set by main.py)
 
         # Joystick control parameters
         self.deadzone = 0.05  # Reduced deadzone for better control
@@ -77,12 +81,12 @@ class JoystickController:
         self.joystick = None
 
         if pygame.joystick.get_count() == 0:
-            print("[JoystickController] ❌ Joystick bulunamadı!")
+            log.error("❌ Joystick bulunamadı!")
             self.joystick = None
         else:
             self.joystick = pygame.joystick.Joystick(0)
             self.joystick.init()
-            print(f"[JoystickController] ✅ Joystick başlatıldı: {self.joystick.get_name()}")
+            log.info(f"✅ Joystick başlatıldı: {self.joystick.get_name()}")
 
     def apply_deadzone(self, value):
         if abs(value) < self.deadzone:
@@ -237,11 +241,9 @@ class JoystickController:
         if response_curve_power is not None:
             self.response_curve_power = response_curve_power
             
-        print(f"[JoystickController] ⚙️ Acceleration parameters updated:")
-        print(f"  Servo max velocity: {self.max_velocity_servo}°/s")
-        print(f"  Stepper max velocity: {self.max_velocity_stepper}°/s")
-        print(f"  Acceleration rate: {self.acceleration_rate}")
-        print(f"  Response curve power: {self.response_curve_power}")
+        log.info(f"⚙️ Acceleration parameters updated: servo max velocity {self.max_velocity_servo}°/s, "
+                 f"stepper max velocity {self.max_velocity_stepper}°/s, acceleration rate {self.acceleration_rate}, "
+                 f"response curve power {self.response_curve_power}")
 
     def check_fire_button(self):
         """Check if fire button (usually button 0 or red button) is pressed."""
@@ -262,7 +264,7 @@ class JoystickController:
         # Detect button press (rising edge)
         if button_pressed and not self.last_fire_button_state:
             self.fire_button_pressed = True
-            print("[JoystickController] 🔥 Fire button pressed!")
+            log.info("🔥 Fire button pressed!")
         
         self.last_fire_button_state = button_pressed
         return button_pressed
@@ -290,21 +292,21 @@ class JoystickController:
         # === Lazer Kontrolleri (from working code) ===
         if current_b and not self.prev_b:
             self.serial.send_command(self.LASER_CMD, 1)
-            print("[JoystickController] Lazer AÇ")
+            log.info("Lazer AÇ")
 
         if current_y and not self.prev_y:
             self.serial.send_command(self.LASER_CMD, 0)
-            print("[JoystickController] Lazer KAPAT")
+            log.info("Lazer KAPAT")
 
         # === Servo Aktif/Pasif Toggle (LB) ===
         if current_lb and not self.prev_lb:
             self.servo_active = not self.servo_active
-            print("[JoystickController] Servo:", "Açık" if self.servo_active else "Kilitli")
+            log.info("Servo: %s", "Açık" if self.servo_active else "Kilitli")
 
         # === Stepper Aktif/Pasif Toggle (RB) ===
         if current_rb and not self.prev_rb:
             self.stepper_active = not self.stepper_active
-            print("[JoystickController] Stepper:", "Açık" if self.stepper_active else "Kilitli")
+            log.info("Stepper: %s", "Açık" if self.stepper_active else "Kilitli")
 
         # === Önceki Butonları Güncelle ===
         self.prev_b, self.prev_y, self.prev_lb, self.prev_rb = current_b, current_y, current_lb, current_rb
@@ -315,8 +317,8 @@ class JoystickController:
         if self.servo_active:
             angle_servo = self.get_servo_angle()
             if angle_servo != self.last_sent_servo and (now - self.last_servo_time) > 0.1:
-                self.serial.send_command(self.SERVO_CMD, angle_servo)
-                print(f"[JoystickController] Servo açı: {angle_servo}")
+                self._send_axis(0, self.SERVO_CMD, angle_servo)
+                log.debug("Servo açı: %s", angle_servo)
                 self.last_sent_servo = angle_servo
                 self.last_servo_time = now
 
@@ -338,19 +340,24 @@ class JoystickController:
             if should_send and angle_stepper != self.last_sent_stepper:
                 # Round to nearest integer to avoid floating point issues
                 rounded_angle = int(round(angle_stepper))
-                self.serial.send_command(self.STEPPER_CMD, rounded_angle)
+                self._send_axis(1, self.STEPPER_CMD, rounded_angle)
                 
                 # Enhanced status reporting
-                status_msg = f"Stepper: {rounded_angle}°"
                 if self.stepper_movement_active:
-                    status_msg += f" (Moving, Vel: {self.current_stepper_velocity:.1f}°/s)"
+                    log.debug("Stepper: %d° (Moving, Vel: %.1f°/s)", rounded_angle, self.current_stepper_velocity)
                 else:
-                    status_msg += " (Holding)"
-                print(f"[JoystickController] {status_msg}")
+                    log.debug("Stepper: %d° (Holding)", rounded_angle)
                 
                 self.last_sent_stepper = angle_stepper
                 self.last_stepper_time = now
 
+    def _send_axis(self, axis, command, angle):
+        """Send an axis angle, through the motion streamer when connected so its profiles start from here."""
+        if self.motion is not None:
+            self.motion.command(axis, angle)
+        else:
+            self.serial.send_command(command, angle)
+
     def get_position(self):
         if self.joystick:
             pygame.event.pump()
@@ -399,4 +406,4 @@ class JoystickController:
 
     def close(self):
         pygame.quit()
-        print("[JoystickController] 🔌 Bağlantı kapatıldı.")
\ No newline at end of file
+        log.info("🔌 Bağlantı kapatıldı.")
\ No newline at end of file
@@ -0,0 +1,158 @@
+import time
+from enum import Enum
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Red in OpenCV HSV wraps around hue 0/180
+RED_HSV_RANGES = (
+    (np.array([0, 100, 60]), np.array([10, 255, 255])),
+    (np.array([170, 100, 60]), np.array([180, 255, 255])),
+)
+
+
+def red_fraction(frame, bbox):
+    """Fraction of saturated red pixels inside bbox (0..1)."""
+    if frame is None:
+        return 0.0
+    h, w = frame.shape[:2]
+    x1, y1 = max(0, int(bbox[0])), max(0, int(bbox[1]))
+    x2, y2 = min(w, int(bbox[2])), min(h, int(bbox[3]))
+    if x2 <= x1 or y2 <= y1:
+        return 0.0
+    hsv = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2HSV)
+    mask = None
+    for lower, upper in RED_HSV_RANGES:
+        part = cv2.inRange(hsv, lower, upper)
+        mask = part if mask is None else mask | part
+    return float(np.count_nonzero(mask)) / mask.size
+
+
+class KillOutcome(Enum):
+    PENDING = "pending"
+    KILLED = "killed"
+    MISSED = "missed"
+
+
+class KillAssessor:
+    """
+    Post-fire assessment of a single shot.
+    After begin() the target's track and ROI are compared against the
+    moment of firing:
+    - the track is missing from `missing_frames` processed frames in a row -> killed
+    - the bbox shrinks to `shrink_ratio` of its area or less -> killed (balloon popped)
+    - the red fraction of the ROI drops by more than `color_change` -> killed
+    If none of these is seen within `window` seconds (and at least
+    `missing_frames` processed frames, `max_window` seconds at most) the shot
+    is a miss. Shrink and color
+    evidence must hold for `confirm_frames` frames to ignore detector jitter.
+    Absence is counted in processed frames, not time: the inference gate and
+    the cascade can skip frames for longer than a kill takes to confirm.
+    A growing box (closer balloon, merged tracks, profile switch) is no evidence.
+    """
+
+    def __init__(self, window=0.6, missing_frames=3, shrink_ratio=0.5, color_change=0.5, confirm_frames=2,
+                 max_window=2.0):
+        self.window = window  # seconds until an unconfirmed shot counts as a miss
+        self.max_window = max_window  # miss after this long even if few frames were processed
+        self.missing_frames = missing_frames  # processed frames in a row without the track to count as killed
+        self.shrink_ratio = shrink_ratio  # bbox area (relative to the shot) at or below which it popped
+        self.color_change = color_change  # relative drop of the red pixel fraction
+        self.confirm_frames = confirm_frames  # consecutive frames of shrink/color evidence
+
+        # Current assessment
+        self.track_id = None
+        self.start_time = 0.0
+        self.baseline_area = 0.0
+        self.baseline_red = 0.0
+        self.frames_seen = 0  # processed frames since the shot
+        self.frames_missing = 0  # consecutive processed frames without the track
+        self.evidence_frames = 0
+        self.outcome = KillOutcome.PENDING
+        self.reason = ""
+
+        # Statistics
+        self.kills = 0
+        self.misses = 0
+        self.total_assessment_time = 0.0
+
+    @property
+    def active(self):
+        return self.track_id is not None and self.outcome == KillOutcome.PENDING
+
+    @staticmethod
+    def _area(bbox):
+        return max(0, bbox[2] - bbox[0]) * max(0, bbox[3] - bbox[1])
+
+    def begin(self, track_id, bbox, frame, timestamp=None):
+        """Start assessing a shot fired at track_id (bbox/frame at the moment of firing)."""
+        timestamp = time.time() if timestamp is None else timestamp
+        self.track_id = track_id
+        self.start_time = timestamp
+        self.frames_seen = 0
+        self.frames_missing = 0
+        self.baseline_area = self._area(bbox)
+        self.baseline_red = red_fraction(frame, bbox)
+        self.evidence_frames = 0
+        self.outcome = KillOutcome.PENDING
+        self.reason = ""
+
+    def update(self, bbox: Optional[tuple], frame, timestamp=None, new_frame=True) -> KillOutcome:
+        """
+        Feed the target's bbox from the latest frame (None if the track is not
+        in it) and return the outcome so far. With new_frame=False only the
+        window is checked.
+        """
+        if not self.active:
+            return self.outcome
+        timestamp = time.time() if timestamp is None else timestamp
+
+        if new_frame:
+            self.frames_seen += 1
+            if bbox is None:
+                self.frames_missing += 1
+                if self.frames_missing >= self.missing_frames:
+                    return self._finish(KillOutcome.KILLED, "track disappeared", timestamp)
+            else:
+                self.frames_missing = 0
+                shrunk = bool(self.baseline_area) and self._area(bbox) <= self.baseline_area * self.shrink_ratio
+                color_changed = False
+                if self.baseline_red > 0:
+                    red = red_fraction(frame, bbox)
+                    color_changed = red <= self.baseline_red * (1.0 - self.color_change)
+                if shrunk or color_changed:
+                    self.evidence_frames += 1
+                    if self.evidence_frames >= self.confirm_frames:
+                        return self._finish(KillOutcome.KILLED, "shrink" if shrunk else "color change", timestamp)
+                else:
+                    self.evidence_frames = 0
+
+        elapsed = timestamp - self.start_time
+        if (elapsed >= self.window and self.frames_seen >= self.missing_frames) or elapsed >= self.max_window:
+            return self._finish(KillOutcome.MISSED, "no change", timestamp)
+        return self.outcome
+
+    def _finish(self, outcome, reason, timestamp):
+        self.outcome = outcome
+        self.reason = reason
+        self.total_assessment_time += timestamp - self.start_time
+        if outcome == KillOutcome.KILLED:
+            self.kills += 1
+        else:
+            self.misses += 1
+        return outcome
+
+    def cancel(self):
+        """Drop the current assessment without recording an outcome."""
+        self.track_id = None
+        self.outcome = KillOutcome.PENDING
+
+    def get_stats(self):
+        assessed = self.kills + self.misses
+        return {
+            'kills': self.kills,
+            'misses': self.misses,
+            'hit_rate': self.kills / assessed if assessed else 0.0,
+            'mean_assessment_time': self.total_assessment_time / assessed if assessed else 0.0
+        }
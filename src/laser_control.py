@@ -93,15 +93,13 @@ class LaserControl:
             print(f"[LaserControl] 🔥 Firing laser for {duration}s")
             self.laser_active = True
             
-            # Send trigger command - Arduino will handle the 300ms ON, 700ms OFF pattern
+            # The firmware only sets the laser pin, so time the pulse here
             self.serial.send_command(0x03, 1)
-            
-            # Wait for the pattern to complete (300ms + 700ms = 1000ms)
-            time.sleep(1.0)
+            time.sleep(duration)
+            self.serial.send_command(0x03, 0)
             
             print("[LaserControl] 🔇 Laser fire complete")
             self.laser_active = False
-            # Don't send OFF command - let Arduino handle timing
             
         except Exception as e:
             print(f"[LaserControl] ❌ Error during laser fire: {e}")
@@ -4,15 +4,26 @@ from joystick_controller import JoystickController
 from serial_comm import SerialComm
 from laser_control import LaserControl
 from motor_control import MotorControl
+import async_logger
 
 if __name__ == "__main__":
     # Configuration
     COM_PORT = "COM14"
-    PROTOCOL = "text"
+    PROTOCOL = "text"  # "text", "binary" (angles 0-255) or "frame" (flash arduino/motor_control.ino first)
+    LINK_BAUD = 115200  # negotiated up from 9600 when the firmware supports it
+    AUTONOMOUS_SYSTEM = "simple"  # "simple" (SimpleAutonomousMode) or "radar" (adaptive radar scanning - scan/track only, never fires)
+    LOG_LEVELS = {}  # e.g. {"SerialComm": "DEBUG"} - per-component levels (default INFO)
+    LOG_FILE = None  # e.g. "sunkar.tlog" - binary log, read with: python async_logger.py sunkar.tlog
+    
+    for component, level in LOG_LEVELS.items():
+        async_logger.set_level(component, level)
+    if LOG_FILE:
+        async_logger.log_to_file(LOG_FILE)
     
     # Initialize components
     cam = CameraManager()
     serial_comm = SerialComm(port=COM_PORT, baudrate=9600, protocol=PROTOCOL)
+    serial_comm.negotiate_baud(LINK_BAUD)
     laser_control = LaserControl(serial_comm)
     
     # Initialize motor control system
@@ -23,10 +34,20 @@ if __name__ == "__main__":
     
     # Connect camera manager to serial communication
     cam.serial = serial_comm
+    # Gate inference on the commanded motion stream
+    cam.inference_gate.motion = motor_control.motion
+    # Direct camera/joystick moves keep the motion profiles in sync with the turret
+    cam.motion = motor_control.motion
+    joystick.motion = motor_control.motion
     
-    # Initialize radar tracking system (✅ motor_control parametresi eklendi)
-    from simple_autonomous import SimpleAutonomousMode
-    autonomous_manager = SimpleAutonomousMode(serial_comm, laser_control, cam, motor_control)
+    # Initialize autonomous system (✅ motor_control parametresi eklendi)
+    if AUTONOMOUS_SYSTEM == "radar":
+        from radar_tracking_system import RadarTrackingSystem
+        autonomous_manager = RadarTrackingSystem(motor_control, cam, serial_comm)
+        print("[Main] ⚠️ Radar otonom sistemi seçildi: yalnızca tarama/takip yapar, hedefe ateş etmez")
+    else:
+        from simple_autonomous import SimpleAutonomousMode
+        autonomous_manager = SimpleAutonomousMode(serial_comm, laser_control, cam, motor_control)
     
     # Start motor control loop
     motor_control.start_control_loop()
@@ -0,0 +1,332 @@
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+
+@dataclass
+class AxisLimits:
+    max_velocity: float  # degrees/s
+    max_acceleration: float  # degrees/s²
+    max_jerk: Optional[float] = None  # degrees/s³, None for a plain trapezoidal profile
+
+    @property
+    def smoothing_time(self):
+        """
+        Length of the moving-average window that turns the trapezoid into an
+        S-curve. The raw acceleration stays within ±max_acceleration, so
+        averaging it over 2·a/j seconds keeps the jerk within max_jerk.
+        """
+        if not self.max_jerk:
+            return 0.0
+        return 2.0 * self.max_acceleration / self.max_jerk
+
+
+class AxisProfile:
+    """
+    Time-optimal trapezoidal profile for one axis, from any initial velocity to
+    rest at `goal`: optionally stop first (moving away or unable to stop in
+    time), then accelerate, cruise and decelerate. Stored as segments of
+    constant acceleration.
+    """
+
+    def __init__(self, start, velocity, goal, limits: AxisLimits, velocity_cap=None):
+        self.start = float(start)
+        self.goal = float(goal)
+        self.max_velocity = limits.max_velocity if velocity_cap is None else min(velocity_cap, limits.max_velocity)
+        self.max_acceleration = limits.max_acceleration
+        self.segments: List[Tuple[float, float, float, float]] = []  # (t_start, position, velocity, accel)
+        self.duration = 0.0
+
+        accel = self.max_acceleration
+        position, velocity = self.start, float(velocity)
+        distance = self.goal - position
+        direction = math.copysign(1.0, distance if distance != 0 else velocity)
+        speed = velocity * direction  # > 0 when already moving towards the goal
+
+        if speed < 0 or speed * speed / (2 * accel) > abs(distance):
+            # Moving away or would overshoot - come to rest first, then plan from there
+            position, velocity = self._add_segment(position, velocity, -math.copysign(accel, velocity),
+                                                   abs(velocity) / accel)
+            velocity = 0.0
+            distance = self.goal - position
+            direction = math.copysign(1.0, distance)
+            speed = 0.0
+
+        distance = abs(distance)
+        peak = min(math.sqrt(accel * distance + speed * speed / 2), max(self.max_velocity, 1e-9))
+        ramp_distance = abs(peak * peak - speed * speed) / (2 * accel)
+        brake_distance = peak * peak / (2 * accel)
+        cruise_distance = max(0.0, distance - ramp_distance - brake_distance)
+
+        position, velocity = self._add_segment(position, velocity, math.copysign(accel, peak - speed) * direction,
+                                               abs(peak - speed) / accel)
+        position, velocity = self._add_segment(position, velocity, 0.0, cruise_distance / peak if peak > 0 else 0.0)
+        self._add_segment(position, velocity, -accel * direction, peak / accel)
+
+    def _add_segment(self, position, velocity, accel, duration):
+        if duration <= 0:
+            return position, velocity
+        self.segments.append((self.duration, position, velocity, accel))
+        self.duration += duration
+        return (position + velocity * duration + 0.5 * accel * duration * duration,
+                velocity + accel * duration)
+
+    def state_at(self, t) -> Tuple[float, float]:
+        """(position, velocity) at t seconds after the start of the profile."""
+        if t >= self.duration:
+            return self.goal, 0.0
+        t = max(0.0, t)
+        segment = self.segments[0]
+        for candidate in self.segments:
+            if candidate[0] > t:
+                break
+            segment = candidate
+        t_start, position, velocity, accel = segment
+        tau = t - t_start
+        return position + velocity * tau + 0.5 * accel * tau * tau, velocity + accel * tau
+
+
+def plan_synchronized(start, velocity, goal, limits: Sequence[AxisLimits], iterations=40) -> List[AxisProfile]:
+    """
+    Plan one profile per axis so that all axes arrive together: the slowest
+    axis runs time-optimally and the others get their cruise velocity lowered
+    (by bisection) until their durations match.
+    """
+    profiles = [AxisProfile(s, v, g, lim) for s, v, g, lim in zip(start, velocity, goal, limits)]
+    duration = max(p.duration for p in profiles)
+    for i, profile in enumerate(profiles):
+        if profile.duration >= duration - 1e-6 or profile.duration == 0:
+            continue
+        low, high = 0.0, limits[i].max_velocity
+        best = profile
+        for _ in range(iterations):
+            cap = (low + high) / 2
+            candidate = AxisProfile(start[i], velocity[i], goal[i], limits[i], velocity_cap=cap)
+            if candidate.duration > duration:
+                low = cap
+            else:
+                high = cap
+                best = candidate
+        profiles[i] = best
+    return profiles
+
+
+class TrajectoryGenerator:
+    """
+    Fixed-rate setpoint generator for synchronized multi-axis moves.
+    Each move is a synchronized trapezoidal plan; a moving average over the
+    longest axis smoothing_time turns it into a jerk-limited S-curve (and
+    keeps the axes in step). set_goal() re-plans from the current state, so
+    a goal that changes mid-slew never causes a velocity jump.
+    """
+
+    def __init__(self, limits: Sequence[AxisLimits], rate=50.0, position=None):
+        self.limits = list(limits)
+        self.rate = rate  # setpoints per second
+        self.dt = 1.0 / rate
+        self.time = 0.0  # generator clock, advanced one dt per step()
+        position = [0.0] * len(self.limits) if position is None else [float(p) for p in position]
+
+        smoothing = max(lim.smoothing_time for lim in self.limits)
+        self.window = max(1, int(math.ceil(smoothing * rate)) + 1)  # moving-average length in samples
+
+        self._plan: Optional[List[AxisProfile]] = None
+        self._plan_start = 0.0
+        self._raw = position  # unsmoothed position at the current time
+        self._raw_velocity = [0.0] * len(self.limits)
+        self._history = [deque([p] * self.window, maxlen=self.window) for p in position]
+        self.setpoint = list(position)
+
+    @property
+    def goal(self):
+        return [p.goal for p in self._plan] if self._plan else list(self._raw)
+
+    @property
+    def is_moving(self):
+        return self._plan is not None or any(h[0] != h[-1] for h in self._history)
+
+    def set_goal(self, goal) -> float:
+        """Re-plan towards `goal` from the current state; returns seconds until the setpoints arrive."""
+        self._plan = plan_synchronized(self._raw, self._raw_velocity, goal, self.limits)
+        self._plan_start = self.time
+        return self.arrival_time()
+
+    def arrival_time(self) -> float:
+        """Seconds from now until the smoothed setpoints reach the goal."""
+        if not self.is_moving:
+            return 0.0
+        remaining = 0.0
+        if self._plan:
+            remaining = max(p.duration for p in self._plan) - (self.time - self._plan_start)
+        return max(0.0, remaining) + (self.window - 1) * self.dt
+
+    def set_position(self, axis, position):
+        """The axis was commanded directly: jump the generator there and drop its motion."""
+        position = float(position)
+        self._raw[axis] = position
+        self._raw_velocity[axis] = 0.0
+        self._history[axis].extend([position] * self.window)
+        self.setpoint[axis] = position
+        if self._plan:
+            # Keep the other axes on their plans, hold this one
+            profiles = list(self._plan)
+            profiles[axis] = AxisProfile(position, 0.0, position, self.limits[axis])
+            self._plan = profiles
+
+    def hold(self):
+        """Drop the current plan and hold every axis at its current setpoint."""
+        self._plan = None
+        self._raw = list(self.setpoint)
+        self._raw_velocity = [0.0] * len(self.limits)
+        for axis, history in enumerate(self._history):
+            history.extend([self.setpoint[axis]] * self.window)
+
+    def step(self) -> List[float]:
+        """Advance one tick and return the new setpoints."""
+        self.time += self.dt
+        if self._plan:
+            t = self.time - self._plan_start
+            states = [p.state_at(t) for p in self._plan]
+            self._raw = [s[0] for s in states]
+            self._raw_velocity = [s[1] for s in states]
+            if t >= max(p.duration for p in self._plan):
+                self._plan = None
+        for axis, history in enumerate(self._history):
+            history.append(self._raw[axis])
+            self.setpoint[axis] = sum(history) / self.window
+        return list(self.setpoint)
+
+
+class MotionStreamer:
+    """
+    Streams TrajectoryGenerator setpoints to the turret through SerialComm at a
+    fixed rate. Setpoints are quantized to `resolution` degrees and only sent
+    when that changed: whole degrees for the text/binary protocols, finer for
+    the fixed-point frame protocol.
+    Every other writer of the axes must go through command()/set_position()
+    so the generator knows where the turret is; a move that starts from rest
+    is also re-seeded from the measured pose (device telemetry) when there is one.
+    """
+
+    def __init__(self, serial_comm, generator: TrajectoryGenerator, commands=(0x01, 0x02), resolution=1.0):
+        self.serial = serial_comm
+        self.generator = generator
+        self.commands = commands  # serial command per axis (servo, stepper)
+        self.resolution = resolution  # degrees per command step
+        self.last_sent = [self._quantize(p) for p in generator.setpoint]
+        self.sent_count = 0
+        self.last_command_time = 0.0  # When an axis was last commanded (streamed or direct)
+        self.late_ticks = 0  # ticks that had to be caught up because the loop ran late
+        self.pose_max_age = 0.5  # seconds a telemetry pose may be old to seed a move from
+
+        self._lock = threading.Lock()
+        self.running = False
+        self.stream_thread = None
+
+    def start(self):
+        if self.stream_thread and self.stream_thread.is_alive():
+            return
+        self.running = True
+        self.stream_thread = threading.Thread(target=self._stream_loop, daemon=True)
+        self.stream_thread.start()
+        print(f"[MotionStreamer] 🚀 Streaming setpoints at {self.generator.rate:.0f} Hz")
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        if self.stream_thread:
+            self.stream_thread.join(timeout=1.0)
+        print("[MotionStreamer] 🛑 Streaming stopped")
+
+    def move_to(self, *goal) -> float:
+        """Start (or re-plan) a synchronized move; returns seconds until the setpoints arrive."""
+        with self._lock:
+            if not self.generator.is_moving:
+                self._reseed()
+            return self.generator.set_goal(goal)
+
+    def _reseed(self):
+        """Start an idle generator where the turret is: the measured pose, else the last commanded angles."""
+        pose = self.serial.latest_pose(self.pose_max_age) if hasattr(self.serial, 'latest_pose') else None
+        position = (pose.servo, pose.stepper) if pose is not None else list(self.last_sent)
+        for axis, value in enumerate(position):
+            if value != self.generator.setpoint[axis]:
+                self.generator.set_position(axis, value)
+                self.last_sent[axis] = self._quantize(value)
+
+    def set_position(self, axis, position):
+        """An axis was commanded directly - keep the generator in sync with it."""
+        with self._lock:
+            self.generator.set_position(axis, position)
+            self.last_sent[axis] = self._quantize(position)
+            self.last_command_time = time.time()
+
+    def command(self, axis, position, **send_options):
+        """Command an axis directly (bypassing the profile) and keep the generator in sync."""
+        self.set_position(axis, position)
+        self.serial.send_command(self.commands[axis], position, **send_options)
+
+    def cancel(self):
+        """Stop streaming the current slew; the axes hold their last setpoints."""
+        with self._lock:
+            was_moving = self.generator.is_moving
+            self.generator.hold()
+        if was_moving:
+            print("[MotionStreamer] ⏹️ Slew cancelled")
+
+    @property
+    def is_moving(self):
+        with self._lock:
+            return self.generator.is_moving
+
+    def _stream_loop(self):
+        next_tick = time.time()
+        while self.running:
+            try:
+                now = time.time()
+                setpoint, ticks = None, 0
+                with self._lock:
+                    # Catch up on missed ticks so the profile keeps wall-clock time
+                    while next_tick <= now:
+                        setpoint = self.generator.step()
+                        next_tick += self.generator.dt
+                        ticks += 1
+                self.late_ticks += max(0, ticks - 1)
+                if setpoint is not None:
+                    self._send(setpoint)
+                time.sleep(max(0.0, next_tick - time.time()))
+            except Exception as e:
+                print(f"[MotionStreamer] ❌ Error in stream loop: {e}")
+                time.sleep(0.1)
+                next_tick = time.time()
+
+    def _quantize(self, value):
+        if self.resolution >= 1.0:
+            return int(round(value))
+        return round(round(value / self.resolution) * self.resolution, 6)
+
+    def _send(self, setpoint):
+        for axis, value in enumerate(setpoint):
+            angle = self._quantize(value)
+            if angle != self.last_sent[axis]:
+                self.serial.send_command(self.commands[axis], angle)
+                self.last_sent[axis] = angle
+                self.sent_count += 1
+                self.last_command_time = time.time()
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'streaming': self.running,
+                'moving': self.generator.is_moving,
+                'setpoint': list(self.generator.setpoint),
+                'goal': self.generator.goal,
+                'arrival_time': self.generator.arrival_time(),
+                'rate': self.generator.rate,
+                'sent_commands': self.sent_count,
+                'late_ticks': self.late_ticks,
+            }
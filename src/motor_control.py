@@ -1,7 +1,12 @@
 import pygame
 import time
 import threading
-from serial_comm import SerialComm
+from serial_comm import PRIORITY_SAFETY, SerialComm
+from motion_profile import AxisLimits, MotionStreamer, TrajectoryGenerator
+from scan_planner import SERVO_SLEW_RATE, STEPPER_SLEW_RATE
+from async_logger import get_logger
+
+log = get_logger("MotorControl")
 
 class MotorControl:
     """
@@ -48,18 +53,28 @@ class MotorControl:
         self.BUTTON_LB = 4   # Servo toggle
         self.BUTTON_RB = 5   # Stepper toggle
         
+        # Motion profiles for planned slews (setpoints streamed at a fixed rate)
+        self.servo_limits = AxisLimits(max_velocity=SERVO_SLEW_RATE, max_acceleration=250.0, max_jerk=5000.0)
+        self.stepper_limits = AxisLimits(max_velocity=STEPPER_SLEW_RATE, max_acceleration=1000.0, max_jerk=20000.0)
+        self.motion_rate = 50.0  # setpoints per second
+        # The firmware boots at servoMinAngle / stepperMinAngle
+        self.motion = MotionStreamer(self.serial, TrajectoryGenerator(
+            [self.servo_limits, self.stepper_limits], rate=self.motion_rate,
+            position=(self.servo_min, self.stepper_min)), commands=(self.SERVO_CMD, self.STEPPER_CMD),
+            resolution=0.1 if protocol == "frame" else 1.0)  # the frame protocol carries sub-degree angles
+        
         # Joystick initialization
         pygame.init()
         pygame.joystick.init()
         self.joystick = None
         
         if pygame.joystick.get_count() == 0:
-            print("[MotorControl] ❌ Joystick bulunamadı!")
+            log.error("❌ Joystick bulunamadı!")
             self.joystick = None
         else:
             self.joystick = pygame.joystick.Joystick(0)
             self.joystick.init()
-            print(f"[MotorControl] ✅ Joystick başlatıldı: {self.joystick.get_name()}")
+            log.info(f"✅ Joystick başlatıldı: {self.joystick.get_name()}")
         
         # Control thread
         self.control_thread = None
@@ -68,20 +83,20 @@ class MotorControl:
     def start_control_loop(self):
         """Start the motor control loop in a separate thread."""
         if self.control_thread and self.control_thread.is_alive():
-            print("[MotorControl] ⚠️ Control loop already running")
+            log.warning("⚠️ Control loop already running")
             return
             
         self.running = True
         self.control_thread = threading.Thread(target=self._control_loop, daemon=True)
         self.control_thread.start()
-        print("[MotorControl] 🚀 Motor control loop started")
+        log.info("🚀 Motor control loop started")
     
     def stop_control_loop(self):
         """Stop the motor control loop."""
         self.running = False
         if self.control_thread:
             self.control_thread.join(timeout=1.0)
-        print("[MotorControl] 🛑 Motor control loop stopped")
+        log.info("🛑 Motor control loop stopped")
     
     def _control_loop(self):
         """Main control loop (from working code)."""
@@ -90,7 +105,7 @@ class MotorControl:
                 self._process_joystick_input()
                 time.sleep(0.01)  # 10ms delay (from working code)
             except Exception as e:
-                print(f"[MotorControl] ❌ Error in control loop: {e}")
+                log.error(f"❌ Error in control loop: {e}")
                 time.sleep(0.1)
     
     def _process_joystick_input(self):
@@ -109,21 +124,21 @@ class MotorControl:
         # === Lazer Kontrolleri (from working code) ===
         if current_b and not self.prev_b:
             self.serial.send_command(self.LASER_CMD, 1)
-            print("[MotorControl] Lazer AÇ")
+            log.info("Lazer AÇ")
 
         if current_y and not self.prev_y:
             self.serial.send_command(self.LASER_CMD, 0)
-            print("[MotorControl] Lazer KAPAT")
+            log.info("Lazer KAPAT")
 
         # === Servo Aktif/Pasif Toggle (LB) ===
         if current_lb and not self.prev_lb:
             self.servo_active = not self.servo_active
-            print("[MotorControl] Servo:", "Açık" if self.servo_active else "Kilitli")
+            log.info("Servo: %s", "Açık" if self.servo_active else "Kilitli")
 
         # === Stepper Aktif/Pasif Toggle (RB) ===
         if current_rb and not self.prev_rb:
             self.stepper_active = not self.stepper_active
-            print("[MotorControl] Stepper:", "Açık" if self.stepper_active else "Kilitli")
+            log.info("Stepper: %s", "Açık" if self.stepper_active else "Kilitli")
 
         # === Önceki Butonları Güncelle ===
         self.prev_b, self.prev_y, self.prev_lb, self.prev_rb = current_b, current_y, current_lb, current_rb
@@ -134,8 +149,8 @@ class MotorControl:
         if self.servo_active:
             angle_servo = self.get_servo_angle()
             if angle_servo != self.last_sent_servo and (now - self.last_servo_time) > 0.1:
-                self.serial.send_command(self.SERVO_CMD, angle_servo)
-                print(f"[MotorControl] Servo açı: {angle_servo}")
+                self.motion.command(0, angle_servo)
+                log.debug("Servo açı: %s", angle_servo)
                 self.last_sent_servo = angle_servo
                 self.last_servo_time = now
 
@@ -143,8 +158,8 @@ class MotorControl:
         if self.stepper_active:
             angle_stepper = self.get_stepper_angle()
             if angle_stepper != self.last_sent_stepper and (now - self.last_stepper_time) > 0.1:
-                self.serial.send_command(self.STEPPER_CMD, angle_stepper)
-                print(f"[MotorControl] Stepper açı: {angle_stepper}")
+                self.motion.command(1, angle_stepper)
+                log.debug("Stepper açı: %s", angle_stepper)
                 self.last_sent_stepper = angle_stepper
                 self.last_stepper_time = now
     
@@ -172,34 +187,59 @@ class MotorControl:
     def set_servo_angle(self, angle):
         """Set servo angle directly."""
         angle = max(self.servo_min, min(self.servo_max, angle))
-        self.serial.send_command(self.SERVO_CMD, angle)
-        print(f"[MotorControl] Servo açısı ayarlandı: {angle}")
+        self.motion.command(0, angle)
+        log.debug("Servo açısı ayarlandı: %s", angle)
     
     def set_stepper_angle(self, angle):
         """Set stepper angle directly."""
         angle = max(self.stepper_min, min(self.stepper_max, angle))
-        self.serial.send_command(self.STEPPER_CMD, angle)
-        print(f"[MotorControl] Stepper açısı ayarlandı: {angle}")
+        self.motion.command(1, angle)
+        log.debug("Stepper açısı ayarlandı: %s", angle)
+    
+    def move_to(self, servo_angle, stepper_angle):
+        """
+        Slew both axes along a synchronized, jerk-limited profile.
+        Calling it again mid-slew re-plans smoothly from the current motion.
+        Returns seconds until the streamed setpoints reach the goal.
+        """
+        servo_angle = max(self.servo_min, min(self.servo_max, servo_angle))
+        stepper_angle = max(self.stepper_min, min(self.stepper_max, stepper_angle))
+        self.motion.start()
+        arrival = self.motion.move_to(servo_angle, stepper_angle)
+        log.debug("Profil hareketi: servo %.1f, stepper %.1f (%.2fs)", servo_angle, stepper_angle, arrival)
+        return arrival
+    
+    def cancel_motion(self):
+        """Stop a planned slew where it is (e.g. when autonomous mode hands the axes back)."""
+        self.motion.cancel()
+    
+    def latest_pose(self, max_age=None):
+        """Measured turret pose from device telemetry (telemetry.Pose), or None without fresh telemetry."""
+        return self.serial.latest_pose(max_age)
+    
+    def pose_at(self, timestamp):
+        """Measured turret pose at host time `timestamp` (e.g. a frame's capture time), or None."""
+        return self.serial.pose_at(timestamp)
     
     def fire_laser(self):
         """Fire laser."""
         self.serial.send_command(self.LASER_CMD, 1)
-        print("[MotorControl] Lazer ateşlendi")
+        log.info("Lazer ateşlendi")
     
     def stop_laser(self):
         """Stop laser."""
         self.serial.send_command(self.LASER_CMD, 0)
-        print("[MotorControl] Lazer durduruldu")
+        log.info("Lazer durduruldu")
     
     def toggle_servo(self):
         """Toggle servo active state."""
         self.servo_active = not self.servo_active
-        print("[MotorControl] Servo:", "Açık" if self.servo_active else "Kilitli")
+        log.info("Servo: %s", "Açık" if self.servo_active else "Kilitli")
     
     def toggle_stepper(self):
         """Toggle stepper active state."""
         self.stepper_active = not self.stepper_active
-        print("[MotorControl] Stepper:", "Açık" if self.stepper_active else "Kilitli")
+        log.info("Stepper: %s", "Açık" if self.stepper_active else "Kilitli")
     
     def get_status(self):
         """Get current motor control status."""
@@ -209,18 +249,23 @@ class MotorControl:
             'servo_angle': self.last_sent_servo,
             'stepper_angle': self.last_sent_stepper,
             'joystick_connected': self.joystick is not None,
-            'protocol': self.protocol
+            'protocol': self.protocol,
+            'motion': self.motion.get_status()
         }
     
     def emergency_stop(self):
         """Emergency stop - stop all motors and laser."""
         self.serial.send_command(self.LASER_CMD, 0)
-        self.serial.send_command(self.SERVO_CMD, 0)
-        self.serial.send_command(self.STEPPER_CMD, 0)
-        print("[MotorControl] 🚨 Emergency stop executed")
+        # Cancel any streamed slew before commanding the axes directly
+        self.motion.cancel()
+        # Safety class: jumps ahead of any queued motion/laser commands
+        self.motion.command(0, 0, priority=PRIORITY_SAFETY)
+        self.motion.command(1, 0, priority=PRIORITY_SAFETY)
+        log.warning("🚨 Emergency stop executed")
     
     def close(self):
         """Close motor control system."""
         self.stop_control_loop()
+        self.motion.stop()
         pygame.quit()
-        print("[MotorControl] 🔌 Motor control system closed") 
\ No newline at end of file
+        log.info("🔌 Motor control system closed")
\ No newline at end of file
@@ -1,9 +1,16 @@
 import os
 import sys
+import time
 from ultralytics import YOLO
 import numpy as np
 import cv2
 import joblib
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+from tracking_window import TrackingWindow
+from inference_governor import DEFAULT_TIERS, InferenceGovernor
+from shape_detector import ShapeDetector
+from frame_cache import FrameCache
 
 # --- BYTETrack path setup ---
 BYTE_TRACK_PATH = os.path.join(os.path.dirname(__file__), "..", "ByteTrack")
@@ -20,6 +27,12 @@ ENCODER_PATH = os.path.join(BASE_DIR, 'label_encoder.pkl')
 
 # --- Models ---
 model = YOLO(MODEL_PATH)
+# Weights per model variant of the governor's tier ladder; variants without a file are skipped
+MODEL_VARIANTS = {
+    'nano': os.path.join(BASE_DIR, 'best_n.pt'),
+    'small': MODEL_PATH,
+}
+models = {'small': model}  # Loaded lazily on first use
 svm_model = joblib.load(SVM_PATH)
 label_encoder = joblib.load(ENCODER_PATH)
 
@@ -33,8 +46,101 @@ args.mot20 = False  # Set True if using MOT20 dataset, else False
 
 tracker = BYTETracker(args, frame_rate=30)  # Set frame_rate to your camera's FPS
 
-def detect_objects(frame):
-    results = model.predict(source=frame, conf=0.7, verbose=False)
+# --- Inference profiles ---
+@dataclass(frozen=True)
+class InferenceProfile:
+    name: str
+    imgsz: int  # YOLO input size (pixels, multiple of 32)
+    conf: float  # minimum detection confidence
+    classes: Optional[Tuple[int, ...]] = None  # YOLO class ids to keep (None = all)
+    max_det: int = 300  # maximum detections per frame
+
+INFERENCE_PROFILES = {
+    # Original settings - operator sees everything the model is sure about
+    "manual": InferenceProfile("manual", imgsz=640, conf=0.7),
+    # Wide, cheap search while scanning; conf stays above BYTETracker's new-track threshold (0.6)
+    "search": InferenceProfile("search", imgsz=320, conf=0.6, max_det=20),
+    # Precise boxes on the engaged target; low-score boxes keep the track alive through ByteTrack's second association
+    "track": InferenceProfile("track", imgsz=640, conf=0.4, max_det=5),
+}
+active_profile = INFERENCE_PROFILES["manual"]
+
+def set_inference_profile(name):
+    """Select the profile used from the next frame on."""
+    global active_profile
+    if name not in INFERENCE_PROFILES:
+        raise ValueError(f"Unknown inference profile: {name}")
+    if active_profile.name != name:
+        active_profile = INFERENCE_PROFILES[name]
+        print(f"[ObjectDetection] 🎛️ Inference profile: {name} (imgsz={active_profile.imgsz}, conf={active_profile.conf})")
+
+def get_model(variant='small'):
+    if variant not in models:
+        print(f"[ObjectDetection] 📦 Loading {variant} model: {MODEL_VARIANTS[variant]}")
+        models[variant] = YOLO(MODEL_VARIANTS[variant])
+    return models[variant]
+
+def predict(frame, profile, variant='small'):
+    """Run a YOLO model variant with a profile's settings."""
+    return get_model(variant).predict(source=frame, imgsz=profile.imgsz, conf=profile.conf,
+                                      classes=list(profile.classes) if profile.classes else None,
+                                      max_det=profile.max_det, verbose=False)
+
+# --- Latency governor: keeps full-frame inference within the per-frame budget ---
+INFERENCE_BUDGET = 0.1  # seconds per full frame (the camera loop runs at 10 FPS)
+governor = InferenceGovernor([t for t in DEFAULT_TIERS if os.path.exists(MODEL_VARIANTS[t.weights])]
+                             or [t for t in DEFAULT_TIERS if t.weights == 'small'],
+                             budget=INFERENCE_BUDGET)
+
+# Crop around the engaged target instead of running the full frame (set by the autonomous mode)
+tracking_window = TrackingWindow()
+
+# --- Cascaded color/shape pre-detector ---
+# "off": YOLO on every frame, "cascade": YOLO only on frames/crops with balloon-like
+# candidates, "only": degraded mode - the pre-detector's candidates replace YOLO
+PRE_DETECTOR_MODE = "cascade"
+CASCADE_FULL_FRAME_INTERVAL = 10  # YOLO sees every Nth frame in full, candidates or not, in case a balloon's color is off
+CASCADE_MAX_CROP_SHARE = 0.5  # crops larger than this share of the frame run as full frames
+shape_detector = ShapeDetector()
+cascade_stats = {'frames': 0, 'yolo_skipped': 0, 'yolo_crops': 0, 'yolo_full_frames': 0}
+frames_since_full_frame = 0  # frames since YOLO last saw the whole frame
+
+def cascade_region(frame):
+    """Where YOLO should look in this frame according to the pre-detector: (region, run_yolo)."""
+    global frames_since_full_frame
+    cascade_stats['frames'] += 1
+    frames_since_full_frame += 1
+    # Safety net: a crop around visible candidates never covers a balloon the pre-detector misses
+    if frames_since_full_frame >= CASCADE_FULL_FRAME_INTERVAL:
+        return _full_frame()
+    candidates = shape_detector.detect(frame)
+    if not candidates:
+        cascade_stats['yolo_skipped'] += 1
+        return None, False
+    region = ShapeDetector.proposal_region(candidates, frame.shape)
+    if region is None:
+        return _full_frame()
+    x1, y1, x2, y2 = region
+    if (x2 - x1) * (y2 - y1) > CASCADE_MAX_CROP_SHARE * frame.shape[0] * frame.shape[1]:
+        return _full_frame()
+    cascade_stats['yolo_crops'] += 1
+    return region, True
+
+def _full_frame():
+    global frames_since_full_frame
+    frames_since_full_frame = 0
+    cascade_stats['yolo_full_frames'] += 1
+    return None, True
+
+def yolo_detections(frame, region, profile, tier):
+    """YOLO boxes [x1, y1, x2, y2, conf] in full-frame coordinates, on the frame or a crop of it."""
+    if region is None:
+        # The governor's tier caps the input size and picks the model variant
+        results = predict(frame, replace(profile, imgsz=min(profile.imgsz, tier.imgsz)), tier.weights)
+    else:
+        # Native resolution on the crop - crops are sized to a multiple of 32
+        x1, y1, x2, y2 = region
+        results = predict(frame[y1:y2, x1:x2], replace(profile, imgsz=max(x2 - x1, y2 - y1)), tier.weights)
     detections = []
 
     for r in results:
@@ -43,8 +149,25 @@ def detect_objects(frame):
             conf = float(box.conf[0])
             x1, y1, x2, y2 = map(float, box.xyxy[0])
             detections.append([x1, y1, x2, y2, conf])
-
-    dets_np = np.array(detections, dtype=np.float32) if detections else np.empty((0, 5), dtype=np.float32)
+    return TrackingWindow.to_frame(np.array(detections, dtype=np.float32).reshape(-1, 5), region)
+
+def detect_objects(frame, profile=None):
+    # Read the profile once so a switch never splits a frame between two profiles
+    profile = profile or active_profile
+    frames = FrameCache.of(frame)  # derived images shared with the other stages of this frame
+    frame = frames.bgr
+    start_time = time.perf_counter()
+    full_frame_yolo = False
+    if PRE_DETECTOR_MODE == "only":
+        # Degraded mode without YOLO: shape candidates go straight to the tracker
+        dets_np = np.array([[*c.bbox, c.score] for c in shape_detector.detect(frames)], dtype=np.float32).reshape(-1, 5)
+    else:
+        region = tracking_window.next_region(frame.shape)
+        run_yolo = True
+        if region is None and PRE_DETECTOR_MODE == "cascade":
+            region, run_yolo = cascade_region(frames)
+        dets_np = yolo_detections(frame, region, profile, governor.tier) if run_yolo else np.empty((0, 5), dtype=np.float32)
+        full_frame_yolo = run_yolo and region is None
 
     # BYTETrack update expects (detections, img_info, img_size)
     online_targets = tracker.update(dets_np, frame.shape[:2], frame.shape[:2])
@@ -59,20 +182,19 @@ def detect_objects(frame):
         if roi.shape[0] == 0 or roi.shape[1] == 0:
             continue
 
-        # RGB ortalamaları
-        roi_rgb = cv2.cvtColor(roi, cv2.COLOR_BGR2RGB)
-        avg_r = np.mean(roi_rgb[:, :, 0])
-        avg_g = np.mean(roi_rgb[:, :, 1])
-        avg_b = np.mean(roi_rgb[:, :, 2])
+        # RGB ortalamaları (BGR kanallarından - dönüşüm gerekmez)
+        avg_r = np.mean(roi[:, :, 2])
+        avg_g = np.mean(roi[:, :, 1])
+        avg_b = np.mean(roi[:, :, 0])
 
         # HSV ortalamaları
-        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+        hsv = frames.roi("hsv", (x1, y1, x2, y2))
         avg_h = np.mean(hsv[:, :, 0]) / 180.0
         avg_s = np.mean(hsv[:, :, 1]) / 255.0
         avg_v = np.mean(hsv[:, :, 2]) / 255.0
 
         # LAB ortalamaları
-        lab = cv2.cvtColor(roi, cv2.COLOR_BGR2LAB)
+        lab = frames.roi("lab", (x1, y1, x2, y2))
         avg_l = np.mean(lab[:, :, 0])
         avg_a = np.mean(lab[:, :, 1]) - 128
         avg_b_lab = np.mean(lab[:, :, 2]) - 128
@@ -91,4 +213,16 @@ def detect_objects(frame):
             'confidence': t.score if hasattr(t, 'score') else None
         })
 
-    return frame, detection_dicts
\ No newline at end of file
+    if full_frame_yolo:
+        # Crops and skipped frames are cheap by construction - only full frames steer the governor
+        governor.record(time.perf_counter() - start_time)
+    return frame, detection_dicts
+
+def get_inference_status():
+    return {
+        'profile': active_profile.name,
+        'governor': governor.get_stats(),
+        'tracking_window': tracking_window.get_stats(),
+        'pre_detector': dict(cascade_stats, mode=PRE_DETECTOR_MODE,
+                             latency_ms=shape_detector.last_latency * 1000),
+    }
\ No newline at end of file
@@ -0,0 +1,93 @@
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+
+@dataclass
+class PatternStats:
+    name: str
+    scan_time: float = 0.0  # discounted seconds spent scanning with this pattern
+    detections: float = 0.0  # discounted new targets found with this pattern
+    selections: int = 0
+
+    def rate(self, prior_detections=0.0, prior_time=0.0):
+        """Detections per second of scan time (posterior mean with a Gamma prior)."""
+        total_time = self.scan_time + prior_time
+        return (self.detections + prior_detections) / total_time if total_time > 0 else 0.0
+
+
+class AdaptivePatternSelector:
+    """
+    Bandit over scan patterns, rewarded by detections per second of scan time.
+    Each epoch picks the pattern with the best Thompson sample from its Gamma
+    posterior, except that a pattern whose share of scan time falls below
+    `min_share` is chosen first so every pattern keeps being explored.
+    Old statistics are discounted every epoch so the choice can follow a
+    changing range.
+    """
+
+    def __init__(self, patterns: Iterable[str], epoch=15.0, min_share=0.1, discount=0.95,
+                 prior_detections=1.0, prior_time=30.0, rng: Optional[random.Random] = None):
+        self.stats: Dict[str, PatternStats] = {name: PatternStats(name) for name in patterns}
+        self.epoch = epoch  # seconds between pattern decisions
+        self.min_share = min_share  # minimum fraction of scan time per pattern
+        self.discount = discount  # weight kept by old statistics at each decision
+        self.prior_detections = prior_detections  # Gamma prior shape
+        self.prior_time = prior_time  # Gamma prior rate (seconds)
+        self.rng = rng or random.Random()
+        self.current: Optional[str] = None
+
+    def record(self, pattern, seconds, detections=0):
+        """Account scan time and new detections to a pattern."""
+        stats = self.stats.get(pattern)
+        if stats is None:
+            return
+        stats.scan_time += seconds
+        stats.detections += detections
+
+    def share(self, pattern):
+        total = sum(s.scan_time for s in self.stats.values())
+        return self.stats[pattern].scan_time / total if total > 0 else 0.0
+
+    def choose(self) -> str:
+        """Pick the pattern for the next epoch."""
+        for stats in self.stats.values():
+            stats.scan_time *= self.discount
+            stats.detections *= self.discount
+
+        total = sum(s.scan_time for s in self.stats.values())
+        starved = [s for s in self.stats.values() if total > 0 and s.scan_time / total < self.min_share]
+        if total == 0:
+            # Nothing measured yet - start from the first pattern
+            choice = next(iter(self.stats.values()))
+        elif starved:
+            choice = min(starved, key=lambda s: s.scan_time)
+        else:
+            def sample(s):
+                return self.rng.gammavariate(s.detections + self.prior_detections,
+                                             1.0 / (s.scan_time + self.prior_time))
+            choice = max(self.stats.values(), key=sample)
+
+        choice.selections += 1
+        self.current = choice.name
+        return choice.name
+
+    def best(self) -> str:
+        """Pattern with the highest posterior mean detection rate."""
+        return max(self.stats.values(), key=lambda s: s.rate(self.prior_detections, self.prior_time)).name
+
+    def get_stats(self):
+        return {
+            'current': self.current,
+            'best': self.best(),
+            'patterns': {
+                name: {
+                    'scan_time': s.scan_time,
+                    'detections': s.detections,
+                    'detections_per_second': s.rate(self.prior_detections, self.prior_time),
+                    'share': self.share(name),
+                    'selections': s.selections,
+                }
+                for name, s in self.stats.items()
+            }
+        }
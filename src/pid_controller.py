@@ -1 +1,287 @@
- 
\ No newline at end of file
+import math
+import random
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from scan_planner import CAMERA_H_FOV, CAMERA_V_FOV, SERVO_SLEW_RATE, STEPPER_SLEW_RATE
+
+
+class PIDController:
+    """
+    Single-axis PID controller.
+    Output is a rate (degrees per second) computed from an angle error, with
+    velocity feedforward, integral anti-windup and a low-pass filtered derivative.
+    """
+
+    def __init__(self, kp, ki=0.0, kd=0.0, kff=0.0, output_limit=None, integral_limit=None,
+                 derivative_tau=0.1):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.kff = kff  # Feedforward gain on the target velocity
+        self.output_limit = output_limit  # Max |output|, None = unlimited
+        self.integral_limit = integral_limit  # Max |integral term contribution|
+        self.derivative_tau = derivative_tau  # Derivative low-pass time constant (seconds)
+        self.reset()
+
+    def reset(self):
+        """Clear integral, derivative and history."""
+        self.integral = 0.0
+        self.derivative = 0.0
+        self.previous_error = None
+        self.last_output = 0.0
+
+    def update(self, error, dt, feedforward=0.0):
+        """Return the controller output for `error` after `dt` seconds."""
+        if dt <= 0:
+            return self.last_output
+
+        # Filtered derivative (first-order low-pass on the raw error slope)
+        if self.previous_error is not None:
+            raw_derivative = (error - self.previous_error) / dt
+            alpha = dt / (self.derivative_tau + dt)
+            self.derivative += alpha * (raw_derivative - self.derivative)
+        self.previous_error = error
+
+        # Candidate integral, committed below only if it does not wind up
+        integral = self.integral + error * dt
+        if self.integral_limit is not None and self.ki:
+            bound = self.integral_limit / abs(self.ki)
+            integral = max(-bound, min(bound, integral))
+
+        output = (self.kp * error + self.ki * integral + self.kd * self.derivative
+                  + self.kff * feedforward)
+
+        if self.output_limit is not None and abs(output) > self.output_limit:
+            output = math.copysign(self.output_limit, output)
+            # Conditional integration: stop integrating while saturated in the error direction
+            if math.copysign(1.0, error) != math.copysign(1.0, output):
+                self.integral = integral
+        else:
+            self.integral = integral
+
+        self.last_output = output
+        return output
+
+
+@dataclass
+class AxisGains:
+    kp: float
+    ki: float
+    kd: float
+    kff: float = 1.0
+    max_rate: float = 60.0  # degrees per second
+    integral_limit: float = 10.0  # degrees per second from the integral term
+    derivative_tau: float = 0.1  # seconds
+
+
+# Per-axis defaults picked with tune_gains() against SimulatedTurret
+SERVO_GAINS = AxisGains(kp=3.5, ki=0.4, kd=0.15, kff=1.0, max_rate=SERVO_SLEW_RATE)
+STEPPER_GAINS = AxisGains(kp=3.5, ki=0.4, kd=0.15, kff=1.0, max_rate=120.0)
+
+
+class VisualServoController:
+    """
+    Two-axis visual-servo controller for target tracking.
+    Takes the target's angular error from the crosshair and returns per-tick
+    servo/stepper angle deltas. Target velocity is estimated from the
+    turret pose plus the measured error and fed forward on both axes.
+    """
+
+    def __init__(self, servo_gains: Optional[AxisGains] = None, stepper_gains: Optional[AxisGains] = None,
+                 velocity_smoothing=0.3):
+        self.servo_gains = servo_gains or SERVO_GAINS
+        self.stepper_gains = stepper_gains or STEPPER_GAINS
+        self.velocity_smoothing = velocity_smoothing  # EMA weight of each new velocity sample
+        self.servo_pid = self._make_pid(self.servo_gains)
+        self.stepper_pid = self._make_pid(self.stepper_gains)
+        self.reset()
+
+    @staticmethod
+    def _make_pid(gains):
+        return PIDController(gains.kp, gains.ki, gains.kd, gains.kff,
+                             output_limit=gains.max_rate,
+                             integral_limit=gains.integral_limit,
+                             derivative_tau=gains.derivative_tau)
+
+    def reset(self):
+        """Reset both axes, e.g. when switching to a new target."""
+        self.servo_pid.reset()
+        self.stepper_pid.reset()
+        self.previous_target = None  # Last absolute (servo, stepper) target estimate
+        self.target_velocity = (0.0, 0.0)  # Estimated target velocity (deg/s)
+
+    def _estimate_velocity(self, target_servo, target_stepper, dt):
+        if self.previous_target is not None and dt > 0:
+            vs = (target_servo - self.previous_target[0]) / dt
+            vt = (target_stepper - self.previous_target[1]) / dt
+            a = self.velocity_smoothing
+            self.target_velocity = (self.target_velocity[0] + a * (vs - self.target_velocity[0]),
+                                    self.target_velocity[1] + a * (vt - self.target_velocity[1]))
+        self.previous_target = (target_servo, target_stepper)
+        return self.target_velocity
+
+    def update(self, servo_error, stepper_error, servo_angle, stepper_angle, dt):
+        """
+        servo_error / stepper_error: angular offset of the target from the crosshair (degrees).
+        servo_angle / stepper_angle: current turret pose (degrees).
+        Returns (servo_delta, stepper_delta) in degrees to apply this tick.
+        """
+        velocity = self._estimate_velocity(servo_angle + servo_error, stepper_angle + stepper_error, dt)
+        servo_rate = self.servo_pid.update(servo_error, dt, feedforward=velocity[0])
+        stepper_rate = self.stepper_pid.update(stepper_error, dt, feedforward=velocity[1])
+        return servo_rate * dt, stepper_rate * dt
+
+
+def pixel_error_to_angles(dx, dy, frame_width, frame_height, h_fov=CAMERA_H_FOV, v_fov=CAMERA_V_FOV):
+    """Convert a pixel offset from the crosshair into (servo_error, stepper_error) degrees."""
+    stepper_error = dx * h_fov / frame_width
+    servo_error = -dy * v_fov / frame_height  # Image y grows downward
+    return servo_error, stepper_error
+
+
+# === Tuning harness ===
+
+class SimulatedTurret:
+    """
+    Turret model for tuning: each axis slews toward its last integer command
+    at the firmware rate, and the stepper holds still while the remaining
+    move is inside the firmware angleTolerance.
+    """
+
+    def __init__(self, servo=30.0, stepper=150.0, servo_rate=SERVO_SLEW_RATE, stepper_rate=STEPPER_SLEW_RATE,
+                 stepper_deadband=3.0, servo_limits=(5, 55), stepper_limits=(10, 290)):
+        self.servo = servo
+        self.stepper = stepper
+        self.servo_command = servo
+        self.stepper_command = stepper
+        self.servo_rate = servo_rate
+        self.stepper_rate = stepper_rate
+        self.stepper_deadband = stepper_deadband
+        self.servo_limits = servo_limits
+        self.stepper_limits = stepper_limits
+
+    def command(self, servo, stepper):
+        self.servo_command = max(self.servo_limits[0], min(self.servo_limits[1], int(servo)))
+        self.stepper_command = max(self.stepper_limits[0], min(self.stepper_limits[1], int(stepper)))
+
+    def step(self, dt):
+        self.servo += max(-self.servo_rate * dt, min(self.servo_rate * dt, self.servo_command - self.servo))
+        stepper_diff = self.stepper_command - self.stepper
+        if abs(stepper_diff) >= self.stepper_deadband:
+            self.stepper += max(-self.stepper_rate * dt, min(self.stepper_rate * dt, stepper_diff))
+
+
+@dataclass
+class TrackingResult:
+    time_to_lock: float  # seconds until the error stays inside the lock tolerance, inf if never
+    settling_error: float  # RMS error (degrees) after lock
+    max_overshoot: float  # largest error (degrees) after first entering the tolerance
+
+
+def simulate_tracking(controller_factory, target_start=(38.0, 175.0), target_velocity=(0.0, 0.0),
+                      duration=8.0, dt=0.1, lock_tolerance=4.0, hold_time=0.5, noise=0.3, seed=0):
+    """
+    Run one tracking scenario and measure time-to-lock and settling error.
+    Mirrors SimpleAutonomousMode: the controller's deltas are added to the
+    commanded pose, and each camera measurement arrives one frame late.
+    controller_factory: callable returning an object with update(...) like VisualServoController.
+    """
+    rng = random.Random(seed)
+    turret = SimulatedTurret()
+    controller = controller_factory()
+    target = list(target_start)
+    setpoint = [turret.servo, turret.stepper]
+    measured = None  # (servo_error, stepper_error, servo_pose, stepper_pose) from the previous frame
+
+    lock_time = math.inf
+    inside_since = None
+    entered = False
+    max_overshoot = 0.0
+    settled_errors = []
+
+    steps = int(duration / dt)
+    for i in range(steps):
+        t = i * dt
+        target[0] += target_velocity[0] * dt
+        target[1] += target_velocity[1] * dt
+        true_error = (target[0] - turret.servo, target[1] - turret.stepper)
+        error_norm = math.hypot(*true_error)
+
+        if measured is not None:
+            servo_delta, stepper_delta = controller.update(*measured, dt)
+            setpoint[0] = max(turret.servo_limits[0], min(turret.servo_limits[1], setpoint[0] + servo_delta))
+            setpoint[1] = max(turret.stepper_limits[0], min(turret.stepper_limits[1], setpoint[1] + stepper_delta))
+            turret.command(*setpoint)
+        measured = (true_error[0] + rng.gauss(0, noise), true_error[1] + rng.gauss(0, noise),
+                    turret.servo, turret.stepper)
+        turret.step(dt)
+
+        if error_norm <= lock_tolerance:
+            entered = True
+            if inside_since is None:
+                inside_since = t
+            if lock_time == math.inf and t - inside_since >= hold_time:
+                lock_time = inside_since
+        else:
+            inside_since = None
+            if entered:
+                max_overshoot = max(max_overshoot, error_norm)
+        if lock_time != math.inf:
+            settled_errors.append(error_norm)
+
+    settling_error = (math.sqrt(sum(e * e for e in settled_errors) / len(settled_errors))
+                      if settled_errors else math.inf)
+    return TrackingResult(lock_time, settling_error, max_overshoot)
+
+
+class LegacyProportionalController:
+    """The old fixed-step proportional tracker (clamped to `movement_speed` per tick), for comparison."""
+
+    def __init__(self, movement_speed=0.5):
+        self.movement_speed = movement_speed
+
+    def update(self, servo_error, stepper_error, servo_angle, stepper_angle, dt):
+        clamp = lambda v: max(-self.movement_speed, min(self.movement_speed, v))
+        return clamp(servo_error), clamp(stepper_error)
+
+
+def evaluate_controller(controller_factory, scenarios=None):
+    """Average time-to-lock and settling error over a set of scenarios."""
+    scenarios = scenarios or [
+        dict(target_start=(38.0, 175.0), target_velocity=(0.0, 0.0)),
+        dict(target_start=(20.0, 130.0), target_velocity=(1.0, -4.0)),
+        dict(target_start=(45.0, 170.0), target_velocity=(-0.5, 8.0)),
+    ]
+    results = [simulate_tracking(controller_factory, seed=i, **scenario) for i, scenario in enumerate(scenarios)]
+    return {
+        'time_to_lock': sum(r.time_to_lock for r in results) / len(results),
+        'settling_error': sum(r.settling_error for r in results) / len(results),
+        'max_overshoot': max(r.max_overshoot for r in results),
+    }
+
+
+def tune_gains(kp_values=(1.5, 2.5, 3.5, 5.0), kd_values=(0.0, 0.15, 0.3), ki_values=(0.0, 0.4)):
+    """Grid search over shared gains; returns (best_metrics, servo_gains, stepper_gains)."""
+    best = None
+    for kp in kp_values:
+        for kd in kd_values:
+            for ki in ki_values:
+                servo = replace(SERVO_GAINS, kp=kp, kd=kd, ki=ki)
+                stepper = replace(STEPPER_GAINS, kp=kp, kd=kd, ki=ki)
+                metrics = evaluate_controller(lambda: VisualServoController(servo, stepper))
+                score = (metrics['time_to_lock'], metrics['settling_error'])
+                if best is None or score < best[0]:
+                    best = (score, metrics, servo, stepper)
+    return best[1], best[2], best[3]
+
+
+if __name__ == "__main__":
+    legacy = evaluate_controller(lambda: LegacyProportionalController(0.5))
+    current = evaluate_controller(VisualServoController)
+    print(f"[PID] Legacy P-clamp : lock={legacy['time_to_lock']:.2f}s settle={legacy['settling_error']:.2f}°")
+    print(f"[PID] Default PID+FF : lock={current['time_to_lock']:.2f}s settle={current['settling_error']:.2f}° "
+          f"overshoot={current['max_overshoot']:.2f}°")
+    metrics, servo, stepper = tune_gains()
+    print(f"[PID] Tuned          : lock={metrics['time_to_lock']:.2f}s settle={metrics['settling_error']:.2f}° "
+          f"(kp={servo.kp}, ki={servo.ki}, kd={servo.kd})")
@@ -1 +1,278 @@
- 
\ No newline at end of file
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from frame_cache import FrameCache
+
+
+@dataclass
+class QRCode:
+    key: object  # track id when the marker sits on a tracked target, else "marker-N"
+    bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2 of the candidate region
+    payload: Optional[str]  # None until a decode succeeds
+    track_id: Optional[int]
+    decoded_at: float
+    last_seen: float
+    thumb: np.ndarray  # small grey thumbnail, to tell whether the region changed
+
+
+def find_finder_patterns(gray, min_size=6) -> List[Tuple[float, float, float]]:
+    """
+    QR finder patterns (the three nested squares in the corners) as
+    (cx, cy, size). A finder is a roughly square contour with a child and a
+    grandchild whose centers coincide with its own.
+    """
+    binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV, 31, 7)
+    contours, hierarchy = cv2.findContours(binary, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    if hierarchy is None:
+        return []
+    hierarchy = hierarchy[0]
+
+    patterns = []
+    for i, contour in enumerate(contours):
+        child = hierarchy[i][2]
+        grandchild = hierarchy[child][2] if child >= 0 else -1
+        if grandchild < 0:
+            continue
+        x, y, w, h = cv2.boundingRect(contour)
+        if min(w, h) < min_size or max(w, h) > 1.5 * min(w, h):
+            continue
+        cx, cy = x + w / 2, y + h / 2
+        gx, gy, gw, gh = cv2.boundingRect(contours[grandchild])
+        # The inner square is ~3/7 of the outer one and centred in it
+        if not 0.2 < gw / w < 0.65 or abs(gx + gw / 2 - cx) > w / 5 or abs(gy + gh / 2 - cy) > h / 5:
+            continue
+        patterns.append((cx, cy, (w + h) / 2))
+    return patterns
+
+
+def group_finder_patterns(patterns, frame_shape, min_finders=2, padding=0.5) -> List[Tuple[int, int, int, int]]:
+    """
+    Candidate QR regions: groups of finder patterns of similar size that are
+    at most ~10 finder sizes apart, padded by `padding` finder sizes.
+    """
+    height, width = frame_shape[:2]
+    # Drop patterns nested in a bigger one (the same finder found at two threshold levels)
+    patterns = sorted(patterns, key=lambda p: -p[2])
+    unique = []
+    for p in patterns:
+        if all(math.hypot(p[0] - q[0], p[1] - q[1]) > q[2] / 2 for q in unique):
+            unique.append(p)
+
+    parent = list(range(len(unique)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in itertools.combinations(range(len(unique)), 2):
+        a, b = unique[i], unique[j]
+        similar = max(a[2], b[2]) < 1.6 * min(a[2], b[2])
+        if similar and math.hypot(a[0] - b[0], a[1] - b[1]) < 10 * max(a[2], b[2]):
+            parent[find(i)] = find(j)
+
+    groups: Dict[int, list] = {}
+    for i, p in enumerate(unique):
+        groups.setdefault(find(i), []).append(p)
+
+    regions = []
+    for members in groups.values():
+        if len(members) < min_finders:
+            continue
+        size = max(p[2] for p in members)
+        x1 = min(p[0] for p in members) - size * (0.5 + padding)
+        y1 = min(p[1] for p in members) - size * (0.5 + padding)
+        x2 = max(p[0] for p in members) + size * (0.5 + padding)
+        y2 = max(p[1] for p in members) + size * (0.5 + padding)
+        if len(members) == 2:
+            # Two finders span one side of the code - the third corner may be on either side of it
+            span = max(x2 - x1, y2 - y1)
+            x1, y1, x2, y2 = (x1 + x2 - 2 * span) / 2, (y1 + y2 - 2 * span) / 2, \
+                (x1 + x2 + 2 * span) / 2, (y1 + y2 + 2 * span) / 2
+        regions.append((max(0, int(x1)), max(0, int(y1)), min(width, int(math.ceil(x2))),
+                        min(height, int(math.ceil(y2)))))
+    return regions
+
+
+def _iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class QRCodeReader:
+    """
+    Throttled, change-driven QR reader for target and station markers.
+    - Only regions with QR finder patterns are decoded, never the full frame
+    - Decoded payloads are cached per region (per track when the region lies
+      on a tracked target); a region is re-decoded only when it moved
+      (IoU below iou_threshold) or its content changed (mean thumbnail
+      difference above change_threshold). Failed decodes are retried every
+      retry_interval seconds
+    - Runs on its own worker at `rate` Hz on the latest submitted frame, so
+      submit() from the vision thread is a cheap copy at most `rate` times a second
+    """
+
+    def __init__(self, rate=4.0, iou_threshold=0.6, change_threshold=12.0, retry_interval=1.0,
+                 max_age=2.0, thumb_size=24, min_decode_size=200):
+        self.rate = rate  # worker passes per second
+        self.iou_threshold = iou_threshold  # below this the region has moved
+        self.change_threshold = change_threshold  # mean grey level difference of the thumbnails
+        self.retry_interval = retry_interval  # seconds between decode attempts on an unchanged, unreadable region
+        self.max_age = max_age  # seconds a marker is kept after it was last seen
+        self.thumb_size = thumb_size
+        self.min_decode_size = min_decode_size  # small crops are upscaled to this before decoding
+
+        self.detector = cv2.QRCodeDetector()
+        self.cache: Dict[object, QRCode] = {}
+        self._next_marker = 0
+        self._lock = threading.Lock()
+        self._pending = None  # (frame, tracks, captured_at)
+        self._last_submit = 0.0
+        self._wake = threading.Event()
+        self.running = False
+        self.thread = None
+
+        self.passes = 0
+        self.decodes = 0
+        self.cache_hits = 0
+        self.last_pass_time = 0.0
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self.thread.start()
+        print(f"[QRCodeReader] 🔳 Started at {self.rate:.1f} Hz")
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def submit(self, frame, tracks=(), now=None):
+        """
+        Offer the latest frame (array or FrameCache) and its tracks
+        [(track_id, bbox), ...]. Frames arriving faster than the worker's rate
+        are dropped without copying; a FrameCache is shared, not copied.
+        """
+        now = time.time() if now is None else now
+        if now - self._last_submit < 1.0 / self.rate:
+            return False
+        self._last_submit = now
+        with self._lock:
+            self._pending = (frame if isinstance(frame, FrameCache) else frame.copy(), list(tracks), now)
+        self._wake.set()
+        return True
+
+    def _worker_loop(self):
+        while self.running:
+            self._wake.wait(timeout=1.0 / self.rate)
+            self._wake.clear()
+            with self._lock:
+                pending, self._pending = self._pending, None
+            if pending is None:
+                continue
+            try:
+                self.process(*pending)
+            except Exception as e:
+                print(f"[QRCodeReader] ❌ {e}")
+
+    def process(self, frame, tracks=(), now=None) -> List[QRCode]:
+        """One reader pass over a frame (the worker calls this); returns the markers with a payload."""
+        now = time.time() if now is None else now
+        start = time.perf_counter()
+        gray = FrameCache.of(frame).get("gray")
+        regions = group_finder_patterns(find_finder_patterns(gray), gray.shape)
+
+        with self._lock:
+            for region in regions:
+                key, track_id = self._key_for(region, tracks)
+                thumb = cv2.resize(gray[region[1]:region[3], region[0]:region[2]],
+                                   (self.thumb_size, self.thumb_size), interpolation=cv2.INTER_AREA)
+                entry = self.cache.get(key)
+                if entry is not None and not self._needs_decode(entry, region, thumb, now):
+                    entry.bbox = region
+                    entry.last_seen = now
+                    self.cache_hits += 1
+                    continue
+                payload = self._decode(gray, region)
+                self.decodes += 1
+                if entry is not None and payload is None and _iou(entry.bbox, region) >= self.iou_threshold:
+                    payload = entry.payload  # a blurred re-read keeps the last good payload
+                self.cache[key] = QRCode(key, region, payload, track_id, now, now, thumb)
+
+            for key in [k for k, e in self.cache.items() if now - e.last_seen > self.max_age]:
+                del self.cache[key]
+            results = [e for e in self.cache.values() if e.payload]
+
+        self.passes += 1
+        self.last_pass_time = time.perf_counter() - start
+        return results
+
+    def _key_for(self, region, tracks):
+        """Cache key of a region: the track it lies on, else the cached marker it overlaps most."""
+        cx, cy = (region[0] + region[2]) / 2, (region[1] + region[3]) / 2
+        for track_id, (x1, y1, x2, y2) in tracks:
+            if x1 <= cx <= x2 and y1 <= cy <= y2:
+                return track_id, track_id
+        best = max(((k, _iou(e.bbox, region)) for k, e in self.cache.items() if e.track_id is None),
+                   key=lambda item: item[1], default=(None, 0.0))
+        if best[1] > 0.3:
+            return best[0], None
+        self._next_marker += 1
+        return f"marker-{self._next_marker}", None
+
+    def _needs_decode(self, entry, region, thumb, now):
+        if _iou(entry.bbox, region) < self.iou_threshold:
+            return True
+        if float(np.mean(cv2.absdiff(entry.thumb, thumb))) > self.change_threshold:
+            return True
+        return entry.payload is None and now - entry.decoded_at >= self.retry_interval
+
+    def _decode(self, gray, region):
+        x1, y1, x2, y2 = region
+        crop = gray[y1:y2, x1:x2]
+        scale = self.min_decode_size / max(1, min(crop.shape[:2]))
+        if scale > 1.0:
+            crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_NEAREST)
+        try:
+            payload, _, _ = self.detector.detectAndDecode(crop)
+        except cv2.error:
+            return None
+        return payload or None
+
+    def get_codes(self) -> List[QRCode]:
+        """Markers currently in view with a decoded payload."""
+        with self._lock:
+            return [e for e in self.cache.values() if e.payload]
+
+    def payload_for_track(self, track_id) -> Optional[str]:
+        with self._lock:
+            entry = self.cache.get(track_id)
+            return entry.payload if entry is not None else None
+
+    def get_stats(self):
+        attempts = self.decodes + self.cache_hits
+        return {
+            'running': self.running,
+            'rate_hz': self.rate,
+            'passes': self.passes,
+            'decodes': self.decodes,
+            'cache_hit_rate': self.cache_hits / attempts if attempts else 0.0,
+            'markers': len(self.get_codes()),
+            'last_pass_ms': self.last_pass_time * 1000,
+        }
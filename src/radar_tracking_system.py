@@ -1,10 +1,18 @@
 import time
 import threading
-import math
 import numpy as np
 from enum import Enum
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
+from pid_controller import VisualServoController, pixel_error_to_angles
+from search_heatmap import SearchHeatmap
+from scan_patterns import SCAN_PATTERNS, compile_pattern
+from pattern_selector import AdaptivePatternSelector
+from serial_comm import PRIORITY_SAFETY
+from autonomous_types import AutonomousSnapshot, AutonomousState
+from async_logger import get_logger
+
+log = get_logger("RadarTracking")
 
 class ScanMode(Enum):
     RADAR_SWEEP = "radar_sweep"
@@ -26,9 +34,11 @@ class RadarTrackingSystem:
     """
     Radar-like scanning system with balloon tracking and motor control.
     Implements multiple scanning patterns and continuous target tracking.
+    It only scans and tracks: nothing here classifies friend/foe, fires the
+    laser or assesses kills - use SimpleAutonomousMode for engagement.
     """
     
-    def __init__(self, motor_control, camera_manager, serial_comm=None):
+    def __init__(self, motor_control, camera_manager, serial_comm=None, search_heatmap=None):
         self.motor_control = motor_control
         self.camera_manager = camera_manager
         self.serial_comm = serial_comm
@@ -45,20 +55,47 @@ class RadarTrackingSystem:
         
         # Scanning parameters
         self.scan_mode = ScanMode.RADAR_SWEEP
-        self.scan_speed = 2.0  # degrees per second
-        self.scan_direction = 1  # 1 for clockwise, -1 for counter-clockwise
+        self.scan_speed = 2.0  # degrees per movement update
+        self.scan_pattern = self.scan_mode.value  # Registered pattern played while not tracking
+        self.pattern_table = None  # Compiled lazily by the control thread
+        self.pattern_clock = 0.0  # Seconds into the pattern table
+        self._pattern_cache = {}  # pattern name -> compiled table at the current speed
+        
+        # Adaptive pattern selection by measured detection yield
+        self.adaptive_scan = False
+        self.pattern_selector = AdaptivePatternSelector(
+            [mode.value for mode in ScanMode if mode != ScanMode.TRACKING])
+        self.pattern_epoch_start = None  # When the current adaptive epoch began
+        self._seen_track_ids = set()  # Track ids already counted as detections
+        self._new_detections = 0  # Detections since the last pattern accounting
+        
+        # Learned target likelihood (shared with the autonomous scan) - the
+        # pattern slows down where targets usually appear and speeds up elsewhere
+        self.search_heatmap = search_heatmap if search_heatmap is not None else SearchHeatmap.load_or_create()
+        self.sweep_speed_limits = (0.33, 2.0)  # min/max multiple of scan_speed
+        self.sweep_profile_interval = 5.0  # seconds between sweep profile refreshes
+        self._sweep_mean_rate = None
+        self._sweep_rates = None  # (pattern times, detection rates) along the current table
+        self._sweep_profile_time = 0
         
         # Target tracking
         self.targets: List[Target] = []
         self.current_target: Optional[Target] = None
         self.target_lost_timeout = 3.0  # seconds
         self.tracking_threshold = 0.7  # confidence threshold for tracking
+        self.resume_scan_mode = self.scan_mode  # Pattern mode to return to when the target is lost
+        self.frame_size = (640, 480)  # width, height of the latest processed frame
+        self._target_fresh = False  # current_target was seen in the latest frame
         
         # Control parameters
         self.movement_speed = 3.0  # degrees per update
         self.movement_interval = 0.05  # seconds between movements
         self.last_movement_time = time.time()
         
+        # Visual-servo tracking (PID + target velocity feedforward)
+        self.visual_servo = VisualServoController()
+        self.visual_servo_target_id = None
+        
         # Threading
         self.running = False
         self.control_thread = None
@@ -76,20 +113,21 @@ class RadarTrackingSystem:
     def start(self):
         """Start the radar tracking system."""
         if self.control_thread and self.control_thread.is_alive():
-            print("[RadarTracking] ⚠️ System already running")
+            log.warning("⚠️ System already running")
             return
             
         self.running = True
         self.control_thread = threading.Thread(target=self._control_loop, daemon=True)
         self.control_thread.start()
-        print("[RadarTracking] 🚀 Radar tracking system started")
+        log.info("🚀 Radar tracking system started")
+        log.warning("⚠️ Radar system scans and tracks only - it never engages or fires the laser")
         
     def stop(self):
         """Stop the radar tracking system."""
         self.running = False
         if self.control_thread:
             self.control_thread.join(timeout=1.0)
-        print("[RadarTracking] 🛑 Radar tracking system stopped")
+        log.info("🛑 Radar tracking system stopped")
         
     def _control_loop(self):
         """Main control loop for radar tracking."""
@@ -99,90 +137,148 @@ class RadarTrackingSystem:
                 self._execute_scanning()
                 time.sleep(0.05)  # 20 FPS control loop
             except Exception as e:
-                print(f"[RadarTracking] ❌ Error in control loop: {e}")
+                log.error(f"❌ Error in control loop: {e}")
                 time.sleep(0.1)
                 
     def _update_targets(self):
-        """Update target list from camera detections."""
-        # This method is now handled by SimpleAutonomousMode.process_frame()
-        # The targets are updated directly from the GUI's track data
-        pass
+        """Update target list from camera detections and count newly found balloons."""
+        if self.camera_manager is None:
+            return
+            
+        frame, tracks, _ = self.camera_manager.get_frame()
+        if frame is None:
+            return
+            
+        current_time = time.time()
+        self.frame_size = (frame.shape[1], frame.shape[0])
+        targets = []
+        for track in tracks:
+            if 'balloon' not in track.get('label', '').lower():
+                continue
+            x1, y1, x2, y2 = track['bbox']
+            targets.append(Target(track['track_id'], tuple(track['bbox']), track['label'],
+                                  track.get('confidence') or 0.0, ((x1 + x2) // 2, (y1 + y2) // 2), current_time))
+            if track['track_id'] not in self._seen_track_ids:
+                self._seen_track_ids.add(track['track_id'])
+                self._new_detections += 1
+        self.targets = targets
+        self._select_target(current_time)
+        
+    def _select_target(self, current_time):
+        """Lock onto the best confident balloon, keep the lock while it is seen, resume scanning when lost."""
+        if self.current_target is not None:
+            seen = next((t for t in self.targets if t.track_id == self.current_target.track_id), None)
+            self._target_fresh = seen is not None
+            if seen is not None:
+                self.current_target = seen
+                return
+            if current_time - self.current_target.last_seen < self.target_lost_timeout:
+                return
+            log.info(f"❓ Target {self.current_target.track_id} lost, resuming {self.resume_scan_mode.value}")
+            self.current_target = None
+            if self.scan_mode == ScanMode.TRACKING:
+                self.scan_mode = self.resume_scan_mode
+                self.pattern_table = None  # Restart the pattern nearest the current pose
+                
+        candidates = [t for t in self.targets if t.confidence >= self.tracking_threshold]
+        if not candidates:
+            return
+        self.current_target = max(candidates, key=lambda t: (t.priority, t.confidence))
+        self._target_fresh = True
+        if self.scan_mode != ScanMode.TRACKING:
+            self.resume_scan_mode = self.scan_mode
+            self.scan_mode = ScanMode.TRACKING
+        log.info(f"🎯 Tracking target {self.current_target.track_id} ({self.current_target.confidence:.2f})")
                 
     def _execute_scanning(self):
         """Execute current scanning mode."""
-        if self.scan_mode == ScanMode.RADAR_SWEEP:
-            self._radar_sweep()
-        elif self.scan_mode == ScanMode.SPIRAL_SCAN:
-            self._spiral_scan()
-        elif self.scan_mode == ScanMode.SECTOR_SCAN:
-            self._sector_scan()
-        elif self.scan_mode == ScanMode.TRACKING:
+        if self.scan_mode == ScanMode.TRACKING:
             self._track_target()
+        else:
+            self._play_pattern()
             
-    def _radar_sweep(self):
-        """Radar-like horizontal sweep pattern."""
+    def _pattern_params(self):
+        """Parameters of the built-in patterns, taken from the system configuration."""
+        if self.scan_pattern == ScanMode.SPIRAL_SCAN.value:
+            return {'center': self.spiral_center, 'radius': self.spiral_radius}
+        if self.scan_pattern == ScanMode.SECTOR_SCAN.value:
+            return {'sector_start': self.sector_start, 'sector_end': self.sector_end,
+                    'sector_step': self.sector_step}
+        return {}
+        
+    def _compile_pattern(self):
+        """Compile the selected pattern and start it at the point nearest the current pose."""
+        # scan_speed is applied once per movement update
+        speed = self.scan_speed / self.movement_interval
+        table = self._pattern_cache.get(self.scan_pattern)
+        if table is None:
+            table = compile_pattern(self.scan_pattern, (self.servo_min, self.servo_max),
+                                    (self.stepper_min, self.stepper_max), speed, **self._pattern_params())
+            self._pattern_cache[self.scan_pattern] = table
+        self.pattern_table = table
+        self.pattern_clock = self.pattern_table.nearest_phase((self.current_servo_angle, self.current_stepper_angle))
+        self._sweep_rates = None
+        
+    def _play_pattern(self):
+        """Advance the pattern clock and command the interpolated table pose."""
         current_time = time.time()
         if current_time - self.last_movement_time < self.movement_interval:
             return
             
-        # Move stepper motor in a sweeping pattern
-        self.current_stepper_angle += self.scan_speed * self.scan_direction
-        
-        # Reverse direction at boundaries
-        if self.current_stepper_angle >= self.stepper_max:
-            self.current_stepper_angle = self.stepper_max
-            self.scan_direction = -1
-        elif self.current_stepper_angle <= self.stepper_min:
-            self.current_stepper_angle = self.stepper_min
-            self.scan_direction = 1
+        if self.pattern_table is None:
+            self._compile_pattern()
+        table = self.pattern_table  # set_scan_pattern() may reset it from another thread
             
-        # Send motor commands
-        self._send_motor_commands()
-        self.last_movement_time = current_time
-        
-    def _spiral_scan(self):
-        """Spiral scanning pattern."""
-        current_time = time.time()
-        if current_time - self.last_movement_time < self.movement_interval:
-            return
-            
-        # Calculate spiral position
-        angle = (current_time * 30) % 360  # 30 degrees per second
-        radius = self.spiral_radius * (angle / 360)  # Gradually increase radius
-        
-        # Convert to motor angles
-        stepper_angle = self.spiral_center[0] + radius * math.cos(math.radians(angle))
-        servo_angle = self.spiral_center[1] + radius * math.sin(math.radians(angle)) * 0.5
-        
-        # Clamp to motor limits
-        self.current_stepper_angle = max(self.stepper_min, min(self.stepper_max, stepper_angle))
-        self.current_servo_angle = max(self.servo_min, min(self.servo_max, servo_angle))
+        dt = min(current_time - self.last_movement_time, 0.5)
+        self.pattern_clock += dt * self._sweep_speed_scale(current_time, table)
+        self.current_servo_angle, self.current_stepper_angle = table.pose_at(self.pattern_clock)
         
         # Send motor commands
         self._send_motor_commands()
         self.last_movement_time = current_time
         
-    def _sector_scan(self):
-        """Sector-based scanning pattern."""
-        current_time = time.time()
-        if current_time - self.last_movement_time < self.movement_interval:
+        # Detection yield of the pattern that was playing
+        self.pattern_selector.record(table.name, dt, self._new_detections)
+        self._new_detections = 0
+        if self.adaptive_scan:
+            self._adapt_pattern(current_time)
+            
+    def _adapt_pattern(self, current_time):
+        """At the end of each epoch let the bandit pick the next pattern."""
+        if self.pattern_epoch_start is None:
+            self.pattern_epoch_start = current_time
+        if current_time - self.pattern_epoch_start < self.pattern_selector.epoch:
             return
+        self.pattern_epoch_start = current_time
+        choice = self.pattern_selector.choose()
+        if choice != self.scan_pattern:
+            self.scan_mode = ScanMode(choice)
+            self.set_scan_pattern(choice)
+            log.info(f"🎲 Adaptive scan switched to {choice}")
             
-        # Move through sectors
-        sector_angle = (int(current_time) % 10) * self.sector_step
-        self.current_stepper_angle = self.sector_start + sector_angle
-        
-        # Oscillate servo within sector
-        servo_oscillation = math.sin(current_time * 2) * 10
-        self.current_servo_angle = 30 + servo_oscillation
-        
-        # Clamp to limits
-        self.current_stepper_angle = max(self.stepper_min, min(self.stepper_max, self.current_stepper_angle))
-        self.current_servo_angle = max(self.servo_min, min(self.servo_max, self.current_servo_angle))
-        
-        # Send motor commands
-        self._send_motor_commands()
-        self.last_movement_time = current_time
+    def set_adaptive_scan(self, enabled: bool):
+        """Let the pattern selector choose the scan pattern by detection yield."""
+        self.adaptive_scan = enabled
+        self.pattern_epoch_start = None
+        log.info(f"🎲 Adaptive scan {'enabled' if enabled else 'disabled'}")
+        
+    def _sweep_speed_scale(self, current_time, table):
+        """Pattern speed multiplier: dwell longer where the heatmap detection rate is high."""
+        if current_time - self._sweep_profile_time >= self.sweep_profile_interval or self._sweep_rates is None:
+            rates = self.search_heatmap.rate_map()
+            times = np.linspace(0.0, table.period, 120)
+            poses = [table.pose_at(t) for t in times]
+            self._sweep_rates = (times, np.array([self.search_heatmap.rate_at(servo, stepper, rates=rates)
+                                                  for servo, stepper in poses]))
+            self._sweep_mean_rate = float(self._sweep_rates[1].mean())
+            self._sweep_profile_time = current_time
+            
+        times, rates = self._sweep_rates
+        rate_here = float(np.interp(self.pattern_clock % table.period, times, rates))
+        if rate_here <= 0:
+            return self.sweep_speed_limits[1]
+        low, high = self.sweep_speed_limits
+        return max(low, min(high, self._sweep_mean_rate / rate_here))
         
     def _track_target(self):
         """Track current target by adjusting motor positions."""
@@ -192,31 +288,34 @@ class RadarTrackingSystem:
         current_time = time.time()
         if current_time - self.last_movement_time < self.movement_interval:
             return
+        if not self._target_fresh:
+            # Hold the pose while the target is briefly out of the detections
+            self.last_movement_time = current_time
+            return
+            
+        # A new target starts from a clean controller state
+        if self.current_target.track_id != self.visual_servo_target_id:
+            self.visual_servo.reset()
+            self.visual_servo_target_id = self.current_target.track_id
             
-        # Calculate target center in image coordinates
+        # Angular error of the target from the image center
         target_center = self.current_target.center
-        frame_height, frame_width = 480, 640  # Assuming standard camera resolution
-        
-        # Convert image coordinates to motor angles
-        # Horizontal movement (stepper) - map x position to stepper angle
-        x_normalized = target_center[0] / frame_width  # 0 to 1
-        target_stepper = self.stepper_min + x_normalized * (self.stepper_max - self.stepper_min)
-        
-        # Vertical movement (servo) - map y position to servo angle (inverted)
-        y_normalized = 1.0 - (target_center[1] / frame_height)  # Invert Y axis
-        target_servo = self.servo_min + y_normalized * (self.servo_max - self.servo_min)
+        frame_width, frame_height = self.frame_size
+        servo_error, stepper_error = pixel_error_to_angles(
+            target_center[0] - frame_width // 2, target_center[1] - frame_height // 2,
+            frame_width, frame_height
+        )
+        
+        # PID + feedforward step (rate limited inside the controller)
+        dt = min(current_time - self.last_movement_time, 0.5)
+        servo_diff, stepper_diff = self.visual_servo.update(
+            servo_error, stepper_error, self.current_servo_angle, self.current_stepper_angle, dt
+        )
+        
+        # Safety clamp per update
+        stepper_diff = max(-self.movement_speed, min(self.movement_speed, stepper_diff))
+        servo_diff = max(-self.movement_speed, min(self.movement_speed, servo_diff))
         
-        # Smooth movement towards target
-        stepper_diff = target_stepper - self.current_stepper_angle
-        servo_diff = target_servo - self.current_servo_angle
-        
-        # Apply movement speed limits
-        if abs(stepper_diff) > self.movement_speed:
-            stepper_diff = self.movement_speed if stepper_diff > 0 else -self.movement_speed
-            
-        if abs(servo_diff) > self.movement_speed:
-            servo_diff = self.movement_speed if servo_diff > 0 else -self.movement_speed
-            
         # Update motor positions
         self.current_stepper_angle += stepper_diff
         self.current_servo_angle += servo_diff
@@ -229,8 +328,8 @@ class RadarTrackingSystem:
         self._send_motor_commands()
         self.last_movement_time = current_time
         
-        print(f"[RadarTracking] 🎯 Tracking target {self.current_target.track_id}: "
-              f"Stepper={self.current_stepper_angle:.1f}°, Servo={self.current_servo_angle:.1f}°")
+        log.debug("🎯 Tracking target %s: Stepper=%.1f°, Servo=%.1f°",
+                  self.current_target.track_id, self.current_stepper_angle, self.current_servo_angle)
         
     def _send_motor_commands(self):
         """Send motor commands to Arduino."""
@@ -245,27 +344,43 @@ class RadarTrackingSystem:
             self.serial_comm.send_command(0x02, int(self.current_stepper_angle))
             
         except Exception as e:
-            print(f"[RadarTracking] ❌ Error sending motor commands: {e}")
+            log.error(f"❌ Error sending motor commands: {e}")
             
     def set_scan_mode(self, mode: ScanMode):
         """Set scanning mode."""
         self.scan_mode = mode
-        print(f"[RadarTracking] 🔄 Scan mode changed to: {mode.value}")
+        if mode != ScanMode.TRACKING:
+            self.resume_scan_mode = mode
+            self.current_target = None
+            self.set_scan_pattern(mode.value)
+        log.info(f"🔄 Scan mode changed to: {mode.value}")
+        
+    def set_scan_pattern(self, name: str):
+        """Play any registered scan pattern (see scan_patterns.register_pattern)."""
+        if name not in SCAN_PATTERNS:
+            raise ValueError(f"Unknown scan pattern: {name}")
+        self.scan_pattern = name
+        self.pattern_table = None  # Recompiled by the control thread
         
     def set_scan_speed(self, speed: float):
-        """Set scanning speed in degrees per second."""
+        """Set scanning speed in degrees per movement update."""
         self.scan_speed = max(0.5, min(10.0, speed))
-        print(f"[RadarTracking] ⚡ Scan speed set to: {self.scan_speed}°/s")
+        self._pattern_cache = {}
+        self.pattern_table = None
+        log.info(f"⚡ Scan speed set to: {self.scan_speed}°/update")
         
     def set_movement_speed(self, speed: float):
         """Set movement speed in degrees per update."""
         self.movement_speed = max(0.5, min(5.0, speed))
-        print(f"[RadarTracking] ⚡ Movement speed set to: {self.movement_speed}°/update")
+        log.info(f"⚡ Movement speed set to: {self.movement_speed}°/update")
         
     def get_status(self):
         """Get current system status."""
         return {
             'scan_mode': self.scan_mode.value,
+            'scan_pattern': self.scan_pattern,
+            'adaptive_scan': self.adaptive_scan,
+            'pattern_stats': self.pattern_selector.get_stats(),
             'current_target': self.current_target.track_id if self.current_target else None,
             'target_count': len(self.targets),
             'servo_angle': self.current_servo_angle,
@@ -274,16 +389,51 @@ class RadarTrackingSystem:
             'movement_speed': self.movement_speed
         }
         
+    # GUI Integration Methods (same interface as SimpleAutonomousMode)
+    def activate(self):
+        """Start adaptive radar scanning - called by GUI."""
+        self.set_adaptive_scan(True)
+        self.start()
+        
+    def deactivate(self):
+        """Stop radar scanning - called by GUI."""
+        self.stop()
+        
+    def get_snapshot(self) -> AutonomousSnapshot:
+        """Current radar state in the form the GUI draws."""
+        target = self.current_target
+        tracking = self.scan_mode == ScanMode.TRACKING and target is not None
+        if not self.running:
+            status = "Autonomous mode not active"
+        elif tracking:
+            status = f"TRACKING target {target.track_id}"
+        else:
+            stats = self.pattern_selector.stats.get(self.scan_pattern)
+            rate = stats.rate() if stats else 0.0
+            status = f"SCANNING - radar {self.scan_pattern} ({rate:.2f} detections/s)"
+        return AutonomousSnapshot(
+            state=AutonomousState.LOCK if tracking else (AutonomousState.SCAN if self.running else AutonomousState.IDLE),
+            is_active=self.running,
+            target_id=target.track_id if tracking else None,
+            target_bbox=target.bbox if tracking else None,
+            target_count=len(self.targets),
+            servo_angle=self.current_servo_angle,
+            stepper_angle=self.current_stepper_angle,
+            status_message=status,
+            timestamp=time.time()
+        )
+        
     def emergency_stop(self):
         """Emergency stop - stop all movement."""
+        self.running = False
         if self.serial_comm:
-            self.serial_comm.send_command(0x01, 0)  # Stop servo
-            self.serial_comm.send_command(0x02, 150)  # Center stepper
-        print("[RadarTracking] 🚨 Emergency stop executed")
+            self.serial_comm.send_command(0x01, 0, priority=PRIORITY_SAFETY)  # Stop servo
+            self.serial_comm.send_command(0x02, 150, priority=PRIORITY_SAFETY)  # Center stepper
+        log.warning("🚨 Emergency stop executed")
         
     def reset_position(self):
         """Reset to safe starting position."""
         self.current_servo_angle = 0
         self.current_stepper_angle = 150
         self._send_motor_commands()
-        print("[RadarTracking] 🔄 Reset to safe position") 
\ No newline at end of file
+        log.info("🔄 Reset to safe position")
\ No newline at end of file
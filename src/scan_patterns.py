@@ -0,0 +1,148 @@
+import math
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+from scan_planner import CAMERA_H_FOV, CAMERA_V_FOV, SERVO_SLEW_RATE, ScanPlanner
+
+
+@dataclass
+class PatternTable:
+    """
+    A scan pattern compiled into a time-parameterized waypoint table.
+    The table is a closed loop: pose_at() wraps around after `period` seconds.
+    """
+    name: str
+    times: np.ndarray  # (N,) seconds from the start of the loop, increasing
+    servo: np.ndarray  # (N,) degrees
+    stepper: np.ndarray  # (N,) degrees
+
+    @property
+    def period(self):
+        return float(self.times[-1])
+
+    def pose_at(self, t) -> Tuple[float, float]:
+        """(servo, stepper) at pattern time t, linearly interpolated."""
+        tau = t % self.period if self.period > 0 else 0.0
+        return float(np.interp(tau, self.times, self.servo)), float(np.interp(tau, self.times, self.stepper))
+
+    def nearest_phase(self, pose) -> float:
+        """Pattern time of the table point closest to a pose (for a jump-free start)."""
+        index = int(np.argmin(np.abs(self.servo - pose[0]) + np.abs(self.stepper - pose[1])))
+        return float(self.times[index])
+
+    def sample(self, interval):
+        """(M, 3) array of [t, servo, stepper] over one period at a fixed interval."""
+        t = np.arange(0.0, self.period, interval)
+        return np.column_stack((t, np.interp(t, self.times, self.servo), np.interp(t, self.times, self.stepper)))
+
+
+# name -> builder(servo_limits, stepper_limits, **params) returning an (N, 2)
+# closed polyline of [servo, stepper] points
+SCAN_PATTERNS: Dict[str, Callable[..., np.ndarray]] = {}
+
+
+def register_pattern(name):
+    """Decorator: register a pattern builder under `name`."""
+    def decorator(builder):
+        SCAN_PATTERNS[name] = builder
+        return builder
+    return decorator
+
+
+def compile_pattern(name, servo_limits, stepper_limits, speed, servo_rate=SERVO_SLEW_RATE, **params) -> PatternTable:
+    """
+    Build a registered pattern once and time-parameterize it: every segment
+    takes as long as its slower axis needs at `speed` degrees/s (the servo
+    axis is also capped at `servo_rate`).
+    """
+    if name not in SCAN_PATTERNS:
+        raise ValueError(f"Unknown scan pattern: {name}")
+    points = np.asarray(SCAN_PATTERNS[name](servo_limits, stepper_limits, **params), dtype=float)
+    points[:, 0] = np.clip(points[:, 0], *servo_limits)
+    points[:, 1] = np.clip(points[:, 1], *stepper_limits)
+
+    # Drop repeated points so times stay strictly increasing
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(np.diff(points, axis=0) != 0, axis=1)
+    points = points[keep]
+
+    deltas = np.abs(np.diff(points, axis=0))
+    segment_times = np.maximum(deltas[:, 0] / min(speed, servo_rate), deltas[:, 1] / speed)
+    times = np.concatenate(([0.0], np.cumsum(segment_times)))
+    return PatternTable(name, times, points[:, 0].copy(), points[:, 1].copy())
+
+
+@register_pattern("radar_sweep")
+def _radar_sweep(servo_limits, stepper_limits, elevation=None, **_):
+    """Horizontal ping-pong sweep at a fixed elevation."""
+    servo = (servo_limits[0] + servo_limits[1]) / 2 if elevation is None else elevation
+    return [(servo, stepper_limits[0]), (servo, stepper_limits[1]), (servo, stepper_limits[0])]
+
+
+@register_pattern("spiral_scan")
+def _spiral_scan(servo_limits, stepper_limits, center=(150, 30), radius=50, turns=3, servo_scale=0.5,
+                 points_per_turn=72, **_):
+    """Archimedean spiral out from `center` (stepper, servo) and back in."""
+    theta = np.linspace(0.0, 2 * math.pi * turns, points_per_turn * turns + 1)
+    r = radius * theta / theta[-1]
+    outward = np.column_stack((center[1] + r * np.sin(theta) * servo_scale, center[0] + r * np.cos(theta)))
+    return np.vstack((outward, outward[-2::-1]))
+
+
+@register_pattern("sector_scan")
+def _sector_scan(servo_limits, stepper_limits, sector_start=0, sector_end=300, sector_step=30,
+                 elevation=30, amplitude=10, points_per_sector=24, **_):
+    """Visit each sector in turn, nodding the servo once per sector; sectors ping-pong."""
+    centers = list(np.arange(sector_start, sector_end, sector_step, dtype=float))
+    order = centers + centers[-2:0:-1]
+    phase = np.linspace(0.0, 2 * math.pi, points_per_sector, endpoint=False)
+    points = []
+    for stepper in order:
+        points.extend((elevation + amplitude * math.sin(p), stepper) for p in phase)
+    points.append(points[0])
+    return points
+
+
+def pattern_report(table: PatternTable, servo_limits, stepper_limits, tick=0.05,
+                   h_fov=CAMERA_H_FOV, v_fov=CAMERA_V_FOV, resolution=1.0):
+    """Coverage and slew statistics of one pattern period, sampled at the control tick."""
+    samples = table.sample(tick)
+    planner = ScanPlanner(h_fov=h_fov, v_fov=v_fov, servo_limits=servo_limits, stepper_limits=stepper_limits)
+    (servo_low, servo_high), (stepper_low, stepper_high) = planner.field_of_regard()
+    servo_cells = np.arange(servo_low, servo_high, resolution) + resolution / 2
+    stepper_cells = np.arange(stepper_low, stepper_high, resolution) + resolution / 2
+    seen = np.zeros((len(servo_cells), len(stepper_cells)), dtype=bool)
+
+    full_time = math.inf
+    for t, servo, stepper in samples:
+        rows = np.abs(servo_cells - servo) <= v_fov / 2
+        cols = np.abs(stepper_cells - stepper) <= h_fov / 2
+        seen[np.ix_(rows, cols)] = True
+        if full_time == math.inf and seen.all():
+            full_time = t
+
+    steps = np.abs(np.diff(samples[:, 1:], axis=0))
+    return {
+        'pattern': table.name,
+        'period': table.period,
+        'table_points': len(table.times),
+        'coverage': float(seen.mean()),
+        'time_to_full_coverage': full_time,
+        'slew_per_period': float(steps.sum()),
+        'max_servo_step': float(steps[:, 0].max()) if len(steps) else 0.0,
+        'max_stepper_step': float(steps[:, 1].max()) if len(steps) else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    # Offline comparison of every registered pattern with the radar defaults
+    servo_limits, stepper_limits = (0, 60), (0, 300)
+    speed = 2.0 / 0.05  # RadarTrackingSystem default: 2° per 50 ms update
+    for name in SCAN_PATTERNS:
+        table = compile_pattern(name, servo_limits, stepper_limits, speed)
+        report = pattern_report(table, servo_limits, stepper_limits)
+        print(f"[ScanPatterns] {name:12s} period={report['period']:6.2f}s points={report['table_points']:4d} "
+              f"coverage={report['coverage'] * 100:5.1f}% full={report['time_to_full_coverage']:6.2f}s "
+              f"slew={report['slew_per_period']:7.1f}° "
+              f"max_step=({report['max_servo_step']:.2f}°, {report['max_stepper_step']:.2f}°)/tick")
@@ -0,0 +1,225 @@
+import math
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Default slew rates derived from arduino/motor_control.ino:
+# - servo: moveServoToAngle() moves 1° and then delay(20) -> ~50°/s
+# - stepper: 6 steps (10.8°) per loop at 2 * stepDelay (2 ms) per step,
+#   plus delay(10) and the 20 ms servo delay when both axes move -> ~250°/s
+SERVO_SLEW_RATE = 50.0  # degrees per second
+STEPPER_SLEW_RATE = 250.0  # degrees per second
+
+# Typical 640x480 USB webcam field of view
+CAMERA_H_FOV = 62.0  # degrees (stepper / horizontal axis)
+CAMERA_V_FOV = 48.0  # degrees (servo / vertical axis)
+
+
+@dataclass
+class CoverageReport:
+    pattern: str
+    waypoint_count: int
+    coverage: float  # fraction of the field of regard seen (0..1)
+    time_to_full_coverage: float  # seconds, math.inf if never fully covered
+    total_time: float  # seconds for the whole waypoint sequence
+    total_slew: float  # degrees travelled (servo + stepper)
+
+
+class ScanPlanner:
+    """
+    Coverage scan planner for the turret.
+    Tiles the whole field of regard (turret limits widened by half the camera
+    FOV) with camera footprints and orders the tiles to minimise slew time.
+    """
+
+    PATTERNS = ("boustrophedon_rows", "boustrophedon_columns", "raster_rows")
+
+    def __init__(self, h_fov=CAMERA_H_FOV, v_fov=CAMERA_V_FOV,
+                 servo_limits=(5, 55), stepper_limits=(10, 290), overlap=0.2,
+                 servo_rate=SERVO_SLEW_RATE, stepper_rate=STEPPER_SLEW_RATE,
+                 settle_time=0.15, dwell_time=0.3):
+        self.h_fov = float(h_fov)
+        self.v_fov = float(v_fov)
+        self.servo_min, self.servo_max = servo_limits
+        self.stepper_min, self.stepper_max = stepper_limits
+        self.overlap = max(0.0, min(0.9, overlap))  # fraction of the FOV shared by neighbouring tiles
+        self.servo_rate = servo_rate
+        self.stepper_rate = stepper_rate
+        self.settle_time = settle_time  # seconds for the turret to stop shaking after a move
+        self.dwell_time = dwell_time  # seconds to hold each tile for detection
+
+    def _axis_positions(self, low, high, fov):
+        """Evenly spaced tile centers so neighbouring footprints overlap by at least `overlap`."""
+        span = high - low
+        step = fov * (1.0 - self.overlap)
+        if span <= 0:
+            return np.array([float(low)])
+        count = int(math.ceil(span / step)) + 1
+        return np.linspace(low, high, count)
+
+    def grid_axes(self):
+        """Return (servo_positions, stepper_positions) of the coverage tiles."""
+        servo_positions = self._axis_positions(self.servo_min, self.servo_max, self.v_fov)
+        stepper_positions = self._axis_positions(self.stepper_min, self.stepper_max, self.h_fov)
+        return servo_positions, stepper_positions
+
+    def _build_pattern(self, pattern, flip_servo=False, flip_stepper=False):
+        """Build an (N, 2) array of [servo, stepper] waypoints for a named pattern."""
+        servo_positions, stepper_positions = self.grid_axes()
+        if flip_servo:
+            servo_positions = servo_positions[::-1]
+        if flip_stepper:
+            stepper_positions = stepper_positions[::-1]
+
+        waypoints = []
+        if pattern == "boustrophedon_rows":
+            for row, servo in enumerate(servo_positions):
+                row_steppers = stepper_positions if row % 2 == 0 else stepper_positions[::-1]
+                waypoints.extend((servo, stepper) for stepper in row_steppers)
+        elif pattern == "boustrophedon_columns":
+            for column, stepper in enumerate(stepper_positions):
+                column_servos = servo_positions if column % 2 == 0 else servo_positions[::-1]
+                waypoints.extend((servo, stepper) for servo in column_servos)
+        elif pattern == "raster_rows":
+            for servo in servo_positions:
+                waypoints.extend((servo, stepper) for stepper in stepper_positions)
+        else:
+            raise ValueError(f"Unknown scan pattern: {pattern}")
+        return np.array(waypoints, dtype=float)
+
+    def plan(self, pattern="auto", start: Optional[Tuple[float, float]] = None):
+        """
+        Precompute the waypoint sequence for a pattern.
+        pattern: one of PATTERNS, or "auto" to pick the fastest to full coverage.
+        start: current (servo, stepper) pose; the pattern is mirrored so it
+        begins at the nearest corner.
+        """
+        patterns = self.PATTERNS if pattern == "auto" else (pattern,)
+        best, best_time = None, math.inf
+        for name in patterns:
+            for flip_servo in (False, True):
+                for flip_stepper in (False, True):
+                    waypoints = self._build_pattern(name, flip_servo, flip_stepper)
+                    total = self.sequence_time(waypoints, start)
+                    if total < best_time:
+                        best, best_time = waypoints, total
+        return best
+
+    def slew_time(self, a, b):
+        """Time to move between two (servo, stepper) poses; both axes move together."""
+        servo_time = abs(b[0] - a[0]) / self.servo_rate
+        stepper_time = abs(b[1] - a[1]) / self.stepper_rate
+        move_time = max(servo_time, stepper_time)
+        return move_time + self.settle_time if move_time > 0 else 0.0
+
+    def sequence_time(self, waypoints, start=None, dwell=None):
+        """Total slew + dwell time to visit every waypoint in order."""
+        dwell = self.dwell_time if dwell is None else dwell
+        total = 0.0
+        previous = start if start is not None else waypoints[0]
+        for waypoint in waypoints:
+            total += self.slew_time(previous, waypoint) + dwell
+            previous = waypoint
+        return total
+
+    def field_of_regard(self):
+        """Return ((servo_low, servo_high), (stepper_low, stepper_high)) seen by the camera."""
+        return ((self.servo_min - self.v_fov / 2, self.servo_max + self.v_fov / 2),
+                (self.stepper_min - self.h_fov / 2, self.stepper_max + self.h_fov / 2))
+
+    def evaluate(self, waypoints, pattern="custom", start=None, dwell=None, resolution=1.0):
+        """
+        Simulate a waypoint sequence over a coverage grid of `resolution` degrees.
+        Reports the fraction of the field of regard seen and the time at which
+        it was first fully covered, so patterns can be compared.
+        """
+        dwell = self.dwell_time if dwell is None else dwell
+        (servo_low, servo_high), (stepper_low, stepper_high) = self.field_of_regard()
+        servo_cells = np.arange(servo_low, servo_high, resolution) + resolution / 2
+        stepper_cells = np.arange(stepper_low, stepper_high, resolution) + resolution / 2
+        seen = np.zeros((len(servo_cells), len(stepper_cells)), dtype=bool)
+
+        elapsed = 0.0
+        total_slew = 0.0
+        full_time = math.inf
+        previous = start if start is not None else waypoints[0]
+        for servo, stepper in waypoints:
+            elapsed += self.slew_time(previous, (servo, stepper)) + dwell
+            total_slew += abs(servo - previous[0]) + abs(stepper - previous[1])
+            previous = (servo, stepper)
+
+            rows = np.abs(servo_cells - servo) <= self.v_fov / 2
+            cols = np.abs(stepper_cells - stepper) <= self.h_fov / 2
+            seen[np.ix_(rows, cols)] = True
+            if full_time == math.inf and seen.all():
+                full_time = elapsed
+
+        return CoverageReport(
+            pattern=pattern,
+            waypoint_count=len(waypoints),
+            coverage=float(seen.mean()),
+            time_to_full_coverage=full_time,
+            total_time=elapsed,
+            total_slew=total_slew,
+        )
+
+    def local_search_offsets(self, rings=1, heading: Optional[Tuple[float, float]] = None):
+        """
+        (N, 2) [servo, stepper] offsets of an expanding square search around a
+        point: the center tile first, then each ring of neighbouring tiles.
+        Within a ring, tiles closest to `heading` (a servo/stepper direction,
+        e.g. the target's angular velocity) come first.
+        """
+        servo_step = self.v_fov * (1.0 - self.overlap)
+        stepper_step = self.h_fov * (1.0 - self.overlap)
+        heading_angle = None
+        if heading is not None and (heading[0] or heading[1]):
+            heading_angle = math.atan2(heading[0], heading[1])
+
+        offsets = [(0.0, 0.0)]
+        for ring in range(1, rings + 1):
+            tiles = [(i, j) for i in range(-ring, ring + 1) for j in range(-ring, ring + 1)
+                     if max(abs(i), abs(j)) == ring]
+            if heading_angle is not None:
+                def angle_from_heading(tile):
+                    diff = math.atan2(tile[0], tile[1]) - heading_angle
+                    return abs(math.atan2(math.sin(diff), math.cos(diff)))
+                tiles.sort(key=angle_from_heading)
+            else:
+                # Sweep around the ring so consecutive tiles are neighbours
+                tiles.sort(key=lambda tile: math.atan2(tile[0], tile[1]))
+            offsets.extend((i * servo_step, j * stepper_step) for i, j in tiles)
+        return np.array(offsets, dtype=float)
+
+    def legacy_spiral_waypoints(self, center=(30, 150), radius_step=0.2, angle_step=0.05, reset_radius=20):
+        """Waypoints of the old SimpleAutonomousMode spiral, for comparison."""
+        waypoints = []
+        radius, angle = 0.0, 0.0
+        while radius < reset_radius:
+            servo = min(self.servo_max, max(self.servo_min, center[0] + radius * math.cos(angle)))
+            stepper = min(self.stepper_max, max(self.stepper_min, center[1] + radius * math.sin(angle)))
+            waypoints.append((servo, stepper))
+            angle += angle_step
+            radius += radius_step
+        return np.array(waypoints, dtype=float)
+
+    def compare_patterns(self, start=None) -> Dict[str, CoverageReport]:
+        """Evaluate every planned pattern plus the legacy spiral."""
+        reports = {}
+        for name in self.PATTERNS:
+            reports[name] = self.evaluate(self.plan(name, start), pattern=name, start=start)
+        # The old spiral moved one small step per ~0.6 s control tick (sleeps included)
+        reports["legacy_spiral"] = self.evaluate(self.legacy_spiral_waypoints(), pattern="legacy_spiral",
+                                                 start=start, dwell=0.6)
+        return reports
+
+
+if __name__ == "__main__":
+    planner = ScanPlanner()
+    servo_positions, stepper_positions = planner.grid_axes()
+    print(f"[ScanPlanner] 📐 Grid: {len(servo_positions)} rows x {len(stepper_positions)} columns")
+    for name, report in planner.compare_patterns(start=(30, 150)).items():
+        print(f"[ScanPlanner] {name:22s} waypoints={report.waypoint_count:4d} "
+              f"coverage={report.coverage * 100:5.1f}% "
+              f"full_coverage={report.time_to_full_coverage:7.2f}s "
+              f"slew={report.total_slew:7.1f}°")
@@ -0,0 +1,172 @@
+import os
+import time
+import numpy as np
+from typing import Optional
+
+from scan_planner import CAMERA_H_FOV, CAMERA_V_FOV
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HEATMAP_PATH = os.path.join(BASE_DIR, 'search_heatmap.npz')
+
+
+class SearchHeatmap:
+    """
+    Likelihood map of where targets appear, over (servo, stepper) angles.
+    Each cell keeps a decayed detection count and a decayed observation time;
+    their ratio (with a Gamma prior) is the detection rate per second of
+    looking at that cell. Both decay with `half_life`, so old sessions fade
+    out, and the map is saved as a compressed npz between sessions.
+    """
+
+    def __init__(self, servo_range=(-19.0, 79.0), stepper_range=(-21.0, 321.0), cell_size=5.0,
+                 half_life=8 * 3600.0, prior_detections=0.02, prior_exposure=60.0):
+        self.servo_range = (float(servo_range[0]), float(servo_range[1]))
+        self.stepper_range = (float(stepper_range[0]), float(stepper_range[1]))
+        self.cell_size = float(cell_size)  # degrees per cell on both axes
+        self.half_life = float(half_life)  # seconds for counts and exposure to halve
+        self.prior_detections = prior_detections  # Gamma prior shape (per cell - a footprint holds ~100 cells)
+        self.prior_exposure = prior_exposure  # Gamma prior rate (seconds)
+
+        rows = int(np.ceil((self.servo_range[1] - self.servo_range[0]) / self.cell_size))
+        cols = int(np.ceil((self.stepper_range[1] - self.stepper_range[0]) / self.cell_size))
+        self.detections = np.zeros((rows, cols), dtype=np.float32)  # decayed detection count
+        self.exposure = np.zeros((rows, cols), dtype=np.float32)  # decayed seconds observed
+        self.last_decay = time.time()
+
+    @property
+    def shape(self):
+        return self.detections.shape
+
+    def _cell(self, servo, stepper):
+        row = int((servo - self.servo_range[0]) // self.cell_size)
+        col = int((stepper - self.stepper_range[0]) // self.cell_size)
+        rows, cols = self.shape
+        return min(rows - 1, max(0, row)), min(cols - 1, max(0, col))
+
+    def _footprint(self, servo, stepper, h_fov=CAMERA_H_FOV, v_fov=CAMERA_V_FOV):
+        """Row/column slices of the cells inside the camera footprint at a pose."""
+        row0, col0 = self._cell(servo - v_fov / 2, stepper - h_fov / 2)
+        row1, col1 = self._cell(servo + v_fov / 2, stepper + h_fov / 2)
+        return slice(row0, row1 + 1), slice(col0, col1 + 1)
+
+    def decay(self, now=None):
+        """Apply exponential forgetting up to `now`."""
+        now = time.time() if now is None else now
+        elapsed = now - self.last_decay
+        if elapsed <= 0:
+            return
+        factor = np.float32(0.5 ** (elapsed / self.half_life))
+        self.detections *= factor
+        self.exposure *= factor
+        self.last_decay = now
+
+    def record_detection(self, servo, stepper, weight=1.0, now=None):
+        """A new target appeared at the given turret angles."""
+        self.decay(now)
+        self.detections[self._cell(servo, stepper)] += weight
+
+    def record_exposure(self, servo, stepper, seconds, h_fov=CAMERA_H_FOV, v_fov=CAMERA_V_FOV, now=None):
+        """The camera looked at the footprint around a pose for `seconds`."""
+        if seconds <= 0:
+            return
+        self.decay(now)
+        self.exposure[self._footprint(servo, stepper, h_fov, v_fov)] += seconds
+
+    def rate_map(self):
+        """Posterior mean detection rate per second of observation, per cell."""
+        return (self.detections + self.prior_detections) / (self.exposure + self.prior_exposure)
+
+    def rate_at(self, servo, stepper, h_fov=CAMERA_H_FOV, v_fov=CAMERA_V_FOV, rates=None):
+        """Expected detections per second while looking at a pose."""
+        rates = self.rate_map() if rates is None else rates
+        return float(rates[self._footprint(servo, stepper, h_fov, v_fov)].sum())
+
+    def detection_probability(self, servo, stepper, dwell, h_fov=CAMERA_H_FOV, v_fov=CAMERA_V_FOV):
+        """Probability of at least one detection when holding a pose for `dwell` seconds."""
+        return 1.0 - float(np.exp(-self.rate_at(servo, stepper, h_fov, v_fov) * dwell))
+
+    def dwell_times(self, waypoints, base_dwell, h_fov=CAMERA_H_FOV, v_fov=CAMERA_V_FOV,
+                    min_scale=0.5, max_scale=3.0):
+        """
+        Split a scan's dwell budget (base_dwell per waypoint) across waypoints
+        in proportion to their detection rate, within [min_scale, max_scale]
+        of base_dwell. The total dwell time of the scan is unchanged.
+        """
+        waypoints = np.asarray(waypoints, dtype=float)
+        if len(waypoints) == 0:
+            return np.zeros(0)
+        rates = self.rate_map()
+        scores = np.array([self.rate_at(s, t, h_fov, v_fov, rates) for s, t in waypoints])
+        scale = np.clip(scores / scores.mean(), min_scale, max_scale)
+        scale *= len(scale) / scale.sum()
+        return base_dwell * scale
+
+    def save(self, path=HEATMAP_PATH):
+        np.savez_compressed(
+            path,
+            detections=self.detections,
+            exposure=self.exposure,
+            last_decay=self.last_decay,
+            servo_range=self.servo_range,
+            stepper_range=self.stepper_range,
+            cell_size=self.cell_size,
+        )
+
+    @classmethod
+    def load(cls, path=HEATMAP_PATH, **kwargs) -> Optional['SearchHeatmap']:
+        """Load a saved map; returns None if missing or if its grid does not match `kwargs`."""
+        if not os.path.exists(path):
+            return None
+        heatmap = cls(**kwargs)
+        try:
+            with np.load(path) as data:
+                if (data['detections'].shape != heatmap.shape
+                        or tuple(data['servo_range']) != heatmap.servo_range
+                        or tuple(data['stepper_range']) != heatmap.stepper_range
+                        or float(data['cell_size']) != heatmap.cell_size):
+                    print(f"[SearchHeatmap] ⚠️ Grid in {path} does not match - starting fresh")
+                    return None
+                heatmap.detections = data['detections'].astype(np.float32)
+                heatmap.exposure = data['exposure'].astype(np.float32)
+                heatmap.last_decay = float(data['last_decay'])
+        except Exception as e:
+            print(f"[SearchHeatmap] ❌ Error loading {path}: {e}")
+            return None
+        # Time passed since the last session counts toward forgetting
+        heatmap.decay()
+        return heatmap
+
+    @classmethod
+    def load_or_create(cls, path=HEATMAP_PATH, **kwargs) -> 'SearchHeatmap':
+        heatmap = cls.load(path, **kwargs)
+        if heatmap is None:
+            heatmap = cls(**kwargs)
+        else:
+            print(f"[SearchHeatmap] 📂 Loaded search heatmap ({heatmap.detections.sum():.1f} detections)")
+        return heatmap
+
+    @classmethod
+    def for_planner(cls, planner, path: Optional[str] = HEATMAP_PATH, **kwargs) -> 'SearchHeatmap':
+        """Heatmap covering a ScanPlanner's field of regard (loaded from `path` when possible)."""
+        servo_range, stepper_range = planner.field_of_regard()
+        kwargs.update(servo_range=servo_range, stepper_range=stepper_range)
+        if path is None:
+            return cls(**kwargs)
+        return cls.load_or_create(path, **kwargs)
+
+
+if __name__ == "__main__":
+    # Show how the dwell budget moves toward a busy sector
+    from scan_planner import ScanPlanner
+
+    planner = ScanPlanner()
+    heatmap = SearchHeatmap.for_planner(planner, path=None)
+    waypoints = planner.plan(start=(30, 150))
+    for servo, stepper in waypoints:
+        heatmap.record_exposure(servo, stepper, 60.0)
+    for _ in range(20):
+        heatmap.record_detection(40.0, 230.0)
+    dwell = heatmap.dwell_times(waypoints, planner.dwell_time)
+    for (servo, stepper), seconds in zip(waypoints, dwell):
+        print(f"[SearchHeatmap] tile ({servo:5.1f}°, {stepper:6.1f}°) dwell={seconds:.2f}s "
+              f"p_detect={heatmap.detection_probability(servo, stepper, seconds):.3f}")
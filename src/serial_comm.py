@@ -1,10 +1,55 @@
+import os
+import re
 import serial
+import queue
 import time
 import threading
+from collections import Counter, deque
+from serial_protocol import (BAUD_COMMIT_TIMEOUT, DEFAULT_BAUD, LINK_TIMEOUT, Frame, FRAME_SIZE, LASER_CMD, SERVO_CMD,
+                             STEPPER_CMD, encode_frame)
+from telemetry import TelemetryBuffer
+from async_logger import get_logger
+
+log = get_logger("SerialComm")
+
+# Priority classes of queued commands (lower is sent first)
+PRIORITY_SAFETY = 0  # laser off, emergency stop - never throttled
+PRIORITY_LASER = 1
+PRIORITY_MOTION = 2
+PRIORITY_TELEMETRY = 3
+PRIORITY_NAMES = {PRIORITY_SAFETY: "safety", PRIORITY_LASER: "laser", PRIORITY_MOTION: "motion",
+                  PRIORITY_TELEMETRY: "telemetry"}
+
+# Commands the "frame" protocol packs into one multi-axis frame
+FRAME_COMMANDS = (SERVO_CMD, STEPPER_CMD, LASER_CMD)
+
+# Device lines are printable ASCII; anything else is line noise (e.g. bytes sent at another baud rate)
+NON_PRINTABLE = re.compile(r"[^\x20-\x7e]")
 
 class SerialComm:
+    """
+    Serial link to the turret's Arduino.
+    send_command() only queues: a writer thread sends the queue in priority
+    order (safety > laser > motion > telemetry) and keeps one pending command
+    per actuator, so a new servo/stepper/laser setpoint replaces a stale one
+    instead of queueing behind it. Writes are paced to `bandwidth_share` of
+    the link (baudrate / 10 bytes/s) so commands wait in the queue, where they
+    can still be coalesced, rather than in the OS serial buffer. Telemetry
+    only uses spare capacity; safety commands ignore the budget.
+    With protocol="frame" every pending servo/stepper/laser command goes out
+    in one 8-byte frame with 0.01° angles, a sequence number and CRC-8 (see
+    serial_protocol.py).
+    negotiate_baud() raises the link from 9600 baud after a capability query
+    and an echo test; a link monitor then pings the device (keeping its baud
+    watchdog fed and measuring round-trip time) and falls back to a lower
+    rate when pings keep failing.
+    A reader thread is the only consumer of the port's input: telemetry
+    lines ("T ...") go into a timestamped ring buffer of measured poses
+    (latest_pose(), pose_at()), every other line into the reply queue.
+    """
+
     def __init__(self, port="/dev/serial0", baudrate=9600, timeout=1, protocol="binary", simulation_mode=False):
-        self.protocol = protocol  # "binary" or "text"
+        self.protocol = protocol  # "binary", "text" or "frame"
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
@@ -13,30 +58,81 @@ class SerialComm:
         self.retry_delay = 2
         self.simulation_mode = simulation_mode
         
-        # Thread safety
-        self._lock = threading.Lock()
+        # Thread safety: _lock guards port writes (re-entered while a baud switch holds it),
+        # _query_lock gives one query at a time the reply stream
+        self._lock = threading.RLock()
+        self._query_lock = threading.RLock()
+        
+        # Asynchronous writer
+        self.bandwidth_share = 0.9  # fraction of the link's byte rate the writer may use
+        self.burst_bytes = 16  # bytes that may go out back-to-back after an idle period
+        self.telemetry_reserve = 8  # telemetry waits until this many bytes of budget are spare
+        self._pending = {}  # cmd -> (priority, sequence, data, queued_at)
+        self._sequence = 0
+        self._queue_cond = threading.Condition()
+        self._tokens = float(self.burst_bytes)
+        self._last_refill = time.monotonic()
+        self._sent_log = deque()  # (time, bytes) of the last second, for link utilization
+        self._in_flight = False
+        self._frame_sequence = 0
+        self.sent_counts = Counter()  # by priority name
+        self.coalesced = 0
+        self.bytes_sent = 0
+        self.max_queue_delay = 0.0
+        
+        # Link negotiation and health
+        self.baud_commit_timeout = BAUD_COMMIT_TIMEOUT  # must match the firmware (motor_control.ino)
+        self.link_timeout = LINK_TIMEOUT  # device drops back to 9600 after this long without a valid command
+        self.echo_count = 3  # echoes that must come back intact before a new rate is kept
+        self.reply_timeout = 0.2  # seconds to wait for a reply line
+        self.link_check_interval = 1.0  # seconds between monitor pings
+        self.max_link_failures = 3  # consecutive failed pings before falling back
+        self.capabilities = None
+        self.link_errors = 0
+        self.bytes_received = 0
+        self.rtt_samples = deque(maxlen=50)
+        self._echo_token = 0
+        self._baud_ceiling = None  # highest rate still worth trying after fallbacks
+        self._monitor_running = False
+        self._monitor_thread = None
+        
+        # Device output: telemetry and replies
+        self.telemetry = TelemetryBuffer()
+        self.telemetry_max_age = 0.5  # seconds; older telemetry doesn't count as current feedback
+        self._replies = queue.Queue(maxsize=64)  # non-telemetry lines, oldest dropped when full
+        self.max_line_length = 256  # longer unterminated input is noise (e.g. bytes at a wrong baud rate)
+        self._discard_partial = False  # set by _query: drop the reader's unterminated line (old-rate noise)
         
         if not self.simulation_mode:
             self._connect_with_retry()
         else:
-            print("[SerialComm] 🎮 Simülasyon modu aktif - Gerçek donanım kullanılmayacak")
+            log.info("🎮 Simülasyon modu aktif - Gerçek donanım kullanılmayacak")
             self.ser = None
+        
+        self._writer_running = True
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        
+        self._reader_running = True
+        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self._reader_thread.start()
 
     def _connect_with_retry(self):
         """Connect to serial port with retry logic"""
         for attempt in range(self.connection_retries):
             try:
-                print(f"[SerialComm] 🔌 Port {self.port} açılmaya çalışılıyor (deneme {attempt + 1}/{self.connection_retries})...")
+                log.info(f"🔌 Port {self.port} açılmaya çalışılıyor (deneme {attempt + 1}/{self.connection_retries})...")
                 
                 # Check if port exists first
                 import serial.tools.list_ports
                 available_ports = [p.device for p in serial.tools.list_ports.comports()]
                 
-                if self.port not in available_ports:
-                    print(f"[SerialComm] ❌ Port {self.port} mevcut değil!")
-                    print(f"[SerialComm] 📋 Mevcut portlar: {available_ports}")
+                # Pseudo-terminals (e.g. arduino_emulator.py) aren't listed but open like any port
+                if self.port not in available_ports and not os.path.exists(self.port):
+                    log.error(f"❌ Port {self.port} mevcut değil!")
+                    log.info(f"📋 Mevcut portlar: {available_ports}")
                     if attempt == self.connection_retries - 1:
-                        print("[SerialComm] ⚠️ Port bulunamadı, simülasyon modunda çalışacak")
+                        log.warning("⚠️ Port bulunamadı, simülasyon modunda çalışacak")
                         self.ser = None
                         return
                     time.sleep(self.retry_delay)
@@ -47,57 +143,172 @@ class SerialComm:
                 time.sleep(2)  # Wait for connection to stabilize
                 
                 if self.ser.is_open:
-                    print(f"[SerialComm] ✅ Port {self.port} başarıyla açıldı")
-                    print(f"[SerialComm] 📡 Baudrate: {self.baudrate}, Protocol: {self.protocol}")
+                    log.info(f"✅ Port {self.port} başarıyla açıldı")
+                    log.info(f"📡 Baudrate: {self.baudrate}, Protocol: {self.protocol}")
                     return
                 else:
-                    print(f"[SerialComm] ❌ Port {self.port} açılamadı")
+                    log.error(f"❌ Port {self.port} açılamadı")
                     
             except serial.SerialException as e:
-                print(f"[SerialComm] ❌ Seri port hatası (deneme {attempt + 1}): {e}")
+                log.error(f"❌ Seri port hatası (deneme {attempt + 1}): {e}")
                 if "Access is denied" in str(e) or "PermissionError" in str(e):
-                    print("[SerialComm] 💡 İzin hatası - Programı yönetici olarak çalıştırın")
+                    log.info("💡 İzin hatası - Programı yönetici olarak çalıştırın")
                 elif "Port is in use" in str(e):
-                    print("[SerialComm] 💡 Port kullanımda - Diğer programları kapatın")
+                    log.info("💡 Port kullanımda - Diğer programları kapatın")
                 
             except PermissionError as e:
-                print(f"[SerialComm] ❌ İzin hatası (deneme {attempt + 1}): {e}")
-                print("[SerialComm] 💡 Çözüm: Programı yönetici olarak çalıştırın")
+                log.error(f"❌ İzin hatası (deneme {attempt + 1}): {e}")
+                log.info("💡 Çözüm: Programı yönetici olarak çalıştırın")
                 
             except Exception as e:
-                print(f"[SerialComm] ❌ Beklenmeyen hata (deneme {attempt + 1}): {e}")
+                log.error(f"❌ Beklenmeyen hata (deneme {attempt + 1}): {e}")
             
             if attempt < self.connection_retries - 1:
-                print(f"[SerialComm] ⏳ {self.retry_delay} saniye sonra tekrar deneniyor...")
+                log.info(f"⏳ {self.retry_delay} saniye sonra tekrar deneniyor...")
                 time.sleep(self.retry_delay)
         
         # If all retries failed
-        print(f"[SerialComm] ⚠️ Port {self.port} açılamadı, simülasyon modunda çalışacak")
+        log.warning(f"⚠️ Port {self.port} açılamadı, simülasyon modunda çalışacak")
         self.ser = None
 
-    def send_command(self, cmd, data):
-        """Send command using current protocol with error handling"""
+    def send_command(self, cmd, data, priority=None):
+        """
+        Queue a command and return immediately. A command still pending for
+        the same actuator is replaced, unless it is a safety command and the
+        new one is less urgent: then the new one is dropped, so a setpoint
+        from another thread can't cancel an emergency move. `priority`
+        overrides the class derived from the command (e.g. PRIORITY_SAFETY
+        for emergency moves).
+        """
+        if priority is None:
+            priority = self.command_priority(cmd, data)
+        with self._queue_cond:
+            if cmd in self._pending:
+                self.coalesced += 1
+                if self._pending[cmd][0] == PRIORITY_SAFETY and priority != PRIORITY_SAFETY:
+                    return
+            self._sequence += 1
+            self._pending[cmd] = (priority, self._sequence, data, time.monotonic())
+            self._queue_cond.notify()
+
+    @staticmethod
+    def command_priority(cmd, data):
+        if cmd == 0x03:  # Laser - switching it off is a safety action
+            return PRIORITY_LASER if data > 0 else PRIORITY_SAFETY
+        if cmd in (0x01, 0x02):  # Servo, stepper
+            return PRIORITY_MOTION
+        return PRIORITY_TELEMETRY
+
+    def _packet_size(self, batch):
+        """Bytes a batch of commands takes on the wire (for the bandwidth budget)."""
+        if self.protocol == "frame":
+            return FRAME_SIZE
+        if self.protocol == "binary":
+            return 4 * len(batch)
+        return sum(2 if cmd == 0x03 else len(str(data)) + 2 for cmd, data in batch)
+
+    def _writer_loop(self):
+        while self._writer_running:
+            with self._queue_cond:
+                if not self._pending:
+                    self._queue_cond.wait(timeout=0.5)
+                    continue
+                cmd, (priority, _, data, queued_at) = min(self._pending.items(), key=lambda item: item[1][:2])
+                batch = [(cmd, data)]
+                if self.protocol == "frame" and cmd in FRAME_COMMANDS:
+                    # One frame carries every pending actuator command
+                    batch = [(c, entry[2]) for c, entry in self._pending.items() if c in FRAME_COMMANDS]
+                    queued_at = min(self._pending[c][3] for c, _ in batch)
+                size = self._packet_size(batch)
+                self._refill_tokens()
+                needed = size + (self.telemetry_reserve if priority == PRIORITY_TELEMETRY else 0)
+                if priority != PRIORITY_SAFETY and self._tokens < needed:
+                    # Over budget - wait for capacity; a newer or more urgent command may arrive meanwhile
+                    self._queue_cond.wait(timeout=(needed - self._tokens) / self._byte_rate())
+                    continue
+                for c, _ in batch:
+                    del self._pending[c]
+                self._tokens -= size
+                self._in_flight = True
+
+            self._write(batch)
+
+            now = time.monotonic()
+            with self._queue_cond:
+                self._in_flight = False
+                self.sent_counts[PRIORITY_NAMES[priority]] += 1
+                self.bytes_sent += size
+                self._sent_log.append((now, size))
+                self.max_queue_delay = max(self.max_queue_delay, now - queued_at)
+                self._queue_cond.notify_all()
+
+    def _byte_rate(self):
+        return self.baudrate / 10.0 * self.bandwidth_share
+
+    def _refill_tokens(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst_bytes, self._tokens + (now - self._last_refill) * self._byte_rate())
+        self._last_refill = now
+
+    def _write(self, batch):
         with self._lock:
             if self.simulation_mode:
-                self._simulate_command(cmd, data)
-            elif self.protocol == "binary":
-                self._send_binary_command(cmd, data)
+                for cmd, data in batch:
+                    self._simulate_command(cmd, data)
+            elif self.protocol == "frame":
+                self._send_frame_command(dict(batch))
             else:
-                self._send_text_command(cmd, data)
+                for cmd, data in batch:
+                    if self.protocol == "binary":
+                        self._send_binary_command(cmd, data)
+                    else:
+                        self._send_text_command(cmd, data)
+
+    def flush(self, timeout=1.0):
+        """Wait until every queued command has been written; False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._queue_cond:
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue_cond.wait(timeout=remaining)
+        return True
+
+    def get_link_stats(self):
+        """Writer queue and link bandwidth statistics."""
+        now = time.monotonic()
+        with self._queue_cond:
+            while self._sent_log and now - self._sent_log[0][0] > 1.0:
+                self._sent_log.popleft()
+            recent_bytes = sum(size for _, size in self._sent_log)
+            rtts = list(self.rtt_samples)
+            return {
+                'baudrate': self.baudrate,
+                'pending': len(self._pending),
+                'coalesced': self.coalesced,
+                'sent': dict(self.sent_counts),
+                'bytes_sent': self.bytes_sent,
+                'bytes_received': self.bytes_received,
+                'link_bytes_per_s': recent_bytes,
+                'link_utilization': recent_bytes / (self.baudrate / 10.0),
+                'max_queue_delay_ms': self.max_queue_delay * 1000,
+                'link_errors': self.link_errors,
+                'rtt_ms': sum(rtts) / len(rtts) * 1000 if rtts else None,
+                'rtt_max_ms': max(rtts) * 1000 if rtts else None,
+                'telemetry': self.telemetry.get_stats(),
+            }
 
     def _simulate_command(self, cmd, data):
         """Simulate command sending for testing without hardware"""
         if cmd == 0x01:  # Servo
-            command = f"S{data}"
-            print(f"[SerialComm] 🎮 Simülasyon - Servo: {command}")
+            log.debug("🎮 Simülasyon - Servo: S%s", data)
         elif cmd == 0x02:  # Stepper
-            command = f"M{data}"
-            print(f"[SerialComm] 🎮 Simülasyon - Stepper: {command}")
+            log.debug("🎮 Simülasyon - Stepper: M%s", data)
         elif cmd == 0x03:  # Laser
-            command = "Laser AÇ" if data > 0 else "Laser KAPAT"
-            print(f"[SerialComm] 🎮 Simülasyon - {command}")
+            log.debug("🎮 Simülasyon - %s", "Laser AÇ" if data > 0 else "Laser KAPAT")
         else:
-            print(f"[SerialComm] 🎮 Simülasyon - Unknown command: {cmd}, data: {data}")
+            log.warning("🎮 Simülasyon - Unknown command: %s, data: %s", cmd, data)
 
     def _send_binary_command(self, cmd, data):
         """Send binary protocol command (0xAA + CMD + DATA + 0x55)"""
@@ -106,11 +317,29 @@ class SerialComm:
             try:
                 packet = bytearray([0xAA, cmd, data, 0x55])
                 self.ser.write(packet)
-                print(f"[SerialComm] Binary gönderildi: CMD={cmd}, DATA={data}")
             except (serial.SerialException, PermissionError) as e:
-                print(f"[SerialComm] ❌ Binary gönderim hatası: {e}")
+                self.link_errors += 1
+                log.error(f"❌ Binary gönderim hatası: {e}")
+        else:
+            log.warning("⚠️ Port açık değil, simülasyon modunda")
+
+    def _send_frame_command(self, values):
+        """Send servo/stepper/laser values in one frame (0.01° angles, sequence number, CRC-8)"""
+        unknown = [cmd for cmd in values if cmd not in FRAME_COMMANDS]
+        if unknown:
+            log.warning("Unknown command: %s", unknown)
+            return
+        if self.ser and self.ser.is_open:
+            try:
+                self._frame_sequence = (self._frame_sequence + 1) & 0xFF
+                frame = Frame(self._frame_sequence, servo=values.get(SERVO_CMD), stepper=values.get(STEPPER_CMD),
+                              laser=values[LASER_CMD] > 0 if LASER_CMD in values else None)
+                self.ser.write(encode_frame(frame))
+            except (serial.SerialException, PermissionError) as e:
+                self.link_errors += 1
+                log.error(f"❌ Frame gönderim hatası: {e}")
         else:
-            print("[SerialComm] ⚠️ Port açık değil, simülasyon modunda")
+            log.warning("⚠️ Port açık değil, simülasyon modunda")
 
     def _send_text_command(self, cmd, data):
         """Send text protocol command (S30, M135, a, p)"""
@@ -123,44 +352,248 @@ class SerialComm:
                 elif cmd == 0x03:  # Laser
                     command = "a\n" if data > 0 else "p\n"
                 else:
-                    print(f"[SerialComm] Unknown command: {cmd}")
+                    log.warning("Unknown command: %s", cmd)
                     return
                     
                 self.ser.write(command.encode())
-                print(f"[SerialComm] Text gönderildi: {command.strip()}")
             except (serial.SerialException, PermissionError) as e:
-                print(f"[SerialComm] ❌ Text gönderim hatası: {e}")
+                self.link_errors += 1
+                log.error(f"❌ Text gönderim hatası: {e}")
         else:
-            print("[SerialComm] ⚠️ Port açık değil, simülasyon modunda")
+            log.warning("⚠️ Port açık değil, simülasyon modunda")
 
     def read_response(self):
+        """Oldest unread reply line (telemetry excluded), or None - never blocks."""
         if self.simulation_mode:
             return "[SIMULATION] Mock response"
-        
-        if self.ser and self.ser.is_open:
+        try:
+            return self._replies.get_nowait()
+        except queue.Empty:
+            return None
+
+    # --- Device output ---
+
+    def _reader_loop(self):
+        buffer = bytearray()
+        while self._reader_running:
+            if self._discard_partial:
+                self._discard_partial = False
+                buffer.clear()
+            if not self._port_ready():
+                time.sleep(0.05)
+                continue
             try:
-                if self.ser.in_waiting:
-                    response = self.ser.readline().decode(errors='ignore').strip()
-                    print(f"[SerialComm] Gelen cevap: {response}")
-                    return response
-            except (serial.SerialException, PermissionError) as e:
-                print(f"[SerialComm] ❌ Okuma hatası: {e}")
-        return None
+                waiting = self.ser.in_waiting
+                data = self.ser.read(waiting) if waiting else b""
+            except (serial.SerialException, PermissionError, OSError) as e:
+                self.link_errors += 1
+                log.error(f"❌ Okuma hatası: {e}")
+                time.sleep(0.1)
+                continue
+            if not data:
+                time.sleep(0.002)
+                continue
+            received_at = time.time()
+            self.bytes_received += len(data)
+            buffer.extend(data)
+            while True:
+                end = buffer.find(b"\n")
+                if end < 0:
+                    break
+                self._dispatch_line(buffer[:end].decode(errors="ignore").rstrip("\r"), received_at)
+                del buffer[:end + 1]
+            if len(buffer) > self.max_line_length:
+                buffer.clear()
+
+    def _dispatch_line(self, line, received_at):
+        line = NON_PRINTABLE.split(line)[-1].strip()  # keep what follows the last noise byte
+        if not line:
+            return
+        if line.startswith("T "):
+            self.telemetry.add_line(line, received_at)
+            return
+        if self._replies.full():
+            try:
+                self._replies.get_nowait()
+            except queue.Empty:
+                pass
+        self._replies.put_nowait(line)
+
+    def latest_pose(self, max_age=None):
+        """Most recent measured pose (telemetry.Pose), or None without fresh telemetry."""
+        return self.telemetry.latest(self.telemetry_max_age if max_age is None else max_age)
+
+    def pose_at(self, timestamp):
+        """Measured pose at host time `timestamp` (e.g. a frame's capture time), or None if not covered."""
+        return self.telemetry.pose_at(timestamp)
+
+    # --- Link negotiation ---
+
+    def _port_ready(self):
+        return not self.simulation_mode and self.ser is not None and self.ser.is_open
+
+    def _write_line(self, text):
+        """Write one text line outside the command queue."""
+        data = (text + "\n").encode()
+        self.ser.write(data)
+        with self._queue_cond:
+            self.bytes_sent += len(data)
+            self._sent_log.append((time.monotonic(), len(data)))
+
+    def _read_line(self, timeout):
+        """Next reply line from the reader thread, or None after `timeout` seconds."""
+        try:
+            return self._replies.get(timeout=max(0.0, timeout))
+        except queue.Empty:
+            return None
+
+    def _query(self, command, prefix, timeout=None):
+        """
+        Send a text command and wait for the reply line starting with `prefix`.
+        Only the write holds self._lock: queued commands (safety stops
+        included) keep going out while the reply is awaited.
+        """
+        timeout = self.reply_timeout if timeout is None else timeout
+        with self._query_lock:
+            self._discard_partial = True
+            while self.read_response() is not None:
+                pass  # stale replies
+            with self._lock:
+                self._write_line(command)
+            deadline = time.monotonic() + timeout
+            while True:
+                line = self._read_line(deadline - time.monotonic())
+                if line is None:
+                    return None
+                if line.startswith(prefix):
+                    return line
+
+    def _echo_test(self, count):
+        """Echo `count` tokens; records round-trip times. True when all came back intact."""
+        with self._query_lock:
+            for _ in range(count):
+                self._echo_token = (self._echo_token + 1) % 100000
+                token = f"E{self._echo_token:05d}"
+                start = time.monotonic()
+                if self._query(token, "E") != token:
+                    self.link_errors += 1
+                    return False
+                self.rtt_samples.append(time.monotonic() - start)
+        return True
+
+    def _set_port_baud(self, baud):
+        self.ser.baudrate = baud
+        self.baudrate = baud
+
+    def query_capabilities(self):
+        """Ask the device what it supports: {'proto': [...], 'baud': [...]}, or None for older firmware."""
+        if not self._port_ready():
+            return None
+        reply = self._query("?", "CAP")
+        if reply is None:
+            return None
+        capabilities = {}
+        for field in reply.split()[1:]:
+            key, _, values = field.partition("=")
+            capabilities[key] = [int(v) if v.isdigit() else v for v in values.split(",") if v]
+        self.capabilities = capabilities
+        return capabilities
+
+    def negotiate_baud(self, target=115200):
+        """
+        Raise the link rate: query the device's rates, then try them from the
+        highest at or below `target` down. Each candidate is switched on both
+        ends and kept only if an echo test passes - otherwise both ends return
+        to 9600 (the device by its commit timeout). Returns the final rate.
+        """
+        if not self._port_ready():
+            return self.baudrate
+        capabilities = self.query_capabilities()
+        if capabilities is None:
+            log.warning("⚠️ Cihaz baud müzakeresini desteklemiyor, 9600 ile devam")
+            return self.baudrate
+        if self._baud_ceiling is not None:
+            target = min(target, self._baud_ceiling)
+        candidates = sorted((b for b in capabilities.get("baud", []) if DEFAULT_BAUD < b <= target), reverse=True)
+        for rate in candidates:
+            with self._query_lock:
+                # Commands must not go out at the old rate once the device has switched
+                with self._lock:
+                    if self._query(f"B{rate}", "OK") != f"OK B{rate}":
+                        self.link_errors += 1
+                        continue
+                    self._set_port_baud(rate)
+                if self._echo_test(self.echo_count):
+                    log.info(f"⚡ Baud {rate} doğrulandı (RTT {self.rtt_samples[-1] * 1000:.1f} ms)")
+                    break
+                log.warning(f"⚠️ Baud {rate} echo testi başarısız, düşülüyor")
+                with self._lock:
+                    self._set_port_baud(DEFAULT_BAUD)
+            self._await_default_baud()
+        if self.baudrate > DEFAULT_BAUD:
+            self.start_link_monitor()
+        return self.baudrate
+
+    def _await_default_baud(self):
+        """Wait until the device is back at 9600 (it reverts on its own) and answers there."""
+        deadline = time.monotonic() + self.link_timeout + self.baud_commit_timeout
+        time.sleep(self.baud_commit_timeout)
+        while time.monotonic() < deadline:
+            if self._query("?", "CAP") is not None:
+                return True
+            time.sleep(self.reply_timeout)
+        self.link_errors += 1
+        return False
+
+    def start_link_monitor(self):
+        if self._monitor_thread is not None and self._monitor_thread.is_alive():
+            return
+        self._monitor_running = True
+        self._monitor_thread = threading.Thread(target=self._link_monitor_loop, daemon=True)
+        self._monitor_thread.start()
+
+    def _link_monitor_loop(self):
+        failures = 0
+        while self._monitor_running:
+            time.sleep(self.link_check_interval)
+            if not self._monitor_running or not self._port_ready():
+                continue
+            ok = self._echo_test(1)
+            failures = 0 if ok else failures + 1
+            if failures >= self.max_link_failures and self.baudrate > DEFAULT_BAUD:
+                failed = self.baudrate
+                log.warning(f"⚠️ Baud {failed} hatalı ({failures} ping kaybı), düşük hıza geçiliyor")
+                # Never retry the failing rate; the device drops to 9600 on its link watchdog
+                self._baud_ceiling = failed - 1
+                with self._lock:
+                    self._set_port_baud(DEFAULT_BAUD)
+                self._await_default_baud()
+                failures = 0
+                self.negotiate_baud(self._baud_ceiling)
 
     def close(self):
+        self._monitor_running = False
+        # Let queued commands (e.g. a final laser off) go out before the port closes
+        self.flush()
+        self._writer_running = False
+        with self._queue_cond:
+            self._queue_cond.notify_all()
+        self._writer_thread.join(timeout=1.0)
+        self._reader_running = False
+        self._reader_thread.join(timeout=1.0)
         if self.ser and self.ser.is_open:
             try:
                 self.ser.close()
-                print("[SerialComm] ✅ Port kapatıldı.")
+                log.info("✅ Port kapatıldı.")
             except Exception as e:
-                print(f"[SerialComm] ❌ Port kapatma hatası: {e}")
+                log.error(f"❌ Port kapatma hatası: {e}")
         elif self.simulation_mode:
-            print("[SerialComm] 🎮 Simülasyon modu kapatıldı")
+            log.info("🎮 Simülasyon modu kapatıldı")
 
     def set_protocol(self, protocol):
-        """Change protocol between binary and text"""
+        """Change protocol between binary, text and frame"""
         self.protocol = protocol
-        print(f"[SerialComm] Protocol changed to: {protocol}")
+        log.info(f"Protocol changed to: {protocol}")
     
     def is_connected(self):
         """Check if serial connection is active"""
@@ -171,10 +604,10 @@ class SerialComm:
     def reconnect(self):
         """Attempt to reconnect to the serial port"""
         if self.simulation_mode:
-            print("[SerialComm] 🎮 Simülasyon modu - yeniden bağlanma gerekmez")
+            log.info("🎮 Simülasyon modu - yeniden bağlanma gerekmez")
             return
             
-        print("[SerialComm] 🔄 Yeniden bağlanmaya çalışılıyor...")
+        log.info("🔄 Yeniden bağlanmaya çalışılıyor...")
         if self.ser:
             try:
                 self.ser.close()
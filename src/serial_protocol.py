@@ -0,0 +1,401 @@
+"""
+Framed multi-axis binary protocol (the "frame" protocol), shared by the host
+side (SerialComm) and the protocol emulator used in tests. The firmware
+parser in arduino/motor_control.ino mirrors this file.
+
+Frame (8 bytes, little-endian):
+    0     FRAME_START (0xA5)
+    1     sequence number (0-255, wraps)
+    2     flags: bit0 laser on, bit1 servo valid, bit2 stepper valid, bit3 laser valid
+    3-4   servo angle, uint16 in 1/100 degree
+    5-6   stepper angle, uint16 in 1/100 degree
+    7     CRC-8 (polynomial 0x07, init 0x00) of bytes 1-6
+
+Only the fields flagged valid are applied, so one frame can carry any
+subset of servo, stepper and laser.
+
+Link negotiation (text lines, firmware replies end in CRLF):
+    ?            -> CAP proto=text,binary,frame baud=9600,19200,...
+    B<baud>      -> OK B<baud> (sent at the old rate), then the device switches
+    E<token>     -> E<token> (echo); the first echo at a new rate commits it
+The device falls back to DEFAULT_BAUD when a new rate isn't committed within
+BAUD_COMMIT_TIMEOUT, or when nothing valid arrives for LINK_TIMEOUT.
+
+Telemetry (device -> host, every TELEMETRY_INTERVAL, twice as often above 9600):
+    T <millis> <servo> <stepper> <servo target> <stepper target> <laser 0/1>
+with the measured (current) angles first, then the targets being moved to.
+"""
+
+import random
+import re
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+FRAME_START = 0xA5
+FRAME_SIZE = 8
+ANGLE_SCALE = 100  # fixed-point units per degree (0.01 degree resolution)
+MAX_ANGLE = 0xFFFF / ANGLE_SCALE
+
+FLAG_LASER_ON = 0x01
+FLAG_SERVO = 0x02
+FLAG_STEPPER = 0x04
+FLAG_LASER = 0x08
+
+DEFAULT_BAUD = 9600
+SUPPORTED_BAUDS = (9600, 19200, 57600, 115200, 230400)
+BAUD_COMMIT_TIMEOUT = 1.0  # seconds
+LINK_TIMEOUT = 3.0  # seconds
+TELEMETRY_INTERVAL = 0.1  # seconds at DEFAULT_BAUD
+TEXT_LINE_MAX = 24  # longest text command line the firmware buffers
+
+# Legacy single-command binary protocol (0xAA CMD DATA 0x55)
+LEGACY_START = 0xAA
+LEGACY_END = 0x55
+SERVO_CMD = 0x01
+STEPPER_CMD = 0x02
+LASER_CMD = 0x03
+
+
+def crc8(data, crc=0x00):
+    """CRC-8/SMBUS (polynomial x^8 + x^2 + x + 1)."""
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def angle_to_fixed(angle):
+    return max(0, min(0xFFFF, int(round(angle * ANGLE_SCALE))))
+
+
+@dataclass
+class Frame:
+    sequence: int
+    servo: Optional[float] = None  # degrees, None = unchanged
+    stepper: Optional[float] = None
+    laser: Optional[bool] = None
+
+
+def encode_frame(frame: Frame) -> bytes:
+    flags = 0
+    if frame.servo is not None:
+        flags |= FLAG_SERVO
+    if frame.stepper is not None:
+        flags |= FLAG_STEPPER
+    if frame.laser is not None:
+        flags |= FLAG_LASER | (FLAG_LASER_ON if frame.laser else 0)
+    body = struct.pack("<BBHH", frame.sequence & 0xFF, flags,
+                       angle_to_fixed(frame.servo or 0.0), angle_to_fixed(frame.stepper or 0.0))
+    return bytes([FRAME_START]) + body + bytes([crc8(body)])
+
+
+def decode_frame(packet) -> Optional[Frame]:
+    """One FRAME_SIZE packet -> Frame, or None when the start byte or CRC is wrong."""
+    if len(packet) != FRAME_SIZE or packet[0] != FRAME_START or crc8(packet[1:7]) != packet[7]:
+        return None
+    sequence, flags, servo, stepper = struct.unpack("<BBHH", bytes(packet[1:7]))
+    return Frame(
+        sequence,
+        servo=servo / ANGLE_SCALE if flags & FLAG_SERVO else None,
+        stepper=stepper / ANGLE_SCALE if flags & FLAG_STEPPER else None,
+        laser=bool(flags & FLAG_LASER_ON) if flags & FLAG_LASER else None,
+    )
+
+
+class FrameDecoder:
+    """
+    Streaming frame parser: feed() any chunk of received bytes, get the
+    complete, CRC-valid frames back. A bad CRC drops only the start byte and
+    rescans, so the decoder resynchronizes after noise or a partial frame.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.crc_errors = 0
+        self.skipped_bytes = 0
+
+    def feed(self, data) -> List[Frame]:
+        self.buffer.extend(data)
+        frames = []
+        while True:
+            start = self.buffer.find(FRAME_START)
+            if start < 0:
+                self.skipped_bytes += len(self.buffer)
+                self.buffer.clear()
+                return frames
+            if start:
+                self.skipped_bytes += start
+                del self.buffer[:start]
+            if len(self.buffer) < FRAME_SIZE:
+                return frames
+            frame = decode_frame(self.buffer[:FRAME_SIZE])
+            if frame is None:
+                self.crc_errors += 1
+                del self.buffer[:1]
+                continue
+            del self.buffer[:FRAME_SIZE]
+            frames.append(frame)
+
+
+class ProtocolEmulator:
+    """
+    Host-side model of the firmware's command parser (motor_control.ino):
+    text commands (S30, M135, a, p), legacy 4-byte binary packets and frames,
+    with the same angle limits and duplicate-sequence rejection, plus the
+    link negotiation commands and baud watchdog. Text commands are only
+    taken from complete printable lines with a numeric argument, so stray
+    frame bytes never move an axis. Feed it the bytes
+    SerialComm writes and inspect the resulting actuator targets; replies
+    and telemetry collect in `output` as (bytes, baud they were sent at).
+    The measured angles (servo_position, stepper_position) slew towards the
+    targets at servo_rate / stepper_rate degrees per second.
+    """
+
+    SERVO_LIMITS = (0, 60)
+    STEPPER_LIMITS = (0, 300)
+
+    def __init__(self, clock=time.monotonic, baud_commit_timeout=BAUD_COMMIT_TIMEOUT, link_timeout=LINK_TIMEOUT,
+                 telemetry_interval=TELEMETRY_INTERVAL, servo_rate=60.0, stepper_rate=120.0):
+        self.clock = clock
+        self.start_time = clock()
+        self.baud_commit_timeout = baud_commit_timeout
+        self.link_timeout = link_timeout
+        self.baud = DEFAULT_BAUD
+        self.baud_committed = True
+        self.baud_switch_time = 0.0
+        self.last_valid_command = clock()
+        self.output = deque()
+        self.servo = float(self.SERVO_LIMITS[0])
+        self.stepper = float(self.STEPPER_LIMITS[0])
+        self.laser = False
+        self.servo_position = self.servo
+        self.stepper_position = self.stepper
+        self.servo_rate = servo_rate  # degrees/s
+        self.stepper_rate = stepper_rate
+        self.telemetry_interval = telemetry_interval  # None disables telemetry
+        self.last_motion_update = self.start_time
+        self.last_telemetry = self.start_time
+        self.frames = 0
+        self.frames_lost = 0
+        self.duplicates = 0
+        self.crc_errors = 0
+        self.last_sequence = None
+        self._buffer = bytearray()
+
+    def poll(self):
+        """Motion, telemetry and baud watchdog (the firmware runs them every loop pass)."""
+        now = self.clock()
+        self._update_motion(now)
+        link_lost = now - self.last_valid_command > self.link_timeout
+        if link_lost:
+            self.last_sequence = None  # the next frame starts a new host session
+        if self.telemetry_interval is not None:
+            interval = self.telemetry_interval if self.baud == DEFAULT_BAUD else self.telemetry_interval / 2
+            if now - self.last_telemetry >= interval:
+                self.last_telemetry = now
+                self._reply(self.telemetry_line(now))
+        if self.baud == DEFAULT_BAUD:
+            return
+        if (not self.baud_committed and now - self.baud_switch_time > self.baud_commit_timeout) or link_lost:
+            self._switch_baud(DEFAULT_BAUD, committed=True)
+
+    def _update_motion(self, now):
+        dt = now - self.last_motion_update
+        self.last_motion_update = now
+        self.servo_position = self._approach(self.servo_position, self.servo, self.servo_rate * dt)
+        self.stepper_position = self._approach(self.stepper_position, self.stepper, self.stepper_rate * dt)
+
+    @staticmethod
+    def _approach(position, target, max_step):
+        return target if abs(target - position) <= max_step else position + max_step * (1 if target > position else -1)
+
+    def telemetry_line(self, now=None):
+        now = self.clock() if now is None else now
+        return (f"T {int((now - self.start_time) * 1000)} {self.servo_position:.2f} {self.stepper_position:.2f} "
+                f"{self.servo:.2f} {self.stepper:.2f} {int(self.laser)}")
+
+    def _switch_baud(self, baud, committed):
+        self.baud = baud
+        self.baud_committed = committed
+        self.baud_switch_time = self.clock()
+
+    def _reply(self, text):
+        self.output.append(((text + "\r\n").encode(), self.baud))
+
+    def feed(self, data):
+        self.poll()
+        self._buffer.extend(data)
+        while self._buffer:
+            first = self._buffer[0]
+            if first in b"SMap?BE":
+                length = self._text_line_length()
+                if length is None:
+                    return
+                if length:
+                    self._apply_text(self._buffer[:length - 1].decode().strip())
+                    del self._buffer[:length]
+            elif first == LEGACY_START:
+                if len(self._buffer) < 4:
+                    return
+                packet = self._buffer[:4]
+                del self._buffer[:4]
+                if packet[3] == LEGACY_END:
+                    self.last_valid_command = self.clock()
+                    self._apply_legacy(packet[1], packet[2])
+            elif first == FRAME_START:
+                if len(self._buffer) < FRAME_SIZE:
+                    return
+                frame = decode_frame(self._buffer[:FRAME_SIZE])
+                del self._buffer[:FRAME_SIZE]
+                if frame is None:
+                    self.crc_errors += 1
+                else:
+                    self.last_valid_command = self.clock()
+                    self._apply_frame(frame)
+            else:
+                del self._buffer[:1]  # noise
+
+    def _text_line_length(self):
+        """
+        Length of the complete text line at the start of the buffer (newline
+        included), None while it is still arriving. A non-printable byte or
+        an overlong line abandons it: the printable prefix is dropped, 0 is
+        returned and the byte is left for the binary parsers.
+        """
+        for index, byte in enumerate(self._buffer):
+            if byte == 0x0A:
+                return index + 1
+            if (byte < 0x20 or byte > 0x7E) and byte != 0x0D or index >= TEXT_LINE_MAX:
+                del self._buffer[:index]
+                return 0
+        return None
+
+    def _apply_text(self, command):
+        value = self._parse_number(command[1:])
+        if command not in ("?", "a", "p") and not (command[:1] in ("B", "E", "S", "M") and value is not None):
+            return  # garbage is not a command and doesn't feed the link watchdog
+        self.last_valid_command = self.clock()
+        if command == "?":
+            self.last_sequence = None  # the host queries capabilities when it connects
+            self._reply("CAP proto=text,binary,frame baud=" + ",".join(str(b) for b in SUPPORTED_BAUDS))
+        elif command.startswith("B"):
+            baud = int(value)
+            if baud in SUPPORTED_BAUDS:
+                self._reply(f"OK B{baud}")
+                self._switch_baud(baud, committed=baud == DEFAULT_BAUD)
+            else:
+                self._reply("ERR B")
+        elif command.startswith("E"):
+            self._reply(command)
+            self.baud_committed = True
+        elif command.startswith("S"):
+            self._set_servo_target(value)
+        elif command.startswith("M"):
+            self._set_stepper_target(value)
+        elif command in ("a", "p"):
+            self.laser = command == "a"
+
+    def _apply_legacy(self, cmd, data):
+        if cmd == SERVO_CMD:
+            self._set_servo_target(data)
+        elif cmd == STEPPER_CMD:
+            self._set_stepper_target(data)
+        elif cmd == LASER_CMD:
+            self.laser = data > 0
+
+    def _apply_frame(self, frame):
+        if frame.sequence == self.last_sequence:
+            self.duplicates += 1
+            return
+        if self.last_sequence is not None:
+            self.frames_lost += (frame.sequence - self.last_sequence - 1) & 0xFF
+        self.last_sequence = frame.sequence
+        self.frames += 1
+        if frame.servo is not None:
+            self._set_servo_target(frame.servo)
+        if frame.stepper is not None:
+            self._set_stepper_target(frame.stepper)
+        if frame.laser is not None:
+            self.laser = frame.laser
+
+    def _set_servo_target(self, angle):
+        self.servo = self._clamp(angle, self.SERVO_LIMITS)
+
+    def _set_stepper_target(self, angle):
+        self.stepper = self._clamp(angle, self.STEPPER_LIMITS)
+
+    @staticmethod
+    def _parse_number(text):
+        """`text` as a number ("30", "-5", "30.0"), None for anything else (the firmware's parseNumber)."""
+        match = re.fullmatch(r"-?\d{1,6}(?:\.\d*)?", text)
+        return float(match.group()) if match else None
+
+    @staticmethod
+    def _clamp(value, limits):
+        return float(min(max(value, limits[0]), limits[1]))
+
+
+class EmulatedPort:
+    """
+    pyserial-like port wired to a ProtocolEmulator. Bytes only arrive intact
+    when the host's `baudrate` matches the rate they were sent at (otherwise
+    they arrive as zeros, which the parsers discard as noise). Above
+    `max_reliable_baud` a fraction `error_rate` of the bytes get a flipped bit.
+    """
+
+    def __init__(self, device: ProtocolEmulator, baudrate=DEFAULT_BAUD, max_reliable_baud=None, error_rate=0.05,
+                 seed=0):
+        self.device = device
+        self.baudrate = baudrate
+        self.max_reliable_baud = max_reliable_baud
+        self.error_rate = error_rate
+        self.is_open = True
+        self.timeout = 0.1
+        self._rng = random.Random(seed)
+        self._rx = bytearray()
+        self._lock = threading.Lock()  # the host writes and reads from different threads
+
+    def _transfer(self, data, sent_at):
+        if sent_at != self.baudrate:
+            return bytes(len(data))
+        if self.max_reliable_baud is not None and sent_at > self.max_reliable_baud:
+            return bytes(b ^ (1 << self._rng.randrange(8)) if self._rng.random() < self.error_rate else b
+                         for b in data)
+        return bytes(data)
+
+    def write(self, data):
+        with self._lock:
+            self.device.feed(self._transfer(data, self.device.baud))
+        return len(data)
+
+    def _receive(self):
+        with self._lock:
+            self.device.poll()
+            while self.device.output:
+                data, sent_at = self.device.output.popleft()
+                self._rx.extend(self._transfer(data, sent_at))
+
+    @property
+    def in_waiting(self):
+        self._receive()
+        return len(self._rx)
+
+    def read(self, size=1):
+        self._receive()
+        with self._lock:
+            data = bytes(self._rx[:size])
+            del self._rx[:size]
+        return data
+
+    def reset_input_buffer(self):
+        self._receive()
+        with self._lock:
+            self._rx.clear()
+
+    def close(self):
+        self.is_open = False
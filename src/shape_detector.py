@@ -1 +1,177 @@
- 
\ No newline at end of file
+import csv
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from frame_cache import FrameCache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COLOR_DATA_PATH = os.path.join(BASE_DIR, 'labeled_colorss.csv')
+
+
+@dataclass(frozen=True)
+class ColorRange:
+    """HSV range of one balloon color, in OpenCV units (H 0-180, S/V 0-255)."""
+    name: str
+    hue_low: float  # may be < 0 or > 180 - the hue range wraps around
+    hue_high: float
+    s_min: float
+    v_min: float
+
+    def mask(self, hsv):
+        hue = hsv[:, :, 0]
+        in_sv = cv2.inRange(hsv, (0.0, self.s_min, self.v_min), (180.0, 255.0, 255.0))
+        lo, hi = self.hue_low % 180, self.hue_high % 180
+        if self.hue_high - self.hue_low >= 180:
+            in_hue = np.full(hue.shape, 255, np.uint8)
+        elif lo <= hi:
+            in_hue = cv2.inRange(hue, lo, hi)
+        else:
+            in_hue = cv2.inRange(hue, lo, 180) | cv2.inRange(hue, 0, hi)
+        return in_sv & in_hue
+
+
+def learn_color_ranges(path=COLOR_DATA_PATH, percentile=2.0, hue_margin=10.0, sv_margin=0.75) -> Dict[str, ColorRange]:
+    """
+    HSV ranges per label from the labelled ROI color table (h/s/v columns are
+    0-1 ROI means). Hue uses circular statistics so red wraps around 0/180;
+    S/V only get a lower bound, loosened by sv_margin since ROI means include
+    the darker, less saturated balloon edges.
+    """
+    samples: Dict[str, List[Tuple[float, float, float]]] = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            samples.setdefault(row['label'].strip(), []).append(
+                (float(row['h']) * 180, float(row['s']) * 255, float(row['v']) * 255))
+
+    ranges = {}
+    for label, values in samples.items():
+        hsv = np.array(values)
+        angles = hsv[:, 0] * (2 * math.pi / 180)
+        center = math.atan2(np.sin(angles).mean(), np.cos(angles).mean()) * 180 / (2 * math.pi) % 180
+        offsets = (hsv[:, 0] - center + 90) % 180 - 90
+        ranges[label] = ColorRange(
+            label,
+            hue_low=float(center + np.percentile(offsets, percentile) - hue_margin),
+            hue_high=float(center + np.percentile(offsets, 100 - percentile) + hue_margin),
+            s_min=float(np.percentile(hsv[:, 1], percentile)) * sv_margin,
+            v_min=float(np.percentile(hsv[:, 2], percentile)) * sv_margin,
+        )
+    return ranges
+
+
+@dataclass
+class Candidate:
+    bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2 in full-frame pixels
+    label: str  # "red_balloon" / "blue_balloon"
+    score: float  # 0..1 roundness score
+    circularity: float  # 4πA/P²
+    fill: float  # blob area / fitted ellipse area
+
+
+class ShapeDetector:
+    """
+    Cheap color/shape pre-detector for balloons.
+    Works on a frame downscaled to `work_width`: HSV thresholds learned from
+    the labelled color table, a morphological open, contours, then
+    circularity and ellipse-fit checks. Proposes candidate regions for YOLO
+    and can also be used on its own as a degraded detector.
+    """
+
+    def __init__(self, color_ranges=None, work_width=160, min_area=12, min_circularity=0.55,
+                 min_fill=0.7, max_aspect=2.0):
+        self.color_ranges = color_ranges or learn_color_ranges()
+        self.work_width = work_width  # pixels; the frame is downscaled to this width
+        self.min_area = min_area  # blob area in downscaled pixels
+        self.min_circularity = min_circularity
+        self.min_fill = min_fill  # how well the blob fills its fitted ellipse
+        self.max_aspect = max_aspect  # major / minor ellipse axis
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self.last_latency = 0.0
+
+    def detect(self, frame) -> List[Candidate]:
+        """Balloon candidates in a BGR frame or FrameCache (sharing its downscaled HSV)."""
+        start = time.perf_counter()
+        frames = FrameCache.of(frame)
+        height, width = frames.shape[:2]
+        scale = min(1.0, self.work_width / width)
+        hsv = frames.get("hsv", self.work_width)
+
+        candidates = []
+        for name, color_range in self.color_ranges.items():
+            mask = cv2.morphologyEx(color_range.mask(hsv), cv2.MORPH_OPEN, self.kernel)
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+            for contour in contours:
+                candidate = self._check_shape(contour, f"{name}_balloon", scale, width, height)
+                if candidate is not None:
+                    candidates.append(candidate)
+        self.last_latency = time.perf_counter() - start
+        return candidates
+
+    def _check_shape(self, contour, label, scale, width, height):
+        area = cv2.contourArea(contour)
+        if area < self.min_area or len(contour) < 5:
+            return None
+        perimeter = cv2.arcLength(contour, True)
+        circularity = 4 * math.pi * area / (perimeter * perimeter) if perimeter > 0 else 0.0
+        (_, _), (axis_a, axis_b), _ = cv2.fitEllipse(contour)
+        major, minor = max(axis_a, axis_b), min(axis_a, axis_b)
+        if minor <= 0:
+            return None
+        fill = area / (math.pi * major * minor / 4)
+        if circularity < self.min_circularity or fill < self.min_fill or major / minor > self.max_aspect:
+            return None
+
+        x, y, w, h = cv2.boundingRect(contour)
+        bbox = (max(0, int(x / scale)), max(0, int(y / scale)),
+                min(width, int(math.ceil((x + w) / scale))), min(height, int(math.ceil((y + h) / scale))))
+        score = min(1.0, circularity) * min(1.0, fill)
+        return Candidate(bbox, label, score, circularity, fill)
+
+    @staticmethod
+    def proposal_region(candidates, frame_shape, scale=2.0, multiple=32):
+        """One crop (x1, y1, x2, y2) covering every candidate with margin, or None for no candidates."""
+        if not candidates:
+            return None
+        height, width = frame_shape[:2]
+        boxes = np.array([c.bbox for c in candidates], dtype=float)
+        x1, y1 = boxes[:, 0].min(), boxes[:, 1].min()
+        x2, y2 = boxes[:, 2].max(), boxes[:, 3].max()
+        margin_x = (scale - 1) / 2 * max(x2 - x1, multiple)
+        margin_y = (scale - 1) / 2 * max(y2 - y1, multiple)
+        crop_w = min(width, int(math.ceil((x2 - x1 + 2 * margin_x) / multiple) * multiple))
+        crop_h = min(height, int(math.ceil((y2 - y1 + 2 * margin_y) / multiple) * multiple))
+        left = int(min(max((x1 + x2 - crop_w) / 2, 0), width - crop_w))
+        top = int(min(max((y1 + y2 - crop_h) / 2, 0), height - crop_h))
+        return left, top, left + crop_w, top + crop_h
+
+
+if __name__ == "__main__":
+    # Degraded mode on its own: live balloon detection from the camera without YOLO
+    detector = ShapeDetector()
+    for name, color_range in detector.color_ranges.items():
+        print(f"[ShapeDetector] 🎨 {name}: H {color_range.hue_low:.0f}..{color_range.hue_high:.0f}, "
+              f"S >= {color_range.s_min:.0f}, V >= {color_range.v_min:.0f}")
+    cap = cv2.VideoCapture(0)
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        for candidate in detector.detect(frame):
+            x1, y1, x2, y2 = candidate.bbox
+            color = (0, 0, 255) if candidate.label.startswith("red") else (255, 0, 0)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+            cv2.putText(frame, f"{candidate.label} {candidate.score:.2f}", (x1, max(0, y1 - 8)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        cv2.putText(frame, f"{detector.last_latency * 1000:.1f} ms", (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                    (0, 255, 0), 2)
+        cv2.imshow("ShapeDetector", frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+    cap.release()
+    cv2.destroyAllWindows()
@@ -1,32 +1,33 @@
 import time
 import threading
 import math
+from collections import deque
 import numpy as np
 import cv2
-from typing import List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Optional
 from enum import Enum
+from scan_planner import ScanPlanner
+from search_heatmap import SearchHeatmap
+from tws_scheduler import TrackWhileScanScheduler, TaskKind
+from pid_controller import VisualServoController, pixel_error_to_angles
+from target_registry import TargetRegistry, TrackRecord
+from kill_assessment import KillAssessor, KillOutcome
+from autonomous_types import AutonomousSnapshot, AutonomousState
 
 class TargetType(Enum):
     ENEMY = "red_balloon"  # Red balloon = enemy to destroy
     FRIENDLY = "blue_balloon"  # Blue balloon = friendly
     UNKNOWN = "unknown"
 
-@dataclass
-class BalloonTarget:
-    track_id: int
-    bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
-    center: Tuple[int, int]  # x, y center
-    target_type: TargetType
-    confidence: float
-    last_seen: float
-    priority: int = 0
-
 class SimpleAutonomousMode:
     """
     Simple autonomous mode for air defense system.
     Self-contained with built-in defaults - no user input required.
     Features: detect, scan, track, and act autonomously.
+    
+    The control thread is the only owner of the state machine
+    (SCAN -> LOCK -> FIRE -> ASSESS). Other threads (the GUI) only read the
+    AutonomousSnapshot it publishes after every tick.
     """
     
     def __init__(self, serial_comm, laser_control, camera_manager, motor_control):
@@ -52,37 +53,85 @@ class SimpleAutonomousMode:
         self.crosshair_y = 240
         
         # Target tracking (built-in defaults)
-        self.targets: List[BalloonTarget] = []
-        self.current_target: Optional[BalloonTarget] = None
         self.target_lost_timeout = 2.0  # seconds
+        self.targets = TargetRegistry(timeout=self.target_lost_timeout)  # Persistent records by track_id
+        self.current_target: Optional[TrackRecord] = None
+        self._last_tracks = None  # Track list already folded into the registry
+        self._frame = None  # Frame of the current control tick
+        self._frame_capture_time = None  # Capture time of the frame the current tracks came from
+        self._frame_track_ids = set()  # Track ids present in the latest camera frame
+        self._new_frame = False  # True when this tick brought a new camera frame
         self.tracking_threshold = 0.6  # confidence threshold
         
-        # Spiral scanning parameters (MUCH SLOWER for YOLO detection)
-        self.spiral_center_servo = 30  # Center servo position
-        self.spiral_center_stepper = 150  # Center stepper position
-        self.spiral_radius = 0  # Current spiral radius
-        self.spiral_angle = 0  # Current spiral angle (radians)
-        self.spiral_radius_step = 0.2  # MUCH SLOWER - reduced from 0.5
-        self.spiral_angle_step = 0.05  # MUCH SLOWER - reduced from 0.1
-        self.max_spiral_radius = 15  # Reduced from 20 - smaller scan area
-        self.spiral_reset_threshold = 20  # Reduced from 25
-        
-        # Movement control (MUCH SLOWER for YOLO detection)
-        self.movement_speed = 0.5  # MUCH SLOWER - reduced from 1.0
-        self.movement_interval = 0.2  # MUCH SLOWER - increased from 0.05 (5x slower)
+        # Coverage scanning (replaces the old center spiral)
+        self.scan_planner = ScanPlanner(servo_limits=(self.servo_min, self.servo_max),
+                                        stepper_limits=(self.stepper_min, self.stepper_max))
+        self.scan_waypoints = self.scan_planner.plan(start=(self.current_servo_angle, self.current_stepper_angle))
+        self.scan_index = 0  # Next waypoint to visit
+        
+        # Learned target likelihood - dwell longer where targets usually appear
+        self.search_heatmap = SearchHeatmap.for_planner(self.scan_planner)
+        self.scan_dwell = self.search_heatmap.dwell_times(self.scan_waypoints, self.scan_planner.dwell_time)
+        self.last_exposure_time = None  # Last time camera exposure was added to the heatmap
+        
+        # Track-while-scan: interleave coverage, revisits of known tracks and engagement
+        self.tws = TrackWhileScanScheduler()
+        self.tws.set_coverage_tiles(self.scan_waypoints)
+        self.revisit_track_id = None  # Track being revisited (REVISIT state)
+        self.glance_track_id = None  # Engagement to return to after a GLANCE
+        self.scan_next_move_time = 0  # When the current tile has been held long enough
+        
+        # Stop-and-stare: leave a tile as soon as enough settled, sharp frames were processed
+        self.stop_and_stare = True  # False -> hold every tile for its fixed dwell time
+        self.stare_timeout = 1.0  # seconds to wait for a sharp frame before moving on anyway
+        self.stare_frames = 0  # Processed frames the current tile still needs (0 = timed hold)
+        self.stare_since = 0  # Frames captured from here on count for the current tile
+        
+        # Lost-target reacquisition (local search before falling back to the global scan)
+        # Processed frames in a row without the current target before it counts as lost.
+        # Counted in frames, not seconds: gate and cascade skips stretch the gap between them
+        self.reacquire_grace_frames = 2
+        self._processed_frame_times = deque(maxlen=self.reacquire_grace_frames)  # Latest processed frames
+        self.reacquire_timeout = 3.0  # seconds of local search before the global scan resumes
+        self.reacquire_rings = 1  # rings of tiles searched around the predicted position
+        self.reacquire_target_id = None
+        self.reacquire_offsets = None  # Search tile offsets around the predicted position
+        self.reacquire_index = 0
+        self.reacquire_start_time = 0
+        self.reacquire_next_move_time = 0
+        self.reacquire_origin = (0.0, 0.0)  # Predicted (servo, stepper) of the target at loss time
+        self.reacquire_rate = (0.0, 0.0)  # Predicted angular velocity of the target (degrees/s)
+        self._pose_history = deque(maxlen=5)  # (time, servo, stepper) while tracking
+        
+        # Movement control
+        self.movement_speed = 12.0  # Safety clamp per control tick (degrees)
+        self.movement_interval = 0.1  # Tracking update at least this often, even without a new frame
+        self.engaged_loop_interval = 0.03  # Faster control ticks while tracking-window inference runs
         self.last_movement_time = time.time()
         self.movement_tolerance = 0.3  # More precise positioning
         
+        # Visual-servo tracking (PID + target velocity feedforward)
+        self.visual_servo = VisualServoController()
+        self.visual_servo_target_id = None  # Track the controller state belongs to
+        
         # Auto-fire settings (built-in defaults)
         self.auto_fire_enabled = True
         self.auto_fire_delay = 0.5  # seconds between shots
         self.last_auto_fire_time = time.time()
         self.auto_fire_range = 50  # pixels from crosshair center
+        self.glance_guard = 2 * self.auto_fire_range  # No coverage glances this close to firing (pixels)
+        
+        # Post-fire kill assessment
+        self.kill_assessor = KillAssessor()
+        self.killed_ids = set()  # Tracks confirmed killed - never engaged again
         
         # Autonomous mode state
         self.is_active = False
         self.running = False
         self.control_thread = None
+        self.state = AutonomousState.IDLE  # Written by the control thread only
+        self.state_entered_time = time.time()
+        self._snapshot = AutonomousSnapshot()  # Replaced atomically, never mutated
         
         # Performance tracking
         self.fps_counter = 0
@@ -93,15 +142,27 @@ class SimpleAutonomousMode:
         if self.is_active:
             print("[SimpleAutonomous] ⚠️ Autonomous mode already active")
             return
+        if self.control_thread and self.control_thread.is_alive():
+            # The previous loop still owns the state until it has published IDLE
+            self.control_thread.join(timeout=1.0)
+            if self.control_thread.is_alive():
+                print("[SimpleAutonomous] ⚠️ Previous control loop still stopping - try again")
+                return
             
         self.is_active = True
         self.running = True
         
         # Initialize camera frame dimensions
-        if self.camera_manager.frame is not None:
-            self.frame_height, self.frame_width = self.camera_manager.frame.shape[:2]
-            self.crosshair_x = self.frame_width // 2
-            self.crosshair_y = self.frame_height // 2
+        frame, _, _ = self.camera_manager.get_frame()
+        self._update_frame_dimensions(frame)
+        
+        self.killed_ids.clear()
+        self._processed_frame_times = deque(maxlen=self.reacquire_grace_frames)
+        self.kill_assessor.cancel()
+        self.last_exposure_time = None
+        self.tws.tracks.clear()
+        self._set_state(AutonomousState.SCAN)
+        self._publish_snapshot()
         
         # Start control thread
         self.control_thread = threading.Thread(target=self._autonomous_loop, daemon=True)
@@ -112,53 +173,83 @@ class SimpleAutonomousMode:
         print(f"[SimpleAutonomous] 🎯 Crosshair: ({self.crosshair_x}, {self.crosshair_y})")
         
     def stop_autonomous_mode(self):
-        """Stop autonomous mode."""
+        """Stop autonomous mode. The control thread publishes IDLE on its way out."""
         self.is_active = False
         self.running = False
         
-        if self.control_thread:
+        if self.control_thread and self.control_thread is not threading.current_thread():
             self.control_thread.join(timeout=1.0)
-            
+            if self.control_thread.is_alive():
+                print("[SimpleAutonomous] ⚠️ Control loop still finishing its tick - it goes IDLE on exit")
+                
+        # Hand the axes back without an in-flight slew streaming under the joystick
+        self._cancel_motion()
+                
         # Stop laser
         if self.laser_control:
-            self.laser_control.stop_laser()
+            self.laser_control.turn_off()
             
         print("[SimpleAutonomous] 🛑 Autonomous mode stopped")
         
     def _autonomous_loop(self):
-        """Main autonomous control loop - makes all decisions automatically."""
+        """Main autonomous control loop - the single owner of the state machine."""
+        try:
+            self._run_control_loop()
+        finally:
+            self._leave_autonomous_mode()
+            
+    def _leave_autonomous_mode(self):
+        """Exit path of the control thread: go IDLE and keep what was learned."""
+        self._cancel_motion()  # a slew started by the last tick
+        self._set_state(AutonomousState.IDLE)
+        self._publish_snapshot()
+        
+        # Keep what was learned about target locations for the next session
+        try:
+            self.search_heatmap.save()
+        except Exception as e:
+            print(f"[SimpleAutonomous] ❌ Error saving search heatmap: {e}")
+            
+    def _cancel_motion(self):
+        if hasattr(self.motor_control, 'cancel_motion'):
+            self.motor_control.cancel_motion()
+            
+    def _run_control_loop(self):
+        """Control ticks until stopped."""
         while self.running and self.is_active:
             try:
+                # One consistent frame/tracks/capture-time read per tick
+                frame, tracks, capture_time = self.camera_manager.get_frame()
+                
                 # Update frame dimensions if needed
-                self._update_frame_dimensions()
+                self._update_frame_dimensions(frame)
                 
                 # Process camera frame and detect targets
-                self._process_camera_frame()
-                
-                # Execute appropriate action based on targets
-                if self.current_target:
-                    self._track_target()
-                else:
-                    self._execute_scanning()
+                self._process_camera_frame(frame, tracks, capture_time)
+                self._record_search_exposure(frame)
                 
-                # Auto-fire logic
-                if self.auto_fire_enabled and self.current_target:
-                    self._auto_fire_logic()
+                # Advance the state machine and publish the result
+                self._step_state_machine()
+                self._publish_snapshot()
                 
                 # Update performance metrics
                 self._update_performance_metrics()
                 
-                # MUCH SLOWER loop for YOLO detection - 10 FPS instead of 50 FPS
-                time.sleep(0.1)  # 10 FPS control loop (5x slower)
+                # MUCH SLOWER loop for YOLO detection - 10 FPS instead of 50 FPS,
+                # except while engaging, when crop inference delivers frames faster
+                if self.state in (AutonomousState.LOCK, AutonomousState.FIRE, AutonomousState.ASSESS):
+                    time.sleep(self.engaged_loop_interval)
+                else:
+                    time.sleep(0.1)  # 10 FPS control loop (5x slower)
                 
             except Exception as e:
                 print(f"[SimpleAutonomous] ❌ Error in autonomous loop: {e}")
                 time.sleep(0.2)  # Slower error recovery
                 
-    def _update_frame_dimensions(self):
+    def _update_frame_dimensions(self, frame):
         """Update frame dimensions from camera."""
-        if self.camera_manager.frame is not None:
-            height, width = self.camera_manager.frame.shape[:2]
+        if frame is not None:
+            height, width = frame.shape[:2]
             if width != self.frame_width or height != self.frame_height:
                 self.frame_width = width
                 self.frame_height = height
@@ -166,45 +257,179 @@ class SimpleAutonomousMode:
                 self.crosshair_y = height // 2
                 print(f"[SimpleAutonomous] 📐 Updated frame: {width}x{height}")
                 
-    def _process_camera_frame(self):
-        """Process camera frame and detect balloon targets."""
-        if self.camera_manager.frame is None:
+    def _process_camera_frame(self, frame, tracks, capture_time=None):
+        """Fold new camera detections into the target registry (`capture_time`: when the tracks' frame was captured)."""
+        self._new_frame = False
+        if frame is None:
             return
             
-        # Get current tracks from camera manager
-        tracks = self.camera_manager.tracks
-        
-        # Update targets list
+        self._frame = frame
         current_time = time.time()
-        new_targets = []
-        
-        for track in tracks:
-            # Check if this is a balloon detection
-            if 'label' in track and 'balloon' in track['label'].lower():
-                bbox = track['bbox']
-                center_x = (bbox[0] + bbox[2]) // 2
-                center_y = (bbox[1] + bbox[3]) // 2
-                
-                # Determine target type based on color analysis
-                target_type = self._classify_balloon_color(track)
-                
-                # Create balloon target
-                balloon_target = BalloonTarget(
-                    track_id=track['track_id'],
-                    bbox=bbox,
-                    center=(center_x, center_y),
-                    target_type=target_type,
-                    confidence=track.get('confidence', 0.0),
-                    last_seen=current_time,
-                    priority=1 if target_type == TargetType.ENEMY else 0
-                )
-                
-                new_targets.append(balloon_target)
         
-        # Update targets list and find current target
-        self.targets = new_targets
+        # The camera publishes a new list per processed frame; re-reading the
+        # same list is not a new sighting and must not refresh last_seen
+        if tracks is not self._last_tracks:
+            self._last_tracks = tracks
+            self._new_frame = True
+            self._processed_frame_times.append(current_time)
+            self._frame_capture_time = capture_time
+            self._frame_track_ids = {track['track_id'] for track in tracks}
+            for track in tracks:
+                if track['track_id'] in self.killed_ids:
+                    continue
+                # Check if this is a balloon detection
+                if 'label' in track and 'balloon' in track['label'].lower():
+                    target_type = self._classify_balloon_color(track)
+                    record = self.targets.observe(
+                        track['track_id'], track['bbox'], current_time,
+                        target_type=target_type,
+                        label=track['label'],
+                        confidence=track.get('confidence') or 0.0,
+                        priority=1 if target_type == TargetType.ENEMY else 0
+                    )
+                    pose, rate = self._target_angles(record)
+                    if record.hits == 1:
+                        self.search_heatmap.record_detection(*pose)
+                    self.tws.update_track(record.track_id, pose, rate,
+                                          threat=self.tws.THREAT_BY_TYPE.get(target_type.value, 0.5),
+                                          now=current_time)
+        
+        # Update targets and find current target
         self._update_current_target()
         
+    def _target_angles(self, record):
+        """Turret angles (servo, stepper) of a target and its angular velocity in degrees/s."""
+        servo_offset, stepper_offset = pixel_error_to_angles(record.smoothed_center[0] - self.crosshair_x,
+                                                             record.smoothed_center[1] - self.crosshair_y,
+                                                             self.frame_width, self.frame_height)
+        
+        # World angular velocity = turret rate + target motion within the image
+        servo_drift, stepper_drift = pixel_error_to_angles(record.velocity[0], record.velocity[1],
+                                                           self.frame_width, self.frame_height)
+        servo_rate, stepper_rate = self._turret_rate()
+        # Offsets are relative to where the turret actually pointed when the frame was captured
+        servo_base, stepper_base = (self._measured_pose(self._frame_capture_time)
+                                    or (self.current_servo_angle, self.current_stepper_angle))
+        return ((servo_base + servo_offset, stepper_base + stepper_offset),
+                (servo_rate + servo_drift, stepper_rate + stepper_drift))
+        
+    def _record_search_exposure(self, frame):
+        """Credit the heatmap with the time the camera looked at the current pose."""
+        now = time.time()
+        if frame is not None and self.last_exposure_time is not None:
+            # Cap the gap so a stalled loop doesn't count as observation time
+            self.search_heatmap.record_exposure(self.current_servo_angle, self.current_stepper_angle,
+                                                min(now - self.last_exposure_time, 0.5), now=now)
+        self.last_exposure_time = now
+        
+    def _set_state(self, state):
+        """Enter a new state (control thread only)."""
+        if state != self.state:
+            self.state = state
+            self.state_entered_time = time.time()
+            self._configure_vision(state)
+            
+    def _configure_vision(self, state):
+        """Wide, cheap detection while searching; precise boxes while engaging."""
+        engaging = state in (AutonomousState.LOCK, AutonomousState.FIRE, AutonomousState.ASSESS)
+        if hasattr(self.camera_manager, 'inference_gate'):
+            # Servoing moves the turret continuously - let the gate's tracking policy apply
+            self.camera_manager.inference_gate.tracking = engaging
+        if hasattr(self.camera_manager, 'set_inference_profile') and state != AutonomousState.IDLE:
+            self.camera_manager.set_inference_profile("track" if engaging else "search")
+        if hasattr(self.camera_manager, 'set_tracking_target') and not engaging:
+            self.camera_manager.set_tracking_target(None)
+            
+    def _step_state_machine(self):
+        """Run one tick of SCAN/REVISIT -> LOCK -> FIRE -> ASSESS."""
+        now = time.time()
+        self.tws.charge(self._task_kind(self.state), now)
+        
+        if self.state == AutonomousState.FIRE:
+            self._set_state(AutonomousState.ASSESS)
+            
+        if self.state == AutonomousState.ASSESS:
+            if self._assess_shot() == KillOutcome.PENDING:
+                # Keep the turret on the target while the shot is judged
+                if self.current_target:
+                    self._track_target()
+                return
+            # Outcome known - move on in this same tick
+            
+        if self.state == AutonomousState.GLANCE:
+            # Hold the glance tile, then go back to the engaged target
+            if not self._tile_held(self.scan_next_move_time, now):
+                return
+            estimate = self.tws.tracks.get(self.glance_track_id)
+            if estimate is not None and self.glance_track_id not in self.killed_ids:
+                self._begin_reacquisition(estimate)
+            else:
+                self._set_state(AutonomousState.SCAN)
+                
+        if not self.current_target:
+            if self.state in (AutonomousState.LOCK, AutonomousState.ASSESS):
+                # Killed targets are already gone from the scheduler
+                lost = self.tws.tracks.get(self.visual_servo_target_id)
+                if lost is not None:
+                    self._begin_reacquisition(lost)
+            if self.state == AutonomousState.REACQUIRE and self._execute_reacquisition():
+                return
+            if self.state not in (AutonomousState.SCAN, AutonomousState.REVISIT):
+                self._set_state(AutonomousState.SCAN)
+            self._execute_scanning()
+            return
+            
+        if self.state == AutonomousState.REACQUIRE:
+            print(f"[SimpleAutonomous] ✅ Reacquired target {self.current_target.track_id} "
+                  f"in {time.time() - self.reacquire_start_time:.2f}s")
+            
+        # Coverage glance when the engagement has starved the scan
+        if (self.state == AutonomousState.LOCK
+                and self._distance_to_crosshair(self.current_target.center) > self.glance_guard
+                and self.tws.next_task(now, engaged_id=self.current_target.track_id).kind == TaskKind.SCAN):
+            self._begin_glance()
+            return
+            
+        self._set_state(AutonomousState.LOCK)
+        self._track_target()
+        
+        # Auto-fire logic
+        if self.auto_fire_enabled and self._auto_fire_logic():
+            self._set_state(AutonomousState.FIRE)
+            
+    @staticmethod
+    def _task_kind(state):
+        """Time-budget category of a state."""
+        if state in (AutonomousState.SCAN, AutonomousState.GLANCE, AutonomousState.IDLE):
+            return TaskKind.SCAN
+        if state == AutonomousState.REVISIT:
+            return TaskKind.REVISIT
+        return TaskKind.ENGAGE
+        
+    def _begin_glance(self):
+        """Leave the engaged target for one coverage tile."""
+        self.glance_track_id = self.current_target.track_id
+        self._set_state(AutonomousState.GLANCE)
+        self._next_coverage_tile()
+        print(f"[SimpleAutonomous] 👀 Coverage glance while engaging target {self.glance_track_id}")
+        
+    def _assess_shot(self):
+        """Feed the latest frame to the kill assessor and act on its verdict."""
+        track_id = self.kill_assessor.track_id
+        record = self.targets.get(track_id)
+        bbox = record.bbox if record is not None and track_id in self._frame_track_ids else None
+        outcome = self.kill_assessor.update(bbox, self._frame, time.time(), new_frame=self._new_frame)
+        
+        if outcome == KillOutcome.KILLED:
+            self.killed_ids.add(track_id)
+            self.targets.remove(track_id)
+            self.tws.drop_track(track_id)
+            self._update_current_target()
+            print(f"[SimpleAutonomous] 💥 Target {track_id} killed ({self.kill_assessor.reason})")
+        elif outcome == KillOutcome.MISSED:
+            print(f"[SimpleAutonomous] ❌ Shot at target {track_id} missed")
+        return outcome
+        
     def _classify_balloon_color(self, track):
         """Classify balloon color based on detection results."""
         label = track.get('label', '').lower()
@@ -220,22 +445,17 @@ class SimpleAutonomousMode:
         """Update current target based on priority and tracking status."""
         current_time = time.time()
         
-        # Remove old targets
-        self.targets = [t for t in self.targets if current_time - t.last_seen < self.target_lost_timeout]
-        
-        if not self.targets:
-            self.current_target = None
-            return
-            
-        # Find highest priority enemy target
-        enemy_targets = [t for t in self.targets if t.target_type == TargetType.ENEMY]
-        
-        if enemy_targets:
-            # Select closest enemy target to crosshair
-            best_target = min(enemy_targets, key=lambda t: self._distance_to_crosshair(t.center))
-            self.current_target = best_target
-        else:
-            self.current_target = None
+        # Remove targets not seen within target_lost_timeout
+        self.targets.expire(current_time)
+        
+        # Highest priority enemy target, closest to the crosshair. Records kept
+        # only for reacquisition (missing from the last reacquire_grace_frames
+        # processed frames) are not engaged
+        recent = self._processed_frame_times[0] if self._processed_frame_times else current_time
+        self.current_target = self.targets.select(
+            lambda t: self._distance_to_crosshair(t.center),
+            predicate=lambda t: t.target_type == TargetType.ENEMY and t.last_seen >= recent
+        )
             
     def _distance_to_crosshair(self, target_center):
         """Calculate distance from target center to crosshair."""
@@ -244,45 +464,51 @@ class SimpleAutonomousMode:
         return math.sqrt(dx*dx + dy*dy)
         
     def _track_target(self):
-        """Track current target with smooth motor control."""
+        """Track current target with the PID/feedforward visual-servo controller."""
         if not self.current_target:
             return
             
+        current_time = time.time()
+        dt = current_time - self.last_movement_time
+        # One controller update per new camera frame
+        if not self._new_frame and dt < self.movement_interval:
+            return
+            
+        # A new target starts from a clean controller state
+        if self.current_target.track_id != self.visual_servo_target_id:
+            self.visual_servo.reset()
+            self.visual_servo_target_id = self.current_target.track_id
+            
+        # Tracking-window inference follows the target's predicted position
+        if hasattr(self.camera_manager, 'set_tracking_target'):
+            self.camera_manager.set_tracking_target(self.current_target.bbox, self.current_target.velocity,
+                                                    self.current_target.last_seen)
+            
         target_center = self.current_target.center
         dx = target_center[0] - self.crosshair_x
         dy = target_center[1] - self.crosshair_y
         
-        # Calculate required motor movements
-        servo_delta = self._calculate_servo_movement(dy)
-        stepper_delta = self._calculate_stepper_movement(dx)
+        # Convert pixel offset to angular error and run the controller
+        servo_error, stepper_error = pixel_error_to_angles(dx, dy, self.frame_width, self.frame_height)
         
-        # Apply smooth movement
-        self._smooth_motor_movement(servo_delta, stepper_delta)
+        # The error was seen from the measured pose at capture time; commands sent
+        # since then (still in flight or being executed) already cover part of it
+        measured = self._measured_pose(self._frame_capture_time)
+        if measured is not None:
+            servo_error -= self.current_servo_angle - measured[0]
+            stepper_error -= self.current_stepper_angle - measured[1]
             
-    def _calculate_servo_movement(self, dy):
-        """Calculate servo movement based on vertical offset."""
-        # Convert pixel offset to servo angle change
-        servo_range = self.servo_max - self.servo_min
-        pixel_to_angle = servo_range / self.frame_height
-        
-        return -dy * pixel_to_angle  # Negative because servo angle increases downward
+        servo_delta, stepper_delta = self.visual_servo.update(
+            servo_error, stepper_error, self.current_servo_angle, self.current_stepper_angle,
+            min(dt, 0.5)  # Don't let a stalled loop produce one huge step
+        )
         
-    def _calculate_stepper_movement(self, dx):
-        """Calculate stepper movement based on horizontal offset."""
-        # Convert pixel offset to stepper angle change
-        stepper_range = self.stepper_max - self.stepper_min
-        pixel_to_angle = stepper_range / self.frame_width
-        
-        return dx * pixel_to_angle
+        self._smooth_motor_movement(servo_delta, stepper_delta)
+        self._pose_history.append((current_time, self.current_servo_angle, self.current_stepper_angle))
         
     def _smooth_motor_movement(self, servo_delta, stepper_delta):
-        """Apply smooth motor movement with acceleration."""
-        current_time = time.time()
-        
-        if current_time - self.last_movement_time < self.movement_interval:
-            return
-            
-        # Apply movement speed limiting
+        """Apply a controller step with safety clamping and motor limits."""
+        # Safety clamp - the controller already limits its rate
         max_delta = self.movement_speed
         servo_delta = max(-max_delta, min(max_delta, servo_delta))
         stepper_delta = max(-max_delta, min(max_delta, stepper_delta))
@@ -304,102 +530,160 @@ class SimpleAutonomousMode:
             self.motor_control.set_stepper_angle(int(new_stepper))
             self.current_stepper_angle = new_stepper
             
-        self.last_movement_time = current_time
+        self.last_movement_time = time.time()
         
     def _execute_scanning(self):
-        """Execute spiral scanning pattern when no targets detected."""
+        """Run the coverage scan, interleaved with scheduled revisits of known tracks."""
         current_time = time.time()
         
-        if current_time - self.last_movement_time < self.movement_interval:
+        # Hold each tile until the slew has settled and the detector has seen it
+        if not self._tile_held(self.scan_next_move_time, current_time):
             return
             
-        # Spiral scanning pattern (MUCH SLOWER for YOLO detection)
-        self._spiral_scan()
-        
-        # Add pause for YOLO detection after each movement
-        time.sleep(0.3)  # 300ms pause for YOLO to process frame
-        
-    def _spiral_scan(self):
-        """Execute spiral scanning pattern - covers both horizontal and vertical axes."""
-        # Calculate spiral position
-        servo_offset = self.spiral_radius * math.cos(self.spiral_angle)
-        stepper_offset = self.spiral_radius * math.sin(self.spiral_angle)
-        
-        # Calculate target positions
-        target_servo = self.spiral_center_servo + servo_offset
-        target_stepper = self.spiral_center_stepper + stepper_offset
-        
-        # Apply limits
-        target_servo = max(self.servo_min, min(self.servo_max, target_servo))
-        target_stepper = max(self.stepper_min, min(self.stepper_max, target_stepper))
-        
-        # Smooth movement to target positions
-        self._smooth_move_to_position(target_servo, target_stepper)
-        
-        # Update spiral parameters (MUCH SLOWER)
-        self.spiral_angle += self.spiral_angle_step
-        self.spiral_radius += self.spiral_radius_step
-        
-        # Reset spiral when it gets too large
-        if self.spiral_radius >= self.spiral_reset_threshold:
-            self._reset_spiral()
+        task = self.tws.next_task(current_time)
+        if task.kind == TaskKind.REVISIT:
+            self._set_state(AutonomousState.REVISIT)
+            self.revisit_track_id = task.track_id
+            self._move_to_scan_waypoint(task.pose, task.dwell)
+            self.tws.record_revisit(task.track_id, current_time)
+            return
             
-        # Add extra pause for YOLO detection
-        time.sleep(0.2)  # 200ms pause for YOLO processing
+        self._set_state(AutonomousState.SCAN)
+        self.revisit_track_id = None
+        self._next_coverage_tile()
+        
+    def _next_coverage_tile(self):
+        """Move to the next tile of the coverage pass."""
+        if self.scan_index >= len(self.scan_waypoints):
+            self._replan_scan()
             
-    def _smooth_move_to_position(self, target_servo, target_stepper):
-        """Smoothly move to target position with controlled speed."""
-        # Calculate required movements
-        servo_delta = target_servo - self.current_servo_angle
-        stepper_delta = target_stepper - self.current_stepper_angle
-        
-        # Limit movement speed for controlled motion
-        max_delta = self.movement_speed
-        servo_delta = max(-max_delta, min(max_delta, servo_delta))
-        stepper_delta = max(-max_delta, min(max_delta, stepper_delta))
-        
-        # Update positions
-        new_servo = self.current_servo_angle + servo_delta
-        new_stepper = self.current_stepper_angle + stepper_delta
-        
-        # Apply limits
-        new_servo = max(self.servo_min, min(self.servo_max, new_servo))
-        new_stepper = max(self.stepper_min, min(self.stepper_max, new_stepper))
-        
-        # Send motor commands only if movement is significant
-        if abs(new_servo - self.current_servo_angle) > self.movement_tolerance:
-            self.motor_control.set_servo_angle(int(new_servo))
-            self.current_servo_angle = new_servo
+        waypoint = self.scan_waypoints[self.scan_index]
+        self._move_to_scan_waypoint(waypoint, self.scan_dwell[self.scan_index])
+        self.tws.record_coverage(waypoint)
+        self.scan_index += 1
+        
+    def _move_to_scan_waypoint(self, waypoint, dwell=None):
+        """Slew directly to a scan tile and schedule when to leave it."""
+        self.scan_next_move_time = self._slew_to_tile(waypoint, dwell)
+        
+    def _slew_to_tile(self, waypoint, dwell=None):
+        """Slew to a (servo, stepper) tile; returns when it has been held long enough."""
+        target_servo = max(self.servo_min, min(self.servo_max, waypoint[0]))
+        target_stepper = max(self.stepper_min, min(self.stepper_max, waypoint[1]))
+        
+        # Synchronized, jerk-limited slew; a new tile mid-slew re-plans from the current motion
+        motion_time = self.motor_control.move_to(target_servo, target_stepper)
+        slew_time = motion_time + self.scan_planner.settle_time if motion_time > 0 else 0.0
+        self.current_servo_angle = target_servo
+        self.current_stepper_angle = target_stepper
+        
+        now = time.time()
+        self.last_movement_time = now
+        dwell = self.scan_planner.dwell_time if dwell is None else dwell
+        self.stare_since = now + motion_time
+        if self.stop_and_stare and hasattr(self.camera_manager, 'processed_frames_since'):
+            # One processed frame per base dwell (more on tiles the heatmap favours);
+            # the hold time only bounds a stare that never gets a sharp frame
+            self.stare_frames = max(1, round(dwell / self.scan_planner.dwell_time))
+            return now + slew_time + self.stare_timeout
+        self.stare_frames = 0
+        return now + slew_time + dwell
+        
+    def _tile_held(self, hold_until, now):
+        """True once the current tile has been looked at long enough."""
+        if now >= hold_until:
+            return True
+        return (self.stare_frames > 0
+                and self.camera_manager.processed_frames_since(self.stare_since) >= self.stare_frames)
+        
+    def _replan_scan(self):
+        """Start a new coverage pass from the current pose."""
+        self.scan_waypoints = self.scan_planner.plan(start=(self.current_servo_angle, self.current_stepper_angle))
+        self.scan_dwell = self.search_heatmap.dwell_times(self.scan_waypoints, self.scan_planner.dwell_time)
+        self.tws.set_coverage_tiles(self.scan_waypoints)
+        self.scan_index = 0
+        print("[SimpleAutonomous] 🔄 Coverage pass complete - starting new pass")
+        
+    def _measured_pose(self, timestamp):
+        """Measured turret angles (servo, stepper) at `timestamp` from device telemetry, or None."""
+        if timestamp is None or not hasattr(self.motor_control, 'pose_at'):
+            return None
+        pose = self.motor_control.pose_at(timestamp)
+        return (pose.servo, pose.stepper) if pose is not None else None
+        
+    def _turret_rate(self):
+        """Recent turret angular velocity (servo, stepper) in degrees/s while tracking."""
+        if len(self._pose_history) < 2:
+            return 0.0, 0.0
+        t0, servo0, stepper0 = self._pose_history[0]
+        t1, servo1, stepper1 = self._pose_history[-1]
+        if t1 - t0 <= 0 or time.time() - t1 > 3 * self.movement_interval:
+            return 0.0, 0.0
+        return (servo1 - servo0) / (t1 - t0), (stepper1 - stepper0) / (t1 - t0)
+        
+    def _begin_reacquisition(self, estimate):
+        """Plan a local search around where a lost track (TrackEstimate) is predicted to be."""
+        now = time.time()
+        self.reacquire_rate = estimate.rate
+        self.reacquire_origin = estimate.predicted_pose(now)
+        self.reacquire_offsets = self.scan_planner.local_search_offsets(self.reacquire_rings, self.reacquire_rate)
+        self.reacquire_index = 0
+        self.reacquire_target_id = estimate.track_id
+        self.reacquire_start_time = now
+        self.reacquire_next_move_time = 0
+        self._pose_history.clear()
+        self._set_state(AutonomousState.REACQUIRE)
+        print(f"[SimpleAutonomous] 🔍 Target {estimate.track_id} lost - searching around "
+              f"({self.reacquire_origin[0]:.1f}°, {self.reacquire_origin[1]:.1f}°)")
+        
+    def _execute_reacquisition(self):
+        """Visit the next local search tile; returns False once the search is over."""
+        now = time.time()
+        elapsed = now - self.reacquire_start_time
+        if elapsed > self.reacquire_timeout:
+            print(f"[SimpleAutonomous] ⌛ Reacquisition of target {self.reacquire_target_id} timed out "
+                  "- resuming scan")
+            return False
             
-        if abs(new_stepper - self.current_stepper_angle) > self.movement_tolerance:
-            self.motor_control.set_stepper_angle(int(new_stepper))
-            self.current_stepper_angle = new_stepper
+        if not self._tile_held(self.reacquire_next_move_time, now):
+            return True
             
-        self.last_movement_time = time.time()
-        
-    def _reset_spiral(self):
-        """Reset spiral to center and start over."""
-        self.spiral_radius = 0
-        self.spiral_angle = 0
-        print("[SimpleAutonomous] 🔄 Spiral scan reset - returning to center")
-        
-        # Move back to center position
-        self._smooth_move_to_position(self.spiral_center_servo, self.spiral_center_stepper)
+        if self.reacquire_index >= len(self.reacquire_offsets):
+            print(f"[SimpleAutonomous] ⌛ Reacquisition search for target {self.reacquire_target_id} exhausted "
+                  "- resuming scan")
+            return False
+            
+        # Follow the predicted position, then apply the search offset
+        offset = self.reacquire_offsets[self.reacquire_index]
+        waypoint = (self.reacquire_origin[0] + self.reacquire_rate[0] * elapsed + offset[0],
+                    self.reacquire_origin[1] + self.reacquire_rate[1] * elapsed + offset[1])
+        self.reacquire_next_move_time = self._slew_to_tile(waypoint)
+        self.reacquire_index += 1
+        return True
+        
+    def get_scan_progress(self):
+        """Fraction of the current coverage pass already visited (0..1)."""
+        if not len(self.scan_waypoints):
+            return 0.0
+        return min(1.0, self.scan_index / len(self.scan_waypoints))
         
     def _auto_fire_logic(self):
-        """Auto-fire logic for enemy targets."""
+        """Auto-fire logic for enemy targets. Returns True if a shot was fired."""
         if not self.current_target or self.current_target.target_type != TargetType.ENEMY:
-            return
+            return False
             
         current_time = time.time()
         if current_time - self.last_auto_fire_time < self.auto_fire_delay:
-            return
+            return False
             
         # Check if target is close enough to crosshair
         distance = self._distance_to_crosshair(self.current_target.center)
         if distance <= self.auto_fire_range:
             self._fire_laser()
             self.last_auto_fire_time = current_time
+            self.kill_assessor.begin(self.current_target.track_id, self.current_target.bbox, self._frame, current_time)
+            return True
+        return False
             
     def _fire_laser(self):
         """Fire laser at current target."""
@@ -407,9 +691,8 @@ class SimpleAutonomousMode:
             return
             
         try:
+            # Non-blocking - LaserControl times the pulse on its own thread
             self.laser_control.fire_laser()
-            time.sleep(0.1)  # Fire for 100ms
-            self.laser_control.stop_laser()
             
             print(f"[SimpleAutonomous] 🔫 Fired at enemy target {self.current_target.track_id}")
             
@@ -436,7 +719,7 @@ class SimpleAutonomousMode:
         """Emergency stop all systems."""
         self.stop_autonomous_mode()
         if self.laser_control:
-            self.laser_control.stop_laser()
+            self.laser_control.emergency_stop()
         if self.motor_control:
             self.motor_control.emergency_stop()
         print("[SimpleAutonomous] 🚨 Emergency stop executed")
@@ -446,34 +729,93 @@ class SimpleAutonomousMode:
         self.current_servo_angle = 30
         self.current_stepper_angle = 150
         
-        self.motor_control.set_servo_angle(int(self.current_servo_angle))
-        self.motor_control.set_stepper_angle(int(self.current_stepper_angle))
+        self.motor_control.move_to(self.current_servo_angle, self.current_stepper_angle)
         
         print("[SimpleAutonomous] 🔄 Reset to safe position")
         
+    def _publish_snapshot(self):
+        """Build an immutable snapshot of the current state (control thread only)."""
+        target = self.current_target
+        distance = self._distance_to_crosshair(target.center) if target else None
+        
+        if self.state == AutonomousState.IDLE:
+            status = "Autonomous mode not active"
+        elif self.state == AutonomousState.REACQUIRE:
+            remaining = max(0.0, self.reacquire_timeout - (time.time() - self.reacquire_start_time))
+            status = f"REACQUIRING target {self.reacquire_target_id} - {remaining:.1f}s left"
+        elif self.state == AutonomousState.GLANCE:
+            status = f"SCANNING - coverage glance, engaging {self.glance_track_id}"
+        elif self.state == AutonomousState.REVISIT and target is None:
+            status = f"REVISITING track {self.revisit_track_id}"
+        elif target is None:
+            status = f"SCANNING - coverage {self.get_scan_progress() * 100:.1f}% complete"
+        elif self.state == AutonomousState.FIRE:
+            status = f"FIRING at enemy {target.track_id}"
+        elif self.state == AutonomousState.ASSESS:
+            status = f"ASSESSING shot at enemy {target.track_id}"
+        elif distance <= self.auto_fire_range:
+            status = f"LOCKING on enemy {target.track_id} - distance: {distance:.1f}px"
+        else:
+            status = f"TRACKING enemy {target.track_id} - distance: {distance:.1f}px"
+        
+        self._snapshot = AutonomousSnapshot(
+            state=self.state,
+            is_active=self.is_active,
+            target_id=target.track_id if target else None,
+            target_bbox=tuple(target.bbox) if target else None,
+            target_type=target.target_type.value if target else None,
+            target_confidence=target.confidence if target else 0.0,
+            target_distance=distance,
+            target_count=len(self.targets),
+            kills=self.kill_assessor.kills,
+            misses=self.kill_assessor.misses,
+            tws_metrics=tuple(self.tws.get_metrics().items()),
+            servo_angle=self.current_servo_angle,
+            stepper_angle=self.current_stepper_angle,
+            scan_progress=self.get_scan_progress(),
+            frame_dimensions=f"{self.frame_width}x{self.frame_height}",
+            status_message=status,
+            timestamp=time.time()
+        )
+        
+    def get_snapshot(self) -> AutonomousSnapshot:
+        """Latest published snapshot - safe to call from any thread."""
+        return self._snapshot
+        
     def get_status(self):
         """Get current autonomous mode status."""
-        return {
-            'is_active': self.is_active,
-            'current_target': self.current_target.track_id if self.current_target else None,
-            'target_count': len(self.targets),
-            'servo_angle': self.current_servo_angle,
-            'stepper_angle': self.current_stepper_angle,
-            'frame_dimensions': f"{self.frame_width}x{self.frame_height}"
+        snapshot = self._snapshot
+        status = {
+            'is_active': snapshot.is_active,
+            'state': snapshot.state.value,
+            'current_target': snapshot.target_id,
+            'target_count': snapshot.target_count,
+            'kills': snapshot.kills,
+            'misses': snapshot.misses,
+            'track_while_scan': dict(snapshot.tws_metrics),
+            'servo_angle': snapshot.servo_angle,
+            'stepper_angle': snapshot.stepper_angle,
+            'scan_progress': snapshot.scan_progress,
+            'frame_dimensions': snapshot.frame_dimensions
         }
+        if hasattr(self.camera_manager, 'get_inference_status'):
+            status['inference'] = self.camera_manager.get_inference_status()
+        return status
         
     def get_target_info(self):
         """Get current target information."""
-        if not self.current_target:
+        snapshot = self._snapshot
+        if snapshot.target_id is None:
             return None
             
+        bbox = snapshot.target_bbox
         return {
-            'track_id': self.current_target.track_id,
-            'target_type': self.current_target.target_type.value,
-            'confidence': self.current_target.confidence,
-            'center': self.current_target.center,
-            'bbox': self.current_target.bbox,
-            'distance_to_crosshair': self._distance_to_crosshair(self.current_target.center)
+            'track_id': snapshot.target_id,
+            'target_type': snapshot.target_type,
+            'confidence': snapshot.target_confidence,
+            'center': ((bbox[0] + bbox[2]) // 2, (bbox[1] + bbox[3]) // 2),
+            'bbox': bbox,
+            'distance_to_crosshair': snapshot.target_distance
         }
         
     # GUI Integration Methods (NEW - for GUI compatibility)
@@ -486,40 +828,12 @@ class SimpleAutonomousMode:
         self.stop_autonomous_mode()
         
     def process_frame(self, frame, tracks):
-        """Process frame and return target information - called by GUI."""
-        if not self.is_active:
+        """
+        Return (target_bbox, target_id, status) for the GUI.
+        Read-only: the control thread already processes every camera frame,
+        so this only reports the latest published snapshot.
+        """
+        snapshot = self._snapshot
+        if not snapshot.is_active:
             return None, None, "Autonomous mode not active"
-            
-        # Update camera frame in camera manager
-        if hasattr(self.camera_manager, 'frame'):
-            self.camera_manager.frame = frame
-            
-        # Update tracks in camera manager
-        if hasattr(self.camera_manager, 'tracks'):
-            self.camera_manager.tracks = tracks
-            
-        # Process the frame (this will update targets)
-        self._process_camera_frame()
-        
-        # Get current target info
-        if self.current_target:
-            target_bbox = self.current_target.bbox
-            target_id = self.current_target.track_id
-            
-            # Determine status based on target type and distance
-            distance = self._distance_to_crosshair(self.current_target.center)
-            
-            if self.current_target.target_type == TargetType.ENEMY:
-                if distance <= self.auto_fire_range:
-                    status = f"FIRING at enemy {target_id}"
-                else:
-                    status = f"TRACKING enemy {target_id} - distance: {distance:.1f}px"
-            else:
-                status = f"TRACKING {self.current_target.target_type.value} {target_id}"
-                
-            return target_bbox, target_id, status
-        else:
-            # No target - show scanning status
-            spiral_progress = (self.spiral_radius / self.spiral_reset_threshold) * 100
-            status = f"SCANNING - spiral {spiral_progress:.1f}% complete"
-            return None, None, status 
\ No newline at end of file
+        return snapshot.target_bbox, snapshot.target_id, snapshot.status_message
@@ -0,0 +1,135 @@
+import heapq
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class TrackRecord:
+    """
+    Long-lived state of one tracked object, updated in place every time the
+    track is observed. __slots__ keeps each record compact and avoids a
+    per-frame allocation.
+    """
+
+    __slots__ = ('track_id', 'bbox', 'center', 'smoothed_center', 'velocity', 'target_type',
+                 'label', 'confidence', 'priority', 'first_seen', 'last_seen', 'hits', '_deadline')
+
+    def __init__(self, track_id, bbox, center, timestamp, target_type=None, label='', confidence=0.0, priority=0):
+        self.track_id = track_id
+        self.bbox = bbox  # x1, y1, x2, y2
+        self.center = center  # Latest measured center (pixels)
+        self.smoothed_center = (float(center[0]), float(center[1]))  # EMA of the center
+        self.velocity = (0.0, 0.0)  # EMA of the center velocity (pixels per second)
+        self.target_type = target_type
+        self.label = label
+        self.confidence = confidence
+        self.priority = priority  # Higher number = higher priority
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.hits = 1  # Number of frames the track was observed in
+        self._deadline = 0.0  # Expiry time currently queued in the registry heap
+
+    def __repr__(self):
+        return (f"TrackRecord(track_id={self.track_id}, center={self.center}, "
+                f"target_type={self.target_type}, hits={self.hits}, last_seen={self.last_seen:.2f})")
+
+
+class TargetRegistry:
+    """
+    Registry of tracked targets keyed by track_id.
+    - observe() updates a record in place (last_seen, hit count, smoothed center, velocity)
+    - expire() drops records not seen for `timeout` seconds using a deadline heap
+    - select() picks the best record through a priority queue
+    """
+
+    def __init__(self, timeout=2.0, smoothing=0.5):
+        self.timeout = timeout  # Seconds a track may go unseen before it is removed
+        self.smoothing = smoothing  # EMA weight of each new center measurement
+        self._records: Dict[int, TrackRecord] = {}
+        self._expiry_heap: List[Tuple[float, int]] = []  # (deadline, track_id), one entry per record
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, track_id):
+        return track_id in self._records
+
+    def __iter__(self) -> Iterator[TrackRecord]:
+        return iter(self._records.values())
+
+    def get(self, track_id) -> Optional[TrackRecord]:
+        return self._records.get(track_id)
+
+    def observe(self, track_id, bbox, timestamp, target_type=None, label='', confidence=0.0, priority=0):
+        """Record one observation of a track in a new frame and return its record."""
+        center = ((bbox[0] + bbox[2]) // 2, (bbox[1] + bbox[3]) // 2)
+        record = self._records.get(track_id)
+
+        if record is None:
+            record = TrackRecord(track_id, bbox, center, timestamp, target_type, label, confidence, priority)
+            self._records[track_id] = record
+            record._deadline = timestamp + self.timeout
+            heapq.heappush(self._expiry_heap, (record._deadline, track_id))
+            return record
+
+        dt = timestamp - record.last_seen
+        a = self.smoothing
+        previous = record.smoothed_center
+        smoothed = (previous[0] + a * (center[0] - previous[0]), previous[1] + a * (center[1] - previous[1]))
+        if dt > 0:
+            vx = (smoothed[0] - previous[0]) / dt
+            vy = (smoothed[1] - previous[1]) / dt
+            record.velocity = (record.velocity[0] + a * (vx - record.velocity[0]),
+                               record.velocity[1] + a * (vy - record.velocity[1]))
+
+        record.bbox = bbox
+        record.center = center
+        record.smoothed_center = smoothed
+        record.target_type = target_type
+        record.label = label
+        record.confidence = confidence
+        record.priority = priority
+        record.last_seen = timestamp
+        record.hits += 1
+        # The heap entry is re-armed lazily in expire(), so nothing is pushed here
+        return record
+
+    def expire(self, now) -> List[int]:
+        """Remove records unseen for longer than `timeout`; returns their track ids."""
+        removed = []
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            deadline, track_id = heapq.heappop(heap)
+            record = self._records.get(track_id)
+            if record is None or record._deadline != deadline:
+                continue  # Stale entry
+            new_deadline = record.last_seen + self.timeout
+            if new_deadline <= now:
+                del self._records[track_id]
+                removed.append(track_id)
+            else:
+                # Seen since the entry was queued - re-arm with the real deadline
+                record._deadline = new_deadline
+                heapq.heappush(heap, (new_deadline, track_id))
+        return removed
+
+    def remove(self, track_id):
+        """Forget a track immediately (its heap entry becomes stale)."""
+        self._records.pop(track_id, None)
+
+    def clear(self):
+        self._records.clear()
+        self._expiry_heap.clear()
+
+    def select(self, cost: Callable[[TrackRecord], float],
+               predicate: Optional[Callable[[TrackRecord], bool]] = None) -> Optional[TrackRecord]:
+        """
+        Return the best record: highest priority first, then lowest `cost`.
+        Records failing `predicate` are skipped as they come off the queue.
+        """
+        queue = [(-r.priority, cost(r), r.track_id) for r in self._records.values()]
+        heapq.heapify(queue)
+        while queue:
+            _, _, track_id = heapq.heappop(queue)
+            record = self._records[track_id]
+            if predicate is None or predicate(record):
+                return record
+        return None
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# Ring buffer columns
+FIELDS = ("time", "device_time", "servo", "stepper", "servo_target", "stepper_target", "laser")
+
+
+@dataclass
+class Pose:
+    timestamp: float  # host clock (time.time())
+    servo: float  # measured angles, degrees
+    stepper: float
+    servo_target: float
+    stepper_target: float
+    laser: bool
+
+
+def parse_telemetry_line(line):
+    """
+    Device telemetry line -> (device_seconds, servo, stepper, servo_target,
+    stepper_target, laser), or None when it isn't a well-formed telemetry line.
+    Format: "T <millis> <servo> <stepper> <servo target> <stepper target> <laser 0/1>"
+    """
+    parts = line.split()
+    if len(parts) != 7 or parts[0] != "T":
+        return None
+    try:
+        values = [float(p) for p in parts[1:]]
+    except ValueError:
+        return None
+    return (values[0] / 1000.0, *values[1:5], values[5] > 0)
+
+
+class TelemetryBuffer:
+    """
+    Timestamped ring buffer of the turret's measured pose, filled from
+    device telemetry. Device timestamps are mapped to the host clock with
+    the smallest recent (host - device) offset, i.e. the sample that spent
+    the least time in the link, so poses line up with camera capture times.
+    - latest(max_age): most recent pose, or None when telemetry is stale
+    - pose_at(t): pose interpolated at host time t (None outside the buffer)
+    """
+
+    def __init__(self, capacity=2048, offset_window=100):
+        self.capacity = capacity
+        self.data = np.zeros((capacity, len(FIELDS)), dtype=np.float64)
+        self.count = 0  # samples ever written
+        self._offsets = deque(maxlen=offset_window)
+        self._lock = threading.Lock()
+        self.parse_errors = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, device_time, servo, stepper, servo_target, stepper_target, laser, received_at=None):
+        received_at = time.time() if received_at is None else received_at
+        with self._lock:
+            self._offsets.append(received_at - device_time)
+            timestamp = device_time + min(self._offsets)
+            if len(self) and timestamp < self.data[(self.count - 1) % self.capacity, 0]:
+                # Device clock went backwards (reset) - restart the clock mapping
+                self._offsets.clear()
+                self._offsets.append(received_at - device_time)
+                timestamp = received_at
+            self.data[self.count % self.capacity] = (timestamp, device_time, servo, stepper, servo_target,
+                                                     stepper_target, float(laser))
+            self.count += 1
+
+    def add_line(self, line, received_at=None):
+        """Parse and store one telemetry line; False when it was malformed."""
+        sample = parse_telemetry_line(line)
+        if sample is None:
+            self.parse_errors += 1
+            return False
+        self.append(*sample, received_at=received_at)
+        return True
+
+    def _ordered(self):
+        """Samples oldest first (call with the lock held)."""
+        n = len(self)
+        if self.count <= self.capacity:
+            return self.data[:n]
+        start = self.count % self.capacity
+        return np.concatenate((self.data[start:], self.data[:start]))
+
+    @staticmethod
+    def _pose(row):
+        return Pose(float(row[0]), float(row[2]), float(row[3]), float(row[4]), float(row[5]), bool(row[6] > 0))
+
+    def latest(self, max_age=None, now=None) -> Optional[Pose]:
+        with self._lock:
+            if not self.count:
+                return None
+            row = self.data[(self.count - 1) % self.capacity].copy()
+        now = time.time() if now is None else now
+        if max_age is not None and now - row[0] > max_age:
+            return None
+        return self._pose(row)
+
+    def pose_at(self, timestamp) -> Optional[Pose]:
+        """Measured pose at host time `timestamp`, linearly interpolated between samples."""
+        with self._lock:
+            samples = self._ordered().copy()
+        if not len(samples) or timestamp < samples[0, 0] or timestamp > samples[-1, 0]:
+            return None
+        i = int(np.searchsorted(samples[:, 0], timestamp))
+        if samples[i, 0] == timestamp or i == 0:
+            return self._pose(samples[i])
+        before, after = samples[i - 1], samples[i]
+        w = (timestamp - before[0]) / (after[0] - before[0])
+        row = before + w * (after - before)
+        row[0] = timestamp
+        row[6] = before[6]  # laser is a state, not interpolated
+        return self._pose(row)
+
+    def window(self, start, end):
+        """(N, len(FIELDS)) array of the samples with start <= time <= end."""
+        with self._lock:
+            samples = self._ordered().copy()
+        return samples[(samples[:, 0] >= start) & (samples[:, 0] <= end)]
+
+    def get_stats(self):
+        latest = self.latest()
+        return {
+            'samples': self.count,
+            'parse_errors': self.parse_errors,
+            'age_ms': (time.time() - latest.timestamp) * 1000 if latest else None,
+            'rate_hz': self._rate(),
+        }
+
+    def _rate(self):
+        with self._lock:
+            samples = self._ordered()[-50:, 0].copy()
+        if len(samples) < 2 or samples[-1] <= samples[0]:
+            return 0.0
+        return (len(samples) - 1) / (samples[-1] - samples[0])
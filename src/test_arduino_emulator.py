@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the pty Arduino emulator (firmware timing, link impairments, SerialComm end to end)
+"""
+
+import sys
+import os
+import time
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from arduino_emulator import ArduinoEmulator, FirmwareModel
+from serial_comm import SerialComm
+from serial_protocol import Frame, encode_frame
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_firmware_model_moves_with_firmware_timing():
+    clock = FakeClock()
+    model = FirmwareModel(clock=clock, telemetry_interval=None)
+    model.feed(b"S10\nM100\n")
+    clock.now = 0.3
+    model.poll()
+    # Each pass: 12 degree stepper burst (6 steps, 12 ms), one servo degree (20 ms), 10 ms loop delay
+    assert model.servo_position == 8.0
+    assert abs(model.stepper_position - 8 * 10.8) < 1e-6
+    clock.now = 2.0
+    model.poll()
+    assert model.servo_position == 10.0
+    # The stepper stops inside its deadband instead of hunting for the exact angle
+    assert abs(model.stepper_position - 100.0) < FirmwareModel.ANGLE_TOLERANCE
+    # Anti-jitter: a small change right after a command is ignored, a later one is taken
+    model.feed(b"M150\n")
+    model.feed(b"M151\n")
+    assert model.stepper == 150.0
+    clock.now = 2.2
+    model.feed(b"M151\n")
+    assert model.stepper == 151.0
+
+
+def test_corrupted_frames_are_rejected():
+    emulator = ArduinoEmulator(corruption_rate=0.05, seed=3)
+    model = emulator.model
+    for sequence in range(1, 201):
+        model.feed(emulator._impair(encode_frame(Frame(sequence, servo=20.0, stepper=120.0))))
+    assert emulator.bytes_corrupted > 0 and model.crc_errors > 0
+    assert model.frames < 200
+    # A clean frame after the noise is applied exactly (the newline ends any text command the noise started)
+    emulator.corruption_rate = 0.0
+    model.feed(b"\n" + emulator._impair(encode_frame(Frame(201, servo=25.0, stepper=130.0))))
+    assert (model.servo, model.stepper) == (25.0, 130.0)
+
+
+def test_serial_comm_runs_end_to_end_on_the_pty():
+    with ArduinoEmulator(latency=0.01, telemetry_interval=0.05) as emulator:
+        serial = SerialComm(port=emulator.port, protocol="binary")
+        try:
+            start = time.time()
+            serial.send_command(0x01, 20)
+            serial.send_command(0x02, 90)
+            serial.send_command(0x03, 1)
+            pose = None
+            while time.time() - start < 5.0:
+                pose = serial.latest_pose()
+                if pose is not None and pose.servo == 20.0 and abs(pose.stepper - 90.0) < 3.0 and pose.laser:
+                    break
+                time.sleep(0.02)
+            elapsed = time.time() - start
+            assert pose is not None and pose.servo == 20.0 and pose.laser
+            # 20 servo degrees at >= 30 ms per firmware loop pass
+            assert elapsed >= 0.6
+            assert serial.query_capabilities()["proto"] == ["text", "binary", "frame"]
+            stats = emulator.get_stats()
+            assert stats['bytes_from_host'] >= 12 and stats['bytes_to_host'] > 0 and stats['host_overruns'] == 0
+        finally:
+            serial.close()
+
+
+if __name__ == "__main__":
+    test_firmware_model_moves_with_firmware_timing()
+    test_corrupted_frames_are_rejected()
+    test_serial_comm_runs_end_to_end_on_the_pty()
+    print("✅ Arduino emulator tests passed")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for the asynchronous logging subsystem
+"""
+
+import sys
+import os
+import io
+import tempfile
+import threading
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from async_logger import DEBUG, ERROR, INFO, WARNING, BinaryLogSink, ConsoleSink, LogService, read_binary_log
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_levels_are_per_component_and_formatting_is_lazy():
+    stream = io.StringIO()
+    service = LogService(sinks=[ConsoleSink(stream)])
+    serial, camera = service.get_logger("SerialComm"), service.get_logger("CameraManager")
+    service.set_level("SerialComm", "debug")
+
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("a filtered message must not be formatted")
+
+    serial.debug("Servo -> %.1f", 12.345)
+    camera.debug("hidden %s", Exploding())  # below CameraManager's (default INFO) level
+    camera.warning("⚠️ Excessive movement: %d°", 12)
+    service.flush()
+    assert stream.getvalue().splitlines() == ["[SerialComm] Servo -> 12.3", "[CameraManager] ⚠️ Excessive movement: 12°"]
+    assert serial.is_enabled_for(DEBUG) and not camera.is_enabled_for(DEBUG)
+    service.shutdown()
+
+
+def test_repeated_messages_are_rate_limited():
+    sink = ListSink()
+    service = LogService(sinks=[sink], repeat_window=1.0)
+    log = service.get_logger("RadarTracking")
+    for _ in range(50):
+        log.warning("⚠️ Port açık değil")
+    log.info("other")
+    service.flush()
+    assert [r.message for r in sink.records] == ["⚠️ Port açık değil", "other"]
+    assert service.get_stats()['suppressed'] == 49
+    # The suppressed count is reported once the window is over
+    service._expire_repeats(float("inf"))
+    assert sink.records[-1].repeated == 49 and sink.records[-1].level == WARNING
+    service.shutdown()
+
+
+def test_ring_drops_oldest_and_counts_concurrent_writers():
+    sink = ListSink()
+    service = LogService(capacity=100, sinks=[sink], repeat_window=0.0)
+    service._running = True  # keep the sink thread out so the ring overflows
+
+    def writer(name):
+        log = service.get_logger(name)
+        for i in range(500):
+            log.info("%s %d", name, i)
+
+    threads = [threading.Thread(target=writer, args=(f"W{n}",)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    service.drain()
+    stats = service.get_stats()
+    assert len(sink.records) == 100 and stats['written'] == 100
+    assert stats['dropped'] == 2000 - 100
+    service._running = False
+
+
+def test_binary_log_round_trip():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "turret.tlog")
+        for session in range(2):  # appending a second session keeps both readable
+            service = LogService(sinks=[BinaryLogSink(path)], repeat_window=10.0)
+            service.get_logger("SerialComm").info("⚡ Baud %d doğrulandı", 115200)
+            for _ in range(3):
+                service.get_logger("MotorControl").error("❌ Error in control loop: %s", "timeout")
+            service.shutdown()
+        records = read_binary_log(path)
+        assert [(r.component, r.level, r.message, r.repeated) for r in records] == [
+            ("SerialComm", INFO, "⚡ Baud 115200 doğrulandı", 0),
+            ("MotorControl", ERROR, "❌ Error in control loop: timeout", 0),
+            ("MotorControl", ERROR, "❌ Error in control loop: timeout", 2),
+        ] * 2
+        # Fixed 18-byte record header + text, component names stored once per session
+        assert os.path.getsize(path) < 2 * (6 + 2 * 20 + 3 * (18 + 40))
+
+
+if __name__ == "__main__":
+    test_levels_are_per_component_and_formatting_is_lazy()
+    test_repeated_messages_are_rate_limited()
+    test_ring_drops_oldest_and_counts_concurrent_writers()
+    test_binary_log_round_trip()
+    print("✅ Async logger tests passed")
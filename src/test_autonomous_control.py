@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for SimpleAutonomousMode's control thread with fake hardware
+"""
+
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from motion_profile import AxisLimits, MotionStreamer, TrajectoryGenerator
+from simple_autonomous import AutonomousState, SimpleAutonomousMode
+
+
+class FakeCamera:
+    def __init__(self):
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.tracks = []
+        self.release = threading.Event()
+        self.release.set()
+        self.in_get_frame = threading.Event()
+
+    def get_frame(self):
+        self.in_get_frame.set()
+        self.release.wait()
+        return self.frame, self.tracks, None
+
+
+class FakeLaser:
+    def turn_off(self):
+        pass
+
+    def fire_laser(self, duration=0.5):
+        pass
+
+    def emergency_stop(self):
+        pass
+
+
+class FakeMotors:
+    def __init__(self):
+        self.moves = []
+
+    def move_to(self, servo, stepper):
+        self.moves.append((servo, stepper))
+        return 0.0
+
+    def set_servo_angle(self, angle):
+        pass
+
+    def set_stepper_angle(self, angle):
+        pass
+
+    def emergency_stop(self):
+        pass
+
+
+class StreamingMotors(FakeMotors):
+    """Planned slews go through a real MotionStreamer."""
+
+    def __init__(self):
+        super().__init__()
+        self.commands = []
+        limits = [AxisLimits(60.0, 250.0, 5000.0), AxisLimits(60.0, 1000.0, 20000.0)]
+        self.motion = MotionStreamer(self, TrajectoryGenerator(limits, rate=50.0, position=(30.0, 150.0)))
+
+    def send_command(self, cmd, data, **options):
+        self.commands.append((cmd, data))
+
+    def move_to(self, servo, stepper):
+        self.motion.start()
+        return self.motion.move_to(servo, stepper)
+
+    def cancel_motion(self):
+        self.motion.cancel()
+
+
+def make_autonomous(motors=None):
+    camera = FakeCamera()
+    autonomous = SimpleAutonomousMode(None, FakeLaser(), camera, motors or FakeMotors())
+    autonomous.search_heatmap.save = lambda *args: None  # keep the test out of the saved heatmap
+    return autonomous, camera
+
+
+def test_control_thread_publishes_idle_when_it_exits():
+    autonomous, camera = make_autonomous()
+    autonomous.start_autonomous_mode()
+    time.sleep(0.15)
+    assert autonomous.get_snapshot().state == AutonomousState.SCAN
+
+    # A tick stuck in get_frame outlives the stopper's join
+    camera.release.clear()
+    camera.in_get_frame.clear()
+    assert camera.in_get_frame.wait(1.0)
+    autonomous.stop_autonomous_mode()
+    assert autonomous.control_thread.is_alive()
+    # The stopper left the state alone: the control thread still owns it
+    assert autonomous.state != AutonomousState.IDLE
+
+    camera.release.set()
+    autonomous.control_thread.join(timeout=1.0)
+    assert not autonomous.control_thread.is_alive()
+    snapshot = autonomous.get_snapshot()
+    assert autonomous.state == AutonomousState.IDLE
+    assert snapshot.state == AutonomousState.IDLE and not snapshot.is_active
+
+
+def test_target_stays_current_across_slow_processed_frames():
+    autonomous, camera = make_autonomous()
+    enemy = {'track_id': 5, 'bbox': [300, 220, 340, 260], 'label': 'red_balloon', 'confidence': 0.9}
+    autonomous._process_camera_frame(camera.frame, [enemy])
+    assert autonomous.current_target.track_id == 5
+
+    # Gate/cascade skips: no processed frame for longer than a scan-mode frame gap
+    time.sleep(0.4)
+    autonomous._process_camera_frame(camera.frame, autonomous._last_tracks)
+    assert autonomous.current_target is not None
+    autonomous._process_camera_frame(camera.frame, [dict(enemy)])
+    assert autonomous.current_target.track_id == 5
+
+    # One processed frame without it is tolerated, two in a row mean lost
+    autonomous._process_camera_frame(camera.frame, [])
+    assert autonomous.current_target is not None
+    autonomous._process_camera_frame(camera.frame, [])
+    assert autonomous.current_target is None
+    assert 5 in autonomous.targets  # still kept for reacquisition
+
+
+def test_capture_time_comes_with_the_tracks_it_belongs_to():
+    autonomous, camera = make_autonomous()
+    enemy = {'track_id': 5, 'bbox': [300, 220, 340, 260], 'label': 'red_balloon', 'confidence': 0.9}
+    tracks = [enemy]
+    autonomous._process_camera_frame(camera.frame, tracks, 100.0)
+    assert autonomous._frame_capture_time == 100.0
+    # Re-reading the same tracks keeps the capture time of the frame they were detected on
+    autonomous._process_camera_frame(camera.frame, tracks, 100.5)
+    assert autonomous._frame_capture_time == 100.0
+    autonomous._process_camera_frame(camera.frame, [dict(enemy)], 101.0)
+    assert autonomous._frame_capture_time == 101.0
+
+
+def test_stop_cancels_the_slew_in_flight():
+    motors = StreamingMotors()
+    autonomous, camera = make_autonomous(motors)
+    autonomous.scan_waypoints[0] = (50.0, 280.0)  # a long first slew
+    autonomous.start_autonomous_mode()
+    try:
+        deadline = time.time() + 1.0
+        while not motors.commands and time.time() < deadline:
+            time.sleep(0.02)
+        assert motors.motion.is_moving
+        autonomous.stop_autonomous_mode()
+        # The joystick gets the axes back: nothing more is streamed
+        assert not motors.motion.is_moving
+        sent = len(motors.commands)
+        time.sleep(0.2)
+        assert len(motors.commands) == sent
+    finally:
+        motors.motion.stop()
+
+
+if __name__ == "__main__":
+    test_control_thread_publishes_idle_when_it_exits()
+    test_stop_cancels_the_slew_in_flight()
+    test_target_stays_current_across_slow_processed_frames()
+    test_capture_time_comes_with_the_tracks_it_belongs_to()
+    print("✅ Autonomous control tests passed")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the inference profile benchmark (no model needed)
+"""
+
+import sys
+import os
+import tempfile
+import types
+
+import cv2
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_inference import benchmark_profile, count_matches, load_recording, read_labels
+
+
+class FakeBoxes:
+    def __init__(self, xyxy):
+        self.xyxy = types.SimpleNamespace(cpu=lambda: types.SimpleNamespace(numpy=lambda: np.array(xyxy, float)))
+
+
+def _write_recording(folder):
+    """Two 640x480 frames with one balloon label each, in images/ + labels/ layout."""
+    os.makedirs(os.path.join(folder, "images"))
+    os.makedirs(os.path.join(folder, "labels"))
+    for i in range(2):
+        cv2.imwrite(os.path.join(folder, "images", f"frame{i}.jpg"), np.zeros((480, 640, 3), np.uint8))
+        with open(os.path.join(folder, "labels", f"frame{i}.txt"), "w") as f:
+            f.write("0 0.5 0.5 0.125 0.25\n")  # 80x120 box centred in the frame
+
+
+def test_labels_are_read_in_pixels():
+    with tempfile.TemporaryDirectory() as folder:
+        _write_recording(folder)
+        samples = load_recording(folder)
+        assert len(samples) == 2
+        labels = read_labels(samples[0][1], 640, 480)
+        assert np.allclose(labels, [[0, 280, 180, 360, 300]])
+
+
+def test_matching_is_one_to_one():
+    gt = [[0, 0, 10, 10], [100, 100, 110, 110]]
+    # Two detections on the first object only count once
+    assert count_matches(np.array(gt), np.array([[0, 0, 10, 10], [1, 0, 11, 10]])) == 1
+    assert count_matches(np.array(gt), np.empty((0, 4))) == 0
+
+
+def test_benchmark_reports_recall_and_fps():
+    profile = types.SimpleNamespace(name="search", imgsz=320, conf=0.6, classes=None)
+    calls = []
+
+    def predict(frame, p):
+        calls.append(p.name)
+        # Finds the balloon in frame 0 only (the second result has no boxes)
+        boxes = [[282, 182, 358, 298]] if len(calls) % 2 == 0 else np.empty((0, 4))
+        return [types.SimpleNamespace(boxes=FakeBoxes(boxes))]
+
+    with tempfile.TemporaryDirectory() as folder:
+        _write_recording(folder)
+        report = benchmark_profile(profile, load_recording(folder), predict, warmup=1)
+    assert report['frames'] == 2
+    assert report['recall'] == 0.5
+    assert report['fps'] > 0
+
+
+if __name__ == "__main__":
+    test_labels_are_read_in_pixels()
+    test_matching_is_one_to_one()
+    test_benchmark_reports_recall_and_fps()
+    print("✅ Inference benchmark tests passed")
@@ -37,7 +37,7 @@ class MockCameraManager:
         self.running = True
     
     def get_frame(self):
-        return self.frame
+        return self.frame, self.tracks, None
     
     def get_tracks(self):
         return self.tracks
@@ -38,7 +38,7 @@ class MockCameraManager:
         self.tracks = []
     
     def get_frame(self):
-        return self.frame, self.tracks
+        return self.frame, self.tracks, None
 
 class MockMotorControl:
     def __init__(self):
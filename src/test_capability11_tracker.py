@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Test script for the Capability 11 engagement scheduler, re-planning and kill confirmation
+"""
+
+import sys
+import os
+import itertools
+import time
+
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from capability11_tracker import Capability11Tracker, EngagementScheduler
+
+
+class FakeCamera:
+    def __init__(self):
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.tracks = []
+        self.capture_time = None
+
+    def get_frame(self):
+        return self.frame, self.tracks, self.capture_time
+
+
+class FakeLaser:
+    def __init__(self):
+        self.shots = 0
+
+    def fire_laser(self, duration=0.5):
+        self.shots += 1
+
+
+def balloon(track_id, bbox, label='red_balloon'):
+    return {'track_id': track_id, 'bbox': bbox, 'label': label, 'confidence': 0.9}
+
+
+def make_tracker():
+    camera = FakeCamera()
+    tracker = Capability11Tracker(None, FakeLaser(), camera, None)
+    return tracker, camera
+
+
+def step(tracker):
+    tracker._update_targets()
+    tracker._update_plan()
+
+
+def age(target, seconds):
+    """Pretend the target's last sighting and shot happened `seconds` earlier."""
+    target.last_seen -= seconds
+    target.last_fire_time -= seconds
+
+
+def test_scheduler_orders_by_objective():
+    scheduler = EngagementScheduler(servo_rate=60.0, stepper_rate=60.0, dwell_time=1.0, settle_time=0.0)
+    # Targets along the stepper axis are taken in passing, whatever their ids
+    positions = {7: (0.0, 30.0), 3: (0.0, 10.0), 5: (0.0, 20.0)}
+    assert scheduler.plan((0.0, 0.0), positions) == [3, 5, 7]
+    # The exhaustive plan is the best permutation
+    positions = {1: (10.0, 120.0), 2: (-5.0, -40.0), 3: (20.0, 60.0), 4: (0.0, -90.0)}
+    best = min(itertools.permutations(positions), key=lambda o: scheduler.cost((0.0, 0.0), o, positions))
+    assert scheduler.plan((0.0, 0.0), positions) == list(best)
+    # A quick kill next door is taken first for kill latency, left for the way back for makespan
+    positions = {1: (0.0, -12.0), 2: (0.0, 60.0), 3: (0.0, 90.0)}
+    makespan = EngagementScheduler(servo_rate=60.0, stepper_rate=60.0, dwell_time=1.0, settle_time=0.0,
+                                   objective="makespan")
+    assert scheduler.plan((0.0, 0.0), positions)[0] == 1
+    assert makespan.sequence_time((0.0, 0.0), makespan.plan((0.0, 0.0), positions), positions) <= \
+        scheduler.sequence_time((0.0, 0.0), scheduler.plan((0.0, 0.0), positions), positions)
+    # Large target sets: 2-opt never does worse than its nearest-neighbour start
+    rng = np.random.default_rng(0)
+    positions = {i: (float(rng.uniform(-25, 25)), float(rng.uniform(-140, 140))) for i in range(10)}
+    greedy = scheduler._nearest_neighbour((0.0, 0.0), sorted(positions), positions)
+    planned = scheduler.plan((0.0, 0.0), positions)
+    assert sorted(planned) == sorted(positions)
+    assert scheduler.cost((0.0, 0.0), planned, positions) <= scheduler.cost((0.0, 0.0), greedy, positions)
+
+
+def test_replans_on_appear_disappear_and_relative_motion_only():
+    tracker, camera = make_tracker()
+    camera.tracks = [balloon(1, (300, 220, 340, 260)), balloon(2, (500, 100, 540, 140)),
+                     balloon(9, (100, 300, 140, 340), label='blue_balloon')]
+    step(tracker)
+    assert tracker.engagement_plan == [1, 2] and tracker.current_target.track_id == 1
+    assert tracker.replan_count == 1
+    # Blue balloons are never planned
+    assert 9 in tracker.targets_by_id and 9 not in tracker.engagement_plan
+
+    # Panning the turret moves every target together: the order still holds
+    camera.tracks = [balloon(1, (280, 210, 320, 250)), balloon(2, (480, 90, 520, 130))]
+    step(tracker)
+    assert tracker.replan_count == 1
+
+    # A target moving relative to the others triggers a re-plan
+    camera.tracks = [balloon(1, (280, 210, 320, 250)), balloon(2, (380, 200, 420, 240))]
+    step(tracker)
+    assert tracker.replan_count == 2
+
+    # So do a new target and a disappearing one
+    camera.tracks = camera.tracks + [balloon(3, (320, 230, 360, 270))]
+    step(tracker)
+    assert tracker.replan_count == 3 and set(tracker.engagement_plan) == {1, 2, 3}
+    camera.tracks = camera.tracks[1:]
+    for target in tracker.targets_by_id.values():
+        target.last_seen -= 1.0 if target.track_id == 1 else 0.0
+    step(tracker)
+    assert tracker.replan_count == 4 and set(tracker.engagement_plan) == {2, 3}
+
+
+def test_disappearance_alone_is_not_a_kill():
+    tracker, camera = make_tracker()
+    camera.tracks = [balloon(1, (300, 220, 340, 260))]
+    step(tracker)
+    tracker._engage_current_target()
+    target = tracker.targets_by_id[1]
+    assert tracker.laser_control.shots == 1 and target.shots_fired == 1
+
+    # The track drops out (gate skip, occlusion) with the balloon still looking the same
+    camera.tracks = []
+    age(target, tracker.kill_confirm_time + 0.1)
+    step(tracker)
+    assert not target.eliminated and tracker.red_balloons_eliminated == 0
+    # ...and is eventually dropped as lost, not counted
+    age(target, tracker.target_lost_timeout)
+    step(tracker)
+    assert 1 not in tracker.targets_by_id and tracker.red_balloons_eliminated == 0
+
+
+def test_shrink_confirms_a_kill_and_records_are_pruned():
+    tracker, camera = make_tracker()
+    camera.tracks = [balloon(1, (300, 220, 340, 260))]
+    step(tracker)
+    tracker._engage_current_target()
+    target = tracker.targets_by_id[1]
+    target.last_fire_time -= 0.01
+
+    # Growing (closer balloon, merged boxes) is not evidence
+    camera.tracks = [balloon(1, (290, 210, 350, 270))]
+    step(tracker)
+    step(tracker)
+    assert not target.eliminated and target.kill_evidence == 0
+
+    # The popped balloon's box collapses for kill_confirm_frames frames
+    camera.tracks = [balloon(1, (310, 230, 330, 250))]
+    step(tracker)
+    assert not target.eliminated
+    # Re-reading the same detections is not a second frame of evidence
+    step(tracker)
+    assert not target.eliminated and target.kill_evidence == 1
+    camera.tracks = [balloon(1, (310, 230, 330, 250))]
+    step(tracker)
+    assert target.eliminated and tracker.red_balloons_eliminated == 1
+    assert tracker.engagement_plan == [] and tracker.current_target is None
+
+    # Eliminated records are pruned once the track is gone
+    camera.tracks = []
+    age(target, tracker.target_lost_timeout + 0.1)
+    step(tracker)
+    assert tracker.targets_by_id == {} and tracker.red_balloons_eliminated == 1
+
+
+def test_republished_tracks_are_not_new_sightings():
+    tracker, camera = make_tracker()
+    camera.capture_time = time.time()
+    camera.tracks = [balloon(1, (300, 220, 340, 260))]
+    step(tracker)
+    target = tracker.targets_by_id[1]
+    assert target.last_seen == camera.capture_time
+
+    # The camera keeps handing out the same list (gate skips, stalled detector)
+    age(target, tracker.target_lost_timeout + 0.1)
+    step(tracker)
+    assert 1 not in tracker.targets_by_id
+    step(tracker)
+    assert tracker.targets_by_id == {}
+    # A new detection list brings it back
+    camera.capture_time = time.time()
+    camera.tracks = [balloon(1, (300, 220, 340, 260))]
+    step(tracker)
+    assert tracker.targets_by_id[1].last_seen == camera.capture_time
+
+
+def test_red_gone_from_a_vanished_track_is_a_kill():
+    tracker, camera = make_tracker()
+    bbox = (300, 220, 340, 260)
+    camera.frame[220:260, 300:340] = (0, 0, 255)
+    camera.tracks = [balloon(1, bbox)]
+    step(tracker)
+    tracker._engage_current_target()
+    target = tracker.targets_by_id[1]
+    assert target.fire_red > 0.9
+
+    # Track and red pixels are gone together
+    camera.frame[:] = 0
+    camera.tracks = []
+    age(target, tracker.kill_confirm_time + 0.1)
+    step(tracker)
+    assert target.eliminated and tracker.red_balloons_eliminated == 1
+
+
+if __name__ == "__main__":
+    test_scheduler_orders_by_objective()
+    test_replans_on_appear_disappear_and_relative_motion_only()
+    test_disappearance_alone_is_not_a_kill()
+    test_shrink_confirms_a_kill_and_records_are_pruned()
+    test_republished_tracks_are_not_new_sightings()
+    test_red_gone_from_a_vanished_track_is_a_kill()
+    print("✅ Capability 11 tracker tests passed")
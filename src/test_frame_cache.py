@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared per-frame image cache
+"""
+
+import sys
+import os
+
+import cv2
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import frame_cache
+from frame_cache import FrameCache
+from inference_gate import frame_sharpness
+from shape_detector import ShapeDetector
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+
+def test_derived_images_are_computed_once_and_shared():
+    frames = FrameCache(_frame())
+    before = frame_cache.get_stats()
+    hsv = frames.get("hsv")
+    assert frames.get("hsv") is hsv
+    assert np.array_equal(hsv, cv2.cvtColor(frames.bgr, cv2.COLOR_BGR2HSV))
+    small = frames.get("gray", 160)
+    assert small.shape == (120, 160)
+    after = frame_cache.get_stats()
+    # hsv + downscaled bgr + gray computed; one hsv reuse saved
+    assert after['computed'] - before['computed'] == 3
+    assert after['saved'] - before['saved'] == 1
+
+
+def test_roi_matches_a_direct_conversion():
+    frames = FrameCache(_frame())
+    bbox = (100, 50, 180, 170)
+    direct = cv2.cvtColor(frames.bgr[50:170, 100:180], cv2.COLOR_BGR2LAB)
+    assert np.array_equal(frames.roi("lab", bbox), direct)
+    # Once the full-frame image exists, ROIs are slices of it
+    frames.get("lab")
+    assert np.array_equal(frames.roi("lab", bbox), direct)
+
+
+def test_consumers_share_one_frame_and_release_frees_it():
+    frames = FrameCache(_frame())
+    # The sharpness gate and the pre-detector give the same answers on a cache as on the array
+    assert frame_sharpness(frames) == frame_sharpness(frames.bgr)
+    detector = ShapeDetector()
+    assert len(detector.detect(frames)) == len(detector.detect(frames.bgr))
+    before = frame_cache.get_stats()['saved']
+    detector.detect(frames)
+    assert frame_cache.get_stats()['saved'] > before
+    frames.release()
+    assert frames._images == {}
+
+
+if __name__ == "__main__":
+    test_derived_images_are_computed_once_and_shared()
+    test_roi_matches_a_direct_conversion()
+    test_consumers_share_one_frame_and_release_frees_it()
+    print("✅ Frame cache tests passed")
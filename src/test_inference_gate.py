@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the settle/sharpness inference gate
+"""
+
+import sys
+import os
+
+import cv2
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from inference_gate import InferenceGate, frame_sharpness
+
+
+def _scene(seed=0):
+    """Textured 640x480 test frame."""
+    rng = np.random.default_rng(seed)
+    frame = cv2.resize(rng.integers(0, 255, (60, 80, 3), dtype=np.uint8), (640, 480),
+                       interpolation=cv2.INTER_NEAREST)
+    cv2.circle(frame, (320, 240), 60, (0, 0, 255), -1)
+    return frame
+
+
+def _motion_blur(frame, length=25):
+    kernel = np.zeros((length, length), np.float32)
+    kernel[length // 2, :] = 1.0 / length
+    return cv2.filter2D(frame, -1, kernel)
+
+
+class FakeMotion:
+    def __init__(self):
+        self.is_moving = False
+        self.last_command_time = 0.0
+
+
+def test_motion_blur_lowers_sharpness():
+    frame = _scene()
+    assert frame_sharpness(_motion_blur(frame)) < 0.3 * frame_sharpness(frame)
+
+
+def test_frames_wait_for_settle_and_sharpness():
+    motion = FakeMotion()
+    gate = InferenceGate(settle_time=0.15, max_skip_time=10.0, motion=motion)
+    sharp, blurred = _scene(), _motion_blur(_scene())
+
+    motion.is_moving = True
+    assert gate.evaluate(sharp, now=1.0).reason == "moving"
+
+    # Streamer idle, but the last setpoint went out only 0.1 s ago
+    motion.is_moving, motion.last_command_time = False, 0.95
+    assert not gate.evaluate(sharp, now=1.05).run
+    assert gate.evaluate(sharp, now=1.2).reason == "settled"
+    # Once the scene's sharpness is known, a blurred settled frame is rejected
+    assert gate.evaluate(blurred, now=1.3).reason == "blurry"
+    assert gate.get_stats()['processed'] == 1
+
+
+def test_tracking_policies():
+    motion = FakeMotion()
+    motion.is_moving = True
+    sharp, blurred = _scene(), _motion_blur(_scene())
+
+    gate = InferenceGate(tracking_policy="sharp", max_skip_time=10.0, motion=motion)
+    gate.reference_sharpness = frame_sharpness(sharp)
+    gate.tracking = True
+    assert gate.evaluate(sharp, now=1.0).reason == "tracking"
+    assert not gate.evaluate(blurred, now=1.1).run
+
+    gate = InferenceGate(tracking_policy="always", motion=motion)
+    gate.tracking = True
+    assert gate.evaluate(blurred, now=1.0).run
+
+
+def test_long_skips_are_forced():
+    motion = FakeMotion()
+    motion.is_moving = True
+    gate = InferenceGate(max_skip_time=1.0, motion=motion)
+    gate.last_run_time = 5.0
+    assert not gate.evaluate(_scene(), now=5.5).run
+    assert gate.evaluate(_scene(), now=6.0).reason == "forced"
+
+
+if __name__ == "__main__":
+    test_motion_blur_lowers_sharpness()
+    test_frames_wait_for_settle_and_sharpness()
+    test_tracking_policies()
+    test_long_skips_are_forced()
+    print("✅ Inference gate tests passed")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the inference latency governor
+"""
+
+import sys
+import os
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from inference_governor import DEFAULT_TIERS, InferenceGovernor
+
+
+def _simulate(governor, frames, base_latency):
+    """Latency of each tier is base_latency x its cost; returns the tier names visited."""
+    names = []
+    for _ in range(frames):
+        governor.record(base_latency * governor.tier.cost)
+        names.append(governor.tier.name)
+    return names
+
+
+def test_overload_steps_down_until_within_budget():
+    governor = InferenceGovernor(budget=0.1, start_tier=4)
+    # Hot CPU: nano-320 takes 30 ms, small-640 would take 360 ms
+    _simulate(governor, 200, 0.03)
+    assert governor.tier.name == "nano-480"
+    assert governor.recent_latency() <= governor.budget
+
+
+def test_headroom_steps_up_with_hysteresis():
+    governor = InferenceGovernor(budget=0.1, start_tier=0, hold_frames=30)
+    names = _simulate(governor, 400, 0.005)
+    # 5 ms x 12 = 60 ms fits within 75% of the budget, so it climbs to the top...
+    assert governor.tier.name == "small-640"
+    # ...one tier at a time, holding each tier it switched to for at least hold_frames
+    first_frame = [names.index(t.name) for t in DEFAULT_TIERS[1:]]
+    assert all(b - a >= 30 for a, b in zip(first_frame, first_frame[1:]))
+
+
+def test_failed_upgrade_backs_off():
+    """A tier whose real cost is higher than predicted is retried less and less often."""
+    governor = InferenceGovernor(budget=0.1, start_tier=1, hold_frames=20)
+
+    def latency(tier):
+        return 0.03 if tier.name == "nano-480" else 0.2  # nano-640 always blows the budget
+
+    for _ in range(1000):
+        governor.record(latency(governor.tier))
+    # Bounced off nano-640 a few times, then settled with a long hold
+    assert governor.switches < 16
+    assert governor._upgrade_hold[2] > 20
+
+
+if __name__ == "__main__":
+    test_overload_steps_down_until_within_budget()
+    test_headroom_steps_up_with_hysteresis()
+    test_failed_upgrade_backs_off()
+    print("✅ Inference governor tests passed")
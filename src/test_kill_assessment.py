@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for post-fire kill assessment
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from kill_assessment import KillAssessor, KillOutcome
+
+
+def make_frame(bbox, color=(0, 0, 255)):
+    """Black frame with a filled BGR rectangle at bbox."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    x1, y1, x2, y2 = bbox
+    frame[y1:y2, x1:x2] = color
+    return frame
+
+
+BBOX = (300, 220, 340, 260)
+
+
+def test_disappearance_is_a_kill():
+    """A track missing from more than confirm_frames processed frames is confirmed killed."""
+    assessor = KillAssessor()
+    assessor.begin(1, BBOX, make_frame(BBOX), timestamp=0.0)
+    assert assessor.update(None, make_frame(BBOX), timestamp=0.1) == KillOutcome.PENDING
+    assert assessor.update(None, make_frame(BBOX), timestamp=0.2) == KillOutcome.PENDING
+    assert assessor.update(None, make_frame(BBOX), timestamp=0.3) == KillOutcome.KILLED
+    assert assessor.reason == "track disappeared"
+
+
+def test_skipped_frames_are_not_absence():
+    """Time without processed frames (gate or cascade skips) doesn't count as the track missing."""
+    assessor = KillAssessor()
+    assessor.begin(1, BBOX, make_frame(BBOX), timestamp=0.0)
+    assert assessor.update(None, make_frame(BBOX), timestamp=0.1) == KillOutcome.PENDING
+    for t in (0.3, 0.5, 0.7):
+        assert assessor.update(None, make_frame(BBOX), timestamp=t, new_frame=False) == KillOutcome.PENDING
+    # The track is back in the next processed frame, unchanged
+    assert assessor.update(BBOX, make_frame(BBOX), timestamp=0.8) == KillOutcome.PENDING
+    assert assessor.update(BBOX, make_frame(BBOX), timestamp=0.9) == KillOutcome.MISSED
+
+
+def test_shrink_is_a_kill_but_growth_is_not():
+    """A collapsing box is a pop; a box growing by half (closer balloon, merged tracks) is not."""
+    assessor = KillAssessor()
+    assessor.begin(1, BBOX, make_frame(BBOX), timestamp=0.0)
+    grown = (290, 210, 350, 270)
+    assert assessor.update(grown, make_frame(grown), timestamp=0.1) == KillOutcome.PENDING
+    assert assessor.update(grown, make_frame(grown), timestamp=0.2) == KillOutcome.PENDING
+    small = (310, 230, 330, 250)
+    assert assessor.update(small, make_frame(small), timestamp=0.3) == KillOutcome.PENDING
+    assert assessor.update(small, make_frame(small), timestamp=0.4) == KillOutcome.KILLED
+    assert assessor.reason == "shrink"
+
+
+def test_color_change_is_a_kill():
+    """The ROI losing its red pixels (popped balloon) is a kill."""
+    assessor = KillAssessor()
+    assessor.begin(1, BBOX, make_frame(BBOX), timestamp=0.0)
+    grey = make_frame(BBOX, color=(90, 90, 90))
+    assessor.update(BBOX, grey, timestamp=0.1)
+    assert assessor.update(BBOX, grey, timestamp=0.2) == KillOutcome.KILLED
+    assert assessor.reason == "color change"
+
+
+def test_unchanged_target_is_a_miss():
+    """A target that stays the same through the window is a miss."""
+    assessor = KillAssessor(window=0.6)
+    assessor.begin(1, BBOX, make_frame(BBOX), timestamp=0.0)
+    outcome = KillOutcome.PENDING
+    t = 0.0
+    while outcome == KillOutcome.PENDING:
+        t += 0.1
+        outcome = assessor.update(BBOX, make_frame(BBOX), timestamp=t)
+    assert outcome == KillOutcome.MISSED
+    assert t < 0.7
+    assert assessor.get_stats()['misses'] == 1
+
+
+def test_single_jittery_frame_is_not_a_kill():
+    """One odd bbox is not enough evidence."""
+    assessor = KillAssessor()
+    assessor.begin(1, BBOX, make_frame(BBOX), timestamp=0.0)
+    small = (310, 230, 330, 250)
+    assert assessor.update(small, make_frame(small), timestamp=0.1) == KillOutcome.PENDING
+    assert assessor.update(BBOX, make_frame(BBOX), timestamp=0.2) == KillOutcome.PENDING
+
+
+if __name__ == "__main__":
+    test_disappearance_is_a_kill()
+    test_skipped_frames_are_not_absence()
+    test_shrink_is_a_kill_but_growth_is_not()
+    test_color_change_is_a_kill()
+    test_unchanged_target_is_a_miss()
+    test_single_jittery_frame_is_not_a_kill()
+    print("✅ Kill assessment tests passed")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the motion profile generator and setpoint streamer
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from motion_profile import AxisLimits, AxisProfile, MotionStreamer, TrajectoryGenerator
+from telemetry import Pose
+
+RATE = 100.0
+LIMITS = [AxisLimits(50.0, 250.0, 5000.0), AxisLimits(250.0, 1000.0, 20000.0)]
+
+
+def _run(generator, steps):
+    return np.array([generator.step() for _ in range(steps)])
+
+
+def _derivatives(samples):
+    velocity = np.diff(samples, axis=0) * RATE
+    accel = np.diff(velocity, axis=0) * RATE
+    jerk = np.diff(accel, axis=0) * RATE
+    return np.abs(velocity).max(axis=0), np.abs(accel).max(axis=0), np.abs(jerk).max(axis=0)
+
+
+def _assert_within_limits(samples):
+    velocity, accel, jerk = _derivatives(samples)
+    for axis, limits in enumerate(LIMITS):
+        assert velocity[axis] <= limits.max_velocity * 1.01, (axis, velocity[axis])
+        assert accel[axis] <= limits.max_acceleration * 1.01, (axis, accel[axis])
+        assert jerk[axis] <= limits.max_jerk * 1.01, (axis, jerk[axis])
+
+
+def test_trapezoid_is_time_optimal():
+    profile = AxisProfile(0.0, 0.0, 100.0, AxisLimits(50.0, 250.0))
+    # 0.2 s ramps (5° each) and 90° of cruise at 50°/s
+    assert abs(profile.duration - 2.2) < 1e-9
+    assert np.allclose(profile.state_at(1.1), (50.0, 50.0))
+    # Starting towards the goal at speed skips the ramp up
+    assert abs(AxisProfile(0.0, 50.0, 100.0, AxisLimits(50.0, 250.0)).duration - 2.1) < 1e-9
+
+
+def test_axes_arrive_together_within_limits():
+    generator = TrajectoryGenerator(LIMITS, rate=RATE)
+    arrival = generator.set_goal((40.0, 200.0))
+    samples = _run(generator, int(arrival * RATE) + 5)
+    _assert_within_limits(samples)
+    arrived = [np.argmax(np.abs(samples[:, axis] - goal) < 1e-9) for axis, goal in enumerate((40.0, 200.0))]
+    print(f"   arrival={arrival:.2f}s, axes arrived at ticks {arrived}")
+    assert abs(arrived[0] - arrived[1]) <= 1
+    assert abs((arrived[0] + 1) / RATE - arrival) <= 2 / RATE
+    assert not generator.is_moving
+
+
+def test_replan_mid_slew_is_smooth():
+    """A goal that moves mid-slew (even backwards) keeps velocity, accel and jerk bounded."""
+    generator = TrajectoryGenerator(LIMITS, rate=RATE)
+    generator.set_goal((40.0, 200.0))
+    first = _run(generator, 60)
+    generator.set_goal((10.0, 50.0))
+    second = _run(generator, 200)
+    _assert_within_limits(np.vstack((first, second)))
+    assert np.allclose(second[-1], (10.0, 50.0))
+
+
+def test_direct_command_resyncs_axis():
+    generator = TrajectoryGenerator(LIMITS, rate=RATE)
+    generator.set_goal((40.0, 200.0))
+    _run(generator, 20)
+    generator.set_position(0, 5.0)
+    samples = _run(generator, 200)
+    assert np.all(samples[:, 0] == 5.0)
+    assert samples[-1, 1] == 200.0
+
+
+class FakeSerial:
+    def __init__(self):
+        self.commands = []
+
+    def send_command(self, cmd, data, **options):
+        self.commands.append((cmd, data))
+
+
+class TelemetrySerial(FakeSerial):
+    def __init__(self, pose=None):
+        super().__init__()
+        self.pose = pose
+
+    def latest_pose(self, max_age=None):
+        return self.pose
+
+
+def test_idle_move_starts_from_the_measured_pose():
+    """A generator seeded at (0, 0) plans from where the turret really is, not from its stale seed."""
+    serial = TelemetrySerial(Pose(time.time(), servo=30.0, stepper=150.0, servo_target=30.0,
+                                  stepper_target=150.0, laser=False))
+    streamer = MotionStreamer(serial, TrajectoryGenerator(LIMITS, rate=RATE, position=(0.0, 0.0)))
+    streamer.move_to(30.0, 120.0)
+    samples = _run(streamer.generator, 100)
+    assert np.all(samples[:, 0] == 30.0)
+    assert np.all(np.diff(samples[:, 1]) <= 0) and samples[:, 1].min() >= 120.0 - 1e-9
+    assert samples[0, 1] > 149.0
+
+    # Without telemetry the last commanded angles are used
+    serial = TelemetrySerial(None)
+    streamer = MotionStreamer(serial, TrajectoryGenerator(LIMITS, rate=RATE, position=(0.0, 0.0)))
+    streamer.command(0, 30)
+    streamer.command(1, 150)
+    assert serial.commands == [(0x01, 30), (0x02, 150)]
+    streamer.move_to(30.0, 120.0)
+    assert _run(streamer.generator, 1)[0, 1] > 149.0
+
+
+def test_cancel_stops_an_in_flight_slew():
+    serial = FakeSerial()
+    streamer = MotionStreamer(serial, TrajectoryGenerator(LIMITS, rate=RATE))
+    streamer.start()
+    try:
+        streamer.move_to(40.0, 250.0)
+        time.sleep(0.15)
+        streamer.cancel()
+        assert not streamer.is_moving
+        held = streamer.get_status()['setpoint']
+        sent = len(serial.commands)
+        time.sleep(0.15)
+    finally:
+        streamer.stop()
+    assert len(serial.commands) == sent
+    assert 0.0 < held[1] < 250.0 and streamer.get_status()['goal'] == held
+
+
+def test_streamer_sends_changed_whole_degrees():
+    serial = FakeSerial()
+    streamer = MotionStreamer(serial, TrajectoryGenerator(LIMITS, rate=RATE))
+    streamer.start()
+    try:
+        arrival = streamer.move_to(20.0, 100.0)
+        time.sleep(arrival + 0.2)
+    finally:
+        streamer.stop()
+    servo = [data for cmd, data in serial.commands if cmd == 0x01]
+    stepper = [data for cmd, data in serial.commands if cmd == 0x02]
+    assert servo[-1] == 20 and stepper[-1] == 100
+    assert all(b != a for a, b in zip(servo, servo[1:]))
+    assert not streamer.get_status()['moving']
+
+
+if __name__ == "__main__":
+    test_trapezoid_is_time_optimal()
+    test_axes_arrive_together_within_limits()
+    test_replan_mid_slew_is_smooth()
+    test_direct_command_resyncs_axis()
+    test_idle_move_starts_from_the_measured_pose()
+    test_cancel_stops_an_in_flight_slew()
+    test_streamer_sends_changed_whole_degrees()
+    print("✅ Motion profile tests passed")
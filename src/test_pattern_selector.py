@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive scan-pattern selector
+"""
+
+import sys
+import os
+import random
+
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pattern_selector import AdaptivePatternSelector
+
+EPOCH = 15.0  # seconds per decision
+
+
+def _run(selector, true_rates, epochs, seed=0):
+    """Simulate epochs of scanning with Poisson detections at `true_rates`."""
+    rng = np.random.default_rng(seed)
+    pattern = selector.choose()
+    for _ in range(epochs):
+        selector.record(pattern, EPOCH, int(rng.poisson(true_rates[pattern] * EPOCH)))
+        pattern = selector.choose()
+
+
+def test_first_epochs_explore_every_pattern():
+    patterns = ["radar_sweep", "spiral_scan", "sector_scan"]
+    selector = AdaptivePatternSelector(patterns, rng=random.Random(0))
+    _run(selector, dict.fromkeys(patterns, 0.1), epochs=3)
+    assert all(s.selections >= 1 for s in selector.stats.values())
+
+
+def test_best_pattern_gets_most_of_the_time():
+    true_rates = {"radar_sweep": 0.05, "spiral_scan": 0.3, "sector_scan": 0.05}
+    selector = AdaptivePatternSelector(true_rates, rng=random.Random(1))
+    _run(selector, true_rates, epochs=60)
+    stats = selector.get_stats()
+    print(f"   shares: { {k: round(v['share'], 2) for k, v in stats['patterns'].items()} }")
+    assert stats['best'] == "spiral_scan"
+    assert stats['patterns']['spiral_scan']['share'] > 0.6
+
+
+def test_min_share_keeps_exploring():
+    """Even a pattern that never finds anything keeps about min_share of the time."""
+    true_rates = {"radar_sweep": 0.0, "spiral_scan": 0.5}
+    selector = AdaptivePatternSelector(true_rates, min_share=0.15, rng=random.Random(2))
+    _run(selector, true_rates, epochs=80)
+    assert selector.share("radar_sweep") >= 0.1
+
+
+if __name__ == "__main__":
+    test_first_epochs_explore_every_pattern()
+    test_best_pattern_gets_most_of_the_time()
+    test_min_share_keeps_exploring()
+    print("✅ Pattern selector tests passed")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the PID/feedforward visual-servo controller and the radar tracking path that uses it
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pid_controller import (LegacyProportionalController, PIDController, VisualServoController,
+                            simulate_tracking)
+from radar_tracking_system import RadarTrackingSystem, ScanMode
+from search_heatmap import SearchHeatmap
+
+
+def test_saturated_output_does_not_wind_up_the_integral():
+    pid = PIDController(kp=1.0, ki=1.0, output_limit=1.0)
+    for _ in range(100):
+        assert pid.update(10.0, 0.1) == 1.0
+    # Saturated in the error direction: nothing was integrated, so a reversed error acts at once
+    assert pid.integral == 0.0
+    assert pid.update(-0.5, 0.1) < 0.0
+
+    bounded = PIDController(kp=0.0, ki=2.0, integral_limit=1.0)
+    for _ in range(100):
+        output = bounded.update(1.0, 0.1)
+    assert abs(output - 1.0) < 1e-9
+
+
+def test_derivative_is_low_pass_filtered():
+    pid = PIDController(kp=0.0, kd=1.0, derivative_tau=0.1)
+    pid.update(0.0, 0.01)
+    kick = pid.update(1.0, 0.01)
+    # A step would give a raw slope of 100; the filter passes dt / (tau + dt) of it
+    assert abs(kick - 100.0 * 0.01 / 0.11) < 1e-9
+    # Sample-to-sample noise of +-0.1 (raw slope +-20/s) is mostly removed
+    noisy = PIDController(kp=0.0, kd=1.0, derivative_tau=0.1)
+    outputs = [noisy.update(0.1 if i % 2 else -0.1, 0.01) for i in range(200)]
+    assert max(abs(o) for o in outputs[100:]) < 2.0
+
+
+def test_feedforward_follows_a_moving_target_without_error():
+    pid = PIDController(kp=0.0, kff=1.0)
+    assert pid.update(0.0, 0.1, feedforward=5.0) == 5.0
+
+    controller = VisualServoController()
+    dt, velocity = 0.1, (2.0, -6.0)
+    for i in range(40):
+        # The turret already sits on the target: only the estimated target velocity drives it
+        delta = controller.update(0.0, 0.0, 30.0 + velocity[0] * i * dt, 150.0 + velocity[1] * i * dt, dt)
+    assert abs(delta[0] - velocity[0] * dt) < 0.01 and abs(delta[1] - velocity[1] * dt) < 0.01
+
+
+def test_simulated_lock_is_faster_than_the_legacy_tracker():
+    moving = dict(target_start=(20.0, 130.0), target_velocity=(1.0, -4.0), seed=1)
+    pid = simulate_tracking(VisualServoController, **moving)
+    legacy = simulate_tracking(lambda: LegacyProportionalController(0.5), **moving)
+    assert pid.time_to_lock <= 1.0 and pid.settling_error < 2.0
+    assert legacy.time_to_lock > pid.time_to_lock
+    assert simulate_tracking(VisualServoController).time_to_lock <= 1.0
+
+
+class FakeCamera:
+    def __init__(self):
+        self.tracks = []
+
+    def get_frame(self):
+        return np.zeros((480, 640, 3), dtype=np.uint8), self.tracks, None
+
+
+def test_radar_locks_onto_a_balloon_and_resumes_scanning():
+    camera = FakeCamera()
+    radar = RadarTrackingSystem(None, camera, search_heatmap=SearchHeatmap())
+    radar.set_scan_mode(ScanMode.SPIRAL_SCAN)
+    camera.tracks = [
+        {'track_id': 3, 'bbox': [420, 80, 480, 140], 'label': 'red_balloon', 'confidence': 0.9},
+        {'track_id': 4, 'bbox': [100, 100, 140, 140], 'label': 'blue_balloon', 'confidence': 0.5},
+    ]
+    radar._update_targets()
+    assert radar.scan_mode == ScanMode.TRACKING and radar.current_target.track_id == 3
+    # The visual servo turns toward the target (right of and above the crosshair)
+    servo, stepper = radar.current_servo_angle, radar.current_stepper_angle
+    radar.last_movement_time -= 1.0
+    radar._execute_scanning()
+    assert radar.current_stepper_angle > stepper and radar.current_servo_angle > servo
+    assert radar.visual_servo_target_id == 3
+
+    camera.tracks = []
+    radar._update_targets()
+    assert radar.scan_mode == ScanMode.TRACKING  # brief gaps keep the lock
+    radar.current_target.last_seen -= radar.target_lost_timeout
+    radar._update_targets()
+    assert radar.current_target is None and radar.scan_mode == ScanMode.SPIRAL_SCAN
+
+
+if __name__ == "__main__":
+    test_saturated_output_does_not_wind_up_the_integral()
+    test_derivative_is_low_pass_filtered()
+    test_feedforward_follows_a_moving_target_without_error()
+    test_simulated_lock_is_faster_than_the_legacy_tracker()
+    test_radar_locks_onto_a_balloon_and_resumes_scanning()
+    print("✅ PID controller tests passed")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the throttled QR code reader
+"""
+
+import sys
+import os
+import time
+
+import cv2
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from qrcode_reader import QRCodeReader, find_finder_patterns, group_finder_patterns
+
+
+def _scene(payload="T-07", origin=(200, 100), scale=4):
+    """Grey 640x480 frame with one QR marker pasted at origin."""
+    code = cv2.resize(cv2.QRCodeEncoder.create().encode(payload), None, fx=scale, fy=scale,
+                      interpolation=cv2.INTER_NEAREST)
+    frame = np.full((480, 640, 3), 120, np.uint8)
+    x, y = origin
+    frame[y:y + code.shape[0], x:x + code.shape[1]] = code[:, :, None]
+    return frame
+
+
+def test_finder_patterns_give_one_region_around_the_code():
+    gray = cv2.cvtColor(_scene(), cv2.COLOR_BGR2GRAY)
+    patterns = find_finder_patterns(gray)
+    assert len(patterns) == 3
+    (x1, y1, x2, y2), = group_finder_patterns(patterns, gray.shape)
+    # The 100 px code (with its quiet zone) starts at (200, 100)
+    assert x1 <= 208 and y1 <= 108 and x2 >= 292 and y2 >= 192
+    # Nothing to decode on a plain frame
+    assert group_finder_patterns(find_finder_patterns(np.full((480, 640), 120, np.uint8)), (480, 640)) == []
+
+
+def test_payload_is_cached_per_track_until_the_region_changes():
+    reader = QRCodeReader()
+    track = (7, (150, 50, 350, 250))
+    codes = reader.process(_scene(), [track], now=0.0)
+    assert [(c.key, c.payload) for c in codes] == [(7, "T-07")]
+    # Same region: served from the cache
+    reader.process(_scene(), [track], now=0.25)
+    assert reader.decodes == 1 and reader.cache_hits == 1
+    # Moved marker: decoded again
+    reader.process(_scene(origin=(240, 100)), [track], now=0.5)
+    assert reader.decodes == 2
+    assert reader.payload_for_track(7) == "T-07"
+    # Out of view for longer than max_age: forgotten
+    reader.process(np.full((480, 640, 3), 120, np.uint8), [], now=3.0)
+    assert reader.get_codes() == []
+
+
+def test_worker_throttles_submitted_frames():
+    reader = QRCodeReader(rate=4.0)
+    reader.start()
+    try:
+        accepted = [reader.submit(_scene("S-1"), now=10.0 + i * 0.05) for i in range(10)]
+        # 20 Hz of frames over 0.5 s -> one every 0.25 s gets through
+        assert sum(accepted) == 2
+        deadline = time.time() + 2.0
+        while not reader.get_codes() and time.time() < deadline:
+            time.sleep(0.02)
+        assert [c.payload for c in reader.get_codes()] == ["S-1"]
+        assert reader.get_codes()[0].track_id is None
+    finally:
+        reader.stop()
+
+
+if __name__ == "__main__":
+    test_finder_patterns_give_one_region_around_the_code()
+    test_payload_is_cached_per_track_until_the_region_changes()
+    test_worker_throttles_submitted_frames()
+    print("✅ QR code reader tests passed")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the precompiled scan-pattern registry
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scan_patterns import SCAN_PATTERNS, compile_pattern, pattern_report, register_pattern
+
+SERVO_LIMITS = (0, 60)
+STEPPER_LIMITS = (0, 300)
+SPEED = 40.0  # degrees per second
+
+
+def test_patterns_are_continuous_closed_loops():
+    """No pattern jumps between ticks, including across the loop wrap."""
+    for name in SCAN_PATTERNS:
+        table = compile_pattern(name, SERVO_LIMITS, STEPPER_LIMITS, SPEED)
+        assert table.servo[0] == table.servo[-1] and table.stepper[0] == table.stepper[-1], name
+        samples = np.array([table.pose_at(t) for t in np.arange(0.0, 2 * table.period, 0.05)])
+        max_step = np.abs(np.diff(samples, axis=0)).max()
+        print(f"   {name}: period={table.period:.2f}s max_step={max_step:.2f}°")
+        assert max_step <= SPEED * 0.05 + 1e-6, f"{name} jumps {max_step:.2f}° in one tick"
+
+
+def test_nearest_phase_starts_without_a_jump():
+    table = compile_pattern("radar_sweep", SERVO_LIMITS, STEPPER_LIMITS, SPEED)
+    phase = table.nearest_phase((30.0, 300.0))
+    assert table.pose_at(phase) == (30.0, 300.0)
+
+
+def test_new_patterns_plug_in():
+    """A registered builder is compiled and reported like the built-ins."""
+    @register_pattern("test_box")
+    def _box(servo_limits, stepper_limits, **_):
+        return [(10, 100), (50, 100), (50, 200), (10, 200), (10, 100)]
+
+    try:
+        table = compile_pattern("test_box", SERVO_LIMITS, STEPPER_LIMITS, SPEED)
+        assert table.period > 0
+        report = pattern_report(table, SERVO_LIMITS, STEPPER_LIMITS)
+        assert 0 < report['coverage'] < 1
+        assert report['max_stepper_step'] <= SPEED * 0.05 + 1e-6
+    finally:
+        del SCAN_PATTERNS["test_box"]
+
+
+if __name__ == "__main__":
+    test_patterns_are_continuous_closed_loops()
+    test_nearest_phase_starts_without_a_jump()
+    test_new_patterns_plug_in()
+    print("✅ Scan pattern tests passed")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the coverage scan planner
+"""
+
+import math
+import sys
+import os
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scan_planner import ScanPlanner
+
+
+def test_grid_covers_field_of_regard():
+    """Every planned pattern must see the whole field of regard."""
+    planner = ScanPlanner(servo_limits=(5, 55), stepper_limits=(10, 290), overlap=0.2)
+    for name in planner.PATTERNS:
+        report = planner.evaluate(planner.plan(name), pattern=name)
+        print(f"   {name}: coverage={report.coverage:.3f}, full={report.time_to_full_coverage:.2f}s")
+        assert report.coverage == 1.0, f"{name} should cover the full field of regard"
+        assert report.time_to_full_coverage < math.inf
+
+
+def test_overlap_shrinks_tile_spacing():
+    """More overlap means more tiles on each axis."""
+    loose = ScanPlanner(overlap=0.0)
+    tight = ScanPlanner(overlap=0.5)
+    assert len(tight.grid_axes()[1]) > len(loose.grid_axes()[1])
+
+
+def test_auto_plan_starts_near_current_pose():
+    """The auto plan is mirrored so the first tile is the nearest corner."""
+    planner = ScanPlanner()
+    waypoints = planner.plan(start=(55, 290))
+    assert tuple(waypoints[0]) == (55, 290)
+
+
+def test_legacy_spiral_is_incomplete():
+    """The old spiral never leaves the center and never reaches full coverage."""
+    planner = ScanPlanner()
+    reports = planner.compare_patterns(start=(30, 150))
+    assert reports["legacy_spiral"].coverage < 0.5
+    assert reports["legacy_spiral"].time_to_full_coverage == math.inf
+
+
+def test_local_search_starts_at_prediction_and_follows_heading():
+    """Reacquisition search visits the predicted tile first, then the heading side."""
+    planner = ScanPlanner()
+    offsets = planner.local_search_offsets(rings=1, heading=(0.0, 20.0))
+    assert len(offsets) == 9
+    assert tuple(offsets[0]) == (0.0, 0.0)
+    assert offsets[1][0] == 0.0 and offsets[1][1] > 0, "Stepper-positive heading should be searched first"
+
+
+if __name__ == "__main__":
+    test_grid_covers_field_of_regard()
+    test_overlap_shrinks_tile_spacing()
+    test_auto_plan_starts_near_current_pose()
+    test_legacy_spiral_is_incomplete()
+    test_local_search_starts_at_prediction_and_follows_heading()
+    print("✅ Scan planner tests passed")
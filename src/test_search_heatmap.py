@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for the search likelihood heatmap
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scan_planner import ScanPlanner
+from search_heatmap import SearchHeatmap
+
+
+def test_dwell_moves_to_busy_sector_with_same_budget():
+    """Detections pull dwell time toward their tiles without changing the total."""
+    planner = ScanPlanner()
+    heatmap = SearchHeatmap.for_planner(planner, path=None)
+    waypoints = planner.plan(start=(30, 150))
+    for servo, stepper in waypoints:
+        heatmap.record_exposure(servo, stepper, 30.0)
+    for _ in range(10):
+        heatmap.record_detection(30.0, 250.0)
+
+    dwell = heatmap.dwell_times(waypoints, planner.dwell_time)
+    busiest = int(np.argmin(np.hypot(waypoints[:, 0] - 30.0, waypoints[:, 1] - 250.0)))
+    assert np.isclose(dwell.sum(), planner.dwell_time * len(waypoints))
+    assert dwell[busiest] == dwell.max()
+    assert dwell.min() >= planner.dwell_time * 0.5 * 0.99
+
+
+def test_counts_decay_with_half_life():
+    """After one half-life the learned counts are halved."""
+    heatmap = SearchHeatmap(half_life=100.0)
+    heatmap.record_detection(30.0, 150.0, now=heatmap.last_decay)
+    heatmap.decay(heatmap.last_decay + 100.0)
+    assert np.isclose(heatmap.detections.sum(), 0.5)
+
+
+def test_heatmap_persists_between_sessions():
+    """A saved map is loaded back with the same counts."""
+    heatmap = SearchHeatmap()
+    heatmap.record_detection(40.0, 200.0)
+    heatmap.record_exposure(40.0, 200.0, 5.0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'heatmap.npz')
+        heatmap.save(path)
+        loaded = SearchHeatmap.load(path)
+        assert loaded is not None
+        assert np.isclose(loaded.detections.sum(), heatmap.detections.sum(), rtol=1e-3)
+        assert loaded.rate_at(40.0, 200.0) > loaded.rate_at(40.0, 20.0)
+        # A different grid is not mixed with the saved one
+        assert SearchHeatmap.load(path, cell_size=10.0) is None
+
+
+if __name__ == "__main__":
+    test_dwell_moves_to_busy_sector_with_same_budget()
+    test_counts_decay_with_half_life()
+    test_heatmap_persists_between_sessions()
+    print("✅ Search heatmap tests passed")
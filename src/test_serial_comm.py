@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test script for the asynchronous serial writer (simulation mode, no hardware)
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from serial_comm import PRIORITY_SAFETY, SerialComm
+
+
+class RecordingSerialComm(SerialComm):
+    """Records what the writer thread writes; `hold` blocks the writer inside a write."""
+
+    def __init__(self, **kwargs):
+        self.written = []
+        self.hold = threading.Event()
+        self.hold.set()
+        self.writing = threading.Event()
+        super().__init__(simulation_mode=True, protocol="text", **kwargs)
+
+    def _write(self, batch):
+        self.writing.set()
+        self.hold.wait()
+        self.written.extend(batch)
+
+
+class SilentPort:
+    """pyserial-like port that takes writes and never answers."""
+
+    def __init__(self):
+        self.is_open = True
+        self.in_waiting = 0
+        self.baudrate = 9600
+        self.written = bytearray()
+
+    def write(self, data):
+        self.written.extend(data)
+        return len(data)
+
+    def read(self, size=1):
+        return b""
+
+    def close(self):
+        self.is_open = False
+
+
+class SilentSerialComm(SerialComm):
+    def _connect_with_retry(self):
+        self.ser = SilentPort()
+
+
+def test_send_returns_immediately_and_setpoints_coalesce():
+    serial = RecordingSerialComm(baudrate=300)  # ~27 bytes/s
+    try:
+        start = time.perf_counter()
+        for angle in range(100):
+            serial.send_command(0x02, angle)
+        assert time.perf_counter() - start < 0.05
+        assert serial.flush(timeout=2.0)
+        stepper = [data for cmd, data in serial.written if cmd == 0x02]
+        # Stale targets were replaced, and the last one always goes out
+        assert len(stepper) < 10 and stepper[-1] == 99
+        assert serial.get_link_stats()['coalesced'] >= 90
+    finally:
+        serial.close()
+
+
+def test_priority_classes_order_the_queue():
+    serial = RecordingSerialComm()
+    try:
+        serial.hold.clear()
+        serial.send_command(0x01, 10)  # Occupies the writer
+        assert serial.writing.wait(1.0)
+        serial.send_command(0x09, 1)  # Unknown command -> telemetry
+        serial.send_command(0x02, 120)  # Motion
+        serial.send_command(0x03, 1)  # Laser on
+        serial.send_command(0x01, 20, priority=PRIORITY_SAFETY)
+        serial.hold.set()
+        assert serial.flush(timeout=2.0)
+        assert serial.written == [(0x01, 10), (0x01, 20), (0x03, 1), (0x02, 120), (0x09, 1)]
+        # Laser off supersedes a laser on that hasn't gone out yet
+        serial.hold.clear()
+        serial.writing.clear()
+        serial.send_command(0x01, 30)
+        assert serial.writing.wait(1.0)
+        serial.send_command(0x03, 1)
+        serial.send_command(0x03, 0)
+        serial.hold.set()
+        assert serial.flush(timeout=2.0)
+        assert serial.written[-2:] == [(0x01, 30), (0x03, 0)]
+    finally:
+        serial.close()
+
+
+def test_pending_safety_commands_are_not_replaced_by_less_urgent_ones():
+    serial = RecordingSerialComm()
+    try:
+        serial.hold.clear()
+        serial.send_command(0x03, 1)  # Occupies the writer
+        assert serial.writing.wait(1.0)
+        # Emergency stop, then a joystick/autonomous setpoint before the writer drains it
+        serial.send_command(0x01, 0, priority=PRIORITY_SAFETY)
+        serial.send_command(0x02, 0, priority=PRIORITY_SAFETY)
+        serial.send_command(0x01, 45)
+        serial.send_command(0x02, 200)
+        # Laser off queues behind them in the safety class
+        serial.send_command(0x03, 0)
+        serial.hold.set()
+        assert serial.flush(timeout=2.0)
+        assert serial.written == [(0x03, 1), (0x01, 0), (0x02, 0), (0x03, 0)]
+        # Once the safety move is out, setpoints flow again
+        serial.send_command(0x01, 45)
+        assert serial.flush(timeout=2.0)
+        assert serial.written[-1] == (0x01, 45)
+    finally:
+        serial.close()
+
+
+def test_writes_stay_within_the_bandwidth_budget():
+    serial = RecordingSerialComm(baudrate=1200)  # 120 bytes/s link
+    try:
+        serial.bandwidth_share = 0.5
+        end = time.monotonic() + 1.0
+        angle = 0
+        while time.monotonic() < end:
+            angle += 1
+            serial.send_command(0x01 + angle % 2, 100 + angle % 50)
+            time.sleep(0.002)
+        stats = serial.get_link_stats()
+        # Burst allowance + 60 bytes/s over one second
+        assert stats['bytes_sent'] <= serial.burst_bytes + 70
+        assert stats['link_utilization'] <= 0.5 + serial.burst_bytes / 120.0
+    finally:
+        serial.close()
+
+
+def test_commands_go_out_while_a_query_waits_for_its_reply():
+    serial = SilentSerialComm(protocol="text", port="silent")
+    try:
+        serial.reply_timeout = 1.0
+        # A query the device will never answer
+        replies = []
+        query = threading.Thread(target=lambda: replies.append(serial.query_capabilities()))
+        query.start()
+        deadline = time.monotonic() + 1.0
+        while b"?" not in serial.ser.written and time.monotonic() < deadline:
+            time.sleep(0.01)
+        serial.send_command(0x01, 0, priority=PRIORITY_SAFETY)
+        assert serial.flush(timeout=0.3)
+        assert query.is_alive()  # the safety stop did not wait out the reply timeout
+        query.join()
+        assert replies == [None]
+    finally:
+        serial.close()
+
+
+if __name__ == "__main__":
+    test_send_returns_immediately_and_setpoints_coalesce()
+    test_priority_classes_order_the_queue()
+    test_pending_safety_commands_are_not_replaced_by_less_urgent_ones()
+    test_writes_stay_within_the_bandwidth_budget()
+    test_commands_go_out_while_a_query_waits_for_its_reply()
+    print("✅ Serial writer tests passed")
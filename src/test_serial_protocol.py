@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test script for the framed multi-axis serial protocol, against the protocol emulator
+"""
+
+import sys
+import os
+import time
+from collections import deque
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from serial_comm import SerialComm
+from serial_protocol import (FRAME_SIZE, EmulatedPort, Frame, FrameDecoder, ProtocolEmulator, crc8, decode_frame,
+                             encode_frame)
+
+
+class EmulatorPort:
+    """Stands in for the pyserial port: written bytes go to the emulator."""
+
+    in_waiting = 0  # replies are not read back
+
+    def __init__(self, emulator):
+        self.emulator = emulator
+        self.is_open = True
+
+    def write(self, data):
+        self.emulator.feed(data)
+        return len(data)
+
+    def read(self, size=1):
+        return b""
+
+    def close(self):
+        self.is_open = False
+
+
+class EmulatedSerialComm(SerialComm):
+    def __init__(self, emulator, port_factory=EmulatorPort, **kwargs):
+        self.emulator = emulator
+        self.port_factory = port_factory
+        super().__init__(**kwargs)
+
+    def _connect_with_retry(self):
+        self.ser = self.port_factory(self.emulator)
+
+
+def _negotiating_link(max_reliable_baud=None):
+    """SerialComm on an emulated device with fast commit/link timeouts."""
+    device = ProtocolEmulator(baud_commit_timeout=0.05, link_timeout=0.3)
+    serial = EmulatedSerialComm(device, port_factory=lambda d: EmulatedPort(
+        d, max_reliable_baud=max_reliable_baud, error_rate=0.5), protocol="frame", port="emulator")
+    serial.baud_commit_timeout = 0.05
+    serial.link_timeout = 0.3
+    serial.link_check_interval = 0.05
+    return device, serial
+
+
+def test_frame_round_trip_with_sub_degree_angles():
+    assert crc8(b"123456789") == 0xF4  # CRC-8/SMBUS check value
+    packet = encode_frame(Frame(7, servo=12.34, stepper=287.5, laser=True))
+    assert len(packet) == FRAME_SIZE
+    frame = decode_frame(packet)
+    assert frame == Frame(7, servo=12.34, stepper=287.5, laser=True)
+    # Fields left out are not applied
+    assert decode_frame(encode_frame(Frame(8, stepper=300.0))) == Frame(8, stepper=300.0)
+    # Any flipped bit is caught by the CRC
+    corrupted = bytearray(packet)
+    corrupted[4] ^= 0x10
+    assert decode_frame(corrupted) is None
+
+
+def test_decoder_resynchronizes_after_noise():
+    decoder = FrameDecoder()
+    good = [encode_frame(Frame(i, servo=float(i))) for i in range(3)]
+    broken = bytearray(good[1])
+    broken[6] ^= 0xFF
+    frames = decoder.feed(b"\x00\xA5\x13" + good[0] + bytes(broken) + good[2][:5])
+    frames += decoder.feed(good[2][5:])
+    assert [f.sequence for f in frames] == [0, 2]
+    assert decoder.crc_errors >= 1
+
+
+def test_serial_comm_drives_the_emulator_with_frames():
+    emulator = ProtocolEmulator()
+    serial = EmulatedSerialComm(emulator, protocol="frame", port="emulator")
+    try:
+        serial.send_command(0x01, 12.34)
+        serial.send_command(0x02, 287.5)  # Beyond the old 0-255 binary range
+        serial.send_command(0x03, 1)
+        assert serial.flush(timeout=2.0)
+        assert (emulator.servo, emulator.stepper, emulator.laser) == (12.34, 287.5, True)
+        serial.send_command(0x03, 0)
+        serial.send_command(0x02, 45.25)
+        assert serial.flush(timeout=2.0)
+        assert (emulator.stepper, emulator.laser) == (45.25, False)
+        assert emulator.crc_errors == 0 and emulator.frames_lost == 0
+        # Pending commands share frames, so there are never more frames than commands
+        assert emulator.frames <= 5 and serial.bytes_sent == emulator.frames * FRAME_SIZE
+    finally:
+        serial.close()
+
+
+def test_emulator_keeps_the_legacy_protocols():
+    emulator = ProtocolEmulator()
+    emulator.feed(b"S30\nM135\na\n")
+    assert (emulator.servo, emulator.stepper, emulator.laser) == (30.0, 135.0, True)
+    emulator.feed(bytes([0xAA, 0x02, 200, 0x55, 0xAA, 0x01, 99, 0x55]))
+    # Servo clamped to its 0-60 range
+    assert (emulator.servo, emulator.stepper) == (60.0, 200.0)
+
+
+def test_stray_frame_bytes_are_not_text_commands():
+    emulator = ProtocolEmulator()
+    emulator.feed(encode_frame(Frame(1, servo=40.0, stepper=200.0)))
+    # A frame cut short after its start byte: the payload starts with 'M' (0x4D) and 'S' (0x53)
+    frame = bytearray(encode_frame(Frame(0x4D, servo=0.83, stepper=1.0)))
+    frame[3] = ord("S")
+    emulator.feed(bytes(frame[1:]))
+    emulator.feed(b"B\x01\xff\n")
+    assert (emulator.servo, emulator.stepper, emulator.baud) == (40.0, 200.0, 9600)
+    # Printable garbage on a complete line is rejected too
+    emulator.feed(b"Sxx\nM\nB12a\n")
+    assert (emulator.servo, emulator.stepper, emulator.output) == (40.0, 200.0, deque())
+    # ...and the next real frame and text line still get through
+    emulator.feed(encode_frame(Frame(2, servo=20.0)) + b"M150\n")
+    assert (emulator.servo, emulator.stepper) == (20.0, 150.0)
+
+
+def test_a_new_host_session_restarts_the_frame_sequence():
+    clock = [0.0]
+    emulator = ProtocolEmulator(clock=lambda: clock[0], link_timeout=3.0, telemetry_interval=None)
+    emulator.feed(encode_frame(Frame(5, servo=30.0)))
+    # The host restarts and its first frame happens to reuse the sequence number
+    clock[0] += 3.5
+    emulator.poll()
+    emulator.feed(encode_frame(Frame(5, servo=10.0)))
+    assert emulator.servo == 10.0 and emulator.duplicates == 0
+    # A capability query (host connecting) also starts a new session
+    emulator.feed(b"?\n" + encode_frame(Frame(5, servo=50.0)))
+    assert emulator.servo == 50.0 and emulator.duplicates == 0
+    emulator.feed(encode_frame(Frame(5, servo=20.0)))
+    assert emulator.servo == 50.0 and emulator.duplicates == 1
+
+
+def test_baud_negotiation_verifies_with_echo():
+    device, serial = _negotiating_link()
+    try:
+        assert serial.query_capabilities()["baud"][-1] == 230400
+        assert serial.negotiate_baud(115200) == 115200
+        assert device.baud == 115200 and device.baud_committed
+        # Commands keep flowing at the new rate
+        serial.send_command(0x02, 250.5)
+        assert serial.flush(timeout=1.0)
+        assert device.stepper == 250.5
+        stats = serial.get_link_stats()
+        assert stats['baudrate'] == 115200 and stats['rtt_ms'] is not None and stats['link_errors'] == 0
+    finally:
+        serial.close()
+
+
+def test_negotiation_falls_back_from_a_noisy_rate():
+    # The cable garbles half the bytes above 57600 baud
+    device, serial = _negotiating_link(max_reliable_baud=57600)
+    try:
+        assert serial.negotiate_baud(230400) == 57600
+        assert device.baud == 57600
+        assert serial.get_link_stats()['link_errors'] > 0
+    finally:
+        serial.close()
+
+
+def test_link_monitor_drops_rate_when_pings_fail():
+    device, serial = _negotiating_link()
+    try:
+        assert serial.negotiate_baud(115200) == 115200
+        # The link degrades after negotiation
+        serial.ser.max_reliable_baud = 57600
+        deadline = time.time() + 5.0
+        while serial.baudrate != 57600 and time.time() < deadline:
+            time.sleep(0.05)
+        assert serial.baudrate == 57600 and device.baud == 57600
+    finally:
+        serial.close()
+
+
+if __name__ == "__main__":
+    test_frame_round_trip_with_sub_degree_angles()
+    test_decoder_resynchronizes_after_noise()
+    test_serial_comm_drives_the_emulator_with_frames()
+    test_emulator_keeps_the_legacy_protocols()
+    test_stray_frame_bytes_are_not_text_commands()
+    test_a_new_host_session_restarts_the_frame_sequence()
+    test_baud_negotiation_verifies_with_echo()
+    test_negotiation_falls_back_from_a_noisy_rate()
+    test_link_monitor_drops_rate_when_pings_fail()
+    print("✅ Serial protocol tests passed")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the color/shape pre-detector and the cascade benchmark (no model needed)
+"""
+
+import sys
+import os
+import tempfile
+import types
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_inference import benchmark_cascade, load_recording
+from shape_detector import ShapeDetector, learn_color_ranges
+from test_benchmark_inference import FakeBoxes
+
+RED = (40, 30, 210)  # BGR
+BLUE = (200, 90, 30)
+
+
+def _scene():
+    """Grey 640x480 frame with a red and a blue balloon and a red rectangle."""
+    frame = np.full((480, 640, 3), 90, np.uint8)
+    cv2.ellipse(frame, (160, 200), (40, 52), 0, 0, 360, RED, -1)
+    cv2.ellipse(frame, (460, 300), (30, 38), 0, 0, 360, BLUE, -1)
+    cv2.rectangle(frame, (300, 40), (600, 80), RED, -1)
+    return frame
+
+
+def test_learned_red_range_wraps_around_zero():
+    ranges = learn_color_ranges()
+    assert {"red", "blue"} <= set(ranges)
+    red = ranges["red"]
+    assert red.hue_low < 180 < red.hue_high
+    hsv = cv2.cvtColor(np.array([[RED, BLUE]], np.uint8), cv2.COLOR_BGR2HSV)
+    assert list(red.mask(hsv)[0]) == [255, 0]
+    assert list(ranges["blue"].mask(hsv)[0]) == [0, 255]
+
+
+def test_balloons_are_found_and_rectangles_rejected():
+    candidates = ShapeDetector().detect(_scene())
+    assert sorted(c.label for c in candidates) == ["blue_balloon", "red_balloon"]
+    red = next(c for c in candidates if c.label == "red_balloon")
+    x1, y1, x2, y2 = red.bbox
+    assert abs(x1 - 120) <= 6 and abs(y1 - 148) <= 6 and abs(x2 - 200) <= 6 and abs(y2 - 252) <= 6
+
+
+def test_proposal_region_covers_candidates_inside_the_frame():
+    detector = ShapeDetector()
+    candidates = detector.detect(_scene())
+    x1, y1, x2, y2 = detector.proposal_region(candidates, (480, 640, 3))
+    assert 0 <= x1 < x2 <= 640 and 0 <= y1 < y2 <= 480
+    for c in candidates:
+        assert x1 <= c.bbox[0] and y1 <= c.bbox[1] and c.bbox[2] <= x2 and c.bbox[3] <= y2
+    assert detector.proposal_region([], (480, 640, 3)) is None
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str = "search"
+    imgsz: int = 320
+    conf: float = 0.6
+    classes: Optional[Tuple[int, ...]] = None
+
+
+def test_cascade_skips_yolo_on_empty_frames():
+    crops = []
+
+    def predict(frame, profile):
+        # A "YOLO" that finds the red balloon wherever it is in the frame it is given
+        crops.append(frame.shape[:2])
+        mask = cv2.inRange(frame, np.array(RED) - 5, np.array(RED) + 5)
+        x, y, w, h = cv2.boundingRect(mask)
+        boxes = [[x, y, x + w, y + h]] if w else np.empty((0, 4))
+        return [types.SimpleNamespace(boxes=FakeBoxes(boxes))]
+
+    with tempfile.TemporaryDirectory() as folder:
+        scene = np.full((480, 640, 3), 90, np.uint8)
+        cv2.ellipse(scene, (160, 200), (40, 52), 0, 0, 360, RED, -1)
+        cv2.imwrite(os.path.join(folder, "balloon.png"), scene)
+        with open(os.path.join(folder, "balloon.txt"), "w") as f:
+            f.write("0 0.25 0.4167 0.125 0.2167\n")
+        cv2.imwrite(os.path.join(folder, "empty.png"), np.full((480, 640, 3), 90, np.uint8))
+        open(os.path.join(folder, "empty.txt"), "w").close()
+        reports = benchmark_cascade(Profile(), load_recording(folder), predict, ShapeDetector(), warmup=0)
+
+    reports = {r['pipeline']: r for r in reports}
+    assert reports["yolo"]['recall'] == reports["cascade"]['recall'] == 1.0
+    # YOLO ran in the cascade on the balloon frame only, and on a crop
+    assert reports["cascade"]['yolo_share'] == 0.5
+    assert min(crops) < (480, 640)
+
+
+if __name__ == "__main__":
+    test_learned_red_range_wraps_around_zero()
+    test_balloons_are_found_and_rectangles_rejected()
+    test_proposal_region_covers_candidates_inside_the_frame()
+    test_cascade_skips_yolo_on_empty_frames()
+    print("✅ Shape detector tests passed")
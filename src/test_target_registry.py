@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent target registry
+"""
+
+import sys
+import os
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from target_registry import TargetRegistry
+
+
+def test_records_are_updated_in_place():
+    """The same record object is reused and accumulates hits."""
+    registry = TargetRegistry(timeout=2.0)
+    first = registry.observe(7, (100, 100, 140, 140), 0.0)
+    second = registry.observe(7, (110, 100, 150, 140), 0.1)
+    assert first is second
+    assert second.hits == 2
+    assert second.last_seen == 0.1
+    assert second.center == (130, 120)
+    assert second.velocity[0] > 0, "Moving right should give a positive x velocity"
+    assert not hasattr(second, '__dict__'), "Records should use __slots__"
+
+
+def test_unseen_tracks_expire():
+    """A track that stops being observed is removed after the timeout."""
+    registry = TargetRegistry(timeout=1.0)
+    registry.observe(1, (0, 0, 10, 10), 0.0)
+    registry.observe(2, (0, 0, 10, 10), 0.0)
+    for t in (0.5, 0.9, 1.4):
+        registry.observe(1, (0, 0, 10, 10), t)
+        registry.expire(t)
+    assert 1 in registry
+    assert 2 not in registry
+    assert registry.expire(3.0) == [1]
+    assert len(registry) == 0
+
+
+def test_select_prefers_priority_then_cost():
+    """Priority wins over cost, and the predicate filters candidates."""
+    registry = TargetRegistry()
+    registry.observe(1, (0, 0, 10, 10), 0.0, target_type="friendly", priority=0)
+    registry.observe(2, (300, 300, 310, 310), 0.0, target_type="enemy", priority=1)
+    registry.observe(3, (100, 100, 110, 110), 0.0, target_type="enemy", priority=1)
+    cost = lambda r: r.center[0]
+    assert registry.select(cost).track_id == 3
+    assert registry.select(cost, predicate=lambda r: r.track_id != 3).track_id == 2
+    assert registry.select(cost, predicate=lambda r: r.target_type == "missing") is None
+
+
+if __name__ == "__main__":
+    test_records_are_updated_in_place()
+    test_unseen_tracks_expire()
+    test_select_prefers_priority_then_cost()
+    print("✅ Target registry tests passed")
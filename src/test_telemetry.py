@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the device telemetry ring buffer and the serial reader thread
+"""
+
+import sys
+import os
+import time
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from serial_comm import SerialComm
+from serial_protocol import EmulatedPort, ProtocolEmulator
+from telemetry import TelemetryBuffer, parse_telemetry_line
+
+
+class EmulatedSerialComm(SerialComm):
+    def __init__(self, device, **kwargs):
+        self.device = device
+        super().__init__(**kwargs)
+
+    def _connect_with_retry(self):
+        self.ser = EmulatedPort(self.device)
+
+
+def test_parse_rejects_malformed_lines():
+    assert parse_telemetry_line("T 1500 30 150.25 32 150.00 1") == (1.5, 30.0, 150.25, 32.0, 150.0, True)
+    assert parse_telemetry_line("T 1500 30 150.25 32 150.00") is None  # truncated
+    assert parse_telemetry_line("T 15x0 30 150.25 32 150.00 0") is None
+    assert parse_telemetry_line("OK B115200") is None
+    buffer = TelemetryBuffer()
+    assert not buffer.add_line("T garbage") and buffer.parse_errors == 1 and len(buffer) == 0
+
+
+def test_buffer_maps_device_time_and_interpolates():
+    buffer = TelemetryBuffer(capacity=8)
+    # Device samples every 100 ms; link delay jitters between 5 and 25 ms on a host clock 1000 s ahead
+    delays = [0.025, 0.005, 0.015, 0.020, 0.010, 0.025, 0.005, 0.015, 0.020, 0.010]
+    for i, delay in enumerate(delays):
+        buffer.append(i * 0.1, servo=10.0 + i, stepper=100.0 - 2 * i, servo_target=20.0, stepper_target=80.0,
+                      laser=i >= 5, received_at=1000.0 + i * 0.1 + delay)
+    # Ring keeps only the newest `capacity` samples, oldest first
+    assert len(buffer) == 8 and buffer.count == 10
+    window = buffer.window(0, 2000)
+    assert list(window[:, 2]) == [12.0 + i for i in range(8)]
+    # The least-delayed sample anchors the clock mapping
+    latest = buffer.latest(now=1001.0)
+    assert abs(latest.timestamp - (1000.9 + 0.005)) < 1e-9 and latest.servo == 19.0 and latest.laser
+    pose = buffer.pose_at(1000.455 + 0.005)  # between samples 4 and 5
+    assert abs(pose.servo - 14.55) < 1e-6 and abs(pose.stepper - 90.9) < 1e-6
+    assert not pose.laser  # state is taken from the earlier sample, not interpolated
+    assert buffer.pose_at(999.0) is None and buffer.pose_at(1002.0) is None
+    assert buffer.latest(max_age=0.05, now=1001.0) is None
+
+
+def test_reader_thread_feeds_telemetry_and_replies():
+    device = ProtocolEmulator(telemetry_interval=0.02, servo_rate=100.0, stepper_rate=400.0)
+    serial = EmulatedSerialComm(device, protocol="frame", port="emulator")
+    try:
+        serial.send_command(0x01, 40)
+        serial.send_command(0x02, 200)
+        assert serial.flush(timeout=1.0)
+        start = time.time()
+        # The command is acknowledged long before the motors arrive: feedback shows the real motion
+        pose = None
+        while time.time() - start < 2.0:
+            pose = serial.latest_pose()
+            if pose is not None and pose.servo == 40.0 and pose.stepper == 200.0:
+                break
+            time.sleep(0.02)
+        assert pose is not None and (pose.servo, pose.stepper) == (40.0, 200.0)
+        assert (pose.servo_target, pose.stepper_target) == (40.0, 200.0)
+        # Intermediate poses were recorded on the way (servo 0 -> 40 takes ~0.4 s)
+        midway = serial.pose_at(start + 0.2)
+        assert midway is not None and 0.0 < midway.servo < 40.0
+        # Replies still reach queries, and telemetry never shows up as a reply
+        assert serial.query_capabilities()["baud"][0] == 9600
+        assert serial.read_response() is None
+        assert serial.get_link_stats()['telemetry']['samples'] > 10
+    finally:
+        serial.close()
+
+
+if __name__ == "__main__":
+    test_parse_rejects_malformed_lines()
+    test_buffer_maps_device_time_and_interpolates()
+    test_reader_thread_feeds_telemetry_and_replies()
+    print("✅ Telemetry tests passed")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for tracking-window (crop) inference
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tracking_window import TrackingWindow
+
+FRAME_SHAPE = (480, 640, 3)
+
+
+def test_window_follows_the_predicted_target():
+    window = TrackingWindow(latency=0.1, full_frame_interval=100)
+    window.set_target((300, 200, 340, 240), velocity=(200.0, 0.0), observed_at=10.0, now=10.0)
+    x1, y1, x2, y2 = window.next_region(FRAME_SHAPE, now=10.1)
+    # Predicted center is 0.2 s * 200 px/s = 40 px to the right
+    assert abs((x1 + x2) / 2 - 360) <= 16 and abs((y1 + y2) / 2 - 220) <= 16
+    assert (x2 - x1) % 32 == 0 and (y2 - y1) % 32 == 0
+    # Wider along the direction of motion
+    assert x2 - x1 > y2 - y1
+
+
+def test_window_stays_inside_the_frame():
+    window = TrackingWindow(full_frame_interval=100)
+    window.set_target((600, 440, 640, 480), now=0.0)
+    x1, y1, x2, y2 = window.next_region(FRAME_SHAPE, now=0.0)
+    assert 0 <= x1 < x2 <= 640 and 0 <= y1 < y2 <= 480
+
+
+def test_periodic_and_stale_full_frames():
+    window = TrackingWindow(full_frame_interval=5, stale_time=0.5)
+    window.set_target((300, 200, 340, 240), now=0.0)
+    regions = [window.next_region(FRAME_SHAPE, now=0.1) for _ in range(10)]
+    assert [r is None for r in regions] == [False, False, False, False, True] * 2
+    # No refresh for longer than stale_time -> full frames only
+    assert window.next_region(FRAME_SHAPE, now=1.0) is None
+    window.clear()
+    assert window.next_region(FRAME_SHAPE) is None
+
+
+def test_boxes_map_back_to_the_frame():
+    boxes = TrackingWindow.to_frame(np.array([[10, 20, 30, 40, 0.9]]), (100, 50, 228, 178))
+    assert np.allclose(boxes, [[110, 70, 130, 90, 0.9]])
+    assert np.allclose(TrackingWindow.to_frame(boxes, None), boxes)
+
+
+if __name__ == "__main__":
+    test_window_follows_the_predicted_target()
+    test_window_stays_inside_the_frame()
+    test_periodic_and_stale_full_frames()
+    test_boxes_map_back_to_the_frame()
+    print("✅ Tracking window tests passed")
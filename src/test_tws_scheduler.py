@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the track-while-scan scheduler
+"""
+
+import sys
+import os
+
+# Add the current directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tws_scheduler import TrackWhileScanScheduler, TaskKind
+
+
+def test_threatening_tracks_are_revisited_sooner():
+    """Enemy and fast tracks get shorter revisit intervals."""
+    scheduler = TrackWhileScanScheduler()
+    scheduler.update_track(1, (30, 100), threat=1.0, now=0.0)
+    scheduler.update_track(2, (30, 200), threat=0.1, now=0.0)
+    scheduler.update_track(3, (30, 250), rate=(0.0, 20.0), threat=0.1, now=0.0)
+    enemy, friendly, fast = (scheduler.tracks[i] for i in (1, 2, 3))
+    assert scheduler.revisit_interval(enemy) < scheduler.revisit_interval(friendly)
+    assert scheduler.revisit_interval(fast) < scheduler.revisit_interval(friendly)
+    # The most urgent due track is the enemy
+    assert scheduler.due_tracks(now=10.0)[0].track_id == 1
+
+
+def test_revisit_budget_is_respected():
+    """Revisits never take more than revisit_share of the turret time."""
+    scheduler = TrackWhileScanScheduler(revisit_share=0.25)
+    for track_id in range(10):
+        scheduler.update_track(track_id, (30, 20 * track_id), threat=1.0, now=0.0)
+    now, kind = 0.0, TaskKind.SCAN
+    for _ in range(600):
+        now += 0.1
+        scheduler.charge(kind, now)
+        task = scheduler.next_task(now)
+        kind = task.kind
+        if task.kind == TaskKind.REVISIT:
+            # Pretend the revisit found the track again
+            scheduler.record_revisit(task.track_id, now)
+            scheduler.update_track(task.track_id, task.pose, threat=1.0, now=now)
+    # Ten due tracks would take all the time without the budget
+    assert 0.2 < scheduler.share(TaskKind.REVISIT) <= 0.27
+    assert scheduler.get_metrics(now)['revisit_latency_mean'] > 0
+
+
+def test_engagement_gives_coverage_its_share():
+    """While engaging, coverage glances start once the scan share is starved."""
+    scheduler = TrackWhileScanScheduler(engaged_scan_share=0.1, window=5.0)
+    now = 0.0
+    for _ in range(30):
+        now += 0.1
+        scheduler.charge(TaskKind.SCAN, now)
+    assert scheduler.next_task(now, engaged_id=7).kind == TaskKind.ENGAGE
+    for _ in range(200):
+        now += 0.1
+        scheduler.charge(TaskKind.ENGAGE, now)
+    assert scheduler.next_task(now, engaged_id=7).kind == TaskKind.SCAN
+
+
+def test_coverage_age_tracks_tile_visits():
+    scheduler = TrackWhileScanScheduler()
+    tiles = [(5.0, 10.0), (5.0, 60.0)]
+    scheduler.set_coverage_tiles(tiles, now=0.0)
+    scheduler.record_coverage(tiles[0], now=4.0)
+    metrics = scheduler.get_metrics(now=5.0)
+    assert metrics['coverage_age_max'] == 5.0
+    assert metrics['coverage_age_mean'] == 3.0
+
+
+if __name__ == "__main__":
+    test_threatening_tracks_are_revisited_sooner()
+    test_revisit_budget_is_respected()
+    test_engagement_gives_coverage_its_share()
+    test_coverage_age_tracks_tile_visits()
+    print("✅ Track-while-scan scheduler tests passed")
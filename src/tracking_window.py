@@ -0,0 +1,109 @@
+import math
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class TrackingWindow:
+    """
+    Tracking-window inference: while a target is engaged, the detector runs on
+    a crop around the target's predicted position instead of the full frame.
+    - The crop is `scale` times the target box, grown by how far the target
+      may have moved (velocity × (age + latency) × velocity_margin), at least
+      min_size, rounded up to a multiple of 32 and kept inside the frame
+    - The crop is processed at native resolution (no downscaling), which keeps
+      small, far balloons sharp
+    - Every `full_frame_interval`-th frame is a full-frame pass so the tracker
+      keeps the other tracks alive
+    - A target that was not refreshed for `stale_time` falls back to full frames
+    """
+
+    def __init__(self, scale=2.5, min_size=128, velocity_margin=2.0, latency=0.15,
+                 full_frame_interval=5, stale_time=0.5, multiple=32):
+        self.scale = scale  # crop size relative to the target box
+        self.min_size = min_size  # pixels
+        self.velocity_margin = velocity_margin  # multiples of the predicted displacement added on each side
+        self.latency = latency  # seconds from target update to the frame being processed
+        self.full_frame_interval = full_frame_interval  # one full-frame pass every N frames
+        self.stale_time = stale_time  # seconds before an un-refreshed target is ignored
+        self.multiple = multiple  # YOLO stride - crops are sized to a multiple of it
+
+        self._lock = threading.Lock()
+        self._target = None  # (bbox, velocity, observed_at, set_at)
+        self._frames_since_full = 0
+        self.crop_frames = 0
+        self.full_frames = 0
+
+    def set_target(self, bbox, velocity=(0.0, 0.0), observed_at=None, now=None):
+        """Engaged target: last box (x1, y1, x2, y2), pixel velocity (px/s) and when the box was measured."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._target = (tuple(bbox), tuple(velocity), now if observed_at is None else observed_at, now)
+
+    def clear(self):
+        with self._lock:
+            self._target = None
+
+    @property
+    def is_active(self):
+        return self._target is not None
+
+    def window_for(self, bbox, velocity, lead, frame_shape) -> Tuple[int, int, int, int]:
+        """Crop (x1, y1, x2, y2) around the box predicted `lead` seconds ahead."""
+        height, width = frame_shape[:2]
+        cx = (bbox[0] + bbox[2]) / 2 + velocity[0] * lead
+        cy = (bbox[1] + bbox[3]) / 2 + velocity[1] * lead
+        crop_w = self._crop_size((bbox[2] - bbox[0]) * self.scale + 2 * self.velocity_margin * abs(velocity[0]) * lead,
+                                 width)
+        crop_h = self._crop_size((bbox[3] - bbox[1]) * self.scale + 2 * self.velocity_margin * abs(velocity[1]) * lead,
+                                 height)
+        x1 = int(round(min(max(cx - crop_w / 2, 0), width - crop_w)))
+        y1 = int(round(min(max(cy - crop_h / 2, 0), height - crop_h)))
+        return x1, y1, x1 + crop_w, y1 + crop_h
+
+    def _crop_size(self, size, limit):
+        size = max(size, self.min_size)
+        size = int(math.ceil(size / self.multiple) * self.multiple)
+        return min(size, limit)
+
+    def next_region(self, frame_shape, now=None) -> Optional[Tuple[int, int, int, int]]:
+        """Region to run the detector on for the next frame; None means the full frame."""
+        now = time.time() if now is None else now
+        with self._lock:
+            target = self._target
+        if target is None or now - target[3] > self.stale_time or \
+                self._frames_since_full + 1 >= self.full_frame_interval:
+            self._frames_since_full = 0
+            self.full_frames += 1
+            return None
+
+        bbox, velocity, observed_at, _ = target
+        region = self.window_for(bbox, velocity, now - observed_at + self.latency, frame_shape)
+        if region[2] - region[0] >= frame_shape[1] and region[3] - region[1] >= frame_shape[0]:
+            # The crop grew to the whole frame - nothing to gain
+            self.full_frames += 1
+            self._frames_since_full = 0
+            return None
+        self._frames_since_full += 1
+        self.crop_frames += 1
+        return region
+
+    @staticmethod
+    def to_frame(boxes, region):
+        """Map (N, 4+) crop boxes back to full-frame coordinates."""
+        boxes = np.array(boxes, dtype=np.float32, copy=True)
+        if region is not None and len(boxes):
+            boxes[:, [0, 2]] += region[0]
+            boxes[:, [1, 3]] += region[1]
+        return boxes
+
+    def get_stats(self):
+        total = self.crop_frames + self.full_frames
+        return {
+            'active': self.is_active,
+            'crop_frames': self.crop_frames,
+            'full_frames': self.full_frames,
+            'crop_share': self.crop_frames / total if total else 0.0,
+        }
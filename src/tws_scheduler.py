@@ -0,0 +1,226 @@
+import math
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from scan_planner import CAMERA_H_FOV, CAMERA_V_FOV
+
+
+class TaskKind(Enum):
+    SCAN = "scan"  # Next coverage tile
+    REVISIT = "revisit"  # Look at a known track's predicted position
+    ENGAGE = "engage"  # Keep servoing the engaged target
+
+
+@dataclass
+class TrackEstimate:
+    track_id: int
+    pose: Tuple[float, float]  # (servo, stepper) where the track was last seen
+    rate: Tuple[float, float]  # angular velocity (servo, stepper) in degrees/s
+    threat: float  # 0 (friendly) .. 1 (enemy)
+    last_seen: float
+    first_seen: float
+    revisits: int = 0
+
+    def age(self, now):
+        return now - self.last_seen
+
+    def predicted_pose(self, now):
+        age = self.age(now)
+        return self.pose[0] + self.rate[0] * age, self.pose[1] + self.rate[1] * age
+
+
+@dataclass
+class ScheduledTask:
+    kind: TaskKind
+    track_id: Optional[int] = None
+    pose: Optional[Tuple[float, float]] = None  # Where to point the turret (revisits only)
+    dwell: float = 0.0
+
+
+class TrackWhileScanScheduler:
+    """
+    Track-while-scan scheduler: time-slices the turret between coverage
+    scanning, short revisits of known tracks and the current engagement.
+    - Each track is due for a revisit when its position uncertainty reaches
+      `uncertainty_limit` of the camera FOV, or sooner for threatening tracks
+    - Revisits may use at most `revisit_share` of the turret time
+    - While engaging, `engaged_scan_share` of the time goes to coverage glances
+    Time shares are measured over an exponential window of `window` seconds.
+    """
+
+    THREAT_BY_TYPE = {"red_balloon": 1.0, "unknown": 0.5, "blue_balloon": 0.1}
+
+    def __init__(self, revisit_share=0.3, engaged_scan_share=0.1, base_revisit_interval=3.0,
+                 min_revisit_interval=0.5, revisit_dwell=0.25, position_sigma=1.0, velocity_sigma=4.0,
+                 uncertainty_limit=0.25, track_timeout=20.0, window=10.0,
+                 h_fov=CAMERA_H_FOV, v_fov=CAMERA_V_FOV):
+        self.revisit_share = revisit_share  # max fraction of turret time spent on revisits
+        self.engaged_scan_share = engaged_scan_share  # fraction of engagement time given to coverage glances
+        self.base_revisit_interval = base_revisit_interval  # seconds between revisits of a zero-threat track
+        self.min_revisit_interval = min_revisit_interval  # never revisit faster than this
+        self.revisit_dwell = revisit_dwell  # seconds to hold a revisit pose
+        self.position_sigma = position_sigma  # degrees of position error right after a sighting
+        self.velocity_sigma = velocity_sigma  # degrees/s of unknown target motion
+        self.uncertainty_limit = uncertainty_limit  # revisit when the error reaches this fraction of the FOV
+        self.track_timeout = track_timeout  # seconds unseen before a track is forgotten
+        self.window = window  # seconds of history behind the time shares
+        self.h_fov = h_fov
+        self.v_fov = v_fov
+
+        self.tracks: Dict[int, TrackEstimate] = {}
+        self._time_spent = {kind: 0.0 for kind in TaskKind}  # exponentially windowed seconds
+        self._last_charge_time = None
+
+        # Coverage age: last visit time per coverage tile
+        self._tile_visits: Dict[Tuple[float, float], float] = {}
+
+        # Revisit latency samples (seconds a track waited past its due time)
+        self._latency_samples: List[float] = []
+        self._revisit_ages: List[float] = []
+        self.max_samples = 200
+
+    # === Track bookkeeping ===
+
+    def update_track(self, track_id, pose, rate=(0.0, 0.0), threat=0.5, now=None):
+        """Record a sighting of a track at turret angles `pose`."""
+        now = time.time() if now is None else now
+        track = self.tracks.get(track_id)
+        if track is None:
+            self.tracks[track_id] = TrackEstimate(track_id, tuple(pose), tuple(rate), threat, now, now)
+            return
+        track.pose = tuple(pose)
+        track.rate = tuple(rate)
+        track.threat = threat
+        track.last_seen = now
+
+    def drop_track(self, track_id):
+        self.tracks.pop(track_id, None)
+
+    def expire_tracks(self, now=None):
+        now = time.time() if now is None else now
+        for track_id in [i for i, t in self.tracks.items() if t.age(now) > self.track_timeout]:
+            del self.tracks[track_id]
+
+    def uncertainty(self, track, now):
+        """Predicted position error (degrees) of a track."""
+        speed = math.hypot(track.rate[0], track.rate[1])
+        return self.position_sigma + (self.velocity_sigma + 0.5 * speed) * track.age(now)
+
+    def revisit_interval(self, track):
+        """Seconds after a sighting that a track becomes due for a revisit."""
+        limit = self.uncertainty_limit * min(self.h_fov, self.v_fov)
+        speed = math.hypot(track.rate[0], track.rate[1])
+        uncertainty_time = max(0.0, limit - self.position_sigma) / (self.velocity_sigma + 0.5 * speed)
+        threat_time = self.base_revisit_interval / (1.0 + 2.0 * track.threat)
+        return max(self.min_revisit_interval, min(uncertainty_time, threat_time))
+
+    def due_tracks(self, now=None, exclude=()):
+        """Tracks due for a revisit, most urgent first."""
+        now = time.time() if now is None else now
+        due = []
+        for track in self.tracks.values():
+            if track.track_id in exclude:
+                continue
+            interval = self.revisit_interval(track)
+            overdue = track.age(now) / interval
+            if overdue >= 1.0:
+                due.append((overdue * (1.0 + track.threat), track))
+        due.sort(key=lambda item: -item[0])
+        return [track for _, track in due]
+
+    # === Time budget ===
+
+    def charge(self, kind: TaskKind, now=None):
+        """Account the time since the last charge to `kind` (call once per control tick)."""
+        now = time.time() if now is None else now
+        if self._last_charge_time is not None:
+            dt = min(now - self._last_charge_time, 1.0)
+            decay = math.exp(-dt / self.window)
+            for k in self._time_spent:
+                self._time_spent[k] *= decay
+            self._time_spent[kind] += dt
+        self._last_charge_time = now
+
+    def share(self, kind: TaskKind):
+        total = sum(self._time_spent.values())
+        return self._time_spent[kind] / total if total > 0 else 0.0
+
+    # === Decisions ===
+
+    def next_task(self, now=None, engaged_id=None) -> ScheduledTask:
+        """
+        Decide what the turret should do next.
+        engaged_id: track currently being engaged (None while searching).
+        """
+        now = time.time() if now is None else now
+        self.expire_tracks(now)
+
+        if engaged_id is not None:
+            # Engagement keeps the turret unless coverage is starved
+            if self.engaged_scan_share > 0 and self.share(TaskKind.SCAN) < self.engaged_scan_share:
+                return ScheduledTask(TaskKind.SCAN)
+            return ScheduledTask(TaskKind.ENGAGE, track_id=engaged_id)
+
+        if self.share(TaskKind.REVISIT) < self.revisit_share:
+            due = self.due_tracks(now)
+            if due:
+                track = due[0]
+                return ScheduledTask(TaskKind.REVISIT, track_id=track.track_id,
+                                     pose=track.predicted_pose(now), dwell=self.revisit_dwell)
+        return ScheduledTask(TaskKind.SCAN)
+
+    def record_revisit(self, track_id, now=None):
+        """The turret has arrived at a revisit pose."""
+        now = time.time() if now is None else now
+        track = self.tracks.get(track_id)
+        if track is None:
+            return
+        track.revisits += 1
+        age = track.age(now)
+        self._revisit_ages.append(age)
+        self._latency_samples.append(max(0.0, age - self.revisit_interval(track)))
+        del self._revisit_ages[:-self.max_samples]
+        del self._latency_samples[:-self.max_samples]
+
+    # === Coverage age ===
+
+    @staticmethod
+    def _tile_key(waypoint):
+        return round(float(waypoint[0]), 1), round(float(waypoint[1]), 1)
+
+    def set_coverage_tiles(self, waypoints, now=None):
+        """Register the tiles of the coverage scan (keeps ages of tiles already known)."""
+        now = time.time() if now is None else now
+        visits = {}
+        for waypoint in waypoints:
+            key = self._tile_key(waypoint)
+            visits[key] = self._tile_visits.get(key, now)
+        self._tile_visits = visits
+
+    def record_coverage(self, waypoint, now=None):
+        self._tile_visits[self._tile_key(waypoint)] = time.time() if now is None else now
+
+    def coverage_ages(self, now=None):
+        now = time.time() if now is None else now
+        return [now - visited for visited in self._tile_visits.values()]
+
+    # === Metrics ===
+
+    def get_metrics(self, now=None):
+        now = time.time() if now is None else now
+        ages = self.coverage_ages(now)
+        latencies = self._latency_samples
+        return {
+            'tracked': len(self.tracks),
+            'due_revisits': len(self.due_tracks(now)),
+            'revisit_latency_mean': sum(latencies) / len(latencies) if latencies else 0.0,
+            'revisit_latency_max': max(latencies) if latencies else 0.0,
+            'revisit_age_mean': sum(self._revisit_ages) / len(self._revisit_ages) if self._revisit_ages else 0.0,
+            'coverage_age_mean': sum(ages) / len(ages) if ages else 0.0,
+            'coverage_age_max': max(ages) if ages else 0.0,
+            'scan_share': self.share(TaskKind.SCAN),
+            'revisit_share': self.share(TaskKind.REVISIT),
+            'engage_share': self.share(TaskKind.ENGAGE),
+        }